@@ -0,0 +1,274 @@
+"""
+Script for benchmarking the stages of a scenario run across parcel counts, year spans, and
+transformer fan-outs
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+
+from run import create_study, post_process_outputs
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB, ProfileCache
+from segment_iat.utils.benchmark import (
+    BASELINE_FILEPATH,
+    DEFAULT_SCENARIO,
+    DEFAULT_TEMPLATE,
+    DEFAULT_THRESHOLD,
+    RESULTS_FILEPATH,
+    compare_to_baseline,
+    get_benchmark_cases,
+    get_case_study_id,
+    get_scaling_curves,
+    write_scaled_study
+)
+from segment_iat.utils.incentives import Incentives
+from segment_iat.utils.stage_recorder import StageRecorder, listen_stages
+from segment_iat.utils.status import QuietStatus
+
+
+RESULTS_VERSION = 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time and memory-profile each stage of a scenario run on studies scaled from "
+        "a template study, and compare the results against a baseline"
+    )
+    parser.add_argument(
+        "--template",
+        default=DEFAULT_TEMPLATE,
+        help="The study whose parcels are tiled into each benchmark study "
+        f"(default: {DEFAULT_TEMPLATE})"
+    )
+    parser.add_argument(
+        "--scenario",
+        default=DEFAULT_SCENARIO,
+        help=f"The template scenario to run (default: {DEFAULT_SCENARIO})"
+    )
+    parser.add_argument("--parcels", type=int, nargs="+", help="Parcel counts of the parcels curve")
+    parser.add_argument("--years", type=int, nargs="+", help="Year spans of the years curve")
+    parser.add_argument(
+        "--fanouts", type=int, nargs="+", help="Parcels per transformer of the fan-out curve"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Timed runs of each case; the fastest is kept (default: 1)"
+    )
+    parser.add_argument(
+        "--no-memory",
+        help="Skip the extra run of each case that records peak memory with tracemalloc",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile-matrix",
+        help="Run with the shared profile matrix, as run.py --profile-matrix does",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Memory budget in MB for energy profiles (default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    parser.add_argument(
+        "--output",
+        default=RESULTS_FILEPATH,
+        help=f"File of the benchmark results (default: {RESULTS_FILEPATH})"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_FILEPATH,
+        help=f"Baseline results to compare against (default: {BASELINE_FILEPATH})"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative increase in a stage's wall time or peak memory over the baseline that is "
+        f"flagged as a regression (default: {DEFAULT_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        help="Write the results as the new baseline instead of comparing against it",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--keep-studies",
+        help="Keep the generated benchmark studies and their outputs",
+        action="store_true"
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    cases = get_benchmark_cases(args.parcels, args.years, args.fanouts)
+
+    template_config = os.path.join("./config_files", args.template, f"{args.template}_config.csv")
+    incentives = Incentives(create_study(template_config).zip_code)
+    incentives.gather_incentives()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "template": args.template,
+        "scenario": args.scenario,
+        "profile_matrix": args.profile_matrix,
+        "repeat": args.repeat,
+        "cases": [],
+    }
+    # Imports and file caches are warmed up by an untimed run, so the first case is not penalized
+    study_id = get_case_study_id({"parcels": 1, "years": 1, "fanout": 1})
+    write_scaled_study(args.template, study_id, 1, 1, 1)
+    try:
+        run_case(study_id, args.scenario, incentives, args.profile_cache_mb, args.profile_matrix)
+    finally:
+        remove_study(study_id)
+
+    for case_num, case in enumerate(cases):
+        print(f"==========Case {case_num + 1} of {len(cases)}: {case['key']}==========")
+        study_id = get_case_study_id(case)
+        write_scaled_study(args.template, study_id, case["parcels"], case["years"], case["fanout"])
+
+        try:
+            timed_runs = [
+                run_case(
+                    study_id, args.scenario, incentives, args.profile_cache_mb, args.profile_matrix
+                )
+                for _ in range(args.repeat)
+            ]
+            stages = min(timed_runs, key=lambda stages: stages["total"]["wall_s"])
+            if not args.no_memory:
+                memory_stages = run_case(
+                    study_id,
+                    args.scenario,
+                    incentives,
+                    args.profile_cache_mb,
+                    args.profile_matrix,
+                    track_memory=True
+                )
+                for stage, stats in memory_stages.items():
+                    stages[stage]["peak_mb"] = round(stats["peak_mb"], 3)
+        finally:
+            if not args.keep_studies:
+                remove_study(study_id)
+
+        results["cases"].append({**case, "stages": stages})
+        print(f"Total: {stages['total']['wall_s']:.3f}s")
+
+    results["curves"] = get_scaling_curves(results)
+    print_curves(results["curves"])
+
+    output_filepath = args.baseline if args.save_baseline else args.output
+    os.makedirs(os.path.dirname(output_filepath) or ".", exist_ok=True)
+    with open(output_filepath, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote benchmark results of {len(cases)} cases to {output_filepath}")
+
+    if args.save_baseline:
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['case']} {regression['stage']} {regression['metric']}: "
+            f"{regression['baseline']:.3f} -> {regression['current']:.3f} "
+            f"(x{regression['ratio']})"
+        )
+    if regressions:
+        sys.exit(f"{len(regressions)} stages regressed by more than {args.threshold:.0%}")
+    print(f"No stage regressed by more than {args.threshold:.0%} against {args.baseline}")
+
+
+def run_case(
+        study_id: str,
+        scenario: str,
+        incentives: Incentives,
+        profile_cache_mb: float,
+        profile_matrix: bool = False,
+        track_memory: bool = False
+) -> dict:
+    """
+    Load a benchmark study from a cold profile cache, run one scenario with CSV outputs, and
+    postprocess its outputs, recording every stage
+
+    Args:
+        study_id (str): The benchmark study ID
+        scenario (str): The scenario ID
+        incentives (Incentives): Incentives gathered once for every case
+        profile_cache_mb (float): Memory budget in MB for energy profiles
+
+    Optional Args:
+        profile_matrix (bool): If True, run with the shared profile matrix
+        track_memory (bool): If True, record peak memory with tracemalloc
+
+    Returns:
+        dict: The stats of each stage, rounded
+    """
+    shutil.rmtree(os.path.join("./outputs", study_id), ignore_errors=True)
+
+    recorder = StageRecorder(track_memory)
+    with listen_stages(recorder), contextlib.redirect_stdout(io.StringIO()):
+        with recorder.measure("total"):
+            profile_cache = ProfileCache(profile_cache_mb)
+            study = create_study(f"./config_files/{study_id}/{study_id}_config.csv")
+            study.load_study(profile_cache, baseline_timeseries=not profile_matrix)
+
+            matrix = None
+            if profile_matrix:
+                with recorder.measure("build_profile_matrix"):
+                    matrix = study.build_profile_matrix([scenario], profile_cache)
+                profile_cache.clear()
+
+            scenario_creator = study.create_scenario_creator(
+                scenario,
+                QuietStatus(),
+                profile_cache=profile_cache,
+                profile_matrix=matrix,
+                incentives=incentives
+            )
+            scenario_creator.create_scenario()
+
+            with recorder.measure("postprocessing"):
+                post_process_outputs(True, [study_id])
+
+    return {
+        stage: {metric: round(value, 4) for metric, value in stats.items()}
+        for stage, stats in recorder.stages.items()
+    }
+
+
+def remove_study(study_id: str) -> None:
+    for dirpath in ["./config_files", "./outputs", "./results"]:
+        shutil.rmtree(os.path.join(dirpath, study_id), ignore_errors=True)
+
+
+def print_curves(curves: dict) -> None:
+    """
+    Print the wall time of each stage along each curve and its scaling exponent
+    """
+    for curve, curve_stats in curves.items():
+        print(f"==========Scaling with {curve}==========")
+        print(f"{'stage':40}" + "".join(f"{x:>10}" for x in curve_stats["x"]) + f"{'exponent':>10}")
+        for stage, stats in curve_stats["stages"].items():
+            exponent = "" if stats["exponent"] is None else f"{stats['exponent']:.2f}"
+            print(
+                f"{stage:40}" + "".join(f"{i:>10.3f}" for i in stats["wall_s"]) + f"{exponent:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
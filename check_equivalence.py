@@ -0,0 +1,190 @@
+"""
+Script for checking that the optimized paths of a scenario run give the same outputs as the
+reference path, on a shipped study or a synthetic one
+"""
+import argparse
+import glob
+import os
+import shutil
+import sys
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB
+from segment_iat.scenario_creator.equivalence_check import (
+    DEFAULT_ATOL,
+    DEFAULT_BUILDING_WORKERS,
+    DEFAULT_RTOL,
+    DEFAULT_VARIANTS,
+    EquivalenceCheck,
+    compare_output_dirs,
+    format_difference
+)
+from segment_iat.utils.synthetic_study import DEFAULT_SEED, PROFILES_BASEPATH, SyntheticStudy
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run scenarios of a study on the reference path and on the optimized paths, "
+        "and compare every output table against the reference. Or compare the CSV outputs of "
+        "two runs with --compare-dirs"
+    )
+    parser.add_argument("study", nargs="?", help="The study to check")
+    parser.add_argument("--scenario", nargs="+", help="The scenario(s) to check (default: all)")
+    parser.add_argument(
+        "--variant",
+        nargs="+",
+        choices=DEFAULT_VARIANTS,
+        help="The optimized paths to check (default: all)"
+    )
+    parser.add_argument(
+        "--building-workers",
+        type=int,
+        default=DEFAULT_BUILDING_WORKERS,
+        help="Number of building workers of paths with building workers "
+        f"(default: {DEFAULT_BUILDING_WORKERS})"
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="PARCELS",
+        help="Write a synthetic study of this many parcels with the study ID, check it, and "
+        "remove it"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Random seed of the synthetic study (default: {DEFAULT_SEED})"
+    )
+    parser.add_argument(
+        "--keep-study",
+        help="Keep the synthetic study and its energy profiles",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--compare-dirs",
+        nargs=2,
+        metavar=("REFERENCE", "CANDIDATE"),
+        help="Compare the CSV output tables of two outputs directories instead of running "
+        "scenarios, i.e. outputs of a study saved before a change and outputs/<study>"
+    )
+    parser.add_argument(
+        "--rtol",
+        type=float,
+        default=DEFAULT_RTOL,
+        help=f"Relative float tolerance (default: {DEFAULT_RTOL})"
+    )
+    parser.add_argument(
+        "--atol",
+        type=float,
+        default=DEFAULT_ATOL,
+        help=f"Absolute float tolerance (default: {DEFAULT_ATOL})"
+    )
+    parser.add_argument(
+        "--tolerance",
+        nargs="+",
+        default=[],
+        metavar="TABLE=RTOL[,ATOL]",
+        help="Float tolerances of one table, i.e. peak_consump=1e-6,1e-3"
+    )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Memory budget in MB for energy profiles (default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    args = parser.parse_args()
+
+    try:
+        tolerances = dict(parse_tolerance(i, args.atol) for i in args.tolerance)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.compare_dirs:
+        if args.study or args.synthetic:
+            parser.error("--compare-dirs compares existing outputs; do not pass a study")
+        differences = compare_output_dirs(*args.compare_dirs, tolerances, args.rtol, args.atol)
+        report_differences(differences, f"Every output table of {args.compare_dirs[1]} matches")
+        return
+
+    if not args.study:
+        parser.error("Pass a study to check, or --compare-dirs")
+    if args.building_workers < 2:
+        parser.error("--building-workers must be at least 2")
+
+    if args.synthetic:
+        print(f"Writing synthetic study {args.study} of {args.synthetic} parcels...")
+        synthetic_study = SyntheticStudy(args.study, args.synthetic, seed=args.seed)
+        synthetic_study.write_study()
+
+    try:
+        study_filepath = f"./config_files/{args.study}/{args.study}_config.csv"
+        if not os.path.exists(study_filepath):
+            raise FileNotFoundError(f"Config file does not exist for study {args.study.upper()}")
+
+        scenarios = args.scenario or sorted(
+            i.split("_config.csv")[0]
+            for i in os.listdir(f"./config_files/{args.study}/scenarios/")
+        )
+
+        equivalence_check = EquivalenceCheck(
+            create_study(study_filepath),
+            scenarios,
+            variants=args.variant,
+            building_workers=args.building_workers,
+            tolerances=tolerances,
+            rtol=args.rtol,
+            atol=args.atol,
+            profile_cache_mb=args.profile_cache_mb
+        )
+        differences = equivalence_check.run()
+    finally:
+        if args.synthetic and not args.keep_study:
+            remove_synthetic_study(args.study)
+
+    for variant, wall_s in equivalence_check.wall_s.items():
+        print(f"{variant:30}{wall_s:>10.3f}s")
+    report_differences(
+        differences,
+        f"Every output table of {len(scenarios)} scenarios matches the reference on "
+        f"{len(equivalence_check.variants)} paths"
+    )
+
+
+def parse_tolerance(tolerance: str, default_atol: float) -> tuple:
+    """
+    Parse a TABLE=RTOL[,ATOL] tolerance into the table name and its tolerances
+    """
+    table_name, _, values = tolerance.partition("=")
+    try:
+        values = [float(i) for i in values.split(",")]
+    except ValueError:
+        values = []
+    if not table_name or not 1 <= len(values) <= 2:
+        raise ValueError(f"Tolerance {tolerance} is not TABLE=RTOL[,ATOL]")
+
+    return table_name, (values[0], values[1] if len(values) == 2 else default_atol)
+
+
+def report_differences(differences: list, match_msg: str) -> None:
+    for difference in differences:
+        print(f"DIFFERENCE {format_difference(difference)}")
+    if differences:
+        sys.exit(f"{len(differences)} output tables differ")
+    print(match_msg)
+
+
+def remove_synthetic_study(study_id: str) -> None:
+    """
+    Remove a synthetic study, and its energy profiles, digests, and profile matrix
+    """
+    shutil.rmtree(os.path.join("./config_files", study_id), ignore_errors=True)
+    profile_filepaths = glob.glob(
+        os.path.join(PROFILES_BASEPATH, "**", f"{study_id}_*"), recursive=True
+    )
+    for filepath in profile_filepaths:
+        os.remove(filepath)
+
+
+if __name__ == "__main__":
+    main()
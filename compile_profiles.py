@@ -0,0 +1,47 @@
+"""
+Simple script for compiling CSV energy consumption profiles into the binary profile store
+"""
+import argparse
+import os
+
+from segment_iat.energy_profiles.profile_store import COMPILED_DIRNAME, ProfileStore
+
+
+PROFILES_DIRPATH = "./config_files/energy_consumption"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile CSV energy consumption profiles into the binary profile store"
+    )
+    parser.add_argument(
+        "consumption_id",
+        nargs="*",
+        help="The consumption profile ID(s) to compile. Compiles all CSV profiles if not provided"
+    )
+    parser.add_argument(
+        "--profiles-dir",
+        default=PROFILES_DIRPATH,
+        help=f"Directory of the CSV energy consumption profiles (default: {PROFILES_DIRPATH})"
+    )
+    args = parser.parse_args()
+
+    profiles_dir = args.profiles_dir
+    consumption_ids = args.consumption_id or None
+
+    if not os.path.exists(profiles_dir):
+        raise FileNotFoundError(f"Energy consumption profiles directory {profiles_dir} does not exist!")
+
+    if consumption_ids:
+        for consumption_id in consumption_ids:
+            if not os.path.exists(os.path.join(profiles_dir, f"{consumption_id}.csv")):
+                raise FileNotFoundError(f"No CSV profile found for consumption ID '{consumption_id}'")
+
+    profile_store = ProfileStore(os.path.join(profiles_dir, COMPILED_DIRNAME))
+    compiled = profile_store.compile_directory(profiles_dir, consumption_ids)
+
+    print(f"Compiled {len(compiled)} profiles to {profile_store.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
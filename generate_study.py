@@ -0,0 +1,110 @@
+"""
+Script for writing a synthetic study of any size, with synthetic energy profiles, for scale testing
+"""
+import argparse
+
+from segment_iat.utils.synthetic_study import (
+    DEFAULT_ARCHETYPES,
+    DEFAULT_END_YEAR,
+    DEFAULT_GAS_PIPE_INTERVENTION_YEAR,
+    DEFAULT_PARCELS_PER_MAIN,
+    DEFAULT_PARCELS_PER_TRANSFORMER,
+    DEFAULT_RETROFIT_WAVES,
+    DEFAULT_SEED,
+    DEFAULT_START_YEAR,
+    PROFILES_BASEPATH,
+    SyntheticStudy
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a complete synthetic study, with synthetic 8760 energy profiles, to "
+        "config_files. The same seed and sizes always write the same study"
+    )
+    parser.add_argument("study_id", help="The ID of the study to write, i.e. synthetic_50k")
+    parser.add_argument("parcels", type=int, help="Number of parcels")
+    parser.add_argument(
+        "--transformers",
+        type=int,
+        help=f"Number of transformers (default: one per {DEFAULT_PARCELS_PER_TRANSFORMER} parcels)"
+    )
+    parser.add_argument(
+        "--mains",
+        type=int,
+        help=f"Number of gas mains (default: one per {DEFAULT_PARCELS_PER_MAIN} gas parcels)"
+    )
+    parser.add_argument(
+        "--retrofit-waves",
+        type=int,
+        default=DEFAULT_RETROFIT_WAVES,
+        help=f"Number of retrofit waves before the gas pipe intervention year "
+        f"(default: {DEFAULT_RETROFIT_WAVES})"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})"
+    )
+    parser.add_argument(
+        "--archetypes",
+        type=int,
+        default=DEFAULT_ARCHETYPES,
+        help=f"Number of building archetypes (default: {DEFAULT_ARCHETYPES})"
+    )
+    parser.add_argument(
+        "--start-year",
+        type=int,
+        default=DEFAULT_START_YEAR,
+        help=f"Start year (default: {DEFAULT_START_YEAR})"
+    )
+    parser.add_argument(
+        "--end-year",
+        type=int,
+        default=DEFAULT_END_YEAR,
+        help=f"End year (default: {DEFAULT_END_YEAR})"
+    )
+    parser.add_argument(
+        "--gas-pipe-intervention-year",
+        type=int,
+        default=DEFAULT_GAS_PIPE_INTERVENTION_YEAR,
+        help=f"Gas pipe intervention year (default: {DEFAULT_GAS_PIPE_INTERVENTION_YEAR})"
+    )
+    parser.add_argument(
+        "--profiles-dir",
+        default=PROFILES_BASEPATH,
+        help=f"Directory of the CSV energy consumption profiles (default: {PROFILES_BASEPATH})"
+    )
+    parser.add_argument(
+        "--compile",
+        help="Also compile the profiles into the binary profile store",
+        action="store_true"
+    )
+    args = parser.parse_args()
+
+    try:
+        study = SyntheticStudy(
+            args.study_id,
+            args.parcels,
+            transformers=args.transformers,
+            mains=args.mains,
+            retrofit_waves=args.retrofit_waves,
+            seed=args.seed,
+            archetypes=args.archetypes,
+            start_year=args.start_year,
+            end_year=args.end_year,
+            gas_pipe_intervention_year=args.gas_pipe_intervention_year
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    study_path = study.write_study(
+        profiles_dirpath=args.profiles_dir, compile_profiles=args.compile
+    )
+
+    print(
+        f"Wrote synthetic study of {args.parcels} parcels to {study_path} and "
+        f"{len(study.profiles)} energy profiles to {args.profiles_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Script for Monte Carlo uncertainty analysis of one scenario's costs, install years, and transformer
+upgrades
+"""
+import argparse
+import os
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB, ProfileCache
+from segment_iat.scenario_creator.monte_carlo import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_NUM_DRAWS,
+    DEFAULT_QUANTILES,
+    MonteCarlo,
+    read_distributions
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Draw measure costs, retrofit install years, and the transformer upgrade cost "
+        "of a scenario from distributions, and write the mean and quantiles of the outputs"
+    )
+    parser.add_argument("study", help="The study to analyze")
+    parser.add_argument("scenario", help="The scenario to analyze")
+    parser.add_argument(
+        "--distributions",
+        help="CSV of the distribution of each uncertain input "
+        "(default: config_files/<study>/<study>_distributions.csv)"
+    )
+    parser.add_argument(
+        "--draws",
+        type=int,
+        default=DEFAULT_NUM_DRAWS,
+        help=f"The number of draws (default: {DEFAULT_NUM_DRAWS})"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"The maximum number of draws evaluated at once (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the draws")
+    parser.add_argument(
+        "--quantiles",
+        type=float,
+        nargs="+",
+        default=DEFAULT_QUANTILES,
+        help=f"The quantiles to report (default: {DEFAULT_QUANTILES})"
+    )
+    parser.add_argument(
+        "--profile-matrix",
+        help="Hold all energy profiles in one shared memory-mapped float32 matrix",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Memory budget in MB for energy profiles (default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    parser.add_argument(
+        "--output",
+        help="File of the summary table; written as Parquet if it ends in .parquet "
+        "(default: results/<study>/<scenario>_monte_carlo.csv)"
+    )
+    args = parser.parse_args()
+
+    study_config_filepath = f"./config_files/{args.study}/{args.study}_config.csv"
+    if not os.path.exists(study_config_filepath):
+        raise FileNotFoundError(f"Config file does not exist for study {args.study.upper()}")
+
+    scenario = args.scenario.lower()
+    if not os.path.exists(f"./config_files/{args.study}/scenarios/{scenario}_config.csv"):
+        raise FileNotFoundError(
+            f"File for scenario {scenario.upper()} does not exist for study {args.study.upper()}"
+        )
+
+    distributions_filepath = (
+        args.distributions or f"./config_files/{args.study}/{args.study}_distributions.csv"
+    )
+    if not os.path.exists(distributions_filepath):
+        raise FileNotFoundError(f"Distributions file {distributions_filepath} does not exist")
+
+    output_filepath = args.output or f"./results/{args.study}/{scenario}_monte_carlo.csv"
+
+    study = create_study(study_config_filepath)
+    profile_cache = ProfileCache(args.profile_cache_mb)
+
+    print("Computing study baseline...")
+    study.load_study(profile_cache, baseline_timeseries=not args.profile_matrix)
+
+    profile_matrix = None
+    if args.profile_matrix:
+        print("Building profile matrix...")
+        profile_matrix = study.build_profile_matrix([scenario], profile_cache)
+        profile_cache.clear()
+
+    monte_carlo = MonteCarlo(
+        study,
+        scenario,
+        read_distributions(distributions_filepath),
+        num_draws=args.draws,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        quantiles=args.quantiles,
+        profile_cache=profile_cache,
+        profile_matrix=profile_matrix
+    )
+    summary_df = monte_carlo.run_monte_carlo()
+
+    os.makedirs(os.path.dirname(output_filepath) or ".", exist_ok=True)
+    if output_filepath.endswith(".parquet"):
+        summary_df.to_parquet(output_filepath, index=False)
+    else:
+        summary_df.to_csv(output_filepath, index=False)
+
+    print(f"Wrote {len(summary_df)} rows summarizing {args.draws} draws to {output_filepath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Script for finding the gas pipe intervention strategy and year with the lowest cost or emissions
+"""
+import argparse
+import os
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB, ProfileCache
+from segment_iat.scenario_creator.gas_intervention_optimizer import (
+    DEFAULT_DISCOUNT_RATE,
+    DEFAULT_METHANE_GWP,
+    OBJECTIVE_COST,
+    OBJECTIVES,
+    STRATEGIES,
+    GasInterventionOptimizer
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search gas pipe intervention strategies (replace or decommission) and years "
+        "for the lowest total present value cost or emissions of a scenario"
+    )
+    parser.add_argument("study", help="The study to optimize")
+    parser.add_argument("scenario", help="The scenario whose measures set the building retrofits")
+    parser.add_argument(
+        "--objective",
+        choices=OBJECTIVES,
+        default=OBJECTIVE_COST,
+        help=f"The objective to minimize (default: {OBJECTIVE_COST})"
+    )
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=STRATEGIES,
+        default=STRATEGIES,
+        help="The gas interventions to search (default: all)"
+    )
+    parser.add_argument(
+        "--years",
+        type=int,
+        nargs="+",
+        help="The gas pipe intervention years to search (default: every study year)"
+    )
+    parser.add_argument(
+        "--discount-rate",
+        type=float,
+        default=DEFAULT_DISCOUNT_RATE,
+        help=f"Annual discount rate of costs (default: {DEFAULT_DISCOUNT_RATE})"
+    )
+    parser.add_argument(
+        "--methane-gwp",
+        type=float,
+        default=DEFAULT_METHANE_GWP,
+        help=f"Global warming potential of methane in kgCO2e/kgCH4 (default: {DEFAULT_METHANE_GWP})"
+    )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Memory budget in MB for energy profiles (default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    parser.add_argument(
+        "--output",
+        help="File of every evaluated intervention "
+        "(default: results/<study>/<scenario>_gas_intervention.csv)"
+    )
+    args = parser.parse_args()
+
+    study_config_filepath = f"./config_files/{args.study}/{args.study}_config.csv"
+    if not os.path.exists(study_config_filepath):
+        raise FileNotFoundError(f"Config file does not exist for study {args.study.upper()}")
+
+    scenario = args.scenario.lower()
+    if not os.path.exists(f"./config_files/{args.study}/scenarios/{scenario}_config.csv"):
+        raise FileNotFoundError(
+            f"File for scenario {scenario.upper()} does not exist for study {args.study.upper()}"
+        )
+
+    output_filepath = args.output or f"./results/{args.study}/{scenario}_gas_intervention.csv"
+
+    study = create_study(study_config_filepath)
+    profile_cache = ProfileCache(args.profile_cache_mb)
+
+    print("Computing study baseline...")
+    study.load_study(profile_cache)
+
+    optimizer = GasInterventionOptimizer(
+        study,
+        scenario,
+        objective=args.objective,
+        strategies=args.strategies,
+        years=args.years,
+        discount_rate=args.discount_rate,
+        methane_gwp=args.methane_gwp,
+        profile_cache=profile_cache
+    )
+    results_df = optimizer.run_optimizer()
+
+    os.makedirs(os.path.dirname(output_filepath) or ".", exist_ok=True)
+    results_df.to_csv(output_filepath, index=False)
+
+    print(f"Wrote {len(results_df)} evaluated gas pipe interventions to {output_filepath}")
+
+
+if __name__ == "__main__":
+    main()
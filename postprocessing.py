@@ -5,6 +5,7 @@ import argparse
 import os
 
 from run import post_process_outputs
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_CSV, OUTPUT_FORMATS
 
 
 def main():
@@ -14,15 +15,22 @@ def main():
         nargs="+",
         help="The street segment(s) whose outputs you would like to post-process"
     )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default=OUTPUT_FORMAT_CSV,
+        help=f"Format the outputs were written in (default: {OUTPUT_FORMAT_CSV})"
+    )
     args = parser.parse_args()
 
     segments = args.street_segment
 
-    for segment in segments:
-        if not os.path.exists(os.path.join(f"outputs/{segment}")):
-            raise FileNotFoundError(f"Outputs for street segment '{segment}' do not exist!")
+    if args.output_format == OUTPUT_FORMAT_CSV:
+        for segment in segments:
+            if not os.path.exists(os.path.join(f"outputs/{segment}")):
+                raise FileNotFoundError(f"Outputs for street segment '{segment}' do not exist!")
 
-    post_process_outputs(True, segments)
+    post_process_outputs(True, segments, args.output_format)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,29 @@
 """
-Main script to run the simulation
+Main script to run the simulation. Only the standard library and light segment_iat modules are
+imported at startup; pandas and the simulation modules are imported once a run needs them, so
+--help, --list-scenarios, --check, and pre-check failures return quickly
 """
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
 import os
-from typing import List
+import sys
+from typing import TYPE_CHECKING, List, Tuple
 
-import pandas as pd
+from segment_iat.scenario_creator.scenario_profiler import PROFILES_BASEPATH, ScenarioProfiler
+from segment_iat.utils.run_defaults import (
+    DEFAULT_MEMORY_BUDGET_MB,
+    OUTPUT_FORMAT_CSV,
+    OUTPUT_FORMAT_PARQUET,
+    OUTPUT_FORMATS
+)
+from segment_iat.utils.study_check import check_study, get_scenarios, get_study_config_filepath
 
-from segment_iat.segment_study.segment_study import SegmentStudy
-from segment_iat.scenario_creator.create_scenario import ScenarioCreator
+if TYPE_CHECKING:
+    from segment_iat.energy_profiles.profile_cache import ProfileCache
+    from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+    from segment_iat.scenario_creator.create_scenario import ScenarioCreator
+    from segment_iat.segment_study.segment_study import SegmentStudy
 
 
 OUTPUT_FILES = [
@@ -29,6 +44,9 @@ OUTPUT_FILES = [
 
 COMBINED_FILES_KEY = "combined"
 
+# Study and shared profile data of a worker process, set once by _init_worker
+_WORKER_STATE = {}
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -42,66 +60,399 @@ def main():
         help="Postprocess outputs across scenarios into condensed files to be tracked by git",
         action="store_true"
     )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help="Memory budget in MB for energy profiles shared across scenarios "
+        f"(default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    parser.add_argument(
+        "--profile-matrix",
+        help="Hold all energy profiles in one shared memory-mapped float32 matrix instead of "
+        "per-profile DataFrames. Reduces memory for large segments",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of scenarios to run in parallel worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--building-workers",
+        type=int,
+        default=1,
+        help="Number of workers loading energy profiles and, with --profile-matrix, populating "
+        "buildings within each scenario (default: 1)"
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default=OUTPUT_FORMAT_CSV,
+        help="Format of the output tables. parquet writes typed, compressed tables partitioned by "
+        "study and scenario under outputs/parquet, and postprocessing combines them without "
+        f"reading their data (default: {OUTPUT_FORMAT_CSV})"
+    )
+    parser.add_argument(
+        "--force",
+        help="Run every scenario, even if its inputs are unchanged since a cached run",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--prune-cache",
+        help="Remove cached runs of the selected scenarios that were made with older inputs",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--cache-max-age-days",
+        type=float,
+        help="Remove cached runs (of any study) not stored or restored within this many days"
+    )
+    parser.add_argument(
+        "--profile",
+        help="Record the wall and CPU time of each stage of each scenario and write a report per "
+        f"scenario to {PROFILES_BASEPATH}/<study>. Profiled scenarios are always run",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        help="With --profile, also record the peak memory of each stage with tracemalloc. Slows "
+        "the run down",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--cprofile",
+        help="With --profile, also dump cProfile stats of each scenario to <scenario>.pstats",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--list-scenarios",
+        help="List the scenarios of the study and exit",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--check",
+        help="Check the study config, parcels, and the selected scenarios' settings and measures, "
+        "report any problems, and exit without running",
+        action="store_true"
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.building_workers < 1:
+        parser.error("--building-workers must be at least 1")
+    if (args.profile_memory or args.cprofile) and not args.profile:
+        parser.error("--profile-memory and --cprofile require --profile")
 
     study = args.study
     scenarios = args.scenario
     postprocessing = args.postprocessing
 
+    if args.list_scenarios:
+        print("\n".join(sorted(get_scenarios(study))))
+        return
+
     print("==========Simulation pre-check==========")
-    study_dir = f"./config_files/{study}/"
-    study_config_filepath = os.path.join(study_dir, f"{study}_config.csv")
-    study_exists = os.path.exists(study_config_filepath)
-    if not study_exists:
-        raise FileNotFoundError(f"Config file does not exist for study {study.upper()}")
-
-    scenarios_basepath = f"./config_files/{study}/scenarios/"
-    if not scenarios:
-        scenarios = [i.split("_config.csv")[0] for i in os.listdir(scenarios_basepath)]
-    else:
-        scenarios = [i.lower() for i in scenarios]
+    scenarios = get_scenarios(study, scenarios)
 
-    for i in scenarios:
-        if not os.path.exists(os.path.join(study_dir, "scenarios", i+"_config.csv")):
-            raise FileNotFoundError(
-                f"File for scenario {i.upper()} does not exist for study {study.upper()}. "
-                f"No file found at {os.path.join(study_dir, i)}"
-            )
+    if args.check:
+        problems = check_study(study, scenarios)
+        for problem in problems:
+            print(f"PROBLEM {problem}")
+        if problems:
+            sys.exit(f"{len(problems)} problems found in study {study.upper()}")
+        print(f"Check complete! {len(scenarios)} scenarios of study {study.upper()} can be run")
+        return
 
     print("Check complete!")
 
-    study = create_study(study_config_filepath)
-    study.load_study()
-
-    street_segments = []
-    for scenario in scenarios:
-        print(f"==========Scenario file: {scenario}==========")
-        print("Loading inputs...")
-
-        settings_filepath = f"./config_files/{study.segment_name}/scenarios/{scenario}_config.csv"
-        scenario_creator = ScenarioCreator(
-            study.segment_name,
-            study.zip_code,
-            study.study_start_year,
-            study.study_end_year,
-            study.gas_pipe_intervention_year,
-            study.parcels_table,
-            settings_filepath
+    # The simulation modules import pandas, so they are only imported once a run starts
+    from segment_iat.energy_profiles.profile_cache import ProfileCache
+    from segment_iat.utils.run_cache import RunCache
+
+    study = create_study(get_study_config_filepath(study))
+    study.load_parcels()
+
+    # Scenarios whose inputs are unchanged since a cached run get their outputs restored
+    run_cache = RunCache()
+    run_options = {"output_format": args.output_format, "profile_matrix": args.profile_matrix}
+    cache_keys = {
+        scenario: run_cache.get_scenario_key(study, scenario, run_options)
+        for scenario in scenarios
+    }
+
+    profiler = None
+    if args.profile:
+        profiler = ScenarioProfiler(track_memory=args.profile_memory, cprofile=args.cprofile)
+
+    scenario_results = {}
+    if not args.force and not profiler:
+        for scenario in scenarios:
+            manifest = run_cache.restore(cache_keys[scenario])
+            if manifest:
+                print(f"==========Scenario unchanged: {scenario} (outputs restored from cache)"
+                      "==========")
+                scenario_results[scenario] = (
+                    manifest["street_segment"],
+                    manifest["building_ids"],
+                    manifest["output_filepaths"]
+                )
+
+    scenarios_to_run = [i for i in scenarios if i not in scenario_results]
+
+    # Energy profiles are parsed once per run and shared by every scenario
+    profile_cache = ProfileCache(args.profile_cache_mb)
+
+    if scenarios_to_run:
+        print("Computing study baseline...")
+        # Matrix-mode buildings read consumption from the matrix, so only the digests and
+        # existing assets of the baseline are shared
+        study.load_study(profile_cache, baseline_timeseries=not args.profile_matrix)
+
+    profile_matrix = None
+    if args.profile_matrix and scenarios_to_run:
+        print("Building profile matrix...")
+        profile_matrix = study.build_profile_matrix(scenarios_to_run, profile_cache)
+        # Buildings only reference the matrix, so the parsed profiles are no longer needed
+        profile_cache.clear()
+
+    if args.jobs > 1 and len(scenarios_to_run) > 1:
+        results = run_scenarios_parallel(
+            study,
+            scenarios_to_run,
+            args.jobs,
+            args.profile_cache_mb,
+            profile_matrix,
+            building_workers=args.building_workers,
+            output_format=args.output_format,
+            profiler=profiler
+        )
+    else:
+        results = []
+        for scenario in scenarios_to_run:
+            print(f"==========Scenario file: {scenario}==========")
+            print("Loading inputs...")
+
+            scenario_creator = run_scenario(
+                study,
+                scenario,
+                profile_cache,
+                profile_matrix,
+                building_workers=args.building_workers,
+                output_format=args.output_format,
+                profiler=profiler
+            )
+
+            print("Buildings: {}".format(list(scenario_creator.buildings.keys())))
+            print("==================")
+            results.append((
+                scenario_creator.street_segment,
+                list(scenario_creator.buildings.keys()),
+                scenario_creator.output_filepaths
+            ))
+
+    for scenario, result in zip(scenarios_to_run, results):
+        street_segment, building_ids, output_filepaths = result
+        run_cache.store(cache_keys[scenario], study, scenario, output_filepaths, building_ids)
+        scenario_results[scenario] = result
+
+    street_segments = [scenario_results[scenario][0] for scenario in scenarios]
+
+    if args.prune_cache or args.cache_max_age_days is not None:
+        removed_keys = run_cache.prune(
+            {(study.segment_name, scenario): key for scenario, key in cache_keys.items()}
+            if args.prune_cache else None,
+            args.cache_max_age_days
+        )
+        print(f"Removed {len(removed_keys)} cached runs")
+
+    print("==========Summary==========")
+    print(f"The following scenarios were successfully executed: {scenarios_to_run}")
+    if len(scenarios_to_run) < len(scenarios):
+        print("The following scenarios were unchanged and restored from cache: "
+              f"{[i for i in scenarios if i not in scenarios_to_run]}")
+
+    post_process_outputs(postprocessing, street_segments, args.output_format)
+
+
+def run_scenario(
+        study: "SegmentStudy",
+        scenario: str,
+        profile_cache: "ProfileCache",
+        profile_matrix: "ProfileMatrix" = None,
+        status_logging=None,
+        building_workers: int = 1,
+        output_format: str = OUTPUT_FORMAT_CSV,
+        profiler: ScenarioProfiler = None
+) -> "ScenarioCreator":
+    """
+    Create and run a single scenario of a study
+
+    Args:
+        study (SegmentStudy): The loaded study
+        scenario (str): The scenario ID
+        profile_cache (ProfileCache): Cache of energy consumption profiles shared across scenarios
+
+    Optional Args:
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+        status_logging: Progress reporter with a progress(pct, msg) method; prints if not provided
+        building_workers (int): Number of workers loading profiles and populating buildings
+        output_format (str): Format of the output tables
+        profiler (ScenarioProfiler): Writes a stage report of the run, if provided
+
+    Returns:
+        ScenarioCreator: The executed scenario
+    """
+    if profiler:
+        profile = profiler.profile(study.segment_name, scenario, status_logging)
+    else:
+        profile = contextlib.nullcontext(status_logging)
+
+    with profile as status_logging:
+        scenario_creator = study.create_scenario_creator(
+            scenario,
+            status_logging,
+            profile_cache=profile_cache,
+            profile_matrix=profile_matrix,
+            building_workers=building_workers,
+            output_format=output_format
         )
 
         scenario_creator.create_scenario()
 
-        print("Buildings: {}".format(list(scenario_creator.buildings.keys())))
-        print("==================")
-        street_segments.append(scenario_creator.street_segment)
+    return scenario_creator
 
-    print("==========Summary==========")
-    print(f"The following scenarios were successfully executed: {scenarios}")
 
-    post_process_outputs(postprocessing, street_segments)
+def run_scenarios_parallel(
+        study: "SegmentStudy",
+        scenarios: List[str],
+        jobs: int,
+        profile_cache_mb: float,
+        profile_matrix: "ProfileMatrix" = None,
+        building_workers: int = 1,
+        output_format: str = OUTPUT_FORMAT_CSV,
+        profiler: ScenarioProfiler = None
+) -> List[Tuple[str, List[str], List[str]]]:
+    """
+    Run scenarios on a pool of worker processes. The loaded study is sent to each worker once,
+    and workers open the shared profile matrix file (if any) instead of receiving profile data.
+    Each scenario writes its own outputs, so results match a sequential run
+
+    Args:
+        study (SegmentStudy): The loaded study
+        scenarios (List[str]): The scenario IDs
+        jobs (int): The maximum number of worker processes
+        profile_cache_mb (float): Memory budget in MB of each worker's profile cache
+
+    Optional Args:
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+        building_workers (int): Number of workers loading profiles and populating buildings
+            within each scenario
+        output_format (str): Format of the output tables
+        profiler (ScenarioProfiler): Writes a stage report of each run, if provided
+
+    Returns:
+        List[Tuple[str, List[str], List[str]]]: The street segment, building IDs, and output files
+            of each scenario, in scenario order
+    """
+    profile_matrix_filepath = profile_matrix.filepath if profile_matrix else None
+    jobs = min(jobs, len(scenarios))
+    print(f"Running {len(scenarios)} scenarios on {jobs} worker processes...")
+
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(
+            study,
+            profile_cache_mb,
+            profile_matrix_filepath,
+            building_workers,
+            output_format,
+            profiler
+        )
+    ) as executor:
+        futures = {
+            executor.submit(_run_scenario_worker, scenario): scenario for scenario in scenarios
+        }
+
+        for future in as_completed(futures):
+            scenario = futures[future]
+            results[scenario] = future.result()
+
+            print(f"==========Scenario complete: {scenario} "
+                  f"({len(results)} of {len(scenarios)})==========")
+            print(f"Buildings: {results[scenario][1]}")
+
+    return [results[scenario] for scenario in scenarios]
 
 
-def create_study(study_filepath: str) -> SegmentStudy:
+class ScenarioStatus:
+    """
+    Prints the progress of a scenario running in a worker process, prefixed by the scenario ID
+
+    Args:
+        scenario (str): The scenario ID
+
+    Methods:
+        progress (None): Print a status message
+    """
+    def __init__(self, scenario: str):
+        self.scenario: str = scenario
+
+    def progress(self, pct: float, msg: str) -> None:
+        # One write per message, so lines from concurrent workers do not interleave
+        sys.stdout.write(f"[{self.scenario}] {msg} ({pct:.0%})\n")
+        sys.stdout.flush()
+
+
+def _init_worker(
+        study: "SegmentStudy",
+        profile_cache_mb: float,
+        profile_matrix_filepath: str,
+        building_workers: int,
+        output_format: str,
+        profiler: ScenarioProfiler = None
+) -> None:
+    from segment_iat.energy_profiles.profile_cache import ProfileCache
+    from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+
+    _WORKER_STATE["study"] = study
+    _WORKER_STATE["building_workers"] = building_workers
+    _WORKER_STATE["output_format"] = output_format
+    _WORKER_STATE["profiler"] = profiler
+    _WORKER_STATE["profile_cache"] = ProfileCache(profile_cache_mb)
+    _WORKER_STATE["profile_matrix"] = (
+        ProfileMatrix(profile_matrix_filepath) if profile_matrix_filepath else None
+    )
+
+
+def _run_scenario_worker(scenario: str) -> Tuple[str, List[str], List[str]]:
+    scenario_creator = run_scenario(
+        _WORKER_STATE["study"],
+        scenario,
+        _WORKER_STATE["profile_cache"],
+        _WORKER_STATE["profile_matrix"],
+        status_logging=ScenarioStatus(scenario),
+        building_workers=_WORKER_STATE["building_workers"],
+        output_format=_WORKER_STATE["output_format"],
+        profiler=_WORKER_STATE["profiler"]
+    )
+
+    return (
+        scenario_creator.street_segment,
+        list(scenario_creator.buildings.keys()),
+        scenario_creator.output_filepaths
+    )
+
+
+def create_study(study_filepath: str) -> "SegmentStudy":
+    import pandas as pd
+
+    from segment_iat.segment_study.segment_study import SegmentStudy
+    from segment_iat.utils.time_axis import DEFAULT_WEATHER_YEAR
+
     study_inputs = pd.read_csv(study_filepath, index_col=0)
     study_inputs = study_inputs["value"].to_dict()
     return SegmentStudy(
@@ -109,11 +460,17 @@ def create_study(study_filepath: str) -> SegmentStudy:
         study_inputs["zip_code"],
         study_inputs["start_year"],
         study_inputs["end_year"],
-        study_inputs["gas_pipe_intervention_year"]
+        study_inputs["gas_pipe_intervention_year"],
+        study_inputs.get("weather_year", DEFAULT_WEATHER_YEAR),
+        study_inputs.get("include_leap_day", "True")
     )
 
 
-def post_process_outputs(postprocessing: bool, street_segments: List[str]) -> None:
+def post_process_outputs(
+        postprocessing: bool,
+        street_segments: List[str],
+        output_format: str = OUTPUT_FORMAT_CSV
+) -> None:
     """
     Post-processing of results from multiple scenarios
 
@@ -121,10 +478,17 @@ def post_process_outputs(postprocessing: bool, street_segments: List[str]) -> No
         post_processing (bool): True if the user wants postprocessing performed
         street_segments (List[str]): List of street segments simulated
 
+    Optional Args:
+        output_format (str): Format of the output tables
+
     Returns:
         None
     """
-    if postprocessing:
+    if postprocessing and output_format == OUTPUT_FORMAT_PARQUET:
+        combine_parquet_outputs()
+    elif postprocessing:
+        import pandas as pd
+
         print("==========Postprocessing==========")
         street_segments_unique = set(street_segments)
 
@@ -161,6 +525,21 @@ def post_process_outputs(postprocessing: bool, street_segments: List[str]) -> No
         print("Postprocessing results complete!")
 
 
+def combine_parquet_outputs() -> None:
+    """
+    Combine the scenario partitions of each Parquet output table into one dataset. Only file
+    metadata is read and written; the combined dataset of each table covers every study and
+    scenario under outputs/parquet
+    """
+    from segment_iat.scenario_creator.output_writer import get_dataset_path, write_dataset_metadata
+
+    print("==========Postprocessing==========")
+    for output_file in OUTPUT_FILES:
+        partition_files = write_dataset_metadata(output_file)
+        print(f"{output_file}: {len(partition_files)} scenarios in {get_dataset_path(output_file)}")
+
+    print("Postprocessing results complete!")
+
 
 if __name__ == "__main__":
     main()
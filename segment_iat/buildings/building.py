@@ -7,31 +7,44 @@ from typing import Dict, List
 import numpy as np
 import pandas as pd
 
+from segment_iat.buildings.building_lifecycle import BuildingLifecycle, FUELS
+from segment_iat.buildings.study_baseline import (
+    END_USE_CLASSES,
+    StudyBaseline,
+    create_end_use,
+    get_existing_end_use_params
+)
 from segment_iat.end_uses.building_end_uses.building_measure import BuildingMeasure
-from segment_iat.end_uses.building_end_uses.clothes_dryer import ClothesDryer
-from segment_iat.end_uses.building_end_uses.domestic_hot_water import DHW
-from segment_iat.end_uses.building_end_uses.hvac import HVAC
-from segment_iat.end_uses.building_end_uses.stove import Stove
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.energy_profiles.profile_digest import DIGEST_DIRNAME, ProfileDigest, ProfileDigestStore
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.energy_profiles.profile_store import COMPILED_DIRNAME, ProfileStore
+from segment_iat.utils.config_tables import ConfigTables
+from segment_iat.utils.stage_recorder import stage
+from segment_iat.utils.time_axis import TimeAxis, get_time_axis
 
 
-METHANE_LEAKS = {
-    "GAS": 2,
-    "HPL": 1,
-}
+# Only consumption columns for simulated fuels are loaded from energy profiles
+PROFILE_COLUMN_PREFIXES = tuple("out.{}".format(fuel) for fuel in FUELS)
 
-
-FUELS = [
-    "electricity",
-    "natural_gas",
-    "propane",
-    "fuel_oil",
-    "thermal_cooling",
-    "thermal_heating"
-]
+# Total consumption columns held for each profile in profile matrix mode
+PROFILE_MATRIX_COLUMNS = [
+    "out.{}.total.energy_consumption".format(fuel) for fuel in FUELS
+] + ["out.total.energy_consumption"]
 
 
 DB_BASEPATH = "./config_files/"
-DEFAULT_INFLATION = 0.02
+
+# Study data shared between Buildings; left out when a Building is sent between processes
+SHARED_ATTRS = [
+    "_profile_cache",
+    "_profile_matrix",
+    "_lifecycle",
+    "_baseline",
+    "_config_tables",
+    "_time_axis",
+    "_year_timestamps",
+]
 
 
 class Building:
@@ -69,30 +82,78 @@ class Building:
             end_date (int): End year (exclusive. this is the stop time)
         }
 
+    Optional Args:
+        profile_cache (ProfileCache): Cache of energy consumption profiles; defaults to the
+            process-wide cache
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles. If provided, the building
+            holds indices into the matrix instead of consumption DataFrames
+        lifecycle (BuildingLifecycle): Lifecycle arrays computed for all buildings of the scenario.
+            If not provided, the lifecycle is computed for this building alone
+        baseline (StudyBaseline): Baseline values computed once for the study. If not provided,
+            or a value is missing, the baseline is computed for this building
+        config_tables (ConfigTables): Study config tables; defaults to loading the segment's tables
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         building_params (dict): Dict of input parameters for the building
         years_vec (List[int]): List of simulation years
         building_id (str): The building ID, also referred to as parcel ID
         retrofit_scenario (str): The energy intervention scenario
         end_uses (Dict[str, BuildingMeasure]): Dict of building asset objects, organized by asset type
-        baseline_consumption (pd.DataFrame): Baseline energy consumption timeseries for the building
-        retrofit_consumption (pd.DataFrame): Retrofit energy consumption timeseries for the buliding
+        baseline_consumption (pd.DataFrame): Baseline energy consumption timeseries for the building.
+            Shared with other buildings using the same profile; treat as read-only
+        retrofit_consumption (pd.DataFrame): Retrofit energy consumption timeseries for the buliding.
+            Shared with other buildings using the same profile; treat as read-only
+        baseline_profile_idx (int): Index of the baseline profile in the profile matrix
+        retrofit_profile_idx (int): Index of the retrofit profile in the profile matrix
+        baseline_digest (ProfileDigest): Annual, monthly, and peak consumption of the baseline profile
+        retrofit_digest (ProfileDigest): Annual, monthly, and peak consumption of the retrofit profile
+        retrofit_book_val_vec (List[float]): Annual book value of all replacement assets
+        existing_book_val_vec (List[float]): Annual book value of all existing assets
+        existing_stranded_val_vec (List[float]): Annual stranded value of all existing assets
+        annual_utility_costs (Dict[str, List[float]]): Annual consumption costs, by fuel
 
     Methods:
         populate_building (None): Executes downstream calculations for the building simulation
+        get_consumption (pd.Series): Returns a baseline or retrofit consumption timeseries
+        get_hourly_consumption (pd.Series): Returns a baseline or retrofit consumption timeseries at
+            hourly frequency
+        get_total_consumption (float): Returns the annual total of a baseline or retrofit
+            consumption timeseries
+        get_digest (ProfileDigest): Returns the baseline or retrofit profile digest
+        get_end_use_params (dict): Returns the input parameters of an end use
+        get_profile_timeseries (pd.DataFrame): Returns the scaled and totaled energy timeseries for
+            a consumption profile
+        get_profile_digest (ProfileDigest): Returns the digest of a scaled consumption profile
         calc_building_utility_costs (Dict[str, List[float]]): Returns dict of annual consumption costs by energy source
         write_building_cost_info (None): Write building cost information to a CSV
         write_building_energy_info (None): Write building energy timeseries to a CSV
+        attach_shared_data (None): Reattach shared study data to a Building received from a
+            worker process
     """
     def __init__(
             self,
             building_params: dict,
             sim_settings: dict,
-            incentives: dict
+            incentives: dict,
+            profile_cache: ProfileCache = None,
+            profile_matrix: ProfileMatrix = None,
+            lifecycle: BuildingLifecycle = None,
+            config_tables: ConfigTables = None,
+            time_axis: TimeAxis = None,
+            baseline: StudyBaseline = None
     ):
         self.building_params: dict = building_params
         self._sim_settings: dict = sim_settings
         self._incentives: dict = incentives
+        self._profile_cache: ProfileCache = (
+            profile_cache if profile_cache is not None else get_profile_cache()
+        )
+        self._profile_matrix: ProfileMatrix = profile_matrix
+        self._lifecycle: BuildingLifecycle = lifecycle
+        self._config_tables: ConfigTables = config_tables or ConfigTables(sim_settings.get("segment_id"))
+        self._time_axis: TimeAxis = time_axis or get_time_axis()
+        self._baseline: StudyBaseline = baseline
 
         self._config_filepath: str = ""
         self._year_timestamps: pd.DatetimeIndex = None
@@ -102,6 +163,10 @@ class Building:
         self.end_uses: Dict[str, BuildingMeasure] = {}
         self.baseline_consumption: pd.DataFrame = pd.DataFrame()
         self.retrofit_consumption: pd.DataFrame = pd.DataFrame()
+        self.baseline_profile_idx: int = None
+        self.retrofit_profile_idx: int = None
+        self.baseline_digest: ProfileDigest = None
+        self.retrofit_digest: ProfileDigest = None
         self._retrofit_vec: List[bool] = []
         self._is_retrofit_vec: List[bool] = []
         self.annual_energy_by_fuel: Dict[str, List[float]] = {}
@@ -110,9 +175,57 @@ class Building:
         self.retrofit_incentive_vec: List[float] = []
         self.retrofit_cost_net: List[float] = []
         self.calculated_incentives: List[dict] = []
+        self.retrofit_book_val_vec: List[float] = []
+        self.existing_book_val_vec: List[float] = []
+        self.existing_stranded_val_vec: List[float] = []
+        self.annual_utility_costs: Dict[str, List[float]] = {}
         self._fuel_type: List[str] = []
         self._combustion_emissions: Dict[str, List[float]] = {}
 
+    def __getstate__(self) -> dict:
+        """
+        Pickle the Building without the shared study data, so a populated Building sent back from
+        a worker process only carries its own results
+        """
+        state = self.__dict__.copy()
+        for attr in SHARED_ATTRS:
+            state[attr] = None
+
+        return state
+
+    def attach_shared_data(
+            self,
+            profile_cache: ProfileCache,
+            profile_matrix: ProfileMatrix,
+            lifecycle: BuildingLifecycle,
+            config_tables: ConfigTables,
+            time_axis: TimeAxis,
+            baseline: StudyBaseline = None
+    ) -> None:
+        """
+        Reattach the shared study data left out when the Building was pickled
+
+        Args:
+            profile_cache (ProfileCache): Cache of energy consumption profiles
+            profile_matrix (ProfileMatrix): Shared matrix of hourly profiles, if used
+            lifecycle (BuildingLifecycle): Lifecycle arrays of the scenario's buildings
+            config_tables (ConfigTables): Study config tables
+            time_axis (TimeAxis): Shared hourly time axis
+
+        Optional Args:
+            baseline (StudyBaseline): Baseline values of the study, if used
+
+        Returns:
+            None
+        """
+        self._profile_cache = profile_cache
+        self._profile_matrix = profile_matrix
+        self._lifecycle = lifecycle
+        self._config_tables = config_tables
+        self._time_axis = time_axis
+        self._year_timestamps = time_axis.timestamps
+        self._baseline = baseline
+
     def populate_building(self) -> None:
         """
         Executes all necessary functions and calculations for simulating the building scenario
@@ -123,26 +236,28 @@ class Building:
         Returns:
             None
         """
-        self._config_filepath = self._set_config_filepath()
-        self._get_years_vec()
-        self._get_building_id()
-        self.retrofit_scenario = self._get_retrofit_scenario()
-        self._get_building_energies()
-        self.end_uses = self._create_end_uses()
-        self._calc_total_energy_baseline()
-        self._calc_total_energy_retrofit()
-        self._retrofit_vec = self._get_replacement_vec()
-        self._is_retrofit_vec = self._get_is_retrofit_vec()
-        self.annual_energy_by_fuel = self._calc_annual_energy_consump()
-        #FIXME: Is this being used...?
-        self._building_annual_costs_other = self._calc_building_costs()
-        self.retrofit_cost_gross = self._get_replacement_gross_vec()
-        self.retrofit_incentive_vec = self._get_retrofit_incentive_vec()
-        self.retrofit_cost_net = self._get_replacement_net_vec()
-        self.calculated_incentives = self._get_calculated_incentives()
-        self._fuel_type = self._get_fuel_type_vec()
-        self._methane_leaks = self._get_methane_leaks()
-        self._combustion_emissions = self._get_combustion_emissions()
+        with stage("populate_building"):
+            self._config_filepath = self._set_config_filepath()
+            self._get_years_vec()
+            self._get_building_id()
+            self.retrofit_scenario = self._get_retrofit_scenario()
+            with stage("building.energies"):
+                self._get_building_energies()
+            self.end_uses = self._create_end_uses()
+            with stage("building.lifecycle"):
+                self._get_lifecycle()
+            with stage("building.costs"):
+                #FIXME: Is this being used...?
+                self._building_annual_costs_other = self._calc_building_costs()
+                self.retrofit_cost_gross = self._get_replacement_gross_vec()
+                self.retrofit_incentive_vec = self._get_retrofit_incentive_vec()
+                self.retrofit_cost_net = self._get_replacement_net_vec()
+                self.calculated_incentives = self._get_calculated_incentives()
+                self.retrofit_book_val_vec = self._get_retrofit_book_value_vec()
+                self.existing_book_val_vec = self._get_exising_book_val_vec()
+                self.existing_stranded_val_vec = self._get_exising_stranded_val_vec()
+            with stage("building.utility_costs"):
+                self.annual_utility_costs = self._calc_building_utility_costs()
 
     def _set_config_filepath(self) -> None:
         """
@@ -159,9 +274,7 @@ class Building:
             self._sim_settings.get("sim_end_year", 2050)
         ))
 
-        self._year_timestamps = pd.date_range(
-            start="2018-01-01", end="2019-01-01", freq="h", inclusive="left"
-        )
+        self._year_timestamps = self._time_axis.timestamps
 
     def _get_building_id(self) -> None:
         self.building_id = self.building_params.get("building_id")
@@ -170,168 +283,364 @@ class Building:
         return self._sim_settings.get("sim_name")
 
     def _get_building_energies(self) -> None:
+        """
+        Get the baseline and retrofit energy timeseries, scaled by the load scaling factor and
+        including total consumption by fuel
+        """
         reference_consump_id = self.building_params.get("baseline_consumption_id")
         retrofit_consump_id = self.building_params.get("retrofit_consumption_id")
+        load_scaling_factor = self.building_params.get("load_scaling_factor", 1)
 
-        self.baseline_consumption = self._load_energy_timeseries(reference_consump_id)
-        self.retrofit_consumption = self._load_energy_timeseries(retrofit_consump_id)
+        if self._baseline:
+            self.baseline_digest = self._baseline.get_digest(self._get_baseline_profile_key())
+        if self.baseline_digest is None:
+            self.baseline_digest = self.get_profile_digest(
+                reference_consump_id, load_scaling_factor, self._profile_cache
+            )
+        self.retrofit_digest = self.get_profile_digest(
+            retrofit_consump_id, load_scaling_factor, self._profile_cache
+        )
 
-        load_scaling_factor = self.building_params.get("load_scaling_factor", 1)
-        self.baseline_consumption[
-            self.baseline_consumption.select_dtypes(include=["number"]).columns
-        ]  *= load_scaling_factor
+        if self._profile_matrix:
+            self.baseline_profile_idx = self._profile_matrix.get_index(
+                reference_consump_id, load_scaling_factor
+            )
+            self.retrofit_profile_idx = self._profile_matrix.get_index(
+                retrofit_consump_id, load_scaling_factor
+            )
+            return
+
+        self.baseline_consumption = self.get_profile_timeseries(
+            reference_consump_id, load_scaling_factor, self._profile_cache
+        )
+        self.retrofit_consumption = self.get_profile_timeseries(
+            retrofit_consump_id, load_scaling_factor, self._profile_cache
+        )
 
-        self.retrofit_consumption[
-            self.retrofit_consumption.select_dtypes(include=["number"]).columns
-        ] *= load_scaling_factor
+    def get_consumption(self, column: str, retrofit: bool = False) -> pd.Series:
+        """
+        Get one column of the baseline or retrofit energy consumption timeseries. In profile matrix
+        mode the Series is backed by the shared matrix
 
-    @staticmethod
-    def _load_energy_timeseries(consumption_id: str) -> pd.DataFrame:
-        consump_filepath = os.path.join(DB_BASEPATH, "energy_consumption", consumption_id+".csv")
-        consump_df = pd.read_csv(consump_filepath).set_index("timestamp")
-        consump_df.index = pd.to_datetime(consump_df.index)
+        Args:
+            column (str): The consumption column, i.e. out.electricity.total.energy_consumption
 
-        return consump_df
+        Optional Args:
+            retrofit (bool): If True, use the retrofit timeseries, otherwise the baseline
 
-    def _create_end_uses(self) -> Dict[str, BuildingMeasure]:
+        Returns:
+            pd.Series: The consumption timeseries
+        """
+        if self._profile_matrix:
+            profile_idx = self.retrofit_profile_idx if retrofit else self.baseline_profile_idx
+            return self._profile_matrix.get_series(profile_idx, column)
+
+        consumption = self.retrofit_consumption if retrofit else self.baseline_consumption
+        return consumption[column]
+
+    def get_hourly_consumption(self, column: str, retrofit: bool = False) -> pd.Series:
         """
-        Create the end uses for the building
+        Get one column of the baseline or retrofit energy consumption timeseries, resampled to
+        hourly and indexed by the shared time axis. Profile matrix rows are already hourly
+
+        Args:
+            column (str): The consumption column, i.e. out.electricity.total.energy_consumption
+
+        Optional Args:
+            retrofit (bool): If True, use the retrofit timeseries, otherwise the baseline
+
+        Returns:
+            pd.Series: The hourly consumption timeseries
         """
-        end_use_instances = {}
+        if self._profile_matrix:
+            return self._time_axis.conform(self.get_consumption(column, retrofit))
+
+        if self._baseline and not retrofit:
+            hourly_consumption = self._baseline.get_hourly_consumption(
+                self._get_baseline_profile_key(), column
+            )
+            if hourly_consumption is not None:
+                return hourly_consumption
+
+        # Resampled once per profile and shared by the buildings (and scenarios) using it
+        consumption_id = self.building_params.get(
+            "retrofit_consumption_id" if retrofit else "baseline_consumption_id"
+        )
+        return self._profile_cache.get(
+            (
+                "hourly",
+                consumption_id,
+                self.building_params.get("load_scaling_factor", 1),
+                column,
+                self._time_axis
+            ),
+            lambda: self._time_axis.conform(
+                self.get_consumption(column, retrofit).resample("h").sum()
+            )
+        )
+
+    def get_total_consumption(self, column: str, retrofit: bool = False) -> float:
+        """
+        Get the annual total of one column of the baseline or retrofit energy consumption
+
+        Args:
+            column (str): The consumption column, i.e. out.electricity.total.energy_consumption
+
+        Optional Args:
+            retrofit (bool): If True, use the retrofit timeseries, otherwise the baseline
+
+        Returns:
+            float: The annual total consumption
+        """
+        if self._baseline and not retrofit and not self._profile_matrix:
+            total_consumption = self._baseline.get_total_consumption(
+                self._get_baseline_profile_key(), column
+            )
+            if total_consumption is not None:
+                return total_consumption
+
+        if self._profile_matrix:
+            return self.get_consumption(column, retrofit).sum()
 
-        cost_original_filepath = os.path.join(
-            self._config_filepath,
-            "parcels",
-            f"{self.building_params["existing_measures_cost_id"]}.csv"
+        consumption_id = self.building_params.get(
+            "retrofit_consumption_id" if retrofit else "baseline_consumption_id"
+        )
+        return self._profile_cache.get(
+            (
+                "total",
+                consumption_id,
+                self.building_params.get("load_scaling_factor", 1),
+                column
+            ),
+            lambda: self.get_consumption(column, retrofit).sum()
         )
 
-        cost_retrofit_filepath = os.path.join(
-            self._config_filepath,
-            "parcels",
-            f"{self.building_params["retrofit_measures_cost_id"]}.csv"
+    def _get_baseline_profile_key(self) -> tuple:
+        return (
+            self.building_params.get("baseline_consumption_id"),
+            self.building_params.get("load_scaling_factor", 1)
         )
 
-        costs_original = pd.read_csv(
-            cost_original_filepath,
-            index_col="parcel_id"
-        ).to_dict(orient="index")
+    def get_digest(self, retrofit: bool = False) -> ProfileDigest:
+        """
+        Get the digest (annual totals, monthly totals, and annual peaks) of the baseline or retrofit
+        energy consumption
+        """
+        return self.retrofit_digest if retrofit else self.baseline_digest
 
-        costs_retrofit = pd.read_csv(
-            cost_retrofit_filepath,
-            index_col="parcel_id"
-        ).to_dict(orient="index")
+    def _get_consumption_frame(self, retrofit: bool = False) -> pd.DataFrame:
+        if self._profile_matrix:
+            profile_idx = self.retrofit_profile_idx if retrofit else self.baseline_profile_idx
+            return self._profile_matrix.get_frame(profile_idx)
 
-        building_costs_original = costs_original.get(self.building_id, {})
-        building_costs_retrofit = costs_retrofit.get(self.building_id, {})
+        return self.retrofit_consumption if retrofit else self.baseline_consumption
 
-        end_uses = [
-            "stove", "hvac", "clothes_dryer", "domestic_hot_water"
-        ]
+    @classmethod
+    def get_profile_timeseries(
+            cls,
+            consumption_id: str,
+            load_scaling_factor: float,
+            profile_cache: ProfileCache
+    ) -> pd.DataFrame:
+        """
+        Get an energy timeseries from the profile cache. Each profile is parsed once and each
+        (profile, load scaling factor) pair is totaled once, then shared between buildings
 
-        for end_use in end_uses:
-            individual_params = {}
-            individual_params["end_use"] = end_use
-            individual_params["end_use_retrofit_item"] = self.building_params.get(f"{end_use}.end_use_retrofit_item")
-            individual_params["existing_install_cost"] = building_costs_original.get(end_use)
-            individual_params["replacement_cost"] = building_costs_retrofit.get(end_use)
-            individual_params["existing_install_year"] = self.building_params.get("asset_install_year")
-            individual_params["replacement_year"] = self.building_params.get("asset_replacement_year")
-            individual_params["inflation_escalator"] = DEFAULT_INFLATION
+        Args:
+            consumption_id (str): The ID of the consumption profile
+            load_scaling_factor (float): The load scaling factor for the consumption
+            profile_cache (ProfileCache): The cache of energy consumption profiles
 
-            end_use_instances[end_use] = self._get_single_end_use(individual_params)
+        Returns:
+            pd.DataFrame: Scaled energy timeseries, including total consumption by fuel
+        """
+        return profile_cache.get(
+            (consumption_id, load_scaling_factor),
+            lambda: cls._calc_total_energy(cls._scale_energy_timeseries(
+                profile_cache.get(
+                    consumption_id, lambda: cls._load_energy_timeseries(consumption_id)
+                ),
+                load_scaling_factor
+            ))
+        )
 
-        return end_use_instances
+    @classmethod
+    def get_profile_digest(
+            cls,
+            consumption_id: str,
+            load_scaling_factor: float,
+            profile_cache: ProfileCache
+    ) -> ProfileDigest:
+        """
+        Get the digest of a scaled energy profile. Digests are saved next to the compiled profile
+        store and only recomputed from the energy timeseries when the profile has changed
 
-    def _get_single_end_use(self, params: dict):
-        if params.get("end_use") == "stove":
-            stove = Stove(
-                self.years_vec,
-                self._incentives,
-                custom_baseline_energy=self.baseline_consumption,
-                custom_retrofit_energy=self.retrofit_consumption,
-                **params
-            )
+        Args:
+            consumption_id (str): The ID of the consumption profile
+            load_scaling_factor (float): The load scaling factor for the consumption
+            profile_cache (ProfileCache): The cache of energy consumption profiles
 
-            stove.initialize_end_use()
+        Returns:
+            ProfileDigest: Annual totals, monthly totals, and annual peaks of the total consumption
+                columns
+        """
+        def load_digest() -> ProfileDigest:
+            profiles_dirpath = os.path.join(DB_BASEPATH, "energy_consumption")
+            compiled_dirpath = os.path.join(profiles_dirpath, COMPILED_DIRNAME)
+            digest_store = ProfileDigestStore(os.path.join(compiled_dirpath, DIGEST_DIRNAME))
 
-            return stove
-        
-        if params.get("end_use") == "clothes_dryer":
-            dryer = ClothesDryer(
-                self.years_vec,
-                self._incentives,
-                custom_baseline_energy=self.baseline_consumption,
-                custom_retrofit_energy=self.retrofit_consumption,
-                **params,
+            source_filepaths = [
+                os.path.join(profiles_dirpath, consumption_id+".csv"),
+                os.path.join(compiled_dirpath, consumption_id+".npy"),
+            ]
+            if digest_store.is_current(consumption_id, load_scaling_factor, source_filepaths):
+                return digest_store.load_digest(consumption_id, load_scaling_factor)
+
+            digest = ProfileDigest.from_timeseries(
+                consumption_id,
+                load_scaling_factor,
+                cls.get_profile_timeseries(consumption_id, load_scaling_factor, profile_cache),
+                PROFILE_MATRIX_COLUMNS
             )
+            digest_store.save_digest(digest)
+            return digest
 
-            dryer.initialize_end_use()
+        return profile_cache.get(("digest", consumption_id, load_scaling_factor), load_digest)
 
-            return dryer
-        
-        if params.get("end_use") == "domestic_hot_water":
-            dhw = DHW(
-                self.years_vec,
-                self._incentives,
-                custom_baseline_energy=self.baseline_consumption,
-                custom_retrofit_energy=self.retrofit_consumption,
-                **params
-            )
+    @staticmethod
+    def _load_energy_timeseries(consumption_id: str) -> pd.DataFrame:
+        """
+        Load the consumption columns of an energy profile. Uses the compiled profile store when it
+        is up to date with the CSV, otherwise parses the CSV
+        """
+        profiles_dirpath = os.path.join(DB_BASEPATH, "energy_consumption")
+        consump_filepath = os.path.join(profiles_dirpath, consumption_id+".csv")
 
-            dhw.initialize_end_use()
+        with stage("profile_load"):
+            profile_store = ProfileStore(os.path.join(profiles_dirpath, COMPILED_DIRNAME))
+            if profile_store.is_current(consumption_id, consump_filepath):
+                return profile_store.load_profile(consumption_id, PROFILE_COLUMN_PREFIXES)
 
-            return dhw
+            consump_df = pd.read_csv(
+                consump_filepath,
+                usecols=lambda col: col == "timestamp" or col.startswith(PROFILE_COLUMN_PREFIXES)
+            ).set_index("timestamp")
+            consump_df.index = pd.to_datetime(consump_df.index)
 
-        if params.get("end_use") == "hvac":
-            hvac = HVAC(
-                self.years_vec,
-                self._incentives,
-                custom_baseline_energy=self.baseline_consumption,
-                custom_retrofit_energy=self.retrofit_consumption,
-                **params
-            )
-            hvac.initialize_end_use()
+        return consump_df
 
-            return hvac
+    @staticmethod
+    def _scale_energy_timeseries(consumption: pd.DataFrame, load_scaling_factor: float) -> pd.DataFrame:
+        """
+        Scale all numeric columns of the timeseries. Returns a new DataFrame; the input is unchanged
+        """
+        if load_scaling_factor == 1:
+            return consumption
 
-        return None
+        return consumption.assign(**{
+            col: consumption[col] * load_scaling_factor
+            for col in consumption.select_dtypes(include=["number"]).columns
+        })
 
-    def _calc_total_energy_baseline(self) -> None:
+    @staticmethod
+    def _calc_total_energy(consumption: pd.DataFrame) -> pd.DataFrame:
         """
-        Calculate the total baseline consumption for the building. Contains logic for direct
-        connection to ResStock or overwrite using locally-provided energy consumption profiles
+        Calculate the total consumption by fuel and for the whole building. Contains logic for direct
+        connection to ResStock or overwrite using locally-provided energy consumption profiles.
+        Returns a new DataFrame; the input is unchanged
         """
+        fuel_totals = {}
         for fuel in FUELS:
             filter_cols = [
                 col
-                for col in self.baseline_consumption
+                for col in consumption
                 if col.startswith("out.{}".format(fuel))
             ]
 
-            self.baseline_consumption["out.{}.total.energy_consumption".format(fuel)] = \
-                self.baseline_consumption[filter_cols].sum(axis=1)
-            
-        self.baseline_consumption["out.total.energy_consumption"] = self.baseline_consumption[[
-            "out.{}.total.energy_consumption".format(i)
-            for i in FUELS
-        ]].sum(axis=1)
-    
-    def _calc_total_energy_retrofit(self) -> None:
-        for fuel in FUELS:
-            filter_cols = [
-                col
-                for col in self.retrofit_consumption
-                if col.startswith("out.{}".format(fuel))
-            ]
+            fuel_totals["out.{}.total.energy_consumption".format(fuel)] = \
+                consumption[filter_cols].sum(axis=1)
 
-            self.retrofit_consumption["out.{}.total.energy_consumption".format(fuel)] = \
-                self.retrofit_consumption[filter_cols].sum(axis=1)
-            
-        self.retrofit_consumption["out.total.energy_consumption"] = self.retrofit_consumption[[
+        consumption = consumption.assign(**fuel_totals)
+        consumption["out.total.energy_consumption"] = consumption[[
             "out.{}.total.energy_consumption".format(i)
             for i in FUELS
         ]].sum(axis=1)
- 
+
+        return consumption
+
+    def _create_end_uses(self) -> Dict[str, BuildingMeasure]:
+        """
+        Create the end uses for the building. Existing asset values computed once for the study are
+        reused when available
+        """
+        end_use_instances = {}
+
+        for end_use in END_USE_CLASSES:
+            individual_params = self.get_end_use_params(end_use)
+
+            existing_book_val = None
+            baseline_energy_use = None
+            if self._baseline:
+                existing_book_val = self._baseline.get_existing_book_val(self.building_id, end_use)
+            if self._baseline and not self._profile_matrix:
+                baseline_energy_use = self._baseline.get_end_use_energy(
+                    self._get_baseline_profile_key(), end_use
+                )
+
+            with stage(f"building.end_uses.{end_use}"):
+                end_use_instances[end_use] = self._get_single_end_use(
+                    individual_params, existing_book_val, baseline_energy_use
+                )
+
+        return end_use_instances
+
+    def get_end_use_params(self, end_use: str) -> dict:
+        """
+        Get the input parameters of one of the building's end uses: the existing asset, and its
+        retrofit item, cost, and year
+
+        Args:
+            end_use (str): The end use, i.e. "stove"
+
+        Returns:
+            dict: Input parameters of the end use
+        """
+        costs_original = self._config_tables.get_measure_costs(
+            self.building_params["existing_measures_cost_id"]
+        )
+        costs_retrofit = self._config_tables.get_measure_costs(
+            self.building_params["retrofit_measures_cost_id"]
+        )
+
+        building_costs_original = costs_original.get(self.building_id, {})
+        building_costs_retrofit = costs_retrofit.get(self.building_id, {})
+
+        params = get_existing_end_use_params(self.building_params, building_costs_original, end_use)
+        params["end_use_retrofit_item"] = self.building_params.get(f"{end_use}.end_use_retrofit_item")
+        params["replacement_cost"] = building_costs_retrofit.get(end_use)
+        params["replacement_year"] = self.building_params.get("asset_replacement_year")
+
+        return params
+
+    def _get_single_end_use(
+            self,
+            params: dict,
+            existing_book_val: List[float] = None,
+            baseline_energy_use: pd.DataFrame = None
+    ) -> BuildingMeasure:
+        end_use = create_end_use(
+            self.years_vec,
+            self._incentives,
+            params,
+            custom_baseline_energy=self.baseline_consumption,
+            custom_retrofit_energy=self.retrofit_consumption
+        )
+
+        if end_use:
+            end_use.initialize_end_use(existing_book_val, baseline_energy_use)
+
+        return end_use
+
     #TODO: Confusing - rename
     def _calc_building_costs(self) -> List[float]:
         """
@@ -339,28 +648,13 @@ class Building:
         """
         other_assets = ["weatherization", "panel_upgrade"]
 
-        cost_original_filepath = os.path.join(
-            self._config_filepath,
-            "parcels",
-            f"{self.building_params["existing_measures_cost_id"]}.csv"
+        costs_original = self._config_tables.get_measure_costs(
+            self.building_params["existing_measures_cost_id"]
         )
-
-        cost_retrofit_filepath = os.path.join(
-            self._config_filepath,
-            "parcels",
-            f"{self.building_params["retrofit_measures_cost_id"]}.csv"
+        costs_retrofit = self._config_tables.get_measure_costs(
+            self.building_params["retrofit_measures_cost_id"]
         )
 
-        costs_original = pd.read_csv(
-            cost_original_filepath,
-            index_col="parcel_id"
-        ).to_dict(orient="index")
-
-        costs_retrofit = pd.read_csv(
-            cost_retrofit_filepath,
-            index_col="parcel_id"
-        ).to_dict(orient="index")
-
         building_costs_original = costs_original.get(self.building_id, {})
         building_costs_retrofit = costs_retrofit.get(self.building_id, {})
 
@@ -370,55 +664,41 @@ class Building:
 
         return np.multiply(other_retrofit_cost, self._retrofit_vec).tolist()
 
-    def _get_replacement_vec(self) -> List[bool]:
-        """
-        The replacement vector is a vector of True when the index is the retrofit year, False o/w
-        """
-        replacement_year = self.building_params.get("asset_replacement_year", self.years_vec[-1])
-        return [True if i==replacement_year else False for i in self.years_vec]
-    
-    def _get_is_retrofit_vec(self) -> List[bool]:
-        """
-        Derived from the retrofit vec; =True in years including and after the retrofit, 0 o/w
+    def _get_lifecycle(self) -> None:
         """
-        return [max(self._retrofit_vec[:i]) for i in range(1, len(self._retrofit_vec) + 1)]
-    
-    def _calc_annual_energy_consump(self) -> Dict[str, List[float]]:
+        Read the building's row of the lifecycle arrays: the replacement and retrofit vectors,
+        annual energy by fuel, fuel type, methane leaks, and combustion emissions
         """
-        Calculate the total annual energy consumption, by energy type
-        """
-        annual_energy_use = {i: [] for i in FUELS}
-
-        for fuel in FUELS:
-            for replaced in self._is_retrofit_vec:
-                if replaced:
-                    annual_use = self.retrofit_consumption[
-                        "out.{}.total.energy_consumption".format(fuel)
-                    ]
-
-                else:
-                    annual_use = self.baseline_consumption[
-                        "out.{}.total.energy_consumption".format(fuel)
-                    ]
+        if self._lifecycle is None:
+            self._lifecycle = BuildingLifecycle(
+                [self.building_params],
+                self._sim_settings,
+                [self.baseline_digest],
+                [self.retrofit_digest],
+                self._config_tables
+            )
+            self._lifecycle.populate_lifecycle()
 
-                annual_use = annual_use.resample("YS").sum().values[0]
-                annual_energy_use[fuel].append(annual_use)
+        idx = self._lifecycle.get_row_index(self.building_id)
 
-        return annual_energy_use
+        self._retrofit_vec = self._lifecycle.replacement[idx].tolist()
+        self._is_retrofit_vec = self._lifecycle.is_retrofit[idx].tolist()
+        self.annual_energy_by_fuel = {
+            fuel: annual_use[idx].tolist()
+            for fuel, annual_use in self._lifecycle.annual_energy_by_fuel.items()
+        }
+        self._fuel_type = self._lifecycle.fuel_type[idx].tolist()
+        self._methane_leaks = self._lifecycle.methane_leaks[idx].tolist()
+        self._combustion_emissions = {
+            fuel: emissions[idx].tolist()
+            for fuel, emissions in self._lifecycle.combustion_emissions.items()
+        }
 
     def _calc_building_utility_costs(self) -> Dict[str, List[float]]:
         """
         Calculate the utility billing metrics for the building, based on total energy consumption
         """
-        segment_id = self._sim_settings.get("segment_id")
-        energy_consump_cost_filepath = os.path.join(
-            DB_BASEPATH,
-            segment_id,
-            "utility_network",
-            f"{segment_id}_consumption_rates.csv"
-        )
-        consump_rates = pd.read_csv(energy_consump_cost_filepath, index_col=0)
-        consump_rates = consump_rates.loc[self.years_vec, :]
+        consump_rates = self._config_tables.get_consumption_rates().loc[self.years_vec, :]
 
         annual_utility_costs = {i: [] for i in FUELS}
 
@@ -452,19 +732,14 @@ class Building:
         if not alternate_rate_id:
             return
         
-        alternate_rate = pd.read_csv(os.path.join(
-            DB_BASEPATH,
-            self._sim_settings.get("segment_id"),
-            "utility_network",
-            f"{alternate_rate_id}.csv"
-        ))
+        alternate_rate = self._config_tables.get_alternate_rate(alternate_rate_id)
 
-        monthly_retrofit_consump = self.retrofit_consumption[
+        monthly_retrofit_consump = self.retrofit_digest.monthly_totals[
             "out.electricity.total.energy_consumption"
-        ].resample("MS").sum()
+        ]
 
         monthly_volumetric_charge = np.multiply(
-            monthly_retrofit_consump.values,
+            monthly_retrofit_consump,
             alternate_rate["volumetric"].values
         )
 
@@ -472,68 +747,6 @@ class Building:
 
         return (monthly_fixed_charge + monthly_volumetric_charge).sum().item()
     
-    def _get_fuel_type_vec(self) -> List[str]:
-        """
-        Fuel type vector of dominant fuel in building. Based on inputs original_fuel_type and
-        retrofit_fuel_type
-        """
-        #TODO: There should be a heirarchy to this, based on the fuel of each asset, to determine these variables
-        # OR, we should be more explicit and just call this the heating fuel... as long as that translates
-        # properly to the fuel type of the other appliances
-        original_fuel = self.building_params.get("heating_fuel", "")
-        original_fuel = original_fuel.lower().replace(" ", "_")
-        retrofit_fuel = self.building_params.get("retrofit_heating_fuel", "")
-        retrofit_fuel = retrofit_fuel.lower().replace(" ", "_")
-
-        fuel_mappings = {
-            "natural_gas": "GAS",
-            "fuel_oil": "OIL",
-            "electricity": "ELEC",
-            "propane": "LPG",
-            "hybrid_gas": "HPL",
-            "hybrid_npa": "NPH",
-            "thermal": "TEN",
-        }
-
-        return [
-            fuel_mappings.get(retrofit_fuel) if i
-            else fuel_mappings.get(original_fuel)
-            for i in self._is_retrofit_vec
-        ]
-
-    def _get_methane_leaks(self) -> List[str]:
-        """
-        Get (hardcoded) methane leaks in the building annually
-        """
-        return [
-            METHANE_LEAKS.get(i, 0)
-            for i in self._fuel_type
-        ]
-
-    def _get_combustion_emissions(self) -> Dict[str, List[float]]:
-        """
-        Combustion emissions from energy consumption
-        """
-        segment_id = self._sim_settings.get("segment_id")
-        emissions_factors_filepath = os.path.join(
-            DB_BASEPATH,
-            segment_id,
-            "utility_network",
-            f"{segment_id}_emission_rates.csv"
-        )
-        emissions_rates = pd.read_csv(emissions_factors_filepath, index_col="Year")
-        # We reindex and use a simple forward fill and back fill for any NaN values
-        # Can expand to more rigorous QA checks in the future
-        emissions_rates = emissions_rates.reindex(self.years_vec).ffill().bfill()
-
-        annual_fuel_consump = pd.DataFrame(self.annual_energy_by_fuel, index=self.years_vec)
-
-        combustion_emissions = {}
-        for fuel in FUELS:
-            combustion_emissions[fuel] = (emissions_rates[fuel] * annual_fuel_consump[fuel]).to_list()
-
-        return combustion_emissions
-
     def write_building_energy_info(self, freq: int =60) -> None:
         """
         Write building energy timeseries (baseline and retrofit) to output CSV
@@ -554,11 +767,11 @@ class Building:
 
         resample_string = "{}T".format(freq)
 
-        self.baseline_consumption.resample(resample_string).sum(axis=0).to_csv(
+        self._get_consumption_frame().resample(resample_string).sum(axis=0).to_csv(
             "./outputs/{}_baseline_consump.csv".format(self.building_id)
         )
 
-        self.retrofit_consumption.resample(resample_string).sum(axis=0).to_csv(
+        self._get_consumption_frame(retrofit=True).resample(resample_string).sum(axis=0).to_csv(
             "./outputs/{}_retrofit_consump.csv".format(self.building_id)
         )
 
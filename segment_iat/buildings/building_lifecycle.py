@@ -0,0 +1,207 @@
+"""
+Batch engine computing annual building lifecycle quantities for all parcels of a scenario at once
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from segment_iat.energy_profiles.profile_digest import ProfileDigest
+from segment_iat.utils.config_tables import ConfigTables
+
+
+METHANE_LEAKS = {
+    "GAS": 2,
+    "HPL": 1,
+}
+
+
+FUELS = [
+    "electricity",
+    "natural_gas",
+    "propane",
+    "fuel_oil",
+    "thermal_cooling",
+    "thermal_heating"
+]
+
+
+FUEL_TYPE_MAPPINGS = {
+    "natural_gas": "GAS",
+    "fuel_oil": "OIL",
+    "electricity": "ELEC",
+    "propane": "LPG",
+    "hybrid_gas": "HPL",
+    "hybrid_npa": "NPH",
+    "thermal": "TEN",
+}
+
+
+class BuildingLifecycle:
+    """
+    Computes the annual lifecycle quantities of a set of buildings as 2-D arrays of shape
+    (buildings x years): replacement year, retrofit status, annual energy by fuel, fuel type,
+    methane leaks, and combustion emissions. Buildings hold a row index into these arrays
+
+    Args:
+        buildings_params (List[dict]): Input parameters for each building, as passed to Building
+        sim_settings (dict): The simulation settings
+        baseline_digests (List[ProfileDigest]): The baseline profile digest of each building
+        retrofit_digests (List[ProfileDigest]): The retrofit profile digest of each building
+
+    Optional Args:
+        config_tables (ConfigTables): Study config tables; defaults to loading the segment's tables
+
+    Attributes:
+        building_ids (List[str]): The building IDs, in row order
+        years_vec (List[int]): List of simulation years
+        replacement (np.ndarray): True in the retrofit year of each building, False o/w
+        is_retrofit (np.ndarray): True in and after the retrofit year of each building, False o/w
+        annual_energy_by_fuel (Dict[str, np.ndarray]): Annual energy consumption, by fuel
+        fuel_type (np.ndarray): Fuel type code of the dominant fuel in each building
+        methane_leaks (np.ndarray): Methane leaks in each building
+        combustion_emissions (Dict[str, np.ndarray]): Combustion emissions from energy consumption,
+            by fuel
+
+    Methods:
+        populate_lifecycle (None): Compute all lifecycle arrays
+        get_row_index (int): Return the row of a building in the lifecycle arrays
+    """
+    def __init__(
+            self,
+            buildings_params: List[dict],
+            sim_settings: dict,
+            baseline_digests: List[ProfileDigest],
+            retrofit_digests: List[ProfileDigest],
+            config_tables: ConfigTables = None
+    ):
+        self._buildings_params: List[dict] = buildings_params
+        self._sim_settings: dict = sim_settings
+        self._baseline_digests: List[ProfileDigest] = baseline_digests
+        self._retrofit_digests: List[ProfileDigest] = retrofit_digests
+        self._config_tables: ConfigTables = config_tables or ConfigTables(sim_settings.get("segment_id"))
+
+        self.building_ids: List[str] = [i.get("building_id") for i in buildings_params]
+        self.years_vec: List[int] = []
+        self.replacement: np.ndarray = None
+        self.is_retrofit: np.ndarray = None
+        self.annual_energy_by_fuel: Dict[str, np.ndarray] = {}
+        self.fuel_type: np.ndarray = None
+        self.methane_leaks: np.ndarray = None
+        self.combustion_emissions: Dict[str, np.ndarray] = {}
+
+        self._row_index: Dict[str, int] = {
+            building_id: idx for idx, building_id in enumerate(self.building_ids)
+        }
+
+    def populate_lifecycle(self) -> None:
+        """
+        Compute all lifecycle arrays for the buildings
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.years_vec = self._get_years_vec()
+        self.replacement = self._get_replacement()
+        self.is_retrofit = self._get_is_retrofit()
+        self.annual_energy_by_fuel = self._calc_annual_energy_consump()
+        self.fuel_type = self._get_fuel_type()
+        self.methane_leaks = self._get_methane_leaks()
+        self.combustion_emissions = self._get_combustion_emissions()
+
+    def get_row_index(self, building_id: str) -> int:
+        return self._row_index[building_id]
+
+    def _get_years_vec(self) -> List[int]:
+        return list(range(
+            self._sim_settings.get("sim_start_year", 2020),
+            self._sim_settings.get("sim_end_year", 2050)
+        ))
+
+    def _get_replacement(self) -> np.ndarray:
+        """
+        True when the year is the building's retrofit year, False o/w. Buildings without a retrofit
+        year are retrofit in the last simulation year
+        """
+        replacement_years = np.array([
+            i.get("asset_replacement_year", self.years_vec[-1])
+            for i in self._buildings_params
+        ], dtype=float)
+
+        return np.array(self.years_vec)[np.newaxis, :] == replacement_years[:, np.newaxis]
+
+    def _get_is_retrofit(self) -> np.ndarray:
+        """
+        True in years including and after the retrofit, False o/w
+        """
+        return np.logical_or.accumulate(self.replacement, axis=1)
+
+    def _calc_annual_energy_consump(self) -> Dict[str, np.ndarray]:
+        """
+        Total annual energy consumption, by energy type
+        """
+        annual_energy_use = {}
+
+        for fuel in FUELS:
+            energy_attr = "out.{}.total.energy_consumption".format(fuel)
+            annual_use_baseline = np.array([i.annual_totals[energy_attr] for i in self._baseline_digests])
+            annual_use_retrofit = np.array([i.annual_totals[energy_attr] for i in self._retrofit_digests])
+
+            annual_energy_use[fuel] = np.where(
+                self.is_retrofit,
+                annual_use_retrofit[:, np.newaxis],
+                annual_use_baseline[:, np.newaxis]
+            )
+
+        return annual_energy_use
+
+    @staticmethod
+    def _get_fuel_code(fuel: str) -> str:
+        return FUEL_TYPE_MAPPINGS.get(fuel.lower().replace(" ", "_"))
+
+    def _get_fuel_type(self) -> np.ndarray:
+        """
+        Fuel type of the dominant fuel in each building. Based on inputs heating_fuel and
+        retrofit_heating_fuel
+        """
+        #TODO: There should be a heirarchy to this, based on the fuel of each asset, to determine these variables
+        # OR, we should be more explicit and just call this the heating fuel... as long as that translates
+        # properly to the fuel type of the other appliances
+        original_fuel = np.array([
+            self._get_fuel_code(i.get("heating_fuel", "")) for i in self._buildings_params
+        ], dtype=object)
+        retrofit_fuel = np.array([
+            self._get_fuel_code(i.get("retrofit_heating_fuel", "")) for i in self._buildings_params
+        ], dtype=object)
+
+        return np.where(
+            self.is_retrofit,
+            retrofit_fuel[:, np.newaxis],
+            original_fuel[:, np.newaxis]
+        )
+
+    def _get_methane_leaks(self) -> np.ndarray:
+        """
+        Get (hardcoded) methane leaks in each building annually
+        """
+        methane_leaks = np.zeros(self.fuel_type.shape, dtype=int)
+        for fuel_type, leaks in METHANE_LEAKS.items():
+            methane_leaks[self.fuel_type == fuel_type] = leaks
+
+        return methane_leaks
+
+    def _get_combustion_emissions(self) -> Dict[str, np.ndarray]:
+        """
+        Combustion emissions from energy consumption
+        """
+        emissions_rates = self._config_tables.get_emission_rates()
+        # We reindex and use a simple forward fill and back fill for any NaN values
+        # Can expand to more rigorous QA checks in the future
+        emissions_rates = emissions_rates.reindex(self.years_vec).ffill().bfill()
+
+        return {
+            fuel: emissions_rates[fuel].to_numpy()[np.newaxis, :] * self.annual_energy_by_fuel[fuel]
+            for fuel in FUELS
+        }
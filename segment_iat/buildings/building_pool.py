@@ -0,0 +1,207 @@
+"""
+Worker pools for loading energy profiles and populating the Buildings of a scenario
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List
+
+from segment_iat.buildings.building import Building
+from segment_iat.buildings.building_lifecycle import BuildingLifecycle
+from segment_iat.buildings.study_baseline import StudyBaseline
+from segment_iat.energy_profiles.profile_cache import BYTES_PER_MB, ProfileCache
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.utils.config_tables import ConfigTables
+from segment_iat.utils.time_axis import TimeAxis
+
+
+# Shared study data of a worker process, set once by _init_worker
+_WORKER_STATE = {}
+
+
+class BuildingPool:
+    """
+    Loads energy profiles and populates Buildings on a pool of workers. Loading profiles and
+    digests is I/O-bound and runs on threads sharing the profile cache. With more than one worker
+    and a profile matrix, Buildings are populated on worker processes, since Buildings then only
+    hold indices into the shared memory-mapped matrix. Without a matrix, Buildings reference the
+    cached profile DataFrames, which would be copied for every Building sent between processes, so
+    Buildings are populated in the calling process. Either way, Buildings are returned in input
+    order
+
+    Args:
+        workers (int): The number of worker threads or processes
+        sim_settings (dict): The simulation settings
+        incentives (list): Incentive information
+        profile_cache (ProfileCache): Cache of energy consumption profiles
+        config_tables (ConfigTables): Study config tables
+        time_axis (TimeAxis): Shared hourly time axis
+
+    Optional Args:
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+        baseline (StudyBaseline): Baseline values computed once for the study
+
+    Attributes:
+        workers (int): The number of worker threads or processes
+
+    Methods:
+        load_profiles (None): Load the energy profiles and digests used by a set of Buildings
+        populate_buildings (Iterator[Building]): Create and populate Buildings, in input order
+    """
+    def __init__(
+            self,
+            workers: int,
+            sim_settings: dict,
+            incentives: list,
+            profile_cache: ProfileCache,
+            config_tables: ConfigTables,
+            time_axis: TimeAxis,
+            profile_matrix: ProfileMatrix = None,
+            baseline: StudyBaseline = None
+    ):
+        self.workers: int = workers
+
+        self._sim_settings: dict = sim_settings
+        self._incentives: list = incentives
+        self._profile_cache: ProfileCache = profile_cache
+        self._config_tables: ConfigTables = config_tables
+        self._time_axis: TimeAxis = time_axis
+        self._profile_matrix: ProfileMatrix = profile_matrix
+        self._baseline: StudyBaseline = baseline
+
+    def load_profiles(self, buildings_params: List[dict]) -> None:
+        """
+        Load the digests (and, without a profile matrix, the timeseries) of every baseline and
+        retrofit profile used by the Buildings into the profile cache, on worker threads
+
+        Args:
+            buildings_params (List[dict]): Input parameters for each building
+
+        Returns:
+            None
+        """
+        profile_keys = list(dict.fromkeys(
+            (params.get(key), params.get("load_scaling_factor", 1))
+            for params in buildings_params
+            for key in ["baseline_consumption_id", "retrofit_consumption_id"]
+        ))
+
+        def load_profile(profile_key: tuple) -> None:
+            Building.get_profile_digest(*profile_key, self._profile_cache)
+            if not self._profile_matrix:
+                Building.get_profile_timeseries(*profile_key, self._profile_cache)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Consume the results so loading errors are raised here
+            list(executor.map(load_profile, profile_keys))
+
+    def populate_buildings(
+            self,
+            buildings_params: List[dict],
+            lifecycle: BuildingLifecycle
+    ) -> Iterator[Building]:
+        """
+        Create and populate a Building for each set of input parameters
+
+        Args:
+            buildings_params (List[dict]): Input parameters for each building
+            lifecycle (BuildingLifecycle): Lifecycle arrays computed for all of the buildings
+
+        Returns:
+            Iterator[Building]: The populated Buildings, in the order of buildings_params
+        """
+        if self.workers == 1 or not self._profile_matrix:
+            for building_params in buildings_params:
+                yield _populate_building(
+                    building_params,
+                    self._sim_settings,
+                    self._incentives,
+                    self._profile_cache,
+                    self._profile_matrix,
+                    lifecycle,
+                    self._config_tables,
+                    self._time_axis,
+                    self._baseline
+                )
+            return
+
+        chunksize = max(1, len(buildings_params) // (self.workers * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                self._sim_settings,
+                self._incentives,
+                self._profile_cache.memory_budget / BYTES_PER_MB,
+                self._profile_matrix.filepath,
+                lifecycle,
+                self._config_tables,
+                self._time_axis,
+                self._baseline
+            )
+        ) as executor:
+            for building in executor.map(
+                _populate_building_worker, buildings_params, chunksize=chunksize
+            ):
+                building.attach_shared_data(
+                    self._profile_cache,
+                    self._profile_matrix,
+                    lifecycle,
+                    self._config_tables,
+                    self._time_axis,
+                    self._baseline
+                )
+                yield building
+
+
+def _populate_building(
+        building_params: dict,
+        sim_settings: dict,
+        incentives: list,
+        profile_cache: ProfileCache,
+        profile_matrix: ProfileMatrix,
+        lifecycle: BuildingLifecycle,
+        config_tables: ConfigTables,
+        time_axis: TimeAxis,
+        baseline: StudyBaseline
+) -> Building:
+    building = Building(
+        building_params,
+        sim_settings,
+        incentives,
+        profile_cache=profile_cache,
+        profile_matrix=profile_matrix,
+        lifecycle=lifecycle,
+        config_tables=config_tables,
+        time_axis=time_axis,
+        baseline=baseline
+    )
+
+    building.populate_building()
+
+    return building
+
+
+def _init_worker(
+        sim_settings: dict,
+        incentives: list,
+        profile_cache_mb: float,
+        profile_matrix_filepath: str,
+        lifecycle: BuildingLifecycle,
+        config_tables: ConfigTables,
+        time_axis: TimeAxis,
+        baseline: StudyBaseline
+) -> None:
+    _WORKER_STATE.update(
+        sim_settings=sim_settings,
+        incentives=incentives,
+        profile_cache=ProfileCache(profile_cache_mb),
+        profile_matrix=ProfileMatrix(profile_matrix_filepath),
+        lifecycle=lifecycle,
+        config_tables=config_tables,
+        time_axis=time_axis,
+        baseline=baseline
+    )
+
+
+def _populate_building_worker(building_params: dict) -> Building:
+    return _populate_building(building_params, **_WORKER_STATE)
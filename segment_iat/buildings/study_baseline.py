@@ -0,0 +1,278 @@
+"""
+Scenario-independent baseline state of the buildings of a study, computed once and shared by all
+of its scenarios
+"""
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from segment_iat.end_uses.building_end_uses.building_measure import BuildingMeasure
+from segment_iat.end_uses.building_end_uses.clothes_dryer import ClothesDryer
+from segment_iat.end_uses.building_end_uses.domestic_hot_water import DHW
+from segment_iat.end_uses.building_end_uses.hvac import HVAC
+from segment_iat.end_uses.building_end_uses.stove import Stove
+from segment_iat.energy_profiles.profile_digest import ProfileDigest
+from segment_iat.utils.config_tables import ConfigTables
+from segment_iat.utils.time_axis import TimeAxis
+
+
+DEFAULT_INFLATION = 0.02
+
+# Building end uses, in the order they are created
+END_USE_CLASSES = {
+    "stove": Stove,
+    "hvac": HVAC,
+    "clothes_dryer": ClothesDryer,
+    "domestic_hot_water": DHW,
+}
+
+# Consumption columns read hourly and as annual totals by building meters
+METER_COLUMNS = [
+    "out.electricity.total.energy_consumption",
+    "out.natural_gas.total.energy_consumption",
+]
+
+# Baseline values derived from the timeseries; left out when the baseline is sent between processes
+TIMESERIES_ATTRS = ["hourly_consumption", "total_consumption", "end_use_energy"]
+
+
+class StudyBaseline:
+    """
+    The baseline (existing) state of the buildings of a study. Scenarios only vary the retrofit, so
+    the baseline profile digests, the hourly and annual total baseline consumption behind the
+    meters, the baseline energy of each end use, and the book value of the existing assets are the
+    same in every scenario. They are computed once for the study and shared by its scenarios,
+    which then only compute retrofit-dependent values. Profile values are computed once per
+    baseline profile and shared by the parcels using it. Without timeseries (i.e. in profile matrix
+    mode, where buildings read consumption from the matrix) only digests and existing asset values
+    are held. Timeseries values are also left out when the baseline is pickled for a worker
+    process; Buildings compute those themselves when they are missing
+
+    Args:
+        buildings_params (List[dict]): Baseline input parameters of each building
+        {
+            building_id (str): The building/parcel ID
+            baseline_consumption_id (str): The ID of the building's baseline consumption profile
+            load_scaling_factor (float): The load scaling factor for the consumption
+            asset_install_year (int): The install year of existing building measures
+            existing_measures_cost_id (str): ID of the costs for existing building measures
+        }
+        years_vec (List[int]): List of simulation years
+        config_tables (ConfigTables): Study config tables
+        time_axis (TimeAxis): Shared hourly time axis
+
+    Attributes:
+        years_vec (List[int]): List of simulation years
+        digests (Dict[Tuple[str, float], ProfileDigest]): Digest of each baseline profile
+        hourly_consumption (Dict[Tuple[str, float], Dict[str, pd.Series]]): Hourly consumption of
+            each baseline profile, by meter column
+        total_consumption (Dict[Tuple[str, float], Dict[str, float]]): Annual total consumption of
+            each baseline profile, by meter column
+        end_use_energy (Dict[Tuple[str, float], Dict[str, pd.DataFrame]]): Baseline energy of each
+            end use, by baseline profile
+        existing_book_val (Dict[str, Dict[str, List[float]]]): Book value of each existing end use,
+            by building
+
+    Methods:
+        populate_baseline (None): Compute the baseline values
+        get_digest (ProfileDigest): Returns the digest of a baseline profile
+        get_hourly_consumption (pd.Series): Returns an hourly baseline consumption column
+        get_total_consumption (float): Returns an annual total baseline consumption column
+        get_end_use_energy (pd.DataFrame): Returns the baseline energy of an end use
+        get_existing_book_val (List[float]): Returns the book value of an existing end use
+    """
+    def __init__(
+            self,
+            buildings_params: List[dict],
+            years_vec: List[int],
+            config_tables: ConfigTables,
+            time_axis: TimeAxis
+    ):
+        self._buildings_params: List[dict] = buildings_params
+        self.years_vec: List[int] = years_vec
+        self._config_tables: ConfigTables = config_tables
+        self._time_axis: TimeAxis = time_axis
+
+        self.digests: Dict[Tuple[str, float], ProfileDigest] = {}
+        self.hourly_consumption: Dict[Tuple[str, float], Dict[str, pd.Series]] = {}
+        self.total_consumption: Dict[Tuple[str, float], Dict[str, float]] = {}
+        self.end_use_energy: Dict[Tuple[str, float], Dict[str, pd.DataFrame]] = {}
+        self.existing_book_val: Dict[str, Dict[str, List[float]]] = {}
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the baseline without the values derived from the timeseries, which are large
+        """
+        state = self.__dict__.copy()
+        for attr in TIMESERIES_ATTRS:
+            state[attr] = {}
+
+        return state
+
+    def populate_baseline(
+            self,
+            load_digest: Callable[[str, float], ProfileDigest],
+            load_profile: Callable[[str, float], pd.DataFrame] = None
+    ) -> None:
+        """
+        Compute the baseline values of every building
+
+        Args:
+            load_digest (Callable[[str, float], ProfileDigest]): Returns the digest of a
+                (consumption ID, load scaling factor) pair
+
+        Optional Args:
+            load_profile (Callable[[str, float], pd.DataFrame]): Returns the scaled and totaled
+                timeseries of a (consumption ID, load scaling factor) pair. If not provided, values
+                derived from the timeseries are not computed
+
+        Returns:
+            None
+        """
+        for building_params in self._buildings_params:
+            profile_key = (
+                building_params.get("baseline_consumption_id"),
+                building_params.get("load_scaling_factor", 1)
+            )
+
+            if profile_key not in self.digests:
+                self.digests[profile_key] = load_digest(*profile_key)
+
+            baseline_consumption = pd.DataFrame()
+            if load_profile:
+                baseline_consumption = load_profile(*profile_key)
+
+            if load_profile and profile_key not in self.hourly_consumption:
+                self.hourly_consumption[profile_key] = {
+                    column: self._time_axis.conform(
+                        baseline_consumption[column].resample("h").sum()
+                    )
+                    for column in METER_COLUMNS
+                }
+                self.total_consumption[profile_key] = {
+                    column: baseline_consumption[column].sum() for column in METER_COLUMNS
+                }
+
+            self._populate_end_uses(building_params, profile_key, baseline_consumption)
+
+    def _populate_end_uses(
+            self,
+            building_params: dict,
+            profile_key: Tuple[str, float],
+            baseline_consumption: pd.DataFrame
+    ) -> None:
+        """
+        Compute the existing book value and baseline energy of each end use of a building
+        """
+        building_id = building_params.get("building_id")
+        existing_costs = self._config_tables.get_measure_costs(
+            building_params.get("existing_measures_cost_id")
+        ).get(building_id, {})
+
+        self.existing_book_val[building_id] = {}
+        end_use_energy = self.end_use_energy.get(profile_key, {})
+
+        for end_use in END_USE_CLASSES:
+            end_use_instance = create_end_use(
+                self.years_vec,
+                [],
+                get_existing_end_use_params(building_params, existing_costs, end_use),
+                custom_baseline_energy=baseline_consumption
+            )
+            end_use_instance.initialize_baseline(end_use_energy.get(end_use))
+
+            self.existing_book_val[building_id][end_use] = end_use_instance.existing_book_val
+            if end_use_instance.baseline_energy_use is not None:
+                end_use_energy[end_use] = end_use_instance.baseline_energy_use
+
+        if end_use_energy:
+            self.end_use_energy[profile_key] = end_use_energy
+
+    def get_digest(self, profile_key: Tuple[str, float]) -> ProfileDigest:
+        """
+        The digest of a baseline profile, or None if the profile is not a baseline profile
+        """
+        return self.digests.get(profile_key)
+
+    def get_hourly_consumption(self, profile_key: Tuple[str, float], column: str) -> pd.Series:
+        """
+        The hourly consumption of a baseline profile column, or None if it was not computed
+        """
+        return self.hourly_consumption.get(profile_key, {}).get(column)
+
+    def get_total_consumption(self, profile_key: Tuple[str, float], column: str) -> float:
+        """
+        The annual total consumption of a baseline profile column, or None if it was not computed
+        """
+        return self.total_consumption.get(profile_key, {}).get(column)
+
+    def get_end_use_energy(self, profile_key: Tuple[str, float], end_use: str) -> pd.DataFrame:
+        """
+        The baseline energy of an end use for a baseline profile, or None if it was not computed
+        """
+        return self.end_use_energy.get(profile_key, {}).get(end_use)
+
+    def get_existing_book_val(self, building_id: str, end_use: str) -> List[float]:
+        """
+        The book value of an existing end use of a building, or None if it was not computed
+        """
+        return self.existing_book_val.get(building_id, {}).get(end_use)
+
+
+def get_existing_end_use_params(
+        building_params: dict,
+        existing_costs: dict,
+        end_use: str
+) -> dict:
+    """
+    The input parameters of an end use that describe the existing asset
+
+    Args:
+        building_params (dict): Input parameters of the building
+        existing_costs (dict): Costs of the building's existing measures, by end use
+        end_use (str): The end use, i.e. "stove"
+
+    Returns:
+        dict: Input parameters of the existing end use
+    """
+    return {
+        "end_use": end_use,
+        "existing_install_cost": existing_costs.get(end_use),
+        "existing_install_year": building_params.get("asset_install_year"),
+        "inflation_escalator": DEFAULT_INFLATION,
+    }
+
+
+def create_end_use(
+        years_vec: List[int],
+        incentives: List[dict],
+        params: dict,
+        custom_baseline_energy: pd.DataFrame = pd.DataFrame(),
+        custom_retrofit_energy: pd.DataFrame = pd.DataFrame()
+) -> BuildingMeasure:
+    """
+    Create (but do not initialize) the end use named by params["end_use"]
+
+    Args:
+        years_vec (List[int]): List of simulation years
+        incentives (List[dict]): Incentive information
+        params (dict): Input parameters of the end use
+
+    Optional Args:
+        custom_baseline_energy (pd.DataFrame): Baseline energy consumption timeseries
+        custom_retrofit_energy (pd.DataFrame): Retrofit energy consumption timeseries
+
+    Returns:
+        BuildingMeasure: The end use, or None if the end use is unknown
+    """
+    end_use_class = END_USE_CLASSES.get(params.get("end_use"))
+    if end_use_class is None:
+        return None
+
+    return end_use_class(
+        years_vec,
+        incentives,
+        custom_baseline_energy=custom_baseline_energy,
+        custom_retrofit_energy=custom_retrofit_energy,
+        **params
+    )
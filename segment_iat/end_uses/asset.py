@@ -6,6 +6,8 @@ from typing import List
 import numpy as np
 import pandas as pd
 
+from segment_iat.utils.time_axis import TimeAxis, get_time_axis
+
 
 class Asset:
     """
@@ -20,6 +22,9 @@ class Asset:
         sim_end_year (int): The simulation end year (exclusive)
         replacement_year (int): The replacement year of the asset
 
+    Optional Args:
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         install_year (int): The install year of the asset
         asset_cost (float): The cost of the asset in present day dollars
@@ -28,6 +33,7 @@ class Asset:
         lifetime (int): The asset lifetime in years
         sim_start_year (int): The simulation start year
         sim_end_year (int): The simulation end year (exclusive)
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
         years_vector (list): List of all years for the simulation
         year_timestamps (pd.DatetimeIndex): DatetimeIndex of hourly timestamps for a full year
         operational_vector (list): Boolean vals for years of the simulation when asset in operation
@@ -59,6 +65,7 @@ class Asset:
         sim_start_year: int,
         sim_end_year: int,
         replacement_year: int,
+        time_axis: TimeAxis = None,
     ):
         self.install_year: int = int(inst_date.split("/")[2])
         self.asset_cost: float = inst_cost
@@ -71,6 +78,7 @@ class Asset:
         self.lifetime: int = lifetime
         self.sim_start_year: int = sim_start_year
         self.sim_end_year: int = sim_end_year
+        self.time_axis: TimeAxis = time_axis or get_time_axis()
 
         self.years_vector: list = []
         self.year_timestamps: pd.DatetimeIndex = None
@@ -98,9 +106,7 @@ class Asset:
         ]
 
     def get_year_timestamps(self) -> pd.DatetimeIndex:
-        return pd.date_range(
-            start="2018-01-01", end="2019-01-01", freq="h", inclusive="left"
-        )
+        return self.time_axis.timestamps
 
     def get_operational_vector(self) -> list:
         """
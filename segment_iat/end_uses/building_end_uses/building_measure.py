@@ -60,6 +60,7 @@ class BuildingMeasure:
 
     Methods:
         initialize_end_use (None): Performs all calculations for the end use
+        initialize_baseline (None): Performs the calculations for the existing asset only
     """
     def __init__(
             self,
@@ -97,11 +98,22 @@ class BuildingMeasure:
         self.baseline_energy_use = None
         self.retrofit_energy_use = None
 
-    def initialize_end_use(self) -> None:
+    def initialize_end_use(
+            self,
+            existing_book_val: List[float] = None,
+            baseline_energy_use: pd.DataFrame = None
+    ) -> None:
         """
         Initialize the end use and calculate values
+
+        Optional Args:
+            existing_book_val (List[float]): Book value of the existing asset, if already calculated
+                (i.e. by a StudyBaseline shared between scenarios)
+            baseline_energy_use (pd.DataFrame): Baseline energy of the end use, if already
+                calculated
         """
-        self.existing_book_val = self._get_existing_book_val()
+        self.existing_book_val = existing_book_val or self._get_existing_book_val()
+        self.baseline_energy_use = baseline_energy_use
         self._replacement_vec = self._get_replacement_vec()
         self.existing_stranded_val = self._get_existing_stranded_val()
         self.replacement_cost_gross = self._get_replacement_cost_gross_value()
@@ -117,15 +129,31 @@ class BuildingMeasure:
         if not self._custom_baseline_energy.empty and not self._custom_retrofit_energy.empty:
             self._get_custom_energies()
 
+    def initialize_baseline(self, baseline_energy_use: pd.DataFrame = None) -> None:
+        """
+        Calculate the values of the existing asset, which do not depend on the retrofit
+
+        Optional Args:
+            baseline_energy_use (pd.DataFrame): Baseline energy of the end use, if already
+                calculated for another building with the same baseline profile
+        """
+        self.existing_book_val = self._get_existing_book_val()
+        self.baseline_energy_use = baseline_energy_use
+
+        if self.baseline_energy_use is None and not self._custom_baseline_energy.empty:
+            self.baseline_energy_use = self._get_baseline_energy_use()
+
     def _get_custom_energies(self) -> None:
-        self.baseline_energy_use = self._custom_baseline_energy.reindex(
-            self._energy_keys, axis=1, fill_value=0
-        )
+        if self.baseline_energy_use is None:
+            self.baseline_energy_use = self._get_baseline_energy_use()
 
         self.retrofit_energy_use = self._custom_retrofit_energy.reindex(
             self._energy_keys, axis=1, fill_value=0
         )
 
+    def _get_baseline_energy_use(self) -> pd.DataFrame:
+        return self._custom_baseline_energy.reindex(self._energy_keys, axis=1, fill_value=0)
+
     def _get_existing_book_val(self) -> List[float]:
         existing_install_year = self._kwargs.get("existing_install_year", self._years_vec[0])
         existing_cost_dollars_year = self._kwargs.get("replacement_cost_dollars_year", DEFAULT_COST_YEAR)
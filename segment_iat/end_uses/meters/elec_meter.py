@@ -23,6 +23,7 @@ class ElecMeter(Meter):
         replacement_year (int): The replacement year of the asset
         decarb_scenario (str): The energy retrofit intervention scenario
         building (Building): Instance of the associated Building object
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
 
     Attributes:
         None
@@ -43,4 +44,5 @@ class ElecMeter(Meter):
             kwargs.get("replacement_year"),
             kwargs.get("building"),
             "electricity",
+            kwargs.get("time_axis"),
         )
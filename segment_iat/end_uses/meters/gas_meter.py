@@ -1,6 +1,8 @@
 """
 Defines a gas meter
 """
+from typing import List
+
 import numpy as np
 
 from segment_iat.end_uses.meters.meter import Meter
@@ -35,6 +37,7 @@ class GasMeter(Meter):
         building (Building): Instance of the associated Building object
         replacement_cost (float): The cost of replacing the gas meter
         replacement_freq (int): The annual frequency at which the gas meter is replaced
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
 
     Attributes:
         None
@@ -56,6 +59,7 @@ class GasMeter(Meter):
             kwargs.get("replacement_year"),
             kwargs.get("building"),
             "natural_gas",
+            kwargs.get("time_axis"),
         )
 
         self._gas_intervention_year: int = kwargs.get("gas_pipe_intervention_year")
@@ -71,18 +75,13 @@ class GasMeter(Meter):
 
         Building _fuel_type can take values of: [GAS, OIL, ELEC, LPG, HPL, NPH]
         """
-        building_fuel = self.building._fuel_type
-
-        final_gas_year = self.sim_start_year - 1
-        if "GAS" in building_fuel:
-            final_gas_year = (
-                len(building_fuel) - building_fuel[::-1].index("GAS")
-                + self.sim_start_year
-            )
-
-        gas_shutoff_year = self.sim_end_year
-        if final_gas_year < self.sim_end_year or self._gas_shutoff:
-            gas_shutoff_year = min(final_gas_year+1, self._gas_intervention_year)
+        gas_shutoff_year = get_gas_shutoff_year(
+            self.building._fuel_type,
+            self.sim_start_year,
+            self.sim_end_year,
+            self._gas_shutoff,
+            self._gas_intervention_year
+        )
 
         return [
             1 if self.install_year <= i and gas_shutoff_year > i else 0
@@ -118,3 +117,36 @@ class GasMeter(Meter):
         retrofit_cost[retrofit_years] = self._retrofit_cost
 
         return (retrofit_cost * np.array(self.operational_vector)).tolist()
+
+
+def get_gas_shutoff_year(
+        building_fuel: List[str],
+        sim_start_year: int,
+        sim_end_year: int,
+        gas_shutoff: bool,
+        gas_intervention_year: int
+) -> int:
+    """
+    The first year without gas service at a meter: the earlier of the year after the building's
+    final gas year and the gas pipe intervention year, if the building stops using gas within the
+    simulation or the gas system is decommissioned. Otherwise the simulation end year
+
+    Args:
+        building_fuel (List[str]): The building's fuel type each year
+        sim_start_year (int): The simulation start year
+        sim_end_year (int): The simulation end year (exclusive)
+        gas_shutoff (bool): If the gas system is decommissioned
+        gas_intervention_year (int): The gas pipe intervention year
+
+    Returns:
+        int: The gas shutoff year of the meter
+    """
+    final_gas_year = sim_start_year - 1
+    if "GAS" in building_fuel:
+        final_gas_year = len(building_fuel) - building_fuel[::-1].index("GAS") + sim_start_year
+
+    gas_shutoff_year = sim_end_year
+    if final_gas_year < sim_end_year or gas_shutoff:
+        gas_shutoff_year = min(final_gas_year+1, gas_intervention_year)
+
+    return gas_shutoff_year
@@ -1,11 +1,11 @@
 """
 Defines meter parent class
 """
-import numpy as np
 from typing import List
 
 from segment_iat.buildings.building import Building
 from segment_iat.end_uses.utility_end_uses.utility_end_use import UtilityEndUse
+from segment_iat.utils.time_axis import TimeAxis
 
 
 class Meter(UtilityEndUse):
@@ -25,6 +25,9 @@ class Meter(UtilityEndUse):
         building (Building): Instance of the associated Building object
         meter_type (str): The type of meter (electricity, natural_gas)
 
+    Optional Args:
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         building (Building): Instance of the associated Building object
         meter_type (str): The type of meter (ELEC, GAS)
@@ -51,6 +54,7 @@ class Meter(UtilityEndUse):
         replacement_year: int,
         building: Building,
         meter_type: str,
+        time_axis: TimeAxis = None,
     ):
         super().__init__(
             gisid,
@@ -61,6 +65,7 @@ class Meter(UtilityEndUse):
             sim_start_year,
             sim_end_year,
             replacement_year,
+            time_axis,
         )
 
         self.building: Building = building
@@ -92,14 +97,10 @@ class Meter(UtilityEndUse):
             list: List of annual energy consumption
         """
         energy_attr = "out." + self.meter_type.lower() + ".total.energy_consumption"
-        annual_total_energy_baseline = np.sum(
-            self.building.baseline_consumption[[energy_attr]],
-            axis=0
-        ).values[0]
-        annual_total_energy_retrofit = np.sum(
-            self.building.retrofit_consumption[[energy_attr]],
-            axis=0
-        ).values[0]
+        annual_total_energy_baseline = self.building.get_total_consumption(energy_attr)
+        annual_total_energy_retrofit = self.building.get_total_consumption(
+            energy_attr, retrofit=True
+        )
 
         annual_total_energy = [
             annual_total_energy_baseline * operation
@@ -117,14 +118,8 @@ class Meter(UtilityEndUse):
         """
         energy_attr = "out." + self.meter_type.lower() + ".total.energy_consumption"
 
-        hourly_baseline_consump = \
-            self.building.baseline_consumption[energy_attr].resample("h").sum()
-
-        hourly_retrofit_consump = \
-            self.building.retrofit_consumption[energy_attr].resample("h").sum()
-
-        annual_peak_energy_baseline = hourly_baseline_consump.max()
-        annual_peak_energy_retrofit = hourly_retrofit_consump.max()
+        annual_peak_energy_baseline = self.building.get_digest().annual_peaks[energy_attr]
+        annual_peak_energy_retrofit = self.building.get_digest(retrofit=True).annual_peaks[energy_attr]
 
         annual_peak_energy = [
             annual_peak_energy_baseline * operation
@@ -139,11 +134,11 @@ class Meter(UtilityEndUse):
     def get_annual_energy_use_timeseries(self) -> dict:
         energy_attr = "out." + self.meter_type.lower() + ".total.energy_consumption"
 
-        annual_energy_use_baseline = \
-            self.building.baseline_consumption[energy_attr].resample("h").sum()
+        annual_energy_use_baseline = self.building.get_hourly_consumption(energy_attr)
 
-        annual_energy_use_retrofit = \
-            self.building.retrofit_consumption[energy_attr].resample("h").sum()
+        annual_energy_use_retrofit = self.building.get_hourly_consumption(
+            energy_attr, retrofit=True
+        )
 
         annual_energy_use_timeseries = [
             annual_energy_use_baseline if i == 1 else annual_energy_use_retrofit
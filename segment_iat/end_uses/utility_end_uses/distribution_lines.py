@@ -1,11 +1,11 @@
 """
 Defines distribution line parent class
 """
-import pandas as pd
 import numpy as np
 from typing import List
 
 from segment_iat.end_uses.utility_end_uses.utility_end_use import UtilityEndUse
+from segment_iat.utils.time_axis import TimeAxis
 from collections import Counter
 
 
@@ -27,6 +27,9 @@ class DistributionLine(UtilityEndUse):
         connected_assets (list): List of associated downstream assets
         distribution_line_type (str): The type of distribution line
 
+    Optional Args:
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         distribution_line_type (str): The type of distribution line
         loss_rate (int): Electric loss rate across the line
@@ -55,6 +58,7 @@ class DistributionLine(UtilityEndUse):
         decarb_scenario: int,
         connected_assets: list,
         distribution_line_type: str,
+        time_axis: TimeAxis = None,
     ):
         super().__init__(
             gisid,
@@ -65,6 +69,7 @@ class DistributionLine(UtilityEndUse):
             sim_start_year,
             sim_end_year,
             replacement_year,
+            time_axis,
         )
 
         self.distribution_line_type: str = distribution_line_type
@@ -109,17 +114,7 @@ class DistributionLine(UtilityEndUse):
         return dict(tmp_counter)
 
     def get_annual_peak_energy_use(self) -> dict:
-        annual_peak = []
-
-        for i in self.years_vector:
-            annual_peak.append(self.annual_energy_use_timeseries[i].max())
-
-        return annual_peak
+        return self._get_annual_peaks()
 
     def get_annual_energy_use_timeseries(self) -> dict:
-        energy_timeseries = {i: pd.Series(0, index=self.year_timestamps) for i in self.years_vector}
-        for i in self.years_vector:
-            for meter in self.connected_assets:
-                energy_timeseries[i] += meter.annual_energy_use_timeseries[i]
-
-        return energy_timeseries
+        return self._aggregate_annual_energy_use_timeseries()
@@ -28,6 +28,7 @@ class ElecPrimary(DistributionLine):
         phase (str): Phase rotation of the line (ABC or ACB)
         pwire_size (int): The wire size
         voltage (str): Voltage rating of the line
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
 
     Attributes:
         circuit (int): The electric circuit ID
@@ -52,6 +53,7 @@ class ElecPrimary(DistributionLine):
             kwargs.get("decarb_scenario"),
             kwargs.get("connected_assets"),
             "elec_primary",
+            kwargs.get("time_axis"),
         )
 
         self.circuit: int = kwargs.get("circuit")
@@ -28,6 +28,7 @@ class ElecService(DistributionLine):
         phase (str): Phase rotation of the line (ABC or ACB)
         sec_wsize (int): The wire size
         sec_wtype (str): Wire type
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
 
     Attributes:
         circuit (int): The electric circuit ID
@@ -52,6 +53,7 @@ class ElecService(DistributionLine):
             kwargs.get("decarb_scenario"),
             kwargs.get("connected_assets"),
             "elec_service",
+            kwargs.get("time_axis"),
         )
 
         self.circuit: int = kwargs.get("circuit")
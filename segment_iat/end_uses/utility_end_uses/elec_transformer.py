@@ -39,6 +39,7 @@ class ElecTransformer(UtilityEndUse):
         PolePadVLT (str): The mounting of the transformer (pole, pad, etc)
         bank_KVA (float): The rated kVA of the transformer
         connected_assets (list): List of associated downstream assets
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
 
     Attributes:
         circuit (int): The electric circuit ID
@@ -77,6 +78,7 @@ class ElecTransformer(UtilityEndUse):
             kwargs.get("sim_start_year"),
             kwargs.get("sim_end_year"),
             kwargs.get("replacement_year"),
+            kwargs.get("time_axis"),
         )
 
         self.decarb_scenario = (kwargs.get("decarb_scenario"),)
@@ -99,6 +101,10 @@ class ElecTransformer(UtilityEndUse):
         self.overloading_flag: list = []
         self.overloading_ratio: list = []
 
+    @property
+    def bank_KVA(self) -> float:
+        return self._bank_kva
+
     def initialize_end_use(self) -> None:
         """
         Calculates aggregate consumption values behind the meter
@@ -135,20 +141,10 @@ class ElecTransformer(UtilityEndUse):
         return dict(tmp_counter)
 
     def get_annual_energy_use_timeseries(self) -> Dict[int, pd.Series]:
-        energy_timeseries = {i: pd.Series(0, index=self.year_timestamps) for i in self.years_vector}
-        for i in self.years_vector:
-            for meter in self.connected_assets:
-                energy_timeseries[i] += meter.annual_energy_use_timeseries[i]
-
-        return energy_timeseries
+        return self._aggregate_annual_energy_use_timeseries()
 
     def get_annual_peak_energy_use(self) -> list:
-        annual_peak = []
-
-        for i in self.years_vector:
-            annual_peak.append(self.annual_energy_use_timeseries[i].max())
-
-        return annual_peak
+        return self._get_annual_peaks()
 
     def get_upgrade_year(self) -> list:
         """
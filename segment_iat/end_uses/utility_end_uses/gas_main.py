@@ -2,7 +2,6 @@
 Defines gas main asset
 """
 import numpy as np
-import pandas as pd
 from typing import List
 import warnings
 
@@ -36,8 +35,10 @@ class GasMain(Pipeline):
         diameter (str): Diameter of the pipe
         material (str): The pipe material
         connected_assets (list): List of associated downstream assets
+        config_tables (ConfigTables): Study config tables; defaults to loading the segment's tables
         replacement_cost (float): The cost of replacing the gas meter
         shutoff_cost (float): The cost of pipeline shutoff
+        time_axis (TimeAxis): Shared hourly time axis of the weather year
 
     Attributes:
         replacement_cost (float): Cost of gas main replacement
@@ -73,6 +74,8 @@ class GasMain(Pipeline):
             kwargs.get("connected_assets"),
             kwargs.get("segment_id"),
             "gas_main",
+            kwargs.get("config_tables"),
+            kwargs.get("time_axis"),
         )
 
         self._gas_intervention_year: int = kwargs.get("gas_pipe_intervention_year")
@@ -183,13 +186,9 @@ class GasMain(Pipeline):
         return (np.array(self.shutoff_year) * self.shutoff_cost).tolist()
 
     def _get_annual_om(self) -> List[float]:
-        om_filepath = f"./config_files/{self._segment_id}/utility_network/{self._segment_id}_operating_expenses.csv"
-        om_table = pd.read_csv(om_filepath)
-
-        annual_operating_expense = om_table[
-            (om_table["type"]==self.pipeline_type)
-            & (om_table["material"]==self.material)
-        ]["operating_expense_per_mile"].to_dict().get(0, DEFAULT_OM_COST)
+        annual_operating_expense = self._config_tables.get_operating_expenses(
+            self.pipeline_type, self.material
+        ).get(0, DEFAULT_OM_COST)
 
         if not annual_operating_expense:
             warnings.warn(
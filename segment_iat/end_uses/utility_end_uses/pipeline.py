@@ -6,6 +6,8 @@ import pandas as pd
 from typing import List
 
 from segment_iat.end_uses.utility_end_uses.utility_end_use import UtilityEndUse
+from segment_iat.utils.config_tables import ConfigTables
+from segment_iat.utils.time_axis import TimeAxis
 from collections import Counter
 
 
@@ -31,6 +33,10 @@ class Pipeline(UtilityEndUse):
         connected_assets (list): List of associated downstream assets
         pipeline_type (str): The type of pipeline (gas_service, gas_main)
 
+    Optional Args:
+        config_tables (ConfigTables): Study config tables; defaults to loading the segment's tables
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         pipeline_type (str): The type of pipeline (gas_service, gas_main)
         length (int): Pipeline length in feet
@@ -40,7 +46,6 @@ class Pipeline(UtilityEndUse):
         leak_rate (int): The pipe's methane leak rate
         connected_assets (list): List of associated downstream assets
         decarb_scenario (str): The energy retrofit intervention scenario
-        leakage_factors (pd.DataFrame): Table of methane leak factors by pipe material
         annual_total_leakage (list): List of total methane leaks by year
         annual_total_energy_use (dict): Total annual energy use behind the pipe, by sim year
         annual_peak_energy_use (dict): Total peak energy use at the pipe, by sim year
@@ -71,6 +76,8 @@ class Pipeline(UtilityEndUse):
         connected_assets: list,
         segment_id: str,
         pipeline_type: str,
+        config_tables: ConfigTables = None,
+        time_axis: TimeAxis = None,
     ):
         super().__init__(
             gisid,
@@ -81,9 +88,11 @@ class Pipeline(UtilityEndUse):
             sim_start_year,
             sim_end_year,
             replacement_year,
+            time_axis,
         )
 
         self._segment_id: str = segment_id
+        self._config_tables: ConfigTables = config_tables or ConfigTables(segment_id)
 
         self.pipeline_type: str = pipeline_type
         self.length: int = length_ft
@@ -101,8 +110,6 @@ class Pipeline(UtilityEndUse):
 
         self.decarb_scenario: str = decarb_scenario
 
-        self.leakage_factors: pd.DataFrame = None
-
         self.annual_total_leakage: list = []
         self.annual_total_energy_use: dict = {}
         self.annual_peak_energy_use: dict = {}
@@ -121,16 +128,11 @@ class Pipeline(UtilityEndUse):
         """
         super().initialize_end_use()
         if self.connected_assets:
-            self.leakage_factors = self._load_leakage_factors()
             self.annual_total_energy_use = self.get_annual_total_energy_use()
             self.annual_peak_energy_use = self.get_annual_peak_energy_use()
             self.annual_energy_use_timeseries = self.get_annual_energy_use_timeseries()
             self.annual_total_leakage = self.get_annual_total_leakage()
 
-    def _load_leakage_factors(self) -> int:
-        leakage_factor_file = f"./config_files/{self._segment_id}/utility_network/{self._segment_id}_leakage_factors.csv"
-        return self._read_csv_config(config_file_path=leakage_factor_file)
-
     def get_annual_total_energy_use(self) -> dict:
         """
         Get the total energy use on a gas service lines
@@ -158,10 +160,9 @@ class Pipeline(UtilityEndUse):
         return dict(tmp_counter)
 
     def get_annual_total_leakage(self) -> list:
-        leakage_factor = self.leakage_factors[
-            (self.leakage_factors["asset"] == self.pipeline_type)
-            & (self.leakage_factors["code"] == self.material)
-        ].loc[:, "value"].iloc[0] * self.length
+        leakage_factor = self._config_tables.get_leakage_factor(
+            self.pipeline_type, self.material
+        ) * self.length
 
         # TODO: check if the units of length and leakage factor match
 
@@ -169,10 +170,7 @@ class Pipeline(UtilityEndUse):
 
         for idx, retrofit in enumerate(self.retrofit_vector):
             if retrofit:
-                leakage_factor = self.leakage_factors[
-                    (self.leakage_factors["asset"] == self.pipeline_type)
-                    & (self.leakage_factors["code"] == "PL")
-                ].loc[:, "value"].iloc[0]
+                leakage_factor = self._config_tables.get_leakage_factor(self.pipeline_type, "PL")
 
                 annual_leakage[idx] = leakage_factor * self.length
 
@@ -167,18 +167,12 @@ class ThermalEnergyNetwork:
             total_thermal_consump = pd.Series(0, index=self._year_timestamps)
 
             for bldg in self._buildings.values():
-                if bldg._is_retrofit_vec[i]:
-                    total_thermal_consump = total_thermal_consump.add(
-                        bldg.retrofit_consumption[
-                            f"out.thermal_{heating_cooling}.total.energy_consumption"
-                        ]
-                    )
-                else:
-                    total_thermal_consump = total_thermal_consump.add(
-                        bldg.baseline_consumption[
-                            f"out.thermal_{heating_cooling}.total.energy_consumption"
-                        ]
+                total_thermal_consump = total_thermal_consump.add(
+                    bldg.get_consumption(
+                        f"out.thermal_{heating_cooling}.total.energy_consumption",
+                        retrofit=bldg._is_retrofit_vec[i]
                     )
+                )
 
             annual_peak.append(total_thermal_consump.max())
 
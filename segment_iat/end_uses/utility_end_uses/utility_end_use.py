@@ -1,7 +1,12 @@
 """
 Defines UtilityEndUse parent class
 """
+from typing import Dict, List
+
+import pandas as pd
+
 from segment_iat.end_uses.asset import Asset
+from segment_iat.utils.time_axis import TimeAxis
 
 
 class UtilityEndUse(Asset):
@@ -19,6 +24,9 @@ class UtilityEndUse(Asset):
         sim_end_year (int): The simulation end year (exclusive)
         replacement_year (int): The replacement year of the asset
 
+    Optional Args:
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         asset_id (str): The ID for the given asset
         parent_id (str): The ID for the parent of the asset (if applicable, otherwise empty)
@@ -37,6 +45,7 @@ class UtilityEndUse(Asset):
         sim_start_year,
         sim_end_year,
         replacement_year,
+        time_axis: TimeAxis = None,
     ):
         super().__init__(
             inst_date,
@@ -45,7 +54,50 @@ class UtilityEndUse(Asset):
             sim_start_year,
             sim_end_year,
             replacement_year,
+            time_axis,
         )
 
         self.asset_id = gisid
         self.parent_id = parentid
+
+    def _aggregate_annual_energy_use_timeseries(self) -> Dict[int, pd.Series]:
+        """
+        Sum the hourly timeseries of the connected assets for each year. The sum only changes in
+        years where a connected timeseries changes (i.e. a downstream building retrofits), so it is
+        computed once per distinct set of connected timeseries and shared by all years with that set
+        """
+        energy_timeseries = {}
+        state_timeseries = {}
+
+        for i in self.years_vector:
+            connected_timeseries = [
+                asset.annual_energy_use_timeseries[i] for asset in self.connected_assets
+            ]
+            # Connected assets share one Series between years in the same state, so the
+            # identities of the connected Series identify the retrofit state of the year
+            state = tuple(id(timeseries) for timeseries in connected_timeseries)
+
+            if state not in state_timeseries:
+                timeseries = pd.Series(0, index=self.year_timestamps)
+                for connected in connected_timeseries:
+                    timeseries += connected
+                state_timeseries[state] = timeseries
+
+            energy_timeseries[i] = state_timeseries[state]
+
+        return energy_timeseries
+
+    def _get_annual_peaks(self) -> List[float]:
+        """
+        The peak of each year's hourly timeseries, computed once per distinct timeseries
+        """
+        peaks = {}
+        annual_peak = []
+
+        for i in self.years_vector:
+            timeseries = self.annual_energy_use_timeseries[i]
+            if id(timeseries) not in peaks:
+                peaks[id(timeseries)] = timeseries.max()
+            annual_peak.append(peaks[id(timeseries)])
+
+        return annual_peak
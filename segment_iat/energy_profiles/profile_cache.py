@@ -0,0 +1,130 @@
+"""
+Process-wide cache for parsed energy consumption profiles
+"""
+from collections import OrderedDict
+import sys
+import threading
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.utils.run_defaults import DEFAULT_MEMORY_BUDGET_MB
+
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class ProfileCache:
+    """
+    Least-recently-used cache for energy consumption profiles, bounded by a memory budget. Profiles
+    are keyed by consumption ID (or any hashable key derived from it) and are shared between all
+    Buildings and Scenarios using the cache, so cached values should be treated as read-only. The
+    cache is thread-safe; values are loaded outside the lock so threads can load different profiles
+    concurrently
+
+    Args:
+        None
+
+    Optional Args:
+        memory_budget_mb (float): The maximum memory held by cached profiles, in MB
+
+    Attributes:
+        memory_budget (int): The maximum memory held by cached profiles, in bytes
+        memory_usage (int): The memory currently held by cached profiles, in bytes
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that required loading the profile
+
+    Methods:
+        get (Any): Return the cached value for a key, loading it on a cache miss
+        clear (None): Remove all cached values
+    """
+    def __init__(self, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB):
+        self.memory_budget: int = int(memory_budget_mb * BYTES_PER_MB)
+        self.memory_usage: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key. On a miss, the value is loaded with loader() and cached,
+        evicting the least recently used values until the cache fits within the memory budget
+
+        Args:
+            key (Hashable): The cache key, typically the consumption ID
+            loader (Callable[[], Any]): Function returning the value when it is not cached
+
+        Returns:
+            Any: The cached (or newly loaded) value
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+            self.misses += 1
+
+        value = loader()
+        size = self._get_size(value)
+
+        # Values larger than the full budget are handed back without being cached
+        if size > self.memory_budget:
+            return value
+
+        with self._lock:
+            # Another thread may have loaded the same key meanwhile; keep the first value so all
+            # users share one object
+            if key in self._entries:
+                return self._entries[key][0]
+
+            self._entries[key] = (value, size)
+            self.memory_usage += size
+            self._evict()
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all cached values
+        """
+        with self._lock:
+            self._entries.clear()
+            self.memory_usage = 0
+
+    def _evict(self) -> None:
+        """
+        Evict least recently used values until memory usage is within the budget
+        """
+        while self.memory_usage > self.memory_budget and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.memory_usage -= size
+
+    @staticmethod
+    def _get_size(value: Any) -> int:
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True))
+        if isinstance(value, np.ndarray):
+            return int(value.nbytes)
+        return sys.getsizeof(value)
+
+
+_PROFILE_CACHE = ProfileCache()
+
+
+def get_profile_cache() -> ProfileCache:
+    """
+    Return the process-wide ProfileCache instance
+    """
+    return _PROFILE_CACHE
@@ -0,0 +1,174 @@
+"""
+Precomputed annual, monthly, and peak summaries of energy consumption profiles
+"""
+import json
+import os
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+
+DIGEST_DIRNAME = "digests"
+DIGEST_VERSION = 1
+
+
+class ProfileDigest:
+    """
+    Annual totals, monthly totals, and annual hourly peaks of the consumption columns of one
+    scaled energy profile. Digests are computed once per (consumption ID, load scaling factor) pair
+    so per-building annual calculations do not touch hourly data
+
+    Args:
+        consumption_id (str): The ID of the consumption profile
+        load_scaling_factor (float): The load scaling factor applied to the profile
+        annual_totals (Dict[str, float]): Total consumption in the first calendar year, by column
+        monthly_totals (Dict[str, List[float]]): Total consumption by month, by column
+        annual_peaks (Dict[str, float]): Peak hourly consumption, by column
+
+    Attributes:
+        consumption_id (str): The ID of the consumption profile
+        load_scaling_factor (float): The load scaling factor applied to the profile
+        annual_totals (Dict[str, float]): Total consumption in the first calendar year, by column
+        monthly_totals (Dict[str, List[float]]): Total consumption by month, by column
+        annual_peaks (Dict[str, float]): Peak hourly consumption, by column
+
+    Methods:
+        from_timeseries (ProfileDigest): Compute the digest of an energy consumption timeseries
+        to_dict (dict): Return the digest as a JSON-serializable dict
+        from_dict (ProfileDigest): Create a digest from a dict produced by to_dict
+    """
+    def __init__(
+            self,
+            consumption_id: str,
+            load_scaling_factor: float,
+            annual_totals: Dict[str, float],
+            monthly_totals: Dict[str, List[float]],
+            annual_peaks: Dict[str, float]
+    ):
+        self.consumption_id: str = consumption_id
+        self.load_scaling_factor: float = float(load_scaling_factor)
+        self.annual_totals: Dict[str, float] = annual_totals
+        self.monthly_totals: Dict[str, List[float]] = monthly_totals
+        self.annual_peaks: Dict[str, float] = annual_peaks
+
+    @classmethod
+    def from_timeseries(
+            cls,
+            consumption_id: str,
+            load_scaling_factor: float,
+            consumption: pd.DataFrame,
+            columns: Iterable[str]
+    ) -> "ProfileDigest":
+        """
+        Compute the digest of a scaled energy consumption timeseries
+
+        Args:
+            consumption_id (str): The ID of the consumption profile
+            load_scaling_factor (float): The load scaling factor applied to the timeseries
+            consumption (pd.DataFrame): The energy consumption timeseries, indexed by timestamp
+            columns (Iterable[str]): The consumption columns to summarize
+
+        Returns:
+            ProfileDigest: The digest
+        """
+        consumption = consumption[list(columns)]
+
+        return cls(
+            consumption_id,
+            load_scaling_factor,
+            annual_totals=consumption.resample("YS").sum().iloc[0].to_dict(),
+            monthly_totals=consumption.resample("MS").sum().to_dict(orient="list"),
+            annual_peaks=consumption.resample("h").sum().max().to_dict()
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": DIGEST_VERSION,
+            "consumption_id": self.consumption_id,
+            "load_scaling_factor": self.load_scaling_factor,
+            "annual_totals": self.annual_totals,
+            "monthly_totals": self.monthly_totals,
+            "annual_peaks": self.annual_peaks,
+        }
+
+    @classmethod
+    def from_dict(cls, digest: dict) -> "ProfileDigest":
+        return cls(
+            digest["consumption_id"],
+            digest["load_scaling_factor"],
+            digest["annual_totals"],
+            digest["monthly_totals"],
+            digest["annual_peaks"]
+        )
+
+
+class ProfileDigestStore:
+    """
+    On-disk store of profile digests, one JSON file per (consumption ID, load scaling factor) pair.
+    Floats are saved with full precision, so loaded digests match freshly computed ones exactly
+
+    Args:
+        store_dir (str): Directory of the digests
+
+    Attributes:
+        store_dir (str): Directory of the digests
+
+    Methods:
+        is_current (bool): True if the digest exists and is not older than its source profile files
+        load_digest (ProfileDigest): Load a saved digest
+        save_digest (None): Save a digest to the store
+    """
+    def __init__(self, store_dir: str):
+        self.store_dir: str = store_dir
+
+    def _get_filepath(self, consumption_id: str, load_scaling_factor: float) -> str:
+        return os.path.join(
+            self.store_dir, f"{consumption_id}_x{float(load_scaling_factor)!r}.json"
+        )
+
+    def is_current(
+            self,
+            consumption_id: str,
+            load_scaling_factor: float,
+            source_filepaths: Iterable[str]
+    ) -> bool:
+        """
+        Check that the digest exists, was saved after the last change to any existing source
+        file of the profile (its CSV and compiled profile), and has the current DIGEST_VERSION
+        """
+        filepath = self._get_filepath(consumption_id, load_scaling_factor)
+        if not os.path.exists(filepath):
+            return False
+
+        digest_mtime = os.path.getmtime(filepath)
+        if any(
+            digest_mtime < os.path.getmtime(i)
+            for i in source_filepaths
+            if os.path.exists(i)
+        ):
+            return False
+
+        # Digests of an older format are stale, even if their profile has not changed
+        try:
+            with open(filepath, "r") as f:
+                return json.load(f).get("version") == DIGEST_VERSION
+        except ValueError:
+            return False
+
+    def load_digest(self, consumption_id: str, load_scaling_factor: float) -> ProfileDigest:
+        with open(self._get_filepath(consumption_id, load_scaling_factor), "r") as f:
+            return ProfileDigest.from_dict(json.load(f))
+
+    def save_digest(self, digest: ProfileDigest) -> None:
+        """
+        Save a digest. The file is written under a temporary name and then moved into place, so
+        concurrent readers never see a partial digest
+        """
+        if not os.path.exists(self.store_dir):
+            os.makedirs(self.store_dir, exist_ok=True)
+
+        filepath = self._get_filepath(digest.consumption_id, digest.load_scaling_factor)
+        tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_filepath, "w") as f:
+            json.dump(digest.to_dict(), f)
+        os.replace(tmp_filepath, filepath)
@@ -0,0 +1,221 @@
+"""
+Memory-mapped float32 matrix of hourly energy consumption profiles
+"""
+import hashlib
+import json
+import os
+import uuid
+from typing import Callable, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+TIMESTAMP_COL = "timestamp"
+MANIFEST_VERSION = 1
+
+
+class ProfileMatrix:
+    """
+    Hourly energy consumption profiles for a Study stored as one memory-mapped float32 array of
+    shape (profiles x columns x hours). Each (consumption ID, load scaling factor) pair is one row
+    block, so Buildings only hold an index into the array. Processes opening the same file share
+    one physical copy through the page cache. Builds write to temporary files that are then
+    swapped in with os.replace, so processes that have the previous file open keep reading it
+    unchanged
+
+    Args:
+        filepath (str): Filepath of the matrix .npy file. The manifest is saved alongside it as JSON
+
+    Attributes:
+        filepath (str): Filepath of the matrix .npy file
+        columns (List[str]): The consumption columns held for each profile
+        profile_keys (List[Tuple[str, float]]): The (consumption ID, load scaling factor) of each profile
+        timestamps (pd.DatetimeIndex): Hourly timestamps shared by all profiles
+        values (np.ndarray): Read-only memory map of the matrix
+
+    Methods:
+        get_filepath (str): Return the filepath of the matrix of a set of profiles
+        build (ProfileMatrix): Write a new matrix file from energy consumption profiles
+        get_index (int): Return the index of a profile in the matrix
+        get_row (np.ndarray): Return a view of one column of one profile
+        get_series (pd.Series): Return one column of one profile as a Series, without copying
+        get_frame (pd.DataFrame): Return all columns of one profile as a DataFrame
+    """
+    def __init__(self, filepath: str):
+        self.filepath: str = filepath
+
+        with open(self._get_manifest_filepath(filepath), "r") as f:
+            manifest = json.load(f)
+
+        self.columns: List[str] = manifest["columns"]
+        self.profile_keys: List[Tuple[str, float]] = [
+            (consumption_id, scaling) for consumption_id, scaling in manifest["profile_keys"]
+        ]
+        self.timestamps: pd.DatetimeIndex = pd.date_range(
+            start=manifest["start"],
+            periods=manifest["periods"],
+            freq="h",
+            name=TIMESTAMP_COL
+        )
+        self.values: np.ndarray = np.load(filepath, mmap_mode="r")
+
+        self._profile_idx = {key: idx for idx, key in enumerate(self.profile_keys)}
+        self._column_idx = {col: idx for idx, col in enumerate(self.columns)}
+
+    @staticmethod
+    def _get_manifest_filepath(filepath: str) -> str:
+        return os.path.splitext(filepath)[0] + ".json"
+
+    @staticmethod
+    def _get_unique_keys(profile_keys: Iterable[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        return [(i, float(j)) for i, j in dict.fromkeys(profile_keys)]
+
+    @classmethod
+    def get_filepath(
+            cls,
+            dirpath: str,
+            name: str,
+            profile_keys: Iterable[Tuple[str, float]],
+            columns: List[str]
+    ) -> str:
+        """
+        Return the filepath of the matrix of a set of profiles,
+        <dirpath>/<name>_profile_matrix_<hash>.npy. The hash covers the profile keys and columns, so
+        matrices of different profile sets (i.e. different scenario subsets) never share a file
+
+        Args:
+            dirpath (str): Directory of the matrix files
+            name (str): Name of the matrix, i.e. the segment name
+            profile_keys (Iterable[Tuple[str, float]]): The (consumption ID, load scaling factor)
+                pairs in the matrix
+            columns (List[str]): The consumption columns held for each profile
+
+        Returns:
+            str: The filepath of the matrix .npy file
+        """
+        contents = {
+            "version": MANIFEST_VERSION,
+            "columns": columns,
+            "profile_keys": cls._get_unique_keys(profile_keys),
+        }
+        key = hashlib.sha256(json.dumps(contents).encode()).hexdigest()[:16]
+
+        return os.path.join(dirpath, f"{name}_profile_matrix_{key}.npy")
+
+    @classmethod
+    def build(
+            cls,
+            filepath: str,
+            profile_keys: Iterable[Tuple[str, float]],
+            loader: Callable[[str, float], pd.DataFrame],
+            columns: List[str]
+    ) -> "ProfileMatrix":
+        """
+        Write a matrix file from energy consumption profiles, resampled to hourly
+
+        Args:
+            filepath (str): Filepath of the matrix .npy file
+            profile_keys (Iterable[Tuple[str, float]]): The (consumption ID, load scaling factor)
+                pairs to include
+            loader (Callable[[str, float], pd.DataFrame]): Returns the energy timeseries for a
+                consumption ID and load scaling factor
+            columns (List[str]): The consumption columns to keep for each profile
+
+        Returns:
+            ProfileMatrix: The opened matrix
+        """
+        profile_keys = cls._get_unique_keys(profile_keys)
+
+        if not os.path.exists(os.path.dirname(filepath)):
+            os.makedirs(os.path.dirname(filepath))
+
+        # Written under a unique temporary name, so concurrent builds and readers of filepath never
+        # see a partly written matrix
+        tmp_filepath = f"{os.path.splitext(filepath)[0]}.{os.getpid()}.{uuid.uuid4().hex}.tmp.npy"
+        tmp_manifest_filepath = cls._get_manifest_filepath(tmp_filepath)
+
+        try:
+            values = None
+            timestamps = None
+            for idx, (consumption_id, load_scaling_factor) in enumerate(profile_keys):
+                hourly = loader(consumption_id, load_scaling_factor)[columns].resample("h").sum()
+
+                if values is None:
+                    timestamps = hourly.index
+                    values = np.lib.format.open_memmap(
+                        tmp_filepath,
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(len(profile_keys), len(columns), len(timestamps))
+                    )
+
+                if len(hourly) != len(timestamps):
+                    raise ValueError(
+                        f"Profile {consumption_id} has {len(hourly)} hours; expected "
+                        f"{len(timestamps)}"
+                    )
+
+                values[idx] = hourly.to_numpy(dtype=np.float32).T
+
+            if values is None:
+                raise ValueError("Cannot build a profile matrix without any profiles")
+
+            values.flush()
+            del values
+
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "columns": columns,
+                "profile_keys": profile_keys,
+                "start": str(timestamps[0]),
+                "periods": len(timestamps),
+            }
+            with open(tmp_manifest_filepath, "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            # Open maps of a previous file keep its data; the matrix and manifest of one filepath
+            # hold the same profiles (see get_filepath), so readers opening them between the two
+            # swaps still get a matching pair
+            os.replace(tmp_filepath, filepath)
+            os.replace(tmp_manifest_filepath, cls._get_manifest_filepath(filepath))
+        finally:
+            # Release the map of a failed build before removing its temporary files
+            values = None
+            for i in [tmp_filepath, tmp_manifest_filepath]:
+                if os.path.exists(i):
+                    os.remove(i)
+
+        return cls(filepath)
+
+    def get_index(self, consumption_id: str, load_scaling_factor: float = 1) -> int:
+        """
+        Return the index of a (consumption ID, load scaling factor) pair in the matrix
+        """
+        key = (consumption_id, float(load_scaling_factor))
+        if key not in self._profile_idx:
+            raise KeyError(f"Profile {consumption_id} (scaled by {load_scaling_factor}) is not in the profile matrix")
+
+        return self._profile_idx[key]
+
+    def get_row(self, profile_idx: int, column: str) -> np.ndarray:
+        """
+        Return a read-only view of one column of one profile
+        """
+        return self.values[profile_idx, self._column_idx[column]]
+
+    def get_series(self, profile_idx: int, column: str) -> pd.Series:
+        """
+        Return one column of one profile as a Series backed by the memory map
+        """
+        return pd.Series(self.get_row(profile_idx, column), index=self.timestamps, name=column, copy=False)
+
+    def get_frame(self, profile_idx: int) -> pd.DataFrame:
+        """
+        Return all columns of one profile as a DataFrame. This copies the profile out of the matrix
+        """
+        return pd.DataFrame(
+            np.array(self.values[profile_idx]).T,
+            index=self.timestamps,
+            columns=self.columns
+        )
@@ -0,0 +1,192 @@
+"""
+Compiled columnar store for energy consumption profiles
+"""
+import json
+import os
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+COMPILED_DIRNAME = "compiled"
+TIMESTAMP_COL = "timestamp"
+MANIFEST_VERSION = 1
+
+
+class ProfileStore:
+    """
+    A compiled store of hourly energy consumption profiles. Each profile is saved as a float64
+    .npy matrix of shape (columns x timestamps), a .npy array of int64 timestamps, and a JSON
+    manifest of column names and dtypes. Columns are contiguous on disk, so loading a subset of
+    columns only reads those columns, and no timestamp strings are parsed
+
+    Args:
+        store_dir (str): Directory of the compiled profiles
+
+    Attributes:
+        store_dir (str): Directory of the compiled profiles
+
+    Methods:
+        has_profile (bool): True if a compiled profile exists for the consumption ID
+        is_current (bool): True if the compiled profile exists and is not older than its CSV
+        load_profile (pd.DataFrame): Load a compiled profile, optionally only selected columns
+        compile_profile (str): Compile a single CSV profile into the store
+        compile_directory (List[str]): Compile all CSV profiles in a directory into the store
+    """
+    def __init__(self, store_dir: str):
+        self.store_dir: str = store_dir
+
+    def _get_filepaths(self, consumption_id: str) -> dict:
+        return {
+            "values": os.path.join(self.store_dir, f"{consumption_id}.npy"),
+            "index": os.path.join(self.store_dir, f"{consumption_id}.index.npy"),
+            "manifest": os.path.join(self.store_dir, f"{consumption_id}.json"),
+        }
+
+    def has_profile(self, consumption_id: str) -> bool:
+        return all(os.path.exists(i) for i in self._get_filepaths(consumption_id).values())
+
+    def is_current(self, consumption_id: str, csv_filepath: str) -> bool:
+        """
+        Check that the compiled profile exists and was compiled after the last change to the CSV.
+        If the CSV does not exist, the compiled profile is treated as the source of truth
+        """
+        if not self.has_profile(consumption_id):
+            return False
+
+        if not os.path.exists(csv_filepath):
+            return True
+
+        compiled_mtime = os.path.getmtime(self._get_filepaths(consumption_id)["manifest"])
+        return compiled_mtime >= os.path.getmtime(csv_filepath)
+
+    def load_profile(
+            self,
+            consumption_id: str,
+            column_prefixes: Iterable[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load a compiled profile, indexed by timestamp
+
+        Args:
+            consumption_id (str): The ID of the consumption profile
+            column_prefixes (Iterable[str]): If provided, only load columns starting with one of
+                these prefixes
+
+        Returns:
+            pd.DataFrame: The energy consumption timeseries
+        """
+        filepaths = self._get_filepaths(consumption_id)
+
+        with open(filepaths["manifest"], "r") as f:
+            manifest = json.load(f)
+
+        columns = manifest["columns"]
+        dtypes = manifest["dtypes"]
+        if column_prefixes is not None:
+            column_prefixes = tuple(column_prefixes)
+            selected = [i for i, col in enumerate(columns) if col.startswith(column_prefixes)]
+        else:
+            selected = list(range(len(columns)))
+
+        # Memory-map so only the selected columns are read from disk
+        values = np.load(filepaths["values"], mmap_mode="r")
+
+        index = pd.DatetimeIndex(np.load(filepaths["index"]).view("datetime64[ns]"))
+        if manifest.get("tz"):
+            index = index.tz_localize("UTC").tz_convert(manifest["tz"])
+        index.name = TIMESTAMP_COL
+
+        return pd.DataFrame(
+            {
+                columns[i]: np.array(values[i], dtype=dtypes[i])
+                for i in selected
+            },
+            index=index
+        )
+
+    def compile_profile(self, csv_filepath: str, consumption_id: str = None) -> str:
+        """
+        Compile a CSV profile, with a timestamp column and one column per consumption field, into
+        the store
+
+        Args:
+            csv_filepath (str): Filepath of the CSV profile
+
+        Optional Args:
+            consumption_id (str): The ID of the profile; defaults to the CSV filename
+
+        Returns:
+            str: The ID of the compiled profile
+        """
+        if consumption_id is None:
+            consumption_id = os.path.splitext(os.path.basename(csv_filepath))[0]
+
+        consump_df = pd.read_csv(csv_filepath).set_index(TIMESTAMP_COL)
+        consump_df.index = pd.to_datetime(consump_df.index)
+        consump_df = consump_df.select_dtypes(include=["number"])
+
+        index = consump_df.index
+        tz = None
+        if index.tz is not None:
+            tz = str(index.tz)
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        if not os.path.exists(self.store_dir):
+            os.makedirs(self.store_dir)
+
+        filepaths = self._get_filepaths(consumption_id)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "consumption_id": consumption_id,
+            "columns": consump_df.columns.to_list(),
+            "dtypes": [str(i) for i in consump_df.dtypes],
+            "tz": tz,
+        }
+
+        # Each file is written to a temporary file and swapped in, so an interrupted compile never
+        # leaves a partial file. The manifest is swapped in last; its mtime marks the profile as
+        # compiled
+        tmp_filepaths = {
+            key: f"{filepath}.{os.getpid()}.tmp" for key, filepath in filepaths.items()
+        }
+        try:
+            with open(tmp_filepaths["values"], "wb") as f:
+                np.save(f, np.ascontiguousarray(consump_df.to_numpy(dtype="float64").T))
+            with open(tmp_filepaths["index"], "wb") as f:
+                np.save(f, index.values.astype("datetime64[ns]").view("int64"))
+            with open(tmp_filepaths["manifest"], "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            for key in ["values", "index", "manifest"]:
+                os.replace(tmp_filepaths[key], filepaths[key])
+        finally:
+            for tmp_filepath in tmp_filepaths.values():
+                if os.path.exists(tmp_filepath):
+                    os.remove(tmp_filepath)
+
+        return consumption_id
+
+    def compile_directory(self, csv_dir: str, consumption_ids: List[str] = None) -> List[str]:
+        """
+        Compile CSV profiles in a directory into the store
+
+        Args:
+            csv_dir (str): Directory of CSV profiles
+
+        Optional Args:
+            consumption_ids (List[str]): The IDs of the profiles to compile; defaults to all CSVs
+
+        Returns:
+            List[str]: The IDs of the compiled profiles
+        """
+        if consumption_ids is None:
+            consumption_ids = sorted(
+                os.path.splitext(i)[0] for i in os.listdir(csv_dir) if i.endswith(".csv")
+            )
+
+        return [
+            self.compile_profile(os.path.join(csv_dir, f"{i}.csv"), i)
+            for i in consumption_ids
+        ]
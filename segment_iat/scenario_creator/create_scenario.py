@@ -8,8 +8,24 @@ import numpy as np
 import pandas as pd
 
 from segment_iat.buildings.building import Building
+from segment_iat.buildings.building_lifecycle import BuildingLifecycle
+from segment_iat.buildings.building_pool import BuildingPool
+from segment_iat.buildings.study_baseline import StudyBaseline
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.scenario_creator.output_table import OutputTable
+from segment_iat.scenario_creator.output_writer import (
+    OUTPUT_FORMAT_CSV,
+    OUTPUT_FORMAT_MEMORY,
+    OUTPUTS_BASEPATH,
+    OutputWriter
+)
+from segment_iat.scenario_creator.scenario_results import ScenarioResults
 from segment_iat.utility_network.utility_network import UtilityNetwork
+from segment_iat.utils.config_tables import ConfigTables
 from segment_iat.utils.incentives import Incentives
+from segment_iat.utils.stage_recorder import listen_stages, stage
+from segment_iat.utils.time_axis import TimeAxis, get_time_axis
 
 
 DEFAULT_SIM_START_YEAR = 2020
@@ -19,8 +35,6 @@ DEFAULT_REPLACEMENT_COST_DOLLARS_YEAR = 2022
 
 FUELS = ["electricity", "natural_gas", "propane", "fuel_oil", "thermal_cooling", "thermal_heating"]
 
-OUTPUTS_BASEPATH = "./outputs"
-
 DOMAIN_BUILDING = "building"
 TYPE_BUILDING_AGGREGATE = "building_aggregate"
 TYPE_BUILDING_GROSS = "building_gross"
@@ -38,6 +52,25 @@ TYPE_GAS_METER = "gas_meter"
 DOMAIN_THERMAL = "thermal_network"
 TYPE_THERMAL = "thermal_network"
 
+# Label columns of the asset x year output tables, in output order
+ASSET_LABEL_COLS = ["asset_id", "asset_domain", "asset_type"]
+ENERGY_LABEL_COLS = ["asset_id", "energy_type", "asset_domain", "asset_type"]
+
+# Typed columns of the incentives table; buildings without incentives report upfront_costs
+INCENTIVES_COLUMN_TYPES = {
+    "authority_type": "string",
+    "program": "string",
+    "asset_type": "string",
+    "items": "list<string>",
+    "upfront_costs": "float64",
+    "upfront_cost": "float64",
+    "incentive_amount": "float64",
+    "start_date": "int64",
+    "end_date": "int64",
+    "install_year": "int64",
+    "asset_id": "string",
+}
+
 
 class ScenarioCreator:
     """
@@ -49,11 +82,39 @@ class ScenarioCreator:
     Optional args:
         write_building_energy_timeseries (bool): If True, write the hourly energy consumption for
             each building to a CSV
+        profile_cache (ProfileCache): Cache of energy consumption profiles shared between
+            Scenarios; defaults to the process-wide cache
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles. If provided, buildings
+            reference the matrix instead of holding consumption DataFrames
+        config_tables (ConfigTables): Study config tables shared between Scenarios; defaults to
+            loading the segment's tables for this Scenario only
+        time_axis (TimeAxis): Hourly time axis of the weather year shared by all buildings and
+            utility assets; defaults to the process-wide axis
+        building_workers (int): Number of worker threads loading energy profiles and, with a
+            profile matrix, worker processes populating buildings. If 1, buildings are created
+            serially
+        output_format (str): Format of the output tables: "csv" writes one CSV per table to the
+            scenario's outputs directory, "parquet" writes typed, compressed Parquet partitioned
+            by study and scenario
+        study_baseline (StudyBaseline): Baseline values of the study's buildings, computed once
+            and shared between Scenarios. If not provided, each Building computes its baseline
+        install_years (Dict[str, int]): Retrofit install years overriding the Scenario's parcel
+            measures table, by parcel ID
+        incentives (Incentives): Incentives already gathered for the study's zip code; gathered
+            for this Scenario if not provided
+        building_cache (Dict[tuple, Building]): Populated Buildings of this Scenario by
+            (parcel ID, retrofit install year), shared between runs of the Scenario that only vary
+            install years or the gas pipe intervention year. Buildings in the cache are reused
+            instead of populated again
 
     Attributes:
         street_segment (str): The ID of the street segment being simulated
         buildings (Dict[str, Building]): Dict of instantiated Building objects, mapped by parcel ID
         utility_network (UtilityNetwork): Instantiated UtilityNetwork object for the street segment
+        output_filepaths (List[str]): The output tables written by the simulation
+        output_tables (Dict[str, pd.DataFrame]): The output tables, if kept in memory
+        results (ScenarioResults): The output tables, Buildings, and utility network, if the
+            output tables are kept in memory
 
     Methods:
         create_scenario (None): Executes the simulation
@@ -69,7 +130,17 @@ class ScenarioCreator:
             parcels_table: dict,
             sim_settings_filepath: str,
             write_building_energy_timeseries: bool = False,
-            status_logging=None
+            status_logging=None,
+            profile_cache: ProfileCache = None,
+            profile_matrix: ProfileMatrix = None,
+            config_tables: ConfigTables = None,
+            time_axis: TimeAxis = None,
+            building_workers: int = 1,
+            output_format: str = OUTPUT_FORMAT_CSV,
+            study_baseline: StudyBaseline = None,
+            install_years: Dict[str, int] = None,
+            incentives: Incentives = None,
+            building_cache: Dict[tuple, Building] = None
     ):
         self.segment_name: str = segment_name
         self.study_zip: int = study_zip
@@ -80,34 +151,81 @@ class ScenarioCreator:
         self._sim_settings_filepath: str = sim_settings_filepath
         self.write_building_energy_timeseries: bool = write_building_energy_timeseries
         self.status_logging = status_logging
+        self._profile_cache: ProfileCache = (
+            profile_cache if profile_cache is not None else get_profile_cache()
+        )
+        self._profile_matrix: ProfileMatrix = profile_matrix
+        self._config_tables: ConfigTables = config_tables or ConfigTables(segment_name)
+        self._time_axis: TimeAxis = time_axis or get_time_axis()
+        self.building_workers: int = building_workers
+        self.output_format: str = output_format
+        self._study_baseline: StudyBaseline = study_baseline
+        self._install_years: Dict[str, int] = install_years or {}
+        self._building_cache: Dict[tuple, Building] = (
+            building_cache if building_cache is not None else {}
+        )
 
         self._sim_config: dict = {}
         self._outputs_path: str = ""
+        self._output_writer: OutputWriter = None
         self._years_vec: List[int] = []
         self._buildings_config: dict = {}
         self.parcel_scenario_table: dict = {}
 
         self.sim_name: str = ""
         self.street_segment: str = ""
-        self.incentives: Incentives = None
+        self.incentives: Incentives = incentives
         self.buildings: Dict[str, Building] = {}
         self.utility_network: UtilityNetwork = None
+        self.results: ScenarioResults = None
 
     def create_scenario(self):
-        self._sim_config = self._get_sim_settings()
-        self.street_segment = self._get_street_segment()
-        self.sim_name = self._get_sim_name()
-        self._outputs_path = self._set_outputs_path()
-        self._years_vec = self._get_years_vec()
-        self._status_update("Creating buildings...", 0.25)
-        self.parcel_scenario_table = self._get_parcel_scenario_table()
-        self.incentives = self._gather_incentives()
-        self._create_building()
-        self._status_update("Creating utility network...", 0.8)
-        self._create_utility_network()
-        self._write_outputs()
-        self._get_utility_network_outputs()
-        self._status_update("Simulation complete!", 1.0)
+        with listen_stages(self.status_logging), stage("create_scenario"):
+            with stage("scenario_inputs"):
+                self._sim_config = self._get_sim_settings()
+                self.street_segment = self._get_street_segment()
+                self.sim_name = self._get_sim_name()
+                self._outputs_path = self._set_outputs_path()
+                self._output_writer = OutputWriter(
+                    self.output_format, self._outputs_path, self.street_segment, self.sim_name
+                )
+                self._years_vec = self._get_years_vec()
+                self._status_update("Creating buildings...", 0.25)
+                self.parcel_scenario_table = self._get_parcel_scenario_table()
+            if not self.incentives:
+                with stage("gather_incentives"):
+                    self.incentives = self._gather_incentives()
+            with stage("populate_buildings"):
+                self._create_building()
+            self._status_update("Creating utility network...", 0.8)
+            self._create_utility_network()
+            with stage("write_outputs"):
+                self._write_outputs()
+            if self.output_format == OUTPUT_FORMAT_MEMORY:
+                self.results = self._get_results()
+            else:
+                with stage("utility_network_outputs"):
+                    self._get_utility_network_outputs()
+            self._status_update("Simulation complete!", 1.0)
+
+    @property
+    def output_filepaths(self) -> List[str]:
+        return self._output_writer.filepaths if self._output_writer else []
+
+    @property
+    def output_tables(self) -> Dict[str, pd.DataFrame]:
+        return self.results if self.results is not None else {}
+
+    def _get_results(self) -> ScenarioResults:
+        return ScenarioResults(
+            self.street_segment,
+            self.sim_name,
+            self._years_vec,
+            self._output_writer.tables,
+            self._output_writer.column_types,
+            buildings=self.buildings,
+            utility_network=self.utility_network
+        )
 
     def _get_sim_settings(self) -> dict:
         """
@@ -144,7 +262,7 @@ class ScenarioCreator:
             self.sim_name
         )
 
-        if not os.path.exists(outputs_filepath):
+        if self.output_format == OUTPUT_FORMAT_CSV and not os.path.exists(outputs_filepath):
             os.makedirs(outputs_filepath)
 
         return outputs_filepath
@@ -173,49 +291,111 @@ class ScenarioCreator:
         return incentives
 
     def _create_building(self) -> None:
-        parcels = self.parcel_table.keys()
-        num_buildings = len(parcels)
+        """
+        Create the Buildings of the Scenario, reusing Buildings in the building cache
+        """
+        all_buildings_params = [
+            self._get_building_params(building_id) for building_id in self.parcel_table.keys()
+        ]
+        buildings_params = [
+            i for i in all_buildings_params
+            if self._get_building_cache_key(i) not in self._building_cache
+        ]
+        if buildings_params:
+            self._populate_buildings(buildings_params)
+
+        for building_params in all_buildings_params:
+            building = self._building_cache[self._get_building_cache_key(building_params)]
+            self.buildings[building.building_id] = building
+
+    def _populate_buildings(self, buildings_params: List[dict]) -> None:
+        """
+        Populate Buildings and add them to the building cache
+        """
+        building_pool = BuildingPool(
+            self.building_workers,
+            self._sim_config,
+            self.incentives.incentives,
+            self._profile_cache,
+            self._config_tables,
+            self._time_axis,
+            profile_matrix=self._profile_matrix,
+            baseline=self._study_baseline
+        )
+        if self.building_workers > 1:
+            building_pool.load_profiles(buildings_params)
+
+        with stage("building_lifecycle"):
+            lifecycle = self._create_building_lifecycle(buildings_params)
+
+        num_buildings = len(buildings_params)
         building_num = 0
 
-        for building_id in parcels:
+        for building in building_pool.populate_buildings(buildings_params, lifecycle):
             building_num += 1
             self._status_update(
-                f"Creating building {building_num} of {num_buildings}",
+                f"Created building {building_num} of {num_buildings}",
                 (building_num / num_buildings) * 0.5 + 0.25
             )
 
-            building_params = self.parcel_table.get(building_id)
-            building_scenario_params = self.parcel_scenario_table.get(building_id)
+            if self.write_building_energy_timeseries:
+                building.write_building_energy_info()
 
-            building_params = {
-                "building_id": building_id,
-                "baseline_consumption_id": building_params.get("baseline_consumption_id"),
-                "retrofit_consumption_id": building_scenario_params.get("energy_profile_id"),
-                "load_scaling_factor": building_params.get("load_scaling_factor"),
-                "asset_install_year": building_params.get("install_year"),
-                "asset_replacement_year": building_scenario_params.get("install_year"),
-                "heating_fuel": building_params.get("heating_fuel"),
-                "retrofit_heating_fuel": building_scenario_params.get("heating_fuel"),
-                "existing_measures_cost_id": building_params.get("measure_costs_filename"),
-                "retrofit_measures_cost_id": self._sim_config.get("parcel_retrofit_measure_costs_filename"),
-                "hvac.end_use_retrofit_item": building_scenario_params.get("hvac"),
-                "domestic_hot_water.end_use_retrofit_item": building_scenario_params.get("domestic_hot_water"),
-                "clothes_dryer.end_use_retrofit_item": building_scenario_params.get("clothes_dryer"),
-                "stove.end_use_retrofit_item": building_scenario_params.get("stove"),
-            }
+            self._building_cache[self._get_building_cache_key(building.building_params)] = building
 
-            building = Building(
-                building_params,
-                self._sim_config,
-                self.incentives.incentives
-            )
+    @staticmethod
+    def _get_building_cache_key(building_params: dict) -> tuple:
+        return (building_params.get("building_id"), building_params.get("asset_replacement_year"))
 
-            building.populate_building()
+    def _get_building_params(self, building_id: str) -> dict:
+        """
+        Get the Building input parameters for a parcel
+        """
+        building_params = self.parcel_table.get(building_id)
+        building_scenario_params = self.parcel_scenario_table.get(building_id)
+
+        return {
+            "building_id": building_id,
+            "baseline_consumption_id": building_params.get("baseline_consumption_id"),
+            "retrofit_consumption_id": building_scenario_params.get("energy_profile_id"),
+            "load_scaling_factor": building_params.get("load_scaling_factor"),
+            "asset_install_year": building_params.get("install_year"),
+            "asset_replacement_year": self._install_years.get(
+                building_id, building_scenario_params.get("install_year")
+            ),
+            "heating_fuel": building_params.get("heating_fuel"),
+            "retrofit_heating_fuel": building_scenario_params.get("heating_fuel"),
+            "existing_measures_cost_id": building_params.get("measure_costs_filename"),
+            "retrofit_measures_cost_id": self._sim_config.get("parcel_retrofit_measure_costs_filename"),
+            "hvac.end_use_retrofit_item": building_scenario_params.get("hvac"),
+            "domestic_hot_water.end_use_retrofit_item": building_scenario_params.get("domestic_hot_water"),
+            "clothes_dryer.end_use_retrofit_item": building_scenario_params.get("clothes_dryer"),
+            "stove.end_use_retrofit_item": building_scenario_params.get("stove"),
+        }
 
-            if self.write_building_energy_timeseries:
-                building.write_building_energy_info()
+    def _create_building_lifecycle(self, buildings_params: List[dict]) -> BuildingLifecycle:
+        """
+        Compute the annual lifecycle arrays for all buildings at once
+        """
+        digests = {
+            key: [
+                Building.get_profile_digest(
+                    i.get(key), i.get("load_scaling_factor", 1), self._profile_cache
+                )
+                for i in buildings_params
+            ]
+            for key in ["baseline_consumption_id", "retrofit_consumption_id"]
+        }
 
-            self.buildings[building.building_id] = building
+        lifecycle = BuildingLifecycle(
+            buildings_params,
+            self._sim_config,
+            digests["baseline_consumption_id"],
+            digests["retrofit_consumption_id"],
+            self._config_tables
+        )
+        lifecycle.populate_lifecycle()
+        return lifecycle
 
     def _create_utility_network(self):
         """
@@ -225,7 +405,11 @@ class ScenarioCreator:
         utility_network_config_filepath = f"./config_files/{segment_id}/utility_network/"
 
         self.utility_network = UtilityNetwork(
-            utility_network_config_filepath, self._sim_config, self.buildings
+            utility_network_config_filepath,
+            self._sim_config,
+            self.buildings,
+            config_tables=self._config_tables,
+            time_axis=self._time_axis
         )
 
         self.utility_network.populate_utility_network()
@@ -236,492 +420,423 @@ class ScenarioCreator:
         """
         self._status_update("Writing outputs", 0.9)
 
-        years_vec = pd.Index(data=self._years_vec, name="year")
+        network = self.utility_network
+        ten = network.thermal_energy_network
 
         # ---Is Retrofit Vec---
-        all_dfs = []
+        table = self._new_output_table("is_retrofit", value_type="bool")
         for building_id, building in self.buildings.items():
-            df = pd.DataFrame({"year": years_vec, "is_retrofit": building._is_retrofit_vec})
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            all_dfs.append(df)
+            table.add_series(
+                building._is_retrofit_vec,
+                asset_id=building_id,
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE
+            )
 
-        for xmfr in self.utility_network.elec_transformers:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "is_retrofit": xmfr.is_replacement_vector
-            })
-            df.loc[:, "asset_id"] = xmfr.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_ELEC
-            df.loc[:, "asset_type"] = TYPE_ELEC_XMFR
-            all_dfs.append(df)
+        for xmfr in network.elec_transformers:
+            table.add_series(
+                xmfr.is_replacement_vector,
+                asset_id=xmfr.asset_id,
+                asset_domain=DOMAIN_ELEC,
+                asset_type=TYPE_ELEC_XMFR
+            )
 
-        for gas_service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "is_retrofit": gas_service.retrofit_vector
-            })
-            df.loc[:, "asset_id"] = gas_service.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            all_dfs.append(df)
+        for gas_service in network.gas_services:
+            table.add_series(
+                gas_service.retrofit_vector,
+                asset_id=gas_service.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE
+            )
 
-        for gas_main in self.utility_network.gas_mains:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "is_retrofit": gas_main.retrofit_vector
-            })
-            df.loc[:, "asset_id"] = gas_main.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            all_dfs.append(df)
+        for gas_main in network.gas_mains:
+            table.add_series(
+                gas_main.retrofit_vector,
+                asset_id=gas_main.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "is_retrofit_vec_table.csv"), index=False)
+        self._write_table(table, "is_retrofit_vec_table")
 
         # ---Retrofit year---
-        all_dfs = []
+        table = self._new_output_table("retrofit_year", value_type="bool")
         for building_id, building in self.buildings.items():
-            df = pd.DataFrame({"year": years_vec, "retrofit_year": building._retrofit_vec})
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            all_dfs.append(df)
+            table.add_series(
+                building._retrofit_vec,
+                asset_id=building_id,
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE
+            )
 
-        for xmfr in self.utility_network.elec_transformers:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_year": xmfr.retrofit_vector
-            })
-            df.loc[:, "asset_id"] = xmfr.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_ELEC
-            df.loc[:, "asset_type"] = TYPE_ELEC_XMFR
-            all_dfs.append(df)
+        for xmfr in network.elec_transformers:
+            table.add_series(
+                xmfr.retrofit_vector,
+                asset_id=xmfr.asset_id,
+                asset_domain=DOMAIN_ELEC,
+                asset_type=TYPE_ELEC_XMFR
+            )
 
-        for gas_service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_year": gas_service.replacement_vector
-            })
-            df.loc[:, "asset_id"] = gas_service.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            all_dfs.append(df)
+        for gas_service in network.gas_services:
+            table.add_series(
+                gas_service.replacement_vector,
+                asset_id=gas_service.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE
+            )
 
-        for gas_main in self.utility_network.gas_mains:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_year": gas_main.replacement_vector
-            })
-            df.loc[:, "asset_id"] = gas_main.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            all_dfs.append(df)
+        for gas_main in network.gas_mains:
+            table.add_series(
+                gas_main.replacement_vector,
+                asset_id=gas_main.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "retrofit_year.csv"), index=False)
+        self._write_table(table, "retrofit_year")
 
         # ---Retrofit cost---
-        all_dfs = []
+        table = self._new_output_table("retrofit_cost")
         for building_id, building in self.buildings.items():
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": building.retrofit_cost_gross
-            })
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_GROSS
-            all_dfs.append(df)
-
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": building.retrofit_incentive_vec
-            })
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_INCENTIVE
-            all_dfs.append(df)
-
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": building.retrofit_cost_net
-            })
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_NET
-            all_dfs.append(df)
-
-        for xmfr in self.utility_network.elec_transformers:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": xmfr.upgrade_cost
-            })
-            df.loc[:, "asset_id"] = xmfr.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_ELEC
-            df.loc[:, "asset_type"] = TYPE_ELEC_XMFR
-            all_dfs.append(df)
+            for cost_vec, asset_type in [
+                (building.retrofit_cost_gross, TYPE_BUILDING_GROSS),
+                (building.retrofit_incentive_vec, TYPE_BUILDING_INCENTIVE),
+                (building.retrofit_cost_net, TYPE_BUILDING_NET),
+            ]:
+                table.add_series(
+                    cost_vec,
+                    asset_id=building_id,
+                    asset_domain=DOMAIN_BUILDING,
+                    asset_type=asset_type
+                )
+
+        for xmfr in network.elec_transformers:
+            table.add_series(
+                xmfr.upgrade_cost,
+                asset_id=xmfr.asset_id,
+                asset_domain=DOMAIN_ELEC,
+                asset_type=TYPE_ELEC_XMFR
+            )
 
-        for gas_meter in self.utility_network.gas_meters:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": gas_meter.get_retrofit_cost()
-            })
-            df.loc[:, "asset_id"] = gas_meter.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_METER
-            all_dfs.append(df)
+        for gas_meter in network.gas_meters:
+            table.add_series(
+                gas_meter.get_retrofit_cost(),
+                asset_id=gas_meter.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_METER
+            )
 
-        for gas_service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": gas_service.get_install_cost()
-            })
-            df.loc[:, "asset_id"] = gas_service.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            all_dfs.append(df)
+        for gas_service in network.gas_services:
+            table.add_series(
+                gas_service.get_install_cost(),
+                asset_id=gas_service.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE
+            )
 
-        for gas_main in self.utility_network.gas_mains:
+        for gas_main in network.gas_mains:
             total_cost = (
                 np.array(gas_main.get_install_cost())
                 + np.array(gas_main.get_system_shutoff_cost())
-            ).tolist()
-
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": total_cost
-            })
-            df.loc[:, "asset_id"] = gas_main.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            all_dfs.append(df)
+            )
 
-        if self.utility_network.thermal_energy_network:
-            ten = self.utility_network.thermal_energy_network
-            df = pd.DataFrame({
-                "year": years_vec,
-                "retrofit_cost": ten.install_cost_vec
-            })
-            df.loc[:, "asset_id"] = ten.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
-            all_dfs.append(df)
+            table.add_series(
+                total_cost,
+                asset_id=gas_main.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN
+            )
+
+        if ten:
+            table.add_series(
+                ten.install_cost_vec,
+                asset_id=ten.asset_id,
+                asset_domain=DOMAIN_THERMAL,
+                asset_type=TYPE_THERMAL
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "retrofit_cost.csv"), index=False)
+        self._write_table(table, "retrofit_cost")
 
         # ---Book value---
-        all_dfs = []
+        table = self._new_output_table(
+            "book_val", ["asset_id", "existing_or_retrofit", "asset_domain", "asset_type"]
+        )
         for building_id, building in self.buildings.items():
             # ---Replacement asset book value---
-            df = pd.DataFrame({
-                "year": years_vec,
-                "book_val": building._get_retrofit_book_value_vec()
-            })
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "existing_or_retrofit"] = "retrofit"
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            all_dfs.append(df)
+            table.add_series(
+                building.retrofit_book_val_vec,
+                asset_id=building_id,
+                existing_or_retrofit="retrofit",
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE
+            )
 
             # ---Existing book val---
-            df = pd.DataFrame({
-                "year": years_vec,
-                "book_val": building._get_exising_book_val_vec()
-            })
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "existing_or_retrofit"] = "existing"
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            all_dfs.append(df)
+            table.add_series(
+                building.existing_book_val_vec,
+                asset_id=building_id,
+                existing_or_retrofit="existing",
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE
+            )
 
-        for gas_service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "book_val": gas_service.book_value
-            })
-            df.loc[:, "asset_id"] = gas_service.asset_id
-            df.loc[:, "existing_or_retrofit"] = "retrofit"
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            all_dfs.append(df)
+        for gas_service in network.gas_services:
+            table.add_series(
+                gas_service.book_value,
+                asset_id=gas_service.asset_id,
+                existing_or_retrofit="retrofit",
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE
+            )
 
-        for gas_main in self.utility_network.gas_mains:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "book_val": gas_main.book_value
-            })
-            df.loc[:, "asset_id"] = gas_main.asset_id
-            df.loc[:, "existing_or_retrofit"] = "retrofit"
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            all_dfs.append(df)
+        for gas_main in network.gas_mains:
+            table.add_series(
+                gas_main.book_value,
+                asset_id=gas_main.asset_id,
+                existing_or_retrofit="retrofit",
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN
+            )
 
-        if self.utility_network.thermal_energy_network:
-            ten = self.utility_network.thermal_energy_network
-            df = pd.DataFrame({
-                "year": years_vec,
-                "book_val": ten.book_value_vec
-            })
-            df.loc[:, "asset_id"] = ten.asset_id
-            # This flag doesn't really apply to TENs, but including for consistency
-            df.loc[:, "existing_or_retrofit"] = "retrofit"
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
-            all_dfs.append(df)
+        if ten:
+            table.add_series(
+                ten.book_value_vec,
+                asset_id=ten.asset_id,
+                # This flag doesn't really apply to TENs, but including for consistency
+                existing_or_retrofit="retrofit",
+                asset_domain=DOMAIN_THERMAL,
+                asset_type=TYPE_THERMAL
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "book_val.csv"), index=False)
+        self._write_table(table, "book_val")
 
         # ---Stranded val---
-        all_dfs = []
+        table = self._new_output_table(
+            "stranded_val", ["asset_id", "asset_domain", "asset_type", "existing_or_retrofit"]
+        )
         for building_id, building in self.buildings.items():
-            df = pd.DataFrame({
-                "year": years_vec,
-                "stranded_val": building._get_exising_stranded_val_vec()
-            })
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            df.loc[:, "existing_or_retrofit"] = "existing"
-            all_dfs.append(df)
+            table.add_series(
+                building.existing_stranded_val_vec,
+                asset_id=building_id,
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE,
+                existing_or_retrofit="existing"
+            )
 
-        for gas_service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "stranded_val": gas_service.stranded_value
-            })
-            df.loc[:, "asset_id"] = gas_service.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            df.loc[:, "existing_or_retrofit"] = "retrofit"
-            all_dfs.append(df)
+        for gas_service in network.gas_services:
+            table.add_series(
+                gas_service.stranded_value,
+                asset_id=gas_service.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE,
+                existing_or_retrofit="retrofit"
+            )
 
-        for gas_main in self.utility_network.gas_mains:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "stranded_val": gas_main.stranded_value
-            })
-            df.loc[:, "asset_id"] = gas_main.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            df.loc[:, "existing_or_retrofit"] = "retrofit"
-            all_dfs.append(df)
+        for gas_main in network.gas_mains:
+            table.add_series(
+                gas_main.stranded_value,
+                asset_id=gas_main.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN,
+                existing_or_retrofit="retrofit"
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "stranded_val.csv"), index=False)
+        self._write_table(table, "stranded_val")
 
         # ---Incentive data---
-        all_dfs = []
-        for bldg_id, bldg in self.buildings.items():
-            df = pd.DataFrame(bldg.calculated_incentives)
-            df.loc[:, "asset_id"] = bldg_id
-            all_dfs.append(df)
-
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "incentives.csv"), index=False)
+        self._output_writer.write_table(
+            self._get_incentives_table, "incentives", INCENTIVES_COLUMN_TYPES
+        )
 
         # ---Energy use---
-        building_energy_usage = {
-            building_id: building.annual_energy_by_fuel
-            for building_id, building in self.buildings.items()
-        }
-
-        all_dfs = []
-        for building_id, building_consumptions in building_energy_usage.items():
+        table = self._new_output_table("consumption", ENERGY_LABEL_COLS)
+        for building_id, building in self.buildings.items():
+            building_consumptions = building.annual_energy_by_fuel
             for fuel in FUELS:
-                df = pd.DataFrame({"year": years_vec, "consumption": building_consumptions[fuel]})
-                df.loc[:, "asset_id"] = building_id
-                df.loc[:, "energy_type"] = fuel
-                df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-                df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-                all_dfs.append(df)
-
-        xmfr_energy_usage = {
-            xmfr.asset_id: list(xmfr.annual_total_energy_use.values())
-            for xmfr in self.utility_network.elec_transformers
-        }
-
-        for asset_id, elec_consumption in xmfr_energy_usage.items():
-            df = pd.DataFrame({"year": years_vec, "consumption": elec_consumption})
-            df.loc[:, "asset_id"] = asset_id
-            df.loc[:, "energy_type"] = "electricity"
-            df.loc[:, "asset_domain"] = DOMAIN_ELEC
-            df.loc[:, "asset_type"] = TYPE_ELEC_XMFR
-            all_dfs.append(df)
-
-        thermal_network = self.utility_network.thermal_energy_network
-        if thermal_network:
-            df = pd.DataFrame({"year": years_vec, "consumption": thermal_network.annual_load_cooling})
-            df.loc[:, "asset_id"] = thermal_network.asset_id
-            df.loc[:, "energy_type"] = "thermal_cooling"
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
-            all_dfs.append(df)
-
-            df = pd.DataFrame({"year": years_vec, "consumption": thermal_network.annual_load_heating})
-            df.loc[:, "asset_id"] = thermal_network.asset_id
-            df.loc[:, "energy_type"] = "thermal_heating"
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
-            all_dfs.append(df)
+                table.add_series(
+                    building_consumptions[fuel],
+                    asset_id=building_id,
+                    energy_type=fuel,
+                    asset_domain=DOMAIN_BUILDING,
+                    asset_type=TYPE_BUILDING_AGGREGATE
+                )
+
+        for xmfr in network.elec_transformers:
+            table.add_series(
+                list(xmfr.annual_total_energy_use.values()),
+                asset_id=xmfr.asset_id,
+                energy_type="electricity",
+                asset_domain=DOMAIN_ELEC,
+                asset_type=TYPE_ELEC_XMFR
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "energy_consumption.csv"), index=False)
+        if ten:
+            for load, energy_type in [
+                (ten.annual_load_cooling, "thermal_cooling"),
+                (ten.annual_load_heating, "thermal_heating"),
+            ]:
+                table.add_series(
+                    load,
+                    asset_id=ten.asset_id,
+                    energy_type=energy_type,
+                    asset_domain=DOMAIN_THERMAL,
+                    asset_type=TYPE_THERMAL
+                )
+
+        self._write_table(table, "energy_consumption")
 
         # ---Peak energy use---
-        all_dfs = []
-        xmfr_peak = {
-            xmfr.asset_id: xmfr.annual_peak_energy_use
-            for xmfr in self.utility_network.elec_transformers
-        }
-
-        for asset_id, peak_consump in xmfr_peak.items():
-            df = pd.DataFrame({"year": years_vec, "peak_consump": peak_consump})
-            df.loc[:, "asset_id"] = asset_id
-            df.loc[:, "energy_type"] = "electricity"
-            df.loc[:, "asset_domain"] = DOMAIN_ELEC
-            df.loc[:, "asset_type"] = TYPE_ELEC_XMFR
-            all_dfs.append(df)
-
-        thermal_network = self.utility_network.thermal_energy_network
-        if thermal_network:
-            df = pd.DataFrame({"year": years_vec, "peak_consump": thermal_network.annual_peak_cooling})
-            df.loc[:, "asset_id"] = thermal_network.asset_id
-            df.loc[:, "energy_type"] = "thermal_cooling"
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
-            all_dfs.append(df)
-
-            df = pd.DataFrame({"year": years_vec, "peak_consump": thermal_network.annual_peak_heating})
-            df.loc[:, "asset_id"] = thermal_network.asset_id
-            df.loc[:, "energy_type"] = "thermal_heating"
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
-            all_dfs.append(df)
+        table = self._new_output_table("peak_consump", ENERGY_LABEL_COLS)
+        for xmfr in network.elec_transformers:
+            table.add_series(
+                xmfr.annual_peak_energy_use,
+                asset_id=xmfr.asset_id,
+                energy_type="electricity",
+                asset_domain=DOMAIN_ELEC,
+                asset_type=TYPE_ELEC_XMFR
+            )
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "peak_consump.csv"), index=False)
+        if ten:
+            for peak, energy_type in [
+                (ten.annual_peak_cooling, "thermal_cooling"),
+                (ten.annual_peak_heating, "thermal_heating"),
+            ]:
+                table.add_series(
+                    peak,
+                    asset_id=ten.asset_id,
+                    energy_type=energy_type,
+                    asset_domain=DOMAIN_THERMAL,
+                    asset_type=TYPE_THERMAL
+                )
+
+        self._write_table(table, "peak_consump")
 
         # ---Building utility costs---
-        building_util_costs = {
-            building_id: building._calc_building_utility_costs()
-            for building_id, building in self.buildings.items()
-        }
-
-        all_dfs = []
-        for building_id, costs in building_util_costs.items():
+        table = self._new_output_table("consumption_costs", ENERGY_LABEL_COLS)
+        for building_id, building in self.buildings.items():
+            costs = building.annual_utility_costs
             for fuel in FUELS:
-                df = pd.DataFrame({
-                    "year": years_vec,
-                    "consumption_costs": costs[fuel]
-                })
-                df.loc[:, "asset_id"] = building_id
-                df.loc[:, "energy_type"] = fuel
-                df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-                df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-                all_dfs.append(df)
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "consumption_costs.csv"), index=False)
+                table.add_series(
+                    costs[fuel],
+                    asset_id=building_id,
+                    energy_type=fuel,
+                    asset_domain=DOMAIN_BUILDING,
+                    asset_type=TYPE_BUILDING_AGGREGATE
+                )
+
+        self._write_table(table, "consumption_costs")
 
         # ---Building fuel---
-        all_dfs = []
+        table = self._new_output_table("fuel_type", value_type="string")
         for building_id, building in self.buildings.items():
-            df = pd.DataFrame({"year": years_vec, "fuel_type": building._fuel_type})
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            all_dfs.append(df)
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "fuel_type.csv"), index=False)
+            table.add_series(
+                building._fuel_type,
+                asset_id=building_id,
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE
+            )
+
+        self._write_table(table, "fuel_type")
 
         # ---Methane leaks---
-        all_dfs = []
+        table = self._new_output_table("leaks")
         # Building leaks
         for building_id, building in self.buildings.items():
-            df = pd.DataFrame({"year": years_vec, "leaks": building._methane_leaks})
-            df.loc[:, "asset_id"] = building_id
-            df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-            df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-            all_dfs.append(df)
+            table.add_series(
+                building._methane_leaks,
+                asset_id=building_id,
+                asset_domain=DOMAIN_BUILDING,
+                asset_type=TYPE_BUILDING_AGGREGATE
+            )
 
         # Gas service leaks
-        for service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "leaks": service.annual_total_leakage
-            })
-            df.loc[:, "asset_id"] = service.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            all_dfs.append(df)
+        for service in network.gas_services:
+            table.add_series(
+                service.annual_total_leakage,
+                asset_id=service.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE
+            )
 
         # Gas main leaks
-        for main in self.utility_network.gas_mains:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "leaks": main.annual_total_leakage
-            })
-            df.loc[:, "asset_id"] = main.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            all_dfs.append(df)
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "methane_leaks.csv"), index=False)
+        for main in network.gas_mains:
+            table.add_series(
+                main.annual_total_leakage,
+                asset_id=main.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN
+            )
+
+        self._write_table(table, "methane_leaks")
 
         # ---Combustion emissions---
-        all_dfs = []
+        table = self._new_output_table("consumption_emissions", ENERGY_LABEL_COLS)
         for building_id, building in self.buildings.items():
             for fuel in FUELS:
-                df = pd.DataFrame({
-                    "year": years_vec,
-                    "consumption_emissions": building._combustion_emissions[fuel]
-                })
-                df.loc[:, "asset_id"] = building_id
-                df.loc[:, "energy_type"] = fuel
-                df.loc[:, "asset_domain"] = DOMAIN_BUILDING
-                df.loc[:, "asset_type"] = TYPE_BUILDING_AGGREGATE
-                all_dfs.append(df)
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "consumption_emissions.csv"), index=False)
+                table.add_series(
+                    building._combustion_emissions[fuel],
+                    asset_id=building_id,
+                    energy_type=fuel,
+                    asset_domain=DOMAIN_BUILDING,
+                    asset_type=TYPE_BUILDING_AGGREGATE
+                )
 
+        self._write_table(table, "consumption_emissions")
 
         # ---O&M costs---
-        all_dfs = []
-        for gas_service in self.utility_network.gas_services:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "annual_operating_costs": gas_service.annual_operating_expenses
-            })
-            df.loc[:, "asset_id"] = gas_service.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_SERVICE
-            all_dfs.append(df)
+        table = self._new_output_table("annual_operating_costs")
+        for gas_service in network.gas_services:
+            table.add_series(
+                gas_service.annual_operating_expenses,
+                asset_id=gas_service.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_SERVICE
+            )
 
-        for gas_main in self.utility_network.gas_mains:
-            df = pd.DataFrame({
-                "year": years_vec,
-                "annual_operating_costs": gas_main.annual_operating_expenses
-            })
-            df.loc[:, "asset_id"] = gas_main.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_GAS
-            df.loc[:, "asset_type"] = TYPE_GAS_MAIN
-            all_dfs.append(df)
+        for gas_main in network.gas_mains:
+            table.add_series(
+                gas_main.annual_operating_expenses,
+                asset_id=gas_main.asset_id,
+                asset_domain=DOMAIN_GAS,
+                asset_type=TYPE_GAS_MAIN
+            )
 
-        if self.utility_network.thermal_energy_network:
-            ten = self.utility_network.thermal_energy_network
-            df = pd.DataFrame({
-                "year": years_vec,
-                "annual_operating_costs": ten.annual_om_vec
-            })
-            df.loc[:, "asset_id"] = ten.asset_id
-            df.loc[:, "asset_domain"] = DOMAIN_THERMAL
-            df.loc[:, "asset_type"] = TYPE_THERMAL
+        if ten:
+            table.add_series(
+                ten.annual_om_vec,
+                asset_id=ten.asset_id,
+                asset_domain=DOMAIN_THERMAL,
+                asset_type=TYPE_THERMAL
+            )
+
+        self._write_table(table, "operating_costs")
+
+    def _new_output_table(
+            self,
+            value_col: str,
+            label_cols: List[str] = None,
+            value_type: str = "float64"
+    ) -> OutputTable:
+        """
+        Create an empty asset x year output table; labelled by asset ID, domain, and type by default
+        """
+        return OutputTable(self._years_vec, value_col, label_cols or ASSET_LABEL_COLS, value_type)
+
+    def _write_table(self, table: OutputTable, table_name: str) -> None:
+        self._output_writer.write_table(table, table_name)
+
+    def _get_incentives_table(self) -> pd.DataFrame:
+        """
+        Incentives of every building. Not an asset x year table: the columns depend on each
+        building's incentives
+        """
+        all_dfs = []
+        for bldg_id, bldg in self.buildings.items():
+            df = pd.DataFrame(bldg.calculated_incentives)
+            df.loc[:, "asset_id"] = bldg_id
             all_dfs.append(df)
 
-        all_dfs = pd.concat(all_dfs)
-        all_dfs.to_csv(os.path.join(self._outputs_path, "operating_costs.csv"), index=False)
+        return pd.concat(all_dfs)
 
     def _get_utility_network_outputs(self):
         """
@@ -0,0 +1,493 @@
+"""
+Checks that the optimized paths of a scenario run give the same output tables as the reference
+path, and compares output tables within float tolerances
+"""
+import os
+import time
+from collections.abc import Mapping
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB, ProfileCache
+from segment_iat.scenario_creator.output_table import YEAR_COL
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.incentives import Incentives
+from segment_iat.utils.status import QuietStatus, report_status
+
+
+DEFAULT_RTOL = 1e-9
+DEFAULT_ATOL = 1e-9
+# Profiles in the matrix are float32, so values computed from hourly profiles (i.e. transformer
+# consumption and peaks) match the float64 reference to about 7 significant digits
+PROFILE_MATRIX_RTOL = 1e-6
+
+# Buildings compute their own baseline from per-profile DataFrames, one at a time. Output tables
+# and asset lifecycles are shared with the optimized paths; tests_integration checks this path
+# against golden outputs written before they were optimized
+REFERENCE_VARIANT = "reference"
+# The settings of each path, and its least relative tolerance. Optimized paths are the ones
+# run.py takes with the same options
+VARIANTS = {
+    REFERENCE_VARIANT: {
+        "study_baseline": False, "profile_matrix": False, "building_workers": False, "rtol": 0.0
+    },
+    "study_baseline": {
+        "study_baseline": True, "profile_matrix": False, "building_workers": False, "rtol": 0.0
+    },
+    "building_workers": {
+        "study_baseline": True, "profile_matrix": False, "building_workers": True, "rtol": 0.0
+    },
+    "profile_matrix": {
+        "study_baseline": True,
+        "profile_matrix": True,
+        "building_workers": False,
+        "rtol": PROFILE_MATRIX_RTOL,
+    },
+    "profile_matrix_workers": {
+        "study_baseline": True,
+        "profile_matrix": True,
+        "building_workers": True,
+        "rtol": PROFILE_MATRIX_RTOL,
+    },
+}
+DEFAULT_VARIANTS = [i for i in VARIANTS if i != REFERENCE_VARIANT]
+DEFAULT_BUILDING_WORKERS = 2
+
+# Columns locating a row of an output table, reported with the first differing row
+LOCATION_COLS = ["asset_id", "energy_type", "asset_type", YEAR_COL]
+
+
+class EquivalenceCheck:
+    """
+    Runs scenarios of a study on the reference path and on optimized paths, and compares every
+    output table of each optimized path against the reference. On the reference path, Buildings
+    compute their own baseline from per-profile DataFrames and are populated one at a time. The
+    optimized paths are the ones run.py takes: the shared study baseline, building workers, the
+    profile matrix, and the profile matrix with building worker processes. Every path gets its
+    own profile cache, so no path reads profiles parsed by another, but compiled profiles and
+    profile matrices on disk are shared. Tables are kept in memory
+
+    Args:
+        study (SegmentStudy): The study; it is loaded for each path as that path needs it
+        scenarios (List[str]): The scenario IDs
+
+    Optional Args:
+        variants (List[str]): The optimized paths to check (default: DEFAULT_VARIANTS)
+        building_workers (int): Number of building workers of paths with building workers
+        tolerances (Dict[str, Tuple[float, float]]): Relative and absolute float tolerances by
+            table name, i.e. {"peak_consump": (1e-6, 1e-3)}; other tables use rtol and atol
+        rtol (float): Relative float tolerance; paths with the float32 profile matrix use at
+            least PROFILE_MATRIX_RTOL
+        atol (float): Absolute float tolerance
+        incentives (Incentives): Incentives shared by every run; gathered once if not provided
+        profile_cache_mb (float): Memory budget in MB for energy profiles of each path
+        status_logging: Progress reporter with a progress(pct, msg) method; prints if not provided
+
+    Attributes:
+        scenarios (List[str]): The scenario IDs
+        variants (List[str]): The optimized paths to check
+        wall_s (Dict[str, float]): The wall time of each path, including loading the study
+        differences (List[dict]): The differences found, one per differing table of a scenario
+            run on an optimized path
+
+    Methods:
+        run (List[dict]): Run every path and compare the output tables
+    """
+    def __init__(
+            self,
+            study: SegmentStudy,
+            scenarios: List[str],
+            variants: List[str] = None,
+            building_workers: int = DEFAULT_BUILDING_WORKERS,
+            tolerances: Dict[str, Tuple[float, float]] = None,
+            rtol: float = DEFAULT_RTOL,
+            atol: float = DEFAULT_ATOL,
+            incentives: Incentives = None,
+            profile_cache_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+            status_logging=None
+    ):
+        variants = DEFAULT_VARIANTS if variants is None else variants
+        unknown_variants = [i for i in variants if i not in DEFAULT_VARIANTS]
+        if unknown_variants:
+            raise ValueError(
+                f"Unknown paths {unknown_variants}! Choose from {DEFAULT_VARIANTS}"
+            )
+        if building_workers < 2:
+            raise ValueError("Paths with building workers need at least 2 workers!")
+
+        self._study: SegmentStudy = study
+        self.scenarios: List[str] = scenarios
+        self.variants: List[str] = variants
+        self._building_workers: int = building_workers
+        self._tolerances: Dict[str, Tuple[float, float]] = tolerances or {}
+        self._rtol: float = rtol
+        self._atol: float = atol
+        self._incentives: Incentives = incentives
+        self._profile_cache_mb: float = profile_cache_mb
+        self.status_logging = status_logging
+
+        self.wall_s: Dict[str, float] = {}
+        self.differences: List[dict] = []
+
+    def run(self) -> List[dict]:
+        """
+        Run every scenario on the reference path, then on each optimized path, comparing each
+        scenario's output tables against the reference as soon as they are computed
+
+        Returns:
+            List[dict]: The differences found, each with the scenario, the path, and the table
+                (see compare_tables)
+        """
+        if self._incentives is None:
+            self._incentives = Incentives(self._study.zip_code)
+            self._incentives.gather_incentives()
+
+        self._status_update(f"Running {len(self.scenarios)} scenarios on the reference path", 0.0)
+        reference_results = self._run_variant(REFERENCE_VARIANT)
+
+        self.differences = []
+        for variant_num, variant in enumerate(self.variants):
+            self._status_update(
+                f"Running {len(self.scenarios)} scenarios on the {variant} path",
+                (variant_num + 1) / (len(self.variants) + 1)
+            )
+            variant_results = self._run_variant(variant)
+
+            for scenario in self.scenarios:
+                differences = compare_results(
+                    reference_results[scenario],
+                    variant_results[scenario],
+                    self._tolerances,
+                    max(self._rtol, VARIANTS[variant]["rtol"]),
+                    self._atol
+                )
+                self.differences.extend(
+                    {"scenario": scenario, "variant": variant, **i} for i in differences
+                )
+
+        num_checked = len(self.scenarios) * len(self.variants)
+        self._status_update(
+            f"Equivalence check complete! {len(self.differences)} differing tables in "
+            f"{num_checked} scenario runs",
+            1.0
+        )
+
+        return self.differences
+
+    def _run_variant(self, variant: str) -> Dict[str, Mapping]:
+        """
+        Load the study as a path needs it and run every scenario on the path
+
+        Returns:
+            Dict[str, Mapping]: The output tables of each scenario, by scenario ID
+        """
+        settings = VARIANTS[variant]
+        start_time = time.perf_counter()
+
+        profile_cache = ProfileCache(self._profile_cache_mb)
+        if settings["study_baseline"]:
+            # Matrix-mode buildings read consumption from the matrix, as in run.py
+            self._study.load_study(
+                profile_cache, baseline_timeseries=not settings["profile_matrix"]
+            )
+        else:
+            self._study.load_parcels()
+
+        profile_matrix = None
+        if settings["profile_matrix"]:
+            profile_matrix = self._study.build_profile_matrix(self.scenarios, profile_cache)
+            profile_cache.clear()
+
+        results = {}
+        for scenario in self.scenarios:
+            scenario_creator = self._study.create_scenario_creator(
+                scenario,
+                QuietStatus(),
+                study_baseline=settings["study_baseline"],
+                profile_cache=profile_cache,
+                profile_matrix=profile_matrix,
+                building_workers=self._building_workers if settings["building_workers"] else 1,
+                output_format=OUTPUT_FORMAT_MEMORY,
+                incentives=self._incentives
+            )
+            scenario_creator.create_scenario()
+            results[scenario] = scenario_creator.output_tables
+
+        self.wall_s[variant] = time.perf_counter() - start_time
+
+        return results
+
+    def _status_update(self, msg: str, pct: float) -> None:
+        """
+        Display a status message on the progress of the check
+        """
+        report_status(self.status_logging, msg, pct)
+
+
+def compare_tables(
+        reference_df: pd.DataFrame,
+        candidate_df: pd.DataFrame,
+        rtol: float = DEFAULT_RTOL,
+        atol: float = DEFAULT_ATOL
+) -> dict:
+    """
+    Compare two output tables row by row. Float columns are equal within the tolerances (as
+    np.isclose, with NaNs equal), every other column is equal exactly, and categorical columns
+    are compared by their values. Each column is compared as a whole array, so tables of
+    millions of rows are compared in well under a second
+
+    Args:
+        reference_df (pd.DataFrame): The reference table
+        candidate_df (pd.DataFrame): The table compared against the reference
+
+    Optional Args:
+        rtol (float): Relative float tolerance
+        atol (float): Absolute float tolerance
+
+    Returns:
+        dict: None if the tables are equal. Otherwise the difference: a message, and if rows
+            differ, the number of differing rows and the first differing row, with its location
+            (asset and year), the first differing column, and both values
+    """
+    if list(reference_df.columns) != list(candidate_df.columns):
+        return {
+            "message": f"Columns differ: {list(reference_df.columns)} in the reference, "
+            f"{list(candidate_df.columns)} in the candidate"
+        }
+
+    for col in reference_df.columns:
+        reference_dtype = reference_df[col].dtype
+        candidate_dtype = candidate_df[col].dtype
+        both_categorical = (
+            isinstance(reference_dtype, pd.CategoricalDtype)
+            and isinstance(candidate_dtype, pd.CategoricalDtype)
+        )
+        if reference_dtype != candidate_dtype and not both_categorical:
+            return {
+                "message": f"Column {col} is {reference_dtype} in the reference and "
+                f"{candidate_dtype} in the candidate"
+            }
+
+    num_rows = min(len(reference_df), len(candidate_df))
+    differing_cols = {
+        col: _get_differing_rows(
+            reference_df[col].iloc[:num_rows], candidate_df[col].iloc[:num_rows], rtol, atol
+        )
+        for col in reference_df.columns
+    }
+    differing_rows = np.zeros(num_rows, dtype=bool)
+    for differing in differing_cols.values():
+        differing_rows |= differing
+
+    if differing_rows.any():
+        row = int(np.argmax(differing_rows))
+        col = next(col for col, differing in differing_cols.items() if differing[row])
+        return {
+            "message": f"{int(differing_rows.sum())} of {len(reference_df)} rows differ",
+            "differing_rows": int(differing_rows.sum()),
+            "row": row,
+            "location": _get_location(reference_df, row),
+            "column": col,
+            "reference": _get_value(reference_df[col].iloc[row]),
+            "candidate": _get_value(candidate_df[col].iloc[row]),
+        }
+
+    if len(reference_df) != len(candidate_df):
+        longer_df = reference_df if len(reference_df) > len(candidate_df) else candidate_df
+        return {
+            "message": f"{len(reference_df)} rows in the reference and {len(candidate_df)} in "
+            f"the candidate; the first {num_rows} rows are equal",
+            "row": num_rows,
+            "location": _get_location(longer_df, num_rows),
+        }
+
+    return None
+
+
+def compare_results(
+        reference_tables: Mapping,
+        candidate_tables: Mapping,
+        tolerances: Dict[str, Tuple[float, float]] = None,
+        rtol: float = DEFAULT_RTOL,
+        atol: float = DEFAULT_ATOL
+) -> List[dict]:
+    """
+    Compare every output table of two runs
+
+    Args:
+        reference_tables (Mapping): The reference tables by table name, i.e. ScenarioResults
+        candidate_tables (Mapping): The tables compared against the reference, by table name
+
+    Optional Args:
+        tolerances (Dict[str, Tuple[float, float]]): Relative and absolute float tolerances by
+            table name; other tables use rtol and atol
+        rtol (float): Relative float tolerance
+        atol (float): Absolute float tolerance
+
+    Returns:
+        List[dict]: The difference of each differing or missing table, with its table name (see
+            compare_tables)
+    """
+    tolerances = tolerances or {}
+
+    differences = []
+    for table_name in reference_tables:
+        if table_name not in candidate_tables:
+            differences.append({"table": table_name, "message": "Missing from the candidate"})
+            continue
+
+        table_rtol, table_atol = tolerances.get(table_name, (rtol, atol))
+        difference = compare_tables(
+            reference_tables[table_name], candidate_tables[table_name], table_rtol, table_atol
+        )
+        if difference:
+            differences.append({"table": table_name, **difference})
+
+    differences.extend(
+        {"table": table_name, "message": "Missing from the reference"}
+        for table_name in candidate_tables
+        if table_name not in reference_tables
+    )
+
+    return differences
+
+
+def compare_output_dirs(
+        reference_path: str,
+        candidate_path: str,
+        tolerances: Dict[str, Tuple[float, float]] = None,
+        rtol: float = DEFAULT_RTOL,
+        atol: float = DEFAULT_ATOL
+) -> List[dict]:
+    """
+    Compare every CSV output table in two outputs directories, i.e. the outputs of a study before
+    and after a change. Tables are named by their path relative to the directory, without the
+    extension (i.e. "ex_gas/book_val"); tolerances apply to tables by their file name
+
+    Args:
+        reference_path (str): The reference outputs directory
+        candidate_path (str): The outputs directory compared against the reference
+
+    Optional Args:
+        tolerances (Dict[str, Tuple[float, float]]): Relative and absolute float tolerances by
+            table name (i.e. "book_val"); other tables use rtol and atol
+        rtol (float): Relative float tolerance
+        atol (float): Absolute float tolerance
+
+    Returns:
+        List[dict]: The difference of each differing or missing table, with its table name (see
+            compare_tables)
+    """
+    reference_filepaths = _get_csv_filepaths(reference_path)
+    candidate_filepaths = _get_csv_filepaths(candidate_path)
+
+    reference_tables = _LazyCsvTables(reference_filepaths)
+    candidate_tables = _LazyCsvTables(candidate_filepaths)
+    tolerances = {
+        table_name: tolerances[os.path.basename(table_name)]
+        for table_name in reference_filepaths
+        if os.path.basename(table_name) in (tolerances or {})
+    }
+
+    return compare_results(reference_tables, candidate_tables, tolerances, rtol, atol)
+
+
+def format_difference(difference: dict) -> str:
+    """
+    A one-line description of a difference, i.e. "[profile_matrix] ex_gas/book_val: 2 of 400
+    rows differ; first at row 41 (asset_id=EX_003, year=2026), book_val: 1200.0 in the reference,
+    1200.5 in the candidate"
+    """
+    description = "/".join(str(difference[i]) for i in ["scenario", "table"] if i in difference)
+    if "variant" in difference:
+        description = f"[{difference['variant']}] {description}"
+    description += f": {difference['message']}"
+
+    if "row" in difference:
+        location = ", ".join(f"{col}={value}" for col, value in difference["location"].items())
+        description += f"; first at row {difference['row']}"
+        if location:
+            description += f" ({location})"
+    if "column" in difference:
+        description += (
+            f", {difference['column']}: {difference['reference']!r} in the reference, "
+            f"{difference['candidate']!r} in the candidate"
+        )
+
+    return description
+
+
+def _get_differing_rows(
+        reference_values: pd.Series,
+        candidate_values: pd.Series,
+        rtol: float,
+        atol: float
+) -> np.ndarray:
+    """
+    Whether each row of a column differs
+    """
+    if isinstance(reference_values.dtype, pd.CategoricalDtype):
+        # Label columns built the same way have the same categories, so only codes are compared
+        if reference_values.cat.categories.equals(candidate_values.cat.categories):
+            return reference_values.cat.codes.to_numpy() != candidate_values.cat.codes.to_numpy()
+
+    reference_values = reference_values.to_numpy()
+    candidate_values = candidate_values.to_numpy()
+    if reference_values.dtype.kind == "f":
+        return ~np.isclose(
+            reference_values, candidate_values, rtol=rtol, atol=atol, equal_nan=True
+        )
+    if reference_values.dtype.kind != "O":
+        return reference_values != candidate_values
+
+    # Object columns hold strings, mixed values, and lists (i.e. incentive items), compared
+    # element by element; nulls of any kind are equal
+    equal = reference_values == candidate_values
+
+    return ~(equal | (pd.isna(reference_values) & pd.isna(candidate_values)))
+
+
+def _get_value(value):
+    """
+    A table value as a Python value, i.e. float instead of np.float64
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _get_location(df: pd.DataFrame, row: int) -> Dict[str, object]:
+    return {col: _get_value(df[col].iloc[row]) for col in LOCATION_COLS if col in df.columns}
+
+
+def _get_csv_filepaths(outputs_path: str) -> Dict[str, str]:
+    """
+    The CSV files under a directory, by their path relative to it without the extension
+    """
+    filepaths = {}
+    for dirpath, _, filenames in sorted(os.walk(outputs_path)):
+        for filename in sorted(filenames):
+            if filename.endswith(".csv"):
+                filepath = os.path.join(dirpath, filename)
+                table_name = os.path.relpath(filepath, outputs_path)[:-len(".csv")]
+                filepaths[table_name.replace(os.sep, "/")] = filepath
+
+    return filepaths
+
+
+class _LazyCsvTables(Mapping):
+    """
+    CSV tables by table name, read when they are compared
+    """
+    def __init__(self, filepaths: Dict[str, str]):
+        self._filepaths: Dict[str, str] = filepaths
+
+    def __getitem__(self, table_name: str) -> pd.DataFrame:
+        return pd.read_csv(self._filepaths[table_name])
+
+    def __iter__(self):
+        return iter(self._filepaths)
+
+    def __len__(self) -> int:
+        return len(self._filepaths)
@@ -0,0 +1,388 @@
+"""
+Searches gas pipe intervention strategies and years for the lowest cost or emissions of a scenario
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.scenario_creator.create_scenario import (
+    DOMAIN_BUILDING,
+    DOMAIN_GAS,
+    ScenarioCreator,
+    TYPE_BUILDING_GROSS,
+    TYPE_BUILDING_INCENTIVE,
+)
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.status import QuietStatus, report_status
+
+
+STRATEGY_REPLACE = "replace"
+STRATEGY_DECOMMISSION = "decommission"
+STRATEGIES = [STRATEGY_REPLACE, STRATEGY_DECOMMISSION]
+
+# Total present value cost in $, or total emissions in tCO2e
+OBJECTIVE_COST = "cost"
+OBJECTIVE_EMISSIONS = "emissions"
+OBJECTIVES = [OBJECTIVE_COST, OBJECTIVE_EMISSIONS]
+
+DEFAULT_DISCOUNT_RATE = 0.03
+# 100 year global warming potential of methane, in kgCO2e / kgCH4
+DEFAULT_METHANE_GWP = 28
+KG_PER_TONNE = 1000
+
+# Costs paid each year: capital costs, gas pipe O&M, and building utility bills. The gross cost and
+# incentive of building retrofits are left out since the net cost is already counted
+COST_TABLES = ["retrofit_cost", "operating_costs", "consumption_costs"]
+EXCLUDED_COST_TYPES = [TYPE_BUILDING_GROSS, TYPE_BUILDING_INCENTIVE]
+
+STRATEGY_COL = "gas_intervention"
+YEAR_COL = "gas_pipe_intervention_year"
+
+
+def get_annual_cost(
+        tables: Dict[str, pd.DataFrame],
+        years: List[int],
+        exclude_domain: str = None
+) -> np.ndarray:
+    """
+    Total cost of each year of a scenario's output tables
+
+    Args:
+        tables (Dict[str, pd.DataFrame]): The scenario's output tables, by table name
+        years (List[int]): The simulation years
+
+    Optional Args:
+        exclude_domain (str): Asset domain left out of the total, i.e. "gas_network"
+
+    Returns:
+        np.ndarray: The total cost of each year
+    """
+    annual_cost = np.zeros(len(years))
+    for table_name in COST_TABLES:
+        df = tables[table_name]
+        is_counted = ~(
+            (df["asset_domain"] == DOMAIN_BUILDING) & df["asset_type"].isin(EXCLUDED_COST_TYPES)
+        )
+        annual_cost += _sum_by_year(df[is_counted], years, exclude_domain)
+
+    return annual_cost
+
+
+def get_annual_emissions(
+        tables: Dict[str, pd.DataFrame],
+        years: List[int],
+        methane_gwp: float = DEFAULT_METHANE_GWP,
+        exclude_domain: str = None
+) -> np.ndarray:
+    """
+    Total emissions of each year of a scenario's output tables: combustion emissions and methane
+    leaks, in tCO2e
+
+    Args:
+        tables (Dict[str, pd.DataFrame]): The scenario's output tables, by table name
+        years (List[int]): The simulation years
+
+    Optional Args:
+        methane_gwp (float): Global warming potential of methane, in kgCO2e / kgCH4
+        exclude_domain (str): Asset domain left out of the total, i.e. "gas_network"
+
+    Returns:
+        np.ndarray: The total emissions of each year
+    """
+    combustion_emissions = _sum_by_year(tables["consumption_emissions"], years, exclude_domain)
+    methane_leaks = _sum_by_year(tables["methane_leaks"], years, exclude_domain)
+
+    return combustion_emissions + methane_leaks * methane_gwp / KG_PER_TONNE
+
+
+def _sum_by_year(df: pd.DataFrame, years: List[int], exclude_domain: str = None) -> np.ndarray:
+    if exclude_domain:
+        df = df[df["asset_domain"] != exclude_domain]
+
+    # Output tables are ordered year, value, labels
+    return (
+        df.groupby("year", observed=True)[df.columns[1]].sum()
+        .reindex(years, fill_value=0)
+        .to_numpy(dtype=float)
+    )
+
+
+class GasNetworkEvaluator:
+    """
+    Evaluates the total cost and emissions of a scenario for any gas pipe intervention strategy
+    and year. Only the gas meters, services, and mains depend on the intervention, so the buildings
+    and electric network of a created scenario are reused and only the gas network is rebuilt for
+    each evaluation; the cost and emissions of everything else are summed once. Evaluations are
+    cached by strategy and year
+
+    Args:
+        scenario_creator (ScenarioCreator): A created scenario, with its output tables in memory
+
+    Optional Args:
+        discount_rate (float): Annual discount rate of costs to the study start year
+        methane_gwp (float): Global warming potential of methane, in kgCO2e / kgCH4
+
+    Attributes:
+        years (List[int]): The simulation years
+        evaluations (Dict[Tuple[str, int], dict]): The evaluations, by strategy and year
+
+    Methods:
+        evaluate (dict): The total cost and emissions of a gas pipe intervention
+        is_feasible (bool): Whether a gas pipe intervention keeps gas service to buildings using gas
+    """
+    def __init__(
+            self,
+            scenario_creator: ScenarioCreator,
+            discount_rate: float = DEFAULT_DISCOUNT_RATE,
+            methane_gwp: float = DEFAULT_METHANE_GWP
+    ):
+        self._network = scenario_creator.utility_network
+        self._methane_gwp: float = methane_gwp
+        self.years: List[int] = self._network.years_vec
+        self.evaluations: Dict[Tuple[str, int], dict] = {}
+
+        self._discount_factors: np.ndarray = (
+            (1 + discount_rate) ** -(np.array(self.years, dtype=float) - self.years[0])
+        )
+
+        tables = scenario_creator.output_tables
+        self._other_annual_cost: np.ndarray = get_annual_cost(tables, self.years, DOMAIN_GAS)
+        self._other_annual_emissions: np.ndarray = get_annual_emissions(
+            tables, self.years, methane_gwp, DOMAIN_GAS
+        )
+
+        # The last year each building on the gas network uses gas
+        self._final_gas_year: int = max(
+            [
+                self.years[0] + idx
+                for meter in self._network.gas_meters if meter.building
+                for idx, fuel in enumerate(meter.building._fuel_type) if fuel == "GAS"
+            ],
+            default=self.years[0] - 1
+        )
+
+    def evaluate(self, strategy: str, year: int) -> dict:
+        """
+        The total cost and emissions of a gas pipe intervention
+
+        Args:
+            strategy (str): The gas intervention, replace or decommission
+            year (int): The gas pipe intervention year
+
+        Returns:
+            dict: The evaluation
+            {
+                gas_intervention (str): The gas intervention
+                gas_pipe_intervention_year (int): The gas pipe intervention year
+                feasible (bool): Whether every building keeps gas service while it uses gas
+                cost (float): Total present value cost, in $
+                emissions (float): Total emissions, in tCO2e
+            }
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown gas intervention {strategy}! Choose one of {STRATEGIES}")
+        if year not in self.years:
+            raise ValueError(f"Gas pipe intervention year {year} is outside of the study years!")
+
+        key = (strategy, year)
+        if key not in self.evaluations:
+            self.evaluations[key] = self._evaluate(strategy, year)
+
+        return self.evaluations[key]
+
+    def is_feasible(self, strategy: str, year: int) -> bool:
+        """
+        Whether a gas pipe intervention keeps gas service to every building while it uses gas.
+        Decommissioning the gas network before the last building stops using gas is infeasible
+        """
+        return strategy != STRATEGY_DECOMMISSION or year > self._final_gas_year
+
+    def _evaluate(self, strategy: str, year: int) -> dict:
+        self._network.populate_gas_network(
+            {"gas_intervention": strategy, "gas_pipe_intervention_year": year}
+        )
+
+        gas_annual_cost, gas_annual_leaks = self._get_gas_network_annuals()
+        annual_cost = self._other_annual_cost + gas_annual_cost
+        annual_emissions = (
+            self._other_annual_emissions + gas_annual_leaks * self._methane_gwp / KG_PER_TONNE
+        )
+
+        return {
+            STRATEGY_COL: strategy,
+            YEAR_COL: year,
+            "feasible": self.is_feasible(strategy, year),
+            OBJECTIVE_COST: float((annual_cost * self._discount_factors).sum()),
+            OBJECTIVE_EMISSIONS: float(annual_emissions.sum()),
+        }
+
+    def _get_gas_network_annuals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Annual cost and methane leaks of the gas network, as written to the output tables by
+        ScenarioCreator
+        """
+        network = self._network
+
+        cost_vecs = [i.get_retrofit_cost() for i in network.gas_meters]
+        for pipe in network.gas_services + network.gas_mains:
+            cost_vecs.append(pipe.get_install_cost())
+            cost_vecs.append(pipe.annual_operating_expenses)
+        cost_vecs += [i.get_system_shutoff_cost() for i in network.gas_mains]
+
+        leak_vecs = [
+            i.annual_total_leakage for i in network.gas_services + network.gas_mains
+            if i.annual_total_leakage
+        ]
+
+        annual_cost = np.zeros(len(self.years))
+        if cost_vecs:
+            annual_cost = np.sum(cost_vecs, axis=0)
+
+        annual_leaks = np.zeros(len(self.years))
+        if leak_vecs:
+            annual_leaks = np.sum(leak_vecs, axis=0)
+
+        return annual_cost, annual_leaks
+
+
+class GasInterventionOptimizer:
+    """
+    Finds the gas pipe intervention strategy and year of a scenario with the lowest total present
+    value cost or emissions. The scenario's buildings are populated once, and every candidate
+    intervention is then evaluated by a GasNetworkEvaluator, which takes milliseconds instead of a
+    full scenario run. Interventions that decommission the gas network while buildings still use
+    gas are infeasible and never chosen
+
+    Args:
+        study (SegmentStudy): The loaded study
+        scenario (str): The scenario ID; its measures set the buildings' retrofits
+
+    Optional Args:
+        objective (str): The objective to minimize, cost or emissions
+        strategies (List[str]): The gas interventions to search (default: replace and decommission)
+        years (List[int]): The gas pipe intervention years to search (default: every study year)
+        discount_rate (float): Annual discount rate of costs to the study start year
+        methane_gwp (float): Global warming potential of methane, in kgCO2e / kgCH4
+        profile_cache (ProfileCache): Cache of energy consumption profiles; defaults to the
+            process-wide cache
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+        status_logging: Progress reporter with a progress(pct, msg) method; prints if not provided
+
+    Attributes:
+        scenario (str): The scenario ID
+        objective (str): The objective to minimize
+        evaluator (GasNetworkEvaluator): The evaluator of the scenario
+
+    Methods:
+        run_optimizer (pd.DataFrame): Evaluate every candidate intervention
+        get_best (dict): The feasible intervention with the lowest objective
+    """
+    def __init__(
+            self,
+            study: SegmentStudy,
+            scenario: str,
+            objective: str = OBJECTIVE_COST,
+            strategies: List[str] = None,
+            years: List[int] = None,
+            discount_rate: float = DEFAULT_DISCOUNT_RATE,
+            methane_gwp: float = DEFAULT_METHANE_GWP,
+            profile_cache: ProfileCache = None,
+            profile_matrix: ProfileMatrix = None,
+            status_logging=None
+    ):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {objective}! Choose one of {OBJECTIVES}")
+        for strategy in strategies or []:
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown gas intervention {strategy}! Choose one of {STRATEGIES}")
+
+        self._study: SegmentStudy = study
+        self.scenario: str = scenario
+        self.objective: str = objective
+        self._strategies: List[str] = strategies or STRATEGIES
+        self._years: List[int] = years
+        self._discount_rate: float = discount_rate
+        self._methane_gwp: float = methane_gwp
+        self._profile_cache: ProfileCache = (
+            profile_cache if profile_cache is not None else get_profile_cache()
+        )
+        self._profile_matrix: ProfileMatrix = profile_matrix
+        self.status_logging = status_logging
+
+        self.evaluator: GasNetworkEvaluator = None
+        self._results: pd.DataFrame = None
+
+    def _create_evaluator(self) -> GasNetworkEvaluator:
+        """
+        Create the scenario once, at the study's gas pipe intervention year
+        """
+        scenario_creator = self._study.create_scenario_creator(
+            self.scenario,
+            QuietStatus(),
+            profile_cache=self._profile_cache,
+            profile_matrix=self._profile_matrix,
+            output_format=OUTPUT_FORMAT_MEMORY
+        )
+        scenario_creator.create_scenario()
+
+        return GasNetworkEvaluator(
+            scenario_creator, discount_rate=self._discount_rate, methane_gwp=self._methane_gwp
+        )
+
+    def run_optimizer(self) -> pd.DataFrame:
+        """
+        Evaluate every candidate gas pipe intervention
+
+        Returns:
+            pd.DataFrame: The strategy, year, feasibility, cost, and emissions of every candidate,
+                sorted from the best feasible candidate to the worst infeasible one
+        """
+        self._status_update("Creating scenario...", 0.0)
+        self.evaluator = self.evaluator or self._create_evaluator()
+
+        years = self._years or self.evaluator.years
+        candidates = [(strategy, year) for strategy in self._strategies for year in years]
+
+        self._status_update(f"Evaluating {len(candidates)} gas pipe interventions...", 0.5)
+        results = pd.DataFrame([
+            self.evaluator.evaluate(strategy, year) for strategy, year in candidates
+        ])
+        self._results = results.sort_values(
+            ["feasible", self.objective], ascending=[False, True], ignore_index=True
+        )
+
+        best = self.get_best()
+        if best:
+            self._status_update(
+                f"Best gas pipe intervention: {best[STRATEGY_COL]} in {best[YEAR_COL]} "
+                f"({self.objective} {best[self.objective]:,.2f})",
+                1.0
+            )
+        else:
+            self._status_update("No feasible gas pipe intervention!", 1.0)
+
+        return self._results
+
+    def get_best(self) -> dict:
+        """
+        The feasible gas pipe intervention with the lowest objective, or an empty dict if no
+        candidate is feasible
+        """
+        if self._results is None:
+            self.run_optimizer()
+
+        feasible = self._results[self._results["feasible"]]
+        if feasible.empty:
+            return {}
+
+        return feasible.iloc[0].to_dict()
+
+    def _status_update(self, msg: str, pct: float) -> None:
+        """
+        Display a status message on the progress of the optimizer
+        """
+        report_status(self.status_logging, msg, pct)
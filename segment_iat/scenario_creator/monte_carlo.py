@@ -0,0 +1,654 @@
+"""
+Monte Carlo uncertainty analysis of building costs and transformer upgrades for one scenario
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.buildings.study_baseline import END_USE_CLASSES
+from segment_iat.end_uses.building_end_uses.building_measure import DEFAULT_COST_YEAR
+from segment_iat.end_uses.utility_end_uses.elec_transformer import (
+    OVERLOADING_FACTOR,
+    POWER_FACTOR,
+    UNIT_UPGRADE_COST,
+)
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.scenario_creator.create_scenario import (
+    DOMAIN_BUILDING,
+    DOMAIN_ELEC,
+    TYPE_BUILDING_AGGREGATE,
+    TYPE_BUILDING_GROSS,
+    TYPE_BUILDING_INCENTIVE,
+    TYPE_BUILDING_NET,
+    TYPE_ELEC_XMFR,
+)
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.status import QuietStatus, report_status
+
+
+# Uncertain inputs. Costs are drawn per parcel and end use, install years per parcel, and the
+# transformer upgrade cost once per draw for all transformers
+PARAM_EXISTING_COST = "existing_cost"
+PARAM_RETROFIT_COST = "retrofit_cost"
+PARAM_INSTALL_YEAR = "install_year"
+PARAM_TRANSFORMER_UPGRADE_COST = "transformer_upgrade_cost"
+PARAMS = [
+    PARAM_EXISTING_COST,
+    PARAM_RETROFIT_COST,
+    PARAM_INSTALL_YEAR,
+    PARAM_TRANSFORMER_UPGRADE_COST,
+]
+
+# Distributions around the point estimate. The spread of costs is relative to the point estimate
+# (i.e. 0.2 is +/-20%); the spread of install years is in years
+DIST_FIXED = "fixed"
+DIST_NORMAL = "normal"
+DIST_UNIFORM = "uniform"
+DIST_TRIANGULAR = "triangular"
+DISTRIBUTIONS = [DIST_FIXED, DIST_NORMAL, DIST_UNIFORM, DIST_TRIANGULAR]
+
+DEFAULT_NUM_DRAWS = 10000
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_QUANTILES = [0.05, 0.5, 0.95]
+DEFAULT_QUANTILE_SAMPLE_SIZE = 2000
+
+# Largest (draws x parcels x end uses x years) array evaluated at once
+MAX_BATCH_ELEMENTS = 20_000_000
+
+ELEC_METER_COLUMN = "out.electricity.total.energy_consumption"
+
+
+def read_distributions(filepath: str) -> Dict[str, dict]:
+    """
+    Read the distributions of the uncertain inputs from a CSV with the columns parameter,
+    distribution, and spread, i.e. "retrofit_cost,triangular,0.2"
+
+    Args:
+        filepath (str): The distributions CSV
+
+    Returns:
+        Dict[str, dict]: The distribution and spread of each uncertain input
+    """
+    return pd.read_csv(filepath, index_col="parameter").to_dict(orient="index")
+
+
+def draw_values(
+        rng: np.random.Generator,
+        point: np.ndarray,
+        distribution: dict,
+        num_draws: int,
+        relative: bool = True
+) -> np.ndarray:
+    """
+    Draw values around point estimates
+
+    Args:
+        rng (np.random.Generator): The random number generator
+        point (np.ndarray): The point estimates
+        distribution (dict): The distribution ("fixed", "normal", "uniform", "triangular") and
+            spread. Normal spreads are standard deviations; uniform and triangular spreads are
+            half-widths
+        num_draws (int): The number of draws
+
+    Optional Args:
+        relative (bool): If True, the spread is relative to the point estimate, otherwise absolute
+
+    Returns:
+        np.ndarray: The draws, of shape (num_draws, *point.shape)
+    """
+    point = np.asarray(point, dtype=float)
+    name = distribution.get("distribution", DIST_FIXED)
+    spread = float(distribution.get("spread", 0))
+    size = (num_draws,) + point.shape
+
+    if name == DIST_FIXED or spread == 0:
+        return np.broadcast_to(point, size).copy()
+    elif name == DIST_NORMAL:
+        deviations = rng.normal(0, spread, size)
+    elif name == DIST_UNIFORM:
+        deviations = rng.uniform(-spread, spread, size)
+    elif name == DIST_TRIANGULAR:
+        deviations = rng.triangular(-spread, 0, spread, size)
+    else:
+        raise ValueError(f"Unknown distribution {name}! Choose one of {DISTRIBUTIONS}")
+
+    if relative:
+        return point * (1 + deviations)
+
+    return point + deviations
+
+
+class StreamingSummary:
+    """
+    Summarizes draws of an array without keeping every draw. The mean and standard deviation are
+    exact and updated batch by batch. Quantiles are computed from a uniform random sample of the
+    draws (reservoir sampling) of a fixed size, so memory does not grow with the number of draws;
+    they are exact while the number of draws does not exceed the sample size
+
+    Args:
+        shape (Tuple[int, ...]): The shape of one draw
+
+    Optional Args:
+        sample_size (int): The number of draws kept for quantiles
+        seed (int): Seed of the sampling
+
+    Attributes:
+        count (int): The number of draws summarized
+        mean (np.ndarray): The mean of the draws
+        std (np.ndarray): The sample standard deviation of the draws
+
+    Methods:
+        update (None): Add a batch of draws
+        get_quantiles (np.ndarray): The quantiles of the draws
+    """
+    def __init__(
+            self,
+            shape: Tuple[int, ...],
+            sample_size: int = DEFAULT_QUANTILE_SAMPLE_SIZE,
+            seed: int = None
+    ):
+        self.count: int = 0
+        self.mean: np.ndarray = np.zeros(shape)
+
+        self._sum_sq_dev: np.ndarray = np.zeros(shape)
+        self._sample: np.ndarray = np.zeros((sample_size,) + tuple(shape))
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+
+    @property
+    def std(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+
+        return np.sqrt(self._sum_sq_dev / (self.count - 1))
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a batch of draws
+
+        Args:
+            values (np.ndarray): The draws, of shape (draws, *shape)
+
+        Returns:
+            None
+        """
+        num_values = len(values)
+        if num_values == 0:
+            return
+
+        # Chan et al. pairwise update of the mean and sum of squared deviations
+        batch_mean = values.mean(axis=0)
+        delta = batch_mean - self.mean
+        total = self.count + num_values
+        self.mean = self.mean + delta * (num_values / total)
+        self._sum_sq_dev = (
+            self._sum_sq_dev
+            + ((values - batch_mean) ** 2).sum(axis=0)
+            + delta ** 2 * (self.count * num_values / total)
+        )
+
+        self._update_sample(values)
+        self.count = total
+
+    def _update_sample(self, values: np.ndarray) -> None:
+        """
+        Reservoir sampling (algorithm R) of a batch: the n-th draw replaces a random slot of the
+        sample with probability sample_size / n
+        """
+        sample_size = len(self._sample)
+        draw_nums = self.count + np.arange(len(values))
+
+        slots = np.where(
+            draw_nums < sample_size,
+            draw_nums,
+            (self._rng.random(len(values)) * (draw_nums + 1)).astype(np.int64)
+        )
+        is_kept = slots < sample_size
+
+        # When draws of a batch land in the same slot the last one wins, as if added one by one
+        slots, values = slots[is_kept][::-1], values[is_kept][::-1]
+        slots, first_idx = np.unique(slots, return_index=True)
+        self._sample[slots] = values[first_idx]
+
+    def get_quantiles(self, quantiles: List[float]) -> np.ndarray:
+        """
+        The quantiles of the draws
+
+        Args:
+            quantiles (List[float]): The quantiles, i.e. [0.05, 0.5, 0.95]
+
+        Returns:
+            np.ndarray: The quantiles, of shape (len(quantiles), *shape)
+        """
+        sample = self._sample[:min(self.count, len(self._sample))]
+        return np.quantile(sample, quantiles, axis=0)
+
+
+class MonteCarlo:
+    """
+    Monte Carlo analysis of a scenario whose measure costs, retrofit install years, and transformer
+    upgrade cost are uncertain. The scenario is run once at its point estimates to get the
+    buildings, end uses, incentives, and electric network; draws are then evaluated in batches as
+    (draws x parcels x end uses x years) arrays through the end use cost and book value logic, and
+    as (draws x transformers x years) arrays through the transformer upgrade logic, without
+    creating any objects per draw. Transformer peaks only depend on which connected buildings have
+    retrofit, so the peak of each retrofit state is computed once and looked up for every draw.
+    Outputs are summarized as they are drawn (see StreamingSummary)
+
+    Args:
+        study (SegmentStudy): The loaded study
+        scenario (str): The scenario ID
+        distributions (Dict[str, dict]): The distribution and spread of each uncertain input
+            (see PARAMS and read_distributions). Inputs without a distribution are fixed
+
+    Optional Args:
+        num_draws (int): The number of draws
+        batch_size (int): The maximum number of draws evaluated at once
+        seed (int): Seed of the draws
+        quantiles (List[float]): The quantiles to report
+        quantile_sample_size (int): The number of draws kept for quantiles
+        profile_cache (ProfileCache): Cache of energy consumption profiles; defaults to the
+            process-wide cache
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+        status_logging: Progress reporter with a progress(pct, msg) method; prints if not provided
+
+    Attributes:
+        scenario (str): The scenario ID
+        num_draws (int): The number of draws
+        quantiles (List[float]): The quantiles to report
+        summaries (Dict[tuple, StreamingSummary]): Summary of each output, by (table, asset
+            domain, asset type, existing or retrofit)
+
+    Methods:
+        run_monte_carlo (pd.DataFrame): Draw and summarize the outputs
+    """
+    def __init__(
+            self,
+            study: SegmentStudy,
+            scenario: str,
+            distributions: Dict[str, dict],
+            num_draws: int = DEFAULT_NUM_DRAWS,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            seed: int = None,
+            quantiles: List[float] = None,
+            quantile_sample_size: int = DEFAULT_QUANTILE_SAMPLE_SIZE,
+            profile_cache: ProfileCache = None,
+            profile_matrix: ProfileMatrix = None,
+            status_logging=None
+    ):
+        for param, distribution in distributions.items():
+            if param not in PARAMS:
+                raise ValueError(f"Unknown uncertain input {param}! Choose from {PARAMS}")
+            if distribution.get("distribution", DIST_FIXED) not in DISTRIBUTIONS:
+                raise ValueError(
+                    f"Unknown distribution {distribution.get('distribution')} for {param}! "
+                    f"Choose one of {DISTRIBUTIONS}"
+                )
+
+        self._study: SegmentStudy = study
+        self.scenario: str = scenario
+        self._distributions: Dict[str, dict] = distributions
+        self.num_draws: int = num_draws
+        self._batch_size: int = batch_size
+        self.quantiles: List[float] = quantiles or DEFAULT_QUANTILES
+        self._quantile_sample_size: int = quantile_sample_size
+        self._profile_cache: ProfileCache = (
+            profile_cache if profile_cache is not None else get_profile_cache()
+        )
+        self._profile_matrix: ProfileMatrix = profile_matrix
+        self.status_logging = status_logging
+
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+        self.summaries: Dict[tuple, StreamingSummary] = {}
+
+        self._years: np.ndarray = None
+        self._building_ids: List[str] = []
+        self._end_use_params: Dict[str, np.ndarray] = {}
+        self._incentives: List[dict] = []
+        self._transformers: List[dict] = []
+
+    def run_monte_carlo(self) -> pd.DataFrame:
+        """
+        Run the scenario at its point estimates, then draw and summarize the outputs
+
+        Returns:
+            pd.DataFrame: The mean, standard deviation, and quantiles of each output by asset and
+                year, with the output table, year, asset ID, domain, and type, and whether the
+                value is of the existing or retrofit asset
+        """
+        self._status_update("Running scenario at point estimates...", 0.0)
+        self._load_point_estimates()
+
+        batch_size = self._get_batch_size()
+        num_done = 0
+        while num_done < self.num_draws:
+            num_batch = min(batch_size, self.num_draws - num_done)
+            self._run_batch(num_batch)
+            num_done += num_batch
+
+            self._status_update(
+                f"Evaluated {num_done} of {self.num_draws} draws", num_done / self.num_draws
+            )
+
+        return self._get_summary_table()
+
+    def _status_update(self, msg: str, pct: float) -> None:
+        """
+        Display a status message on the progress of the analysis
+        """
+        report_status(self.status_logging, msg, pct)
+
+    def _load_point_estimates(self) -> None:
+        """
+        Run the scenario at its point estimates and read the inputs of the batched model from its
+        buildings and electric network
+        """
+        scenario_creator = self._study.create_scenario_creator(
+            self.scenario,
+            QuietStatus(),
+            profile_cache=self._profile_cache,
+            profile_matrix=self._profile_matrix,
+            output_format=OUTPUT_FORMAT_MEMORY
+        )
+        scenario_creator.create_scenario()
+
+        buildings = list(scenario_creator.buildings.values())
+        self._years = np.array(buildings[0].years_vec)
+        self._building_ids = [i.building_id for i in buildings]
+        self._incentives = scenario_creator.incentives.incentives
+        self._end_use_params = self._get_end_use_params(buildings)
+
+        building_idx = {building_id: idx for idx, building_id in enumerate(self._building_ids)}
+        self._transformers = [
+            self._get_transformer_params(xmfr, building_idx)
+            for xmfr in scenario_creator.utility_network.elec_transformers
+            if xmfr.connected_assets
+        ]
+
+    def _get_end_use_params(self, buildings: list) -> Dict[str, np.ndarray]:
+        """
+        Point estimates of the end use inputs, as (parcels x end uses) arrays
+        """
+        end_uses = list(END_USE_CLASSES)
+        params = [[i.get_end_use_params(end_use) for end_use in end_uses] for i in buildings]
+
+        def get_array(key: str, default=np.nan) -> np.ndarray:
+            return np.array([
+                [default if j.get(key) is None else j.get(key) for j in i] for i in params
+            ], dtype=float)
+
+        return {
+            "existing_install_cost": get_array("existing_install_cost", 0),
+            "existing_install_year": get_array("existing_install_year"),
+            "inflation_escalator": get_array("inflation_escalator"),
+            "cost_dollars_year": get_array("replacement_cost_dollars_year", DEFAULT_COST_YEAR),
+            "replacement_cost": get_array("replacement_cost", 0),
+            "replacement_year": np.array([
+                i.building_params.get("asset_replacement_year", self._years[-1]) for i in buildings
+            ], dtype=float),
+            "lifetime": np.array(
+                [[i.end_uses[end_use].lifetime for end_use in end_uses] for i in buildings],
+                dtype=float
+            ),
+            # Which incentives apply to the retrofit item of each end use
+            "incentive_applies": np.array([
+                [[j.get("end_use_retrofit_item") in k["items"] for j in i] for i in params]
+                for k in self._incentives
+            ], dtype=bool).reshape(len(self._incentives), len(buildings), len(end_uses)),
+        }
+
+    @staticmethod
+    def _get_transformer_params(xmfr, building_idx: Dict[str, int]) -> dict:
+        """
+        The meters behind a transformer and their hourly baseline and retrofit consumption
+        """
+        meters = []
+        assets = list(xmfr.connected_assets)
+        while assets:
+            asset = assets.pop(0)
+            if hasattr(asset, "building"):
+                meters.append(asset)
+            else:
+                assets = list(asset.connected_assets) + assets
+
+        return {
+            "asset_id": xmfr.asset_id,
+            "bank_kva": xmfr.bank_KVA,
+            "building_idx": np.array([building_idx[i.building.building_id] for i in meters]),
+            "meter_install_year": np.array([i.install_year for i in meters], dtype=float),
+            "meter_replacement_year": np.array([i.replacement_year for i in meters], dtype=float),
+            "baseline": np.array([
+                i.building.get_hourly_consumption(ELEC_METER_COLUMN).to_numpy() for i in meters
+            ]),
+            "retrofit": np.array([
+                i.building.get_hourly_consumption(ELEC_METER_COLUMN, retrofit=True).to_numpy()
+                for i in meters
+            ]),
+            "peaks": {},
+        }
+
+    def _get_batch_size(self) -> int:
+        num_parcels, num_end_uses = self._end_use_params["lifetime"].shape
+        elements_per_draw = max(num_parcels * num_end_uses * len(self._years), 1)
+        return max(1, min(self._batch_size, MAX_BATCH_ELEMENTS // elements_per_draw))
+
+    def _draw(self, param: str, point: np.ndarray, num_draws: int, relative: bool = True):
+        return draw_values(
+            self._rng, point, self._distributions.get(param, {}), num_draws, relative
+        )
+
+    def _run_batch(self, num_draws: int) -> None:
+        """
+        Draw the uncertain inputs for a batch and add the outputs to the summaries
+        """
+        params = self._end_use_params
+
+        existing_cost = np.maximum(
+            self._draw(PARAM_EXISTING_COST, params["existing_install_cost"], num_draws), 0
+        )
+        replacement_cost = np.maximum(
+            self._draw(PARAM_RETROFIT_COST, params["replacement_cost"], num_draws), 0
+        )
+        replacement_year = np.round(self._draw(
+            PARAM_INSTALL_YEAR, params["replacement_year"], num_draws, relative=False
+        ))
+        unit_upgrade_cost = np.maximum(
+            self._draw(PARAM_TRANSFORMER_UPGRADE_COST, UNIT_UPGRADE_COST, num_draws), 0
+        )
+
+        self._add_building_costs(existing_cost, replacement_cost, replacement_year)
+        self._add_transformer_upgrades(replacement_year, unit_upgrade_cost)
+
+    def _add_building_costs(
+            self,
+            existing_cost: np.ndarray,
+            replacement_cost: np.ndarray,
+            replacement_year: np.ndarray
+    ) -> None:
+        """
+        Vectorized end use costs and book values (see BuildingMeasure), summed over the end uses of
+        each building. Draws are (draws x parcels x end uses); outputs are (draws x parcels x years)
+        """
+        params = self._end_use_params
+        years = self._years[np.newaxis, np.newaxis, np.newaxis, :]
+        escalator = params["inflation_escalator"][np.newaxis, :, :]
+        cost_year = params["cost_dollars_year"][np.newaxis, :, :]
+        lifetime = params["lifetime"][np.newaxis, :, :]
+        install_year = params["existing_install_year"][np.newaxis, :, :]
+        end_use_year = replacement_year[:, :, np.newaxis]
+
+        # Existing asset
+        existing_adjusted_cost = existing_cost * (1 - escalator) ** (cost_year - install_year)
+        existing_depreciation = existing_adjusted_cost / lifetime
+        existing_book_val = np.maximum(
+            existing_adjusted_cost[..., np.newaxis]
+            - existing_depreciation[..., np.newaxis] * (years - install_year[..., np.newaxis]),
+            0
+        )
+        is_replacement = years == end_use_year[..., np.newaxis]
+        existing_stranded_val = existing_book_val * is_replacement
+
+        # Replacement asset
+        gross_cost = replacement_cost * (1 + escalator) ** (end_use_year - cost_year)
+        incentive = np.zeros_like(gross_cost)
+        for incentive_data, applies in zip(self._incentives, params["incentive_applies"]):
+            amount_data = incentive_data["amount"]
+
+            amount = np.zeros_like(gross_cost)
+            if amount_data["type"] == "dollar_amount":
+                amount = np.full_like(gross_cost, amount_data["number"])
+            elif amount_data["type"] == "percent":
+                amount = amount_data["number"] * gross_cost
+
+            amount = np.maximum(amount, amount_data.get("maximum", 0))
+            amount = amount * (end_use_year >= incentive_data["start_date"])
+            amount = amount * (end_use_year < incentive_data["end_date"])
+            incentive = incentive + amount * applies[np.newaxis, :, :]
+
+        net_cost = gross_cost - incentive
+        replacement_depreciation = net_cost / lifetime
+        replacement_book_val = np.where(
+            years >= end_use_year[..., np.newaxis],
+            np.maximum(
+                net_cost[..., np.newaxis]
+                - replacement_depreciation[..., np.newaxis]
+                * (years - end_use_year[..., np.newaxis]),
+                0
+            ),
+            0
+        )
+
+        for key, values in [
+            (("retrofit_cost", DOMAIN_BUILDING, TYPE_BUILDING_GROSS, None),
+             gross_cost[..., np.newaxis] * is_replacement),
+            (("retrofit_cost", DOMAIN_BUILDING, TYPE_BUILDING_INCENTIVE, None),
+             incentive[..., np.newaxis] * is_replacement),
+            (("retrofit_cost", DOMAIN_BUILDING, TYPE_BUILDING_NET, None),
+             net_cost[..., np.newaxis] * is_replacement),
+            (("book_val", DOMAIN_BUILDING, TYPE_BUILDING_AGGREGATE, "retrofit"),
+             replacement_book_val),
+            (("book_val", DOMAIN_BUILDING, TYPE_BUILDING_AGGREGATE, "existing"),
+             existing_book_val),
+            (("stranded_val", DOMAIN_BUILDING, TYPE_BUILDING_AGGREGATE, "existing"),
+             existing_stranded_val),
+        ]:
+            self._add_summary(key, values.sum(axis=2))
+
+    def _add_transformer_upgrades(
+            self,
+            replacement_year: np.ndarray,
+            unit_upgrade_cost: np.ndarray
+    ) -> None:
+        """
+        Vectorized transformer peaks and upgrades (see ElecTransformer), as (draws x transformers x
+        years) arrays
+        """
+        if not self._transformers:
+            return
+
+        num_draws = len(replacement_year)
+        peaks = np.array([
+            self._get_transformer_peaks(xmfr, replacement_year) for xmfr in self._transformers
+        ]).transpose(1, 0, 2)
+        bank_kva = np.array([i["bank_kva"] for i in self._transformers], dtype=float)
+        capacity = bank_kva[np.newaxis, :] * POWER_FACTOR * OVERLOADING_FACTOR
+
+        # Upgrades add one bank at a time while the peak exceeds the upgraded capacity, and stop
+        # after the 11th upgrade of each year once more than 10 have been made
+        upgrades = np.zeros(peaks.shape)
+        total_upgrades = np.zeros((num_draws, len(self._transformers)))
+        for year_idx in range(len(self._years)):
+            load = peaks[:, :, year_idx]
+            required = np.maximum(np.ceil(load / capacity) - 1, 0)
+            required = np.where(load > (required + 1) * capacity, required + 1, required)
+            required = np.where((required > 0) & (load <= required * capacity), required - 1, required)
+
+            num_upgrades = np.where(
+                total_upgrades > 10,
+                load > (total_upgrades + 1) * capacity,
+                np.minimum(np.maximum(required - total_upgrades, 0), 11 - total_upgrades)
+            )
+            upgrades[:, :, year_idx] = num_upgrades
+            total_upgrades = total_upgrades + num_upgrades
+
+        self._add_summary(
+            ("retrofit_cost", DOMAIN_ELEC, TYPE_ELEC_XMFR, None),
+            upgrades * unit_upgrade_cost[:, np.newaxis, np.newaxis]
+        )
+        self._add_summary(("peak_consump", DOMAIN_ELEC, TYPE_ELEC_XMFR, None), peaks)
+
+    def _get_transformer_peaks(self, xmfr: dict, replacement_year: np.ndarray) -> np.ndarray:
+        """
+        Annual peak load of a transformer for each draw, as a (draws x years) array. A meter reads
+        the retrofit consumption outside of its building's operational years; the peak of each
+        combination of retrofit meters is computed once and cached across batches
+        """
+        num_draws = len(replacement_year)
+        meter_replacement_year = replacement_year[:, xmfr["building_idx"]]
+        meter_replacement_year = np.where(
+            np.isnan(meter_replacement_year),
+            xmfr["meter_replacement_year"][np.newaxis, :],
+            meter_replacement_year
+        )
+
+        years = self._years[np.newaxis, :, np.newaxis]
+        is_operational = (
+            (xmfr["meter_install_year"][np.newaxis, np.newaxis, :] <= years)
+            & (meter_replacement_year[:, np.newaxis, :] > years)
+        )
+        states = np.packbits(~is_operational, axis=2).reshape(num_draws * len(self._years), -1)
+        unique_states, state_idx = np.unique(states, axis=0, return_inverse=True)
+
+        state_peaks = np.empty(len(unique_states))
+        for idx, state in enumerate(unique_states):
+            state_key = state.tobytes()
+            if state_key not in xmfr["peaks"]:
+                is_retrofit = np.unpackbits(state)[:len(xmfr["building_idx"])].astype(bool)
+                load = np.where(
+                    is_retrofit[:, np.newaxis], xmfr["retrofit"], xmfr["baseline"]
+                ).sum(axis=0)
+                xmfr["peaks"][state_key] = load.max()
+            state_peaks[idx] = xmfr["peaks"][state_key]
+
+        return state_peaks[state_idx.ravel()].reshape(num_draws, len(self._years))
+
+    def _add_summary(self, key: tuple, values: np.ndarray) -> None:
+        if key not in self.summaries:
+            self.summaries[key] = StreamingSummary(
+                values.shape[1:],
+                self._quantile_sample_size,
+                seed=self._rng.integers(2 ** 32)
+            )
+
+        self.summaries[key].update(values)
+
+    def _get_summary_table(self) -> pd.DataFrame:
+        """
+        One row per output, asset, and year with the mean, standard deviation, and quantiles
+        """
+        asset_ids = {
+            DOMAIN_BUILDING: self._building_ids,
+            DOMAIN_ELEC: [i["asset_id"] for i in self._transformers],
+        }
+
+        summary_dfs = []
+        for (table, domain, asset_type, existing_or_retrofit), summary in self.summaries.items():
+            num_assets, num_years = summary.mean.shape
+            summary_df = pd.DataFrame({
+                "table": table,
+                "year": np.tile(self._years, num_assets),
+                "asset_id": np.repeat(asset_ids[domain], num_years),
+                "asset_domain": domain,
+                "asset_type": asset_type,
+                "existing_or_retrofit": existing_or_retrofit,
+                "mean": summary.mean.ravel(),
+                "std": summary.std.ravel(),
+            })
+            for quantile, values in zip(self.quantiles, summary.get_quantiles(self.quantiles)):
+                summary_df[f"q{quantile:g}"] = values.ravel()
+
+            summary_dfs.append(summary_df)
+
+        return pd.concat(summary_dfs, ignore_index=True)
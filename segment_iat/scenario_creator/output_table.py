@@ -0,0 +1,164 @@
+"""
+Builder for the long-format (asset x year) output tables of a scenario
+"""
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+YEAR_COL = "year"
+
+
+class OutputTable:
+    """
+    A long-format output table with one row per asset and simulation year. Series are collected
+    per asset and the table is assembled once: values are filled into one preallocated
+    (assets x years) array and label columns are categorical, so the table is built with a single
+    DataFrame constructor call. Values keep the dtype that concatenating one DataFrame per series
+    would give them, so written CSVs are unchanged
+
+    Args:
+        years_vec (List[int]): List of simulation years
+        value_col (str): The name of the value column
+        label_cols (List[str]): The label columns (i.e. asset_id, asset_type), in output order
+
+    Optional Args:
+        value_type (str): The type of the value column in typed (Parquet) outputs
+
+    Attributes:
+        years_vec (List[int]): List of simulation years
+        value_col (str): The name of the value column
+        label_cols (List[str]): The label columns, in output order
+        value_type (str): The type of the value column in typed outputs
+        column_types (Dict[str, str]): The type of each column in typed outputs
+
+    Methods:
+        add_series (None): Add the annual values of one asset
+        to_frame (pd.DataFrame): Assemble the table
+        to_array (Tuple[np.ndarray, pd.DataFrame]): The values as an (assets x years) array
+    """
+    def __init__(
+            self,
+            years_vec: List[int],
+            value_col: str,
+            label_cols: List[str],
+            value_type: str = "float64"
+    ):
+        self.years_vec: List[int] = years_vec
+        self.value_col: str = value_col
+        self.label_cols: List[str] = label_cols
+        self.value_type: str = value_type
+
+        self._values: List[np.ndarray] = []
+        self._labels: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._values) * len(self.years_vec)
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        return {
+            YEAR_COL: "int64",
+            self.value_col: self.value_type,
+            **{col: "string" for col in self.label_cols}
+        }
+
+    def add_series(self, values: List, **labels: Hashable) -> None:
+        """
+        Add the annual values of one asset, with one label per label column
+
+        Args:
+            values (List): The value for each simulation year
+            labels (Hashable): The label of each label column, i.e. asset_id="EX_001"
+
+        Returns:
+            None
+        """
+        values = np.asarray(values)
+        if len(values) != len(self.years_vec):
+            raise ValueError(
+                f"Series for {labels} has {len(values)} values; expected {len(self.years_vec)}"
+            )
+
+        self._values.append(values)
+        self._labels.append(labels)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Assemble the table, with series in the order they were added
+
+        Args:
+            None
+
+        Returns:
+            pd.DataFrame: The long-format table
+        """
+        num_series = len(self._values)
+        data = {
+            YEAR_COL: np.tile(np.asarray(self.years_vec, dtype=np.int64), num_series),
+            self.value_col: self._get_values(),
+        }
+
+        for col in self.label_cols:
+            data[col] = self._get_label_column(col)
+
+        return pd.DataFrame(data, columns=[YEAR_COL, self.value_col] + self.label_cols)
+
+    def to_array(self) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        The values as an (assets x years) array, without assembling the long-format table
+
+        Args:
+            None
+
+        Returns:
+            Tuple[np.ndarray, pd.DataFrame]: The values, with one row per series in the order they
+                were added, and the labels of each series
+        """
+        values = self._get_values().reshape(len(self._values), len(self.years_vec))
+        labels = pd.DataFrame(self._labels, columns=self.label_cols)
+
+        return values, labels
+
+    def _get_values(self) -> np.ndarray:
+        """
+        Fill the values of every series into one array, with the dtype and values pandas gives
+        the value column when concatenating one DataFrame per series. Numeric series (or only
+        booleans) are promoted as numpy promotes them, and strings and other objects are kept as
+        objects. How booleans or objects mixed with numbers are promoted differs between pandas
+        versions, so those values are concatenated by the installed pandas itself
+        """
+        num_years = len(self.years_vec)
+        kinds = {series_values.dtype.kind for series_values in self._values}
+        numeric_kinds = {"i", "u", "f"}
+
+        if kinds and (kinds <= numeric_kinds or kinds == {"b"}):
+            dtype = np.result_type(*self._values)
+        elif not kinds & (numeric_kinds | {"b"}):
+            dtype = np.dtype(object)
+        else:
+            return pd.concat(
+                [pd.DataFrame({self.value_col: i}) for i in self._values], ignore_index=True
+            )[self.value_col].to_numpy()
+
+        values = np.empty(len(self), dtype=dtype)
+        for idx, series_values in enumerate(self._values):
+            values[idx * num_years:(idx + 1) * num_years] = series_values
+
+        return values
+
+    def _get_label_column(self, col: str) -> pd.Categorical:
+        """
+        Categorical label column; categories are in order of first appearance
+        """
+        labels = [i.get(col) for i in self._labels]
+        categories = list(dict.fromkeys(i for i in labels if not pd.isna(i)))
+        category_codes = {category: code for code, category in enumerate(categories)}
+
+        codes = np.repeat(
+            np.array([-1 if pd.isna(i) else category_codes[i] for i in labels], dtype=np.int32),
+            len(self.years_vec)
+        )
+
+        return pd.Categorical.from_codes(codes, categories=categories)
@@ -0,0 +1,231 @@
+"""
+Writes scenario output tables as CSVs or as a Parquet dataset partitioned by study and scenario,
+or keeps them in memory
+"""
+import glob
+import importlib.util
+import os
+from typing import Callable, Dict, List, Union
+
+import pandas as pd
+
+from segment_iat.scenario_creator.output_table import OutputTable
+from segment_iat.utils.run_defaults import (
+    OUTPUT_FORMAT_CSV,
+    OUTPUT_FORMAT_MEMORY,
+    OUTPUT_FORMAT_PARQUET,
+    OUTPUT_FORMATS,
+    OUTPUTS_BASEPATH
+)
+
+
+# Parquet outputs: <outputs>/parquet/<table>/study=<segment>/scenario=<scenario>/part-0.parquet
+PARQUET_DIRNAME = "parquet"
+PARQUET_FILENAME = "part-0.parquet"
+PARQUET_COMPRESSION = "zstd"
+STUDY_PARTITION = "study"
+SCENARIO_PARTITION = "scenario"
+METADATA_FILENAME = "_metadata"
+
+
+class OutputWriter:
+    """
+    Writes the output tables of one scenario. CSVs are written to the scenario's outputs
+    directory. Parquet tables are typed and compressed, and each table is one dataset under
+    <outputs>/parquet/<table> with a hive-style study=<segment>/scenario=<scenario> partition
+    per scenario, so the scenarios of a table can be combined without reading their data
+    (see write_dataset_metadata). In memory nothing is written, and tables are kept as they were
+    built so they are only assembled if they are read (see ScenarioResults)
+
+    Args:
+        output_format (str): The output format; one of OUTPUT_FORMATS or OUTPUT_FORMAT_MEMORY
+        outputs_path (str): The CSV outputs directory of the scenario
+        segment (str): The ID of the street segment being simulated
+        scenario (str): The name of the scenario
+
+    Optional Args:
+        outputs_basepath (str): The root outputs directory, holding the Parquet datasets
+
+    Attributes:
+        output_format (str): The output format
+        filepaths (List[str]): The files written so far
+        tables (Dict[str, Union[OutputTable, Callable, pd.DataFrame]]): The tables kept in memory,
+            by table name: OutputTables, functions returning the DataFrame, or DataFrames
+        column_types (Dict[str, Dict[str, str]]): The column types of the tables kept in memory
+
+    Methods:
+        write (None): Write an output table
+        write_table (None): Write an output table that is assembled when it is written
+    """
+    def __init__(
+            self,
+            output_format: str,
+            outputs_path: str,
+            segment: str,
+            scenario: str,
+            outputs_basepath: str = OUTPUTS_BASEPATH
+    ):
+        if output_format not in OUTPUT_FORMATS + [OUTPUT_FORMAT_MEMORY]:
+            raise ValueError(
+                f"Unknown output format {output_format}! Choose one of {OUTPUT_FORMATS}"
+            )
+
+        if output_format == OUTPUT_FORMAT_PARQUET:
+            # Fail before the scenario is simulated if the Parquet writer is not installed
+            if importlib.util.find_spec("pyarrow") is None:
+                raise ImportError(
+                    f"The {OUTPUT_FORMAT_PARQUET} output format needs pyarrow; install it with "
+                    "pip install pyarrow"
+                )
+
+        self.output_format: str = output_format
+        self._outputs_path: str = outputs_path
+        self._segment: str = segment
+        self._scenario: str = scenario
+        self._outputs_basepath: str = outputs_basepath
+
+        self.filepaths: List[str] = []
+        self.tables: Dict[str, Union[OutputTable, Callable, pd.DataFrame]] = {}
+        self.column_types: Dict[str, Dict[str, str]] = {}
+
+    def write(self, df: pd.DataFrame, table_name: str, column_types: Dict[str, str]) -> None:
+        """
+        Write an output table
+
+        Args:
+            df (pd.DataFrame): The output table
+            table_name (str): The name of the table, i.e. "book_val"
+            column_types (Dict[str, str]): The Parquet type of each column (see get_arrow_type).
+                Columns missing from df are written as nulls
+
+        Returns:
+            None
+        """
+        if self.output_format == OUTPUT_FORMAT_MEMORY:
+            self.tables[table_name] = df
+            self.column_types[table_name] = column_types
+            return
+
+        if self.output_format == OUTPUT_FORMAT_CSV:
+            filepath = os.path.join(self._outputs_path, f"{table_name}.csv")
+            df.to_csv(filepath, index=False)
+            self.filepaths.append(filepath)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        partition_path = os.path.join(
+            get_dataset_path(table_name, self._outputs_basepath),
+            f"{STUDY_PARTITION}={self._segment}",
+            f"{SCENARIO_PARTITION}={self._scenario}"
+        )
+        os.makedirs(partition_path, exist_ok=True)
+
+        # Every scenario is written with the same schema, so the datasets can be combined
+        # from their file metadata alone
+        schema = pa.schema([
+            (col, get_arrow_type(col_type)) for col, col_type in column_types.items()
+        ])
+        df = df.reindex(columns=schema.names)
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+
+        filepath = os.path.join(partition_path, PARQUET_FILENAME)
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        pq.write_table(table, filepath, compression=PARQUET_COMPRESSION)
+        self.filepaths.append(filepath)
+
+    def write_table(
+            self,
+            table: Union[OutputTable, Callable[[], pd.DataFrame]],
+            table_name: str,
+            column_types: Dict[str, str] = None
+    ) -> None:
+        """
+        Write an output table that is assembled when it is written. In memory, the table is kept
+        unassembled
+
+        Args:
+            table (Union[OutputTable, Callable[[], pd.DataFrame]]): The OutputTable, or a function
+                returning the output table
+            table_name (str): The name of the table, i.e. "book_val"
+
+        Optional Args:
+            column_types (Dict[str, str]): The Parquet type of each column (default: the
+                OutputTable's column types)
+
+        Returns:
+            None
+        """
+        column_types = column_types or table.column_types
+
+        if self.output_format == OUTPUT_FORMAT_MEMORY:
+            self.tables[table_name] = table
+            self.column_types[table_name] = column_types
+            return
+
+        df = table.to_frame() if isinstance(table, OutputTable) else table()
+        self.write(df, table_name, column_types)
+
+
+def get_arrow_type(col_type: str):
+    """
+    The pyarrow type of a column type name, i.e. "float64" or "list<string>"
+    """
+    import pyarrow as pa
+
+    if col_type.startswith("list<") and col_type.endswith(">"):
+        return pa.list_(get_arrow_type(col_type[len("list<"):-1]))
+
+    return pa.type_for_alias(col_type)
+
+
+def get_dataset_path(table_name: str, outputs_basepath: str = OUTPUTS_BASEPATH) -> str:
+    return os.path.join(outputs_basepath, PARQUET_DIRNAME, table_name)
+
+
+def write_dataset_metadata(
+        table_name: str,
+        outputs_basepath: str = OUTPUTS_BASEPATH
+) -> List[str]:
+    """
+    Combine every scenario partition of a Parquet output table into one dataset by writing a
+    _metadata file that references the row groups of each partition file. Only the file footers
+    are read. The dataset can be read with the study and scenario partition columns using, for
+    example, pyarrow.dataset.parquet_dataset(<metadata file>, partitioning="hive")
+
+    Args:
+        table_name (str): The name of the table, i.e. "book_val"
+
+    Optional Args:
+        outputs_basepath (str): The root outputs directory
+
+    Returns:
+        List[str]: The partition files in the dataset, relative to the dataset directory
+    """
+    import pyarrow.parquet as pq
+
+    dataset_path = get_dataset_path(table_name, outputs_basepath)
+    partition_filepaths = sorted(glob.glob(os.path.join(
+        dataset_path, f"{STUDY_PARTITION}=*", f"{SCENARIO_PARTITION}=*", PARQUET_FILENAME
+    )))
+
+    metadata = None
+    relative_filepaths = []
+    for filepath in partition_filepaths:
+        relative_filepath = os.path.relpath(filepath, dataset_path).replace(os.sep, "/")
+        file_metadata = pq.read_metadata(filepath)
+        file_metadata.set_file_path(relative_filepath)
+
+        if metadata is None:
+            metadata = file_metadata
+        else:
+            metadata.append_row_groups(file_metadata)
+        relative_filepaths.append(relative_filepath)
+
+    if metadata is not None:
+        metadata.write_metadata_file(os.path.join(dataset_path, METADATA_FILENAME))
+
+    return relative_filepaths
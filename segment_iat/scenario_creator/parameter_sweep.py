@@ -0,0 +1,259 @@
+"""
+Runs one scenario of a study over a grid of gas pipe intervention years and retrofit install years
+"""
+import itertools
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from segment_iat.buildings.building import Building
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.incentives import Incentives
+from segment_iat.utils.status import QuietStatus, report_status
+
+
+PARAM_GAS_PIPE_INTERVENTION_YEAR = "gas_pipe_intervention_year"
+# Install year of every parcel; "install_year.<parcel_id>" sets the install year of one parcel
+PARAM_INSTALL_YEAR = "install_year"
+
+SWEEP_KEY_COL = "sweep_key"
+TABLE_COL = "table"
+VALUE_COL = "value"
+
+# Numeric asset x year output tables of a scenario; fuel_type (strings) can also be swept
+SWEEP_TABLES = [
+    "is_retrofit_vec_table",
+    "retrofit_year",
+    "retrofit_cost",
+    "book_val",
+    "stranded_val",
+    "energy_consumption",
+    "peak_consump",
+    "consumption_costs",
+    "consumption_emissions",
+    "methane_leaks",
+    "operating_costs",
+]
+
+
+class ParameterSweep:
+    """
+    Runs one scenario of a loaded study at every point of a grid of parameters. Only the gas
+    pipe intervention year and the retrofit install years of parcels are swept, and neither
+    changes the energy profiles, the study baseline, or the incentives, so those are loaded once
+    for the whole sweep. Buildings only depend on their own install year, so each Building is
+    populated once per install year and reused by every point with that install year; the
+    utility network, which depends on the gas pipe intervention year and the buildings, is
+    rebuilt at every point. Tables are kept in memory and combined into one tidy table
+
+    Args:
+        study (SegmentStudy): The loaded study
+        scenario (str): The scenario ID
+        grid (Dict[str, List[int]]): The values of each swept parameter:
+        {
+            gas_pipe_intervention_year (List[int]): Gas pipe intervention years
+            install_year (List[int]): Retrofit install years of every parcel
+            install_year.<parcel_id> (List[int]): Retrofit install years of one parcel
+        }
+
+    Optional Args:
+        profile_cache (ProfileCache): Cache of energy consumption profiles; defaults to the
+            process-wide cache
+        profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+        status_logging: Progress reporter with a progress(pct, msg) method; prints if not provided
+        output_tables (List[str]): The output tables to collect (default: SWEEP_TABLES)
+
+    Attributes:
+        scenario (str): The scenario ID
+        grid (Dict[str, List[int]]): The values of each swept parameter
+        output_tables (List[str]): The output tables to collect
+
+    Methods:
+        get_sweep_points (List[Dict[str, int]]): The parameter values of every point of the grid
+        get_sweep_key (str): The sweep key of a point, i.e. "gas_pipe_intervention_year=2030"
+        run_point (Dict[str, pd.DataFrame]): Run the scenario at one point
+        run_sweep (pd.DataFrame): Run the scenario at every point
+    """
+    def __init__(
+            self,
+            study: SegmentStudy,
+            scenario: str,
+            grid: Dict[str, List[int]],
+            profile_cache: ProfileCache = None,
+            profile_matrix: ProfileMatrix = None,
+            status_logging=None,
+            output_tables: List[str] = None
+    ):
+        self._study: SegmentStudy = study
+        self.scenario: str = scenario
+        self.grid: Dict[str, List[int]] = grid
+        self._profile_cache: ProfileCache = (
+            profile_cache if profile_cache is not None else get_profile_cache()
+        )
+        self._profile_matrix: ProfileMatrix = profile_matrix
+        self.status_logging = status_logging
+        self.output_tables: List[str] = output_tables or SWEEP_TABLES
+
+        self._validate_grid()
+
+        self._incentives: Incentives = None
+        self._building_cache: Dict[tuple, Building] = {}
+
+    def _validate_grid(self) -> None:
+        for param, values in self.grid.items():
+            if param == PARAM_GAS_PIPE_INTERVENTION_YEAR or param == PARAM_INSTALL_YEAR:
+                pass
+            elif param.startswith(f"{PARAM_INSTALL_YEAR}."):
+                parcel_id = param[len(PARAM_INSTALL_YEAR) + 1:]
+                if parcel_id not in self._study.parcels_table:
+                    raise ValueError(f"Parcel {parcel_id} of sweep parameter {param} not found!")
+            else:
+                raise ValueError(
+                    f"Unknown sweep parameter {param}! Sweep {PARAM_GAS_PIPE_INTERVENTION_YEAR}, "
+                    f"{PARAM_INSTALL_YEAR}, or {PARAM_INSTALL_YEAR}.<parcel_id>"
+                )
+
+            if len(values) == 0:
+                raise ValueError(f"Sweep parameter {param} has no values!")
+
+    def get_sweep_points(self) -> List[Dict[str, int]]:
+        """
+        The parameter values of every point of the grid, in grid order
+
+        Returns:
+            List[Dict[str, int]]: The value of each swept parameter, for each point
+        """
+        params = list(self.grid.keys())
+        return [
+            dict(zip(params, values))
+            for values in itertools.product(*[self.grid[param] for param in params])
+        ]
+
+    @staticmethod
+    def get_sweep_key(point: Dict[str, int]) -> str:
+        """
+        The sweep key of a point, i.e. "gas_pipe_intervention_year=2030|install_year=2028"
+        """
+        return "|".join(f"{param}={value}" for param, value in point.items())
+
+    def _get_install_years(self, point: Dict[str, int]) -> Dict[str, int]:
+        """
+        The install year of each parcel set by a point; parcel install years take precedence over
+        the install year of every parcel
+        """
+        install_years = {}
+        if PARAM_INSTALL_YEAR in point:
+            install_years = {
+                parcel_id: point[PARAM_INSTALL_YEAR] for parcel_id in self._study.parcels_table
+            }
+
+        for param, value in point.items():
+            if param.startswith(f"{PARAM_INSTALL_YEAR}."):
+                install_years[param[len(PARAM_INSTALL_YEAR) + 1:]] = value
+
+        return install_years
+
+    def run_point(self, point: Dict[str, int]) -> Dict[str, pd.DataFrame]:
+        """
+        Run the scenario at one point of the grid
+
+        Args:
+            point (Dict[str, int]): The value of each swept parameter
+
+        Returns:
+            Dict[str, pd.DataFrame]: The output tables, by table name
+        """
+        scenario_creator = self._study.create_scenario_creator(
+            self.scenario,
+            QuietStatus(),
+            gas_pipe_intervention_year=point.get(PARAM_GAS_PIPE_INTERVENTION_YEAR),
+            profile_cache=self._profile_cache,
+            profile_matrix=self._profile_matrix,
+            output_format=OUTPUT_FORMAT_MEMORY,
+            install_years=self._get_install_years(point),
+            incentives=self._incentives,
+            building_cache=self._building_cache
+        )
+        scenario_creator.create_scenario()
+
+        # Incentives only depend on the study's zip code, so they are gathered once
+        self._incentives = scenario_creator.incentives
+
+        return scenario_creator.output_tables
+
+    def run_sweep(self) -> pd.DataFrame:
+        """
+        Run the scenario at every point of the grid
+
+        Returns:
+            pd.DataFrame: Tidy table of every output table at every point, with the sweep key,
+                the value of each swept parameter, the table name, the table's label columns, and
+                the table's values in one value column
+        """
+        points = self.get_sweep_points()
+
+        sweep_dfs = []
+        for point_num, point in enumerate(points):
+            sweep_key = self.get_sweep_key(point)
+            self._status_update(
+                f"Running sweep point {point_num + 1} of {len(points)}: {sweep_key}",
+                point_num / len(points)
+            )
+
+            tables = self.run_point(point)
+            for table_name in self.output_tables:
+                # Output tables are ordered year, value, labels
+                df = tables[table_name]
+                df = df.rename(columns={df.columns[1]: VALUE_COL})
+                if df[VALUE_COL].dtype == bool:
+                    df[VALUE_COL] = df[VALUE_COL].astype(float)
+
+                df.insert(0, TABLE_COL, _repeat_categorical(table_name, len(df)))
+                for param, value in reversed(list(point.items())):
+                    df.insert(0, param, value)
+                df.insert(0, SWEEP_KEY_COL, _repeat_categorical(sweep_key, len(df)))
+
+                sweep_dfs.append(df)
+
+        self._status_update(f"Sweep complete! Ran {len(points)} points", 1.0)
+
+        return _concat_categorical(sweep_dfs)
+
+    def _status_update(self, msg: str, pct: float) -> None:
+        """
+        Display a status message on the progress of the sweep
+        """
+        report_status(self.status_logging, msg, pct)
+
+
+def _repeat_categorical(value: str, length: int) -> pd.Categorical:
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def _concat_categorical(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate tables whose label columns differ, keeping the label columns categorical.
+    Concatenating categoricals with different categories would give object columns of repeated
+    strings, so the categories of each label column are unioned instead. Label columns missing
+    from a table are null for its rows
+    """
+    columns = list(dict.fromkeys(col for df in dfs for col in df.columns))
+
+    data = {}
+    for col in columns:
+        parts = [df[col] for df in dfs if col in df.columns]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            data[col] = union_categoricals([
+                df[col].array if col in df.columns
+                else pd.Categorical.from_codes(np.full(len(df), -1), dtype=parts[0].dtype)
+                for df in dfs
+            ])
+        else:
+            data[col] = pd.concat(parts, ignore_index=True)
+
+    return pd.DataFrame(data, columns=columns)
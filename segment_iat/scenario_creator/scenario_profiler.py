@@ -0,0 +1,127 @@
+"""
+Defines a ScenarioProfiler class, which writes a stage timing report, and optionally a cProfile
+dump, of each scenario run
+"""
+import contextlib
+import cProfile
+import json
+import os
+from typing import Iterator, List
+
+from segment_iat.utils.run_defaults import STAGE_PROFILES_BASEPATH
+from segment_iat.utils.stage_recorder import StageRecorder
+
+
+PROFILES_BASEPATH = STAGE_PROFILES_BASEPATH
+# The stage covering the whole scenario run; the report gives each stage's share of it
+TOTAL_STAGE = "create_scenario"
+
+
+class ScenarioProfiler:
+    """
+    Records the stage hooks of scenario runs and writes a report of each run to
+    <profiles_basepath>/<segment>/: <scenario>_stages.txt, a table of each stage's calls, wall
+    time, CPU time, peak memory (with track_memory), and share of the run, and
+    <scenario>_stages.json with the same values. With cprofile, the run is also profiled with
+    cProfile and its stats dumped to <scenario>.pstats. Stages run by building worker processes
+    and profile loading threads are not recorded
+
+    Args:
+        None
+
+    Optional Args:
+        profiles_basepath (str): The root directory of the reports
+        track_memory (bool): If True, record the peak memory of each stage with tracemalloc,
+            which slows the run down
+        cprofile (bool): If True, also dump cProfile stats of each run
+
+    Attributes:
+        filepaths (List[str]): The reports written by this profiler
+
+    Methods:
+        profile (StageRecorder): Record a scenario run within a block and write its report
+    """
+    def __init__(
+            self,
+            profiles_basepath: str = PROFILES_BASEPATH,
+            track_memory: bool = False,
+            cprofile: bool = False
+    ):
+        self.profiles_basepath: str = profiles_basepath
+        self.track_memory: bool = track_memory
+        self.cprofile: bool = cprofile
+        self.filepaths: List[str] = []
+
+    @contextlib.contextmanager
+    def profile(
+            self,
+            segment_name: str,
+            scenario: str,
+            status_logging=None
+    ) -> Iterator[StageRecorder]:
+        """
+        Record a scenario run within a block and write its report when the block exits. The run's
+        ScenarioCreator is given the yielded StageRecorder as its status_logging
+
+        Args:
+            segment_name (str): The ID of the street segment
+            scenario (str): The scenario ID
+
+        Optional Args:
+            status_logging: Progress reporter the run's progress messages are passed on to;
+                prints them if not provided
+
+        Returns:
+            StageRecorder: The recorder of the run's stages
+        """
+        recorder = StageRecorder(self.track_memory, status_logging)
+        profiler = cProfile.Profile() if self.cprofile else None
+
+        if profiler:
+            profiler.enable()
+        try:
+            yield recorder
+        finally:
+            if profiler:
+                profiler.disable()
+
+        self._write_report(segment_name, scenario, recorder, profiler)
+
+    def _write_report(
+            self,
+            segment_name: str,
+            scenario: str,
+            recorder: StageRecorder,
+            profiler: cProfile.Profile = None
+    ) -> None:
+        """
+        Write the stage report, and cProfile stats if profiled, of a scenario run
+        """
+        profiles_path = os.path.join(self.profiles_basepath, segment_name)
+        os.makedirs(profiles_path, exist_ok=True)
+
+        filepaths = {
+            "txt": os.path.join(profiles_path, f"{scenario}_stages.txt"),
+            "json": os.path.join(profiles_path, f"{scenario}_stages.json"),
+        }
+        with open(filepaths["txt"], "w") as f:
+            f.write(f"Stages of scenario {scenario} of {segment_name}\n")
+            f.write(recorder.format_report(TOTAL_STAGE) + "\n")
+        with open(filepaths["json"], "w") as f:
+            json.dump(
+                {
+                    "segment": segment_name,
+                    "scenario": scenario,
+                    "track_memory": self.track_memory,
+                    "stages": recorder.stages,
+                },
+                f,
+                indent=2
+            )
+
+        if profiler:
+            filepaths["pstats"] = os.path.join(profiles_path, f"{scenario}.pstats")
+            profiler.dump_stats(filepaths["pstats"])
+
+        self.filepaths.extend(filepaths.values())
+        recorder.progress(1.0, f"Wrote stage report to {filepaths['txt']}")
@@ -0,0 +1,133 @@
+"""
+In-memory output tables of a scenario, assembled when they are read
+"""
+import os
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.buildings.building import Building
+from segment_iat.scenario_creator.output_table import OutputTable
+from segment_iat.scenario_creator.output_writer import (
+    OUTPUT_FORMAT_CSV,
+    OUTPUTS_BASEPATH,
+    OutputWriter
+)
+from segment_iat.utility_network.utility_network import UtilityNetwork
+
+
+class ScenarioResults(Mapping):
+    """
+    The output tables of a scenario run in memory, by table name (i.e. results["book_val"]).
+    Tables are kept as they were built and only assembled into DataFrames when first read, so
+    tables that are never read are never assembled. Asset x year tables can also be read as
+    (assets x years) arrays without assembling the long-format DataFrame. Nothing is written
+    unless write is called
+
+    Args:
+        segment (str): The ID of the street segment
+        scenario (str): The name of the scenario
+        years_vec (List[int]): List of simulation years
+        tables (Dict[str, Union[OutputTable, Callable, pd.DataFrame]]): The tables, by table name:
+            OutputTables, functions returning the DataFrame, or DataFrames
+        column_types (Dict[str, Dict[str, str]]): The column types of each table
+
+    Optional Args:
+        buildings (Dict[str, Building]): The scenario's Buildings, by parcel ID
+        utility_network (UtilityNetwork): The scenario's utility network
+
+    Attributes:
+        segment (str): The ID of the street segment
+        scenario (str): The name of the scenario
+        years_vec (List[int]): List of simulation years
+        buildings (Dict[str, Building]): The scenario's Buildings, by parcel ID
+        utility_network (UtilityNetwork): The scenario's utility network
+
+    Methods:
+        get_array (Tuple[np.ndarray, pd.DataFrame]): An asset x year table as an array
+        write (List[str]): Write the tables as CSVs or a Parquet dataset
+    """
+    def __init__(
+            self,
+            segment: str,
+            scenario: str,
+            years_vec: List[int],
+            tables: Dict[str, Union[OutputTable, Callable, pd.DataFrame]],
+            column_types: Dict[str, Dict[str, str]],
+            buildings: Dict[str, Building] = None,
+            utility_network: UtilityNetwork = None
+    ):
+        self.segment: str = segment
+        self.scenario: str = scenario
+        self.years_vec: List[int] = years_vec
+        self.buildings: Dict[str, Building] = buildings or {}
+        self.utility_network: UtilityNetwork = utility_network
+
+        self._tables: Dict[str, Union[OutputTable, Callable, pd.DataFrame]] = tables
+        self._column_types: Dict[str, Dict[str, str]] = column_types
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, table_name: str) -> pd.DataFrame:
+        if table_name not in self._frames:
+            table = self._tables[table_name]
+
+            if isinstance(table, OutputTable):
+                table = table.to_frame()
+            elif callable(table):
+                table = table()
+
+            self._frames[table_name] = table
+
+        return self._frames[table_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def get_array(self, table_name: str) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        An asset x year table as an array
+
+        Args:
+            table_name (str): The name of the table, i.e. "book_val"
+
+        Returns:
+            Tuple[np.ndarray, pd.DataFrame]: The values, with one row per asset series and one
+                column per simulation year, and the labels of each row
+        """
+        table = self._tables[table_name]
+        if not isinstance(table, OutputTable):
+            raise ValueError(f"Table {table_name} is not an asset x year table!")
+
+        return table.to_array()
+
+    def write(
+            self,
+            output_format: str = OUTPUT_FORMAT_CSV,
+            outputs_basepath: str = OUTPUTS_BASEPATH
+    ) -> List[str]:
+        """
+        Write the tables as a scenario run writes them
+
+        Optional Args:
+            output_format (str): The output format, csv or parquet
+            outputs_basepath (str): The root outputs directory
+
+        Returns:
+            List[str]: The files written
+        """
+        outputs_path = os.path.join(outputs_basepath, self.segment, self.scenario)
+        if output_format == OUTPUT_FORMAT_CSV:
+            os.makedirs(outputs_path, exist_ok=True)
+
+        output_writer = OutputWriter(
+            output_format, outputs_path, self.segment, self.scenario, outputs_basepath
+        )
+        for table_name in self._tables:
+            output_writer.write(self[table_name], table_name, self._column_types[table_name])
+
+        return output_writer.filepaths
@@ -0,0 +1,324 @@
+"""
+Long-running worker that keeps studies loaded and runs scenario jobs sent over a local socket
+"""
+import json
+import os
+import socket
+import socketserver
+import time
+from typing import Callable, Dict, List, Tuple
+
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB, ProfileCache
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.scenario_creator.output_writer import (
+    OUTPUT_FORMAT_MEMORY,
+    OUTPUT_FORMATS,
+    OUTPUTS_BASEPATH
+)
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.incentives import Incentives
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+COMMAND_RUN = "run"
+COMMAND_RELOAD = "reload"
+COMMAND_STATUS = "status"
+COMMAND_SHUTDOWN = "shutdown"
+COMMANDS = [COMMAND_RUN, COMMAND_RELOAD, COMMAND_STATUS, COMMAND_SHUTDOWN]
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class SimulationWorker:
+    """
+    Keeps studies, their baselines, energy profiles, config tables, and incentives in memory
+    between scenario runs, so each job only pays for the scenario itself. Jobs are JSON objects,
+    sent one per line over a local TCP socket by serve, or passed to run_job directly:
+    {
+        command (str): One of COMMANDS (default: run)
+        study (str): The study ID, i.e. "example_street"; loaded on first use
+        scenario (str): The scenario ID to run
+        output_format (str): csv or parquet to write the outputs as run.py does and return their
+            paths, or memory (default) to return the tables in the response
+        tables (List[str]): The tables to return with the memory output format (default: all)
+    }
+    Each job gets one JSON response with a status of "ok" or "error". Config files are read when
+    a study is loaded; send a reload job after editing a study's configs
+
+    Args:
+        create_study (Callable[[str], SegmentStudy]): Creates a study from its config file
+            (i.e. run.create_study)
+
+    Optional Args:
+        profile_cache_mb (float): Memory budget in MB for energy profiles shared by every study
+        profile_matrix (bool): If True, hold the energy profiles of every scenario of a study in
+            a shared profile matrix
+        outputs_basepath (str): The root outputs directory
+        status_logging: Progress reporter with a progress(pct, msg) method; prints if not provided
+        verbose (bool): If True, print the status messages of each scenario run
+
+    Attributes:
+        studies (Dict[str, SegmentStudy]): The loaded studies, by study ID
+        profile_cache (ProfileCache): Cache of energy consumption profiles shared by every study
+        jobs_run (int): Number of jobs handled
+        address (Tuple[str, int]): The address and port the worker is listening on, once serving
+
+    Methods:
+        load_study (SegmentStudy): Load a study, if not already loaded
+        run_job (dict): Handle one job
+        serve (None): Handle jobs sent to a local socket until a shutdown job
+    """
+    def __init__(
+            self,
+            create_study: Callable[[str], SegmentStudy],
+            profile_cache_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+            profile_matrix: bool = False,
+            outputs_basepath: str = OUTPUTS_BASEPATH,
+            status_logging=None,
+            verbose: bool = False
+    ):
+        self._create_study: Callable[[str], SegmentStudy] = create_study
+        self._use_profile_matrix: bool = profile_matrix
+        self._outputs_basepath: str = outputs_basepath
+        self.status_logging = status_logging
+        self._verbose: bool = verbose
+
+        self.studies: Dict[str, SegmentStudy] = {}
+        self.profile_cache: ProfileCache = ProfileCache(profile_cache_mb)
+        self.jobs_run: int = 0
+        self.address: Tuple[str, int] = None
+
+        self._profile_matrices: Dict[str, ProfileMatrix] = {}
+        self._incentives: Dict[str, Incentives] = {}
+        self._shutdown: bool = False
+
+    def load_study(self, study_id: str) -> SegmentStudy:
+        """
+        Load a study, compute its baseline, and gather its incentives, if not already loaded
+
+        Args:
+            study_id (str): The study ID, i.e. "example_street"
+
+        Returns:
+            SegmentStudy: The loaded study
+        """
+        if study_id in self.studies:
+            return self.studies[study_id]
+
+        study_config_filepath = f"./config_files/{study_id}/{study_id}_config.csv"
+        if not os.path.exists(study_config_filepath):
+            raise FileNotFoundError(f"Config file does not exist for study {study_id.upper()}")
+
+        self._status_update(f"Loading study {study_id}...")
+        study = self._create_study(study_config_filepath)
+        study.load_study(self.profile_cache, baseline_timeseries=not self._use_profile_matrix)
+
+        if self._use_profile_matrix:
+            self._status_update(f"Building profile matrix of study {study_id}...")
+            self._profile_matrices[study_id] = study.build_profile_matrix(
+                self._get_scenarios(study_id), self.profile_cache
+            )
+
+        # Incentives only depend on the study's zip code, so they are gathered once per study
+        self._status_update(f"Gathering incentives of study {study_id}...")
+        incentives = Incentives(study.zip_code)
+        incentives.gather_incentives()
+        self._incentives[study_id] = incentives
+
+        self.studies[study_id] = study
+
+        return study
+
+    def run_job(self, job: dict) -> dict:
+        """
+        Handle one job. Errors are returned in the response rather than raised, so one bad job
+        does not stop the worker
+
+        Args:
+            job (dict): The job (see the class docstring)
+
+        Returns:
+            dict: The response, with the status of the job, its elapsed seconds, and for run jobs
+                either the output_filepaths or the tables, each as {columns, data}
+        """
+        start_time = time.perf_counter()
+        self.jobs_run += 1
+
+        try:
+            command = job.get("command", COMMAND_RUN)
+            if command == COMMAND_RUN:
+                response = self._run_scenario(job)
+            elif command == COMMAND_RELOAD:
+                response = self._reload(job)
+            elif command == COMMAND_STATUS:
+                response = {"studies": list(self.studies.keys()), "jobs_run": self.jobs_run}
+            elif command == COMMAND_SHUTDOWN:
+                self._shutdown = True
+                response = {}
+            else:
+                raise ValueError(f"Unknown command {command}! Choose one of {COMMANDS}")
+            response = {"status": STATUS_OK, **response}
+        except Exception as e:
+            response = {"status": STATUS_ERROR, "error": f"{type(e).__name__}: {e}"}
+
+        response["elapsed_s"] = round(time.perf_counter() - start_time, 4)
+
+        return response
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """
+        Handle jobs sent to a local TCP socket, one JSON object per line, until a shutdown job.
+        Connections are served one at a time, each until it closes, so clients should close
+        their connection after their jobs (as submit_job does). The socket is unauthenticated, so
+        only bind it to a local address
+
+        Optional Args:
+            host (str): The address to listen on
+            port (int): The port to listen on; 0 picks a free port
+
+        Returns:
+            None
+        """
+        with _JobServer((host, port), _JobHandler) as server:
+            server.worker = self
+            self.address = server.server_address
+            self._status_update(f"Worker listening on {host}:{self.address[1]}")
+            self._shutdown = False
+            while not self._shutdown:
+                server.handle_request()
+
+        self._status_update(f"Worker stopped after {self.jobs_run} jobs")
+
+    def _run_scenario(self, job: dict) -> dict:
+        if not job.get("study") or not job.get("scenario"):
+            raise ValueError("Run jobs need a study and a scenario!")
+        study_id = job["study"]
+        scenario = job["scenario"].lower()
+        output_format = job.get("output_format", OUTPUT_FORMAT_MEMORY)
+        if output_format not in OUTPUT_FORMATS + [OUTPUT_FORMAT_MEMORY]:
+            raise ValueError(
+                f"Unknown output format {output_format}! Choose one of "
+                f"{OUTPUT_FORMATS + [OUTPUT_FORMAT_MEMORY]}"
+            )
+
+        study = self.load_study(study_id)
+        if scenario not in self._get_scenarios(study_id):
+            raise FileNotFoundError(
+                f"File for scenario {scenario.upper()} does not exist for study {study_id.upper()}"
+            )
+
+        results = study.run_scenario(
+            scenario,
+            status_logging=self.status_logging if self._verbose else None,
+            verbose=self._verbose,
+            profile_cache=self.profile_cache,
+            profile_matrix=self._profile_matrices.get(study_id),
+            incentives=self._incentives.get(study_id)
+        )
+
+        response = {"study": study_id, "scenario": scenario}
+        if output_format == OUTPUT_FORMAT_MEMORY:
+            table_names = job.get("tables") or list(results.keys())
+            unknown_tables = [i for i in table_names if i not in results]
+            if unknown_tables:
+                raise ValueError(f"Unknown tables {unknown_tables}! Choose from {list(results)}")
+
+            response["tables"] = {
+                table_name: json.loads(results[table_name].to_json(orient="split", index=False))
+                for table_name in table_names
+            }
+        else:
+            response["output_filepaths"] = results.write(output_format, self._outputs_basepath)
+
+        return response
+
+    def _reload(self, job: dict) -> dict:
+        """
+        Drop a loaded study (or every study), so its configs are read again on its next job
+        """
+        study_ids = [job["study"]] if job.get("study") else list(self.studies.keys())
+        for study_id in study_ids:
+            self.studies.pop(study_id, None)
+            self._profile_matrices.pop(study_id, None)
+            self._incentives.pop(study_id, None)
+        self.profile_cache.clear()
+
+        return {"studies": list(self.studies.keys())}
+
+    @staticmethod
+    def _get_scenarios(study_id: str) -> List[str]:
+        scenarios_basepath = f"./config_files/{study_id}/scenarios/"
+        return sorted(
+            i.split("_config.csv")[0] for i in os.listdir(scenarios_basepath)
+            if i.endswith("_config.csv")
+        )
+
+    def _status_update(self, msg: str) -> None:
+        """
+        Display a status message of the worker
+        """
+        if self.status_logging:
+            self.status_logging.progress(1.0, msg)
+        else:
+            print(msg, flush=True)
+
+
+class _JobServer(socketserver.TCPServer):
+    """
+    Local TCP server of a SimulationWorker; restarting the worker can reuse its port right away
+    """
+    allow_reuse_address = True
+    worker: SimulationWorker = None
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """
+    Handles the jobs of one connection, one JSON object per line, replying one line per job
+    """
+    def handle(self) -> None:
+        worker = self.server.worker
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("jobs must be JSON objects")
+            except ValueError as e:
+                response = {"status": STATUS_ERROR, "error": f"Invalid job: {e}"}
+            else:
+                response = worker.run_job(job)
+                worker._status_update(_describe_job(job, response))
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            if worker._shutdown:
+                break
+
+
+def submit_job(job: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> dict:
+    """
+    Send one job to a running worker and wait for its response
+
+    Args:
+        job (dict): The job (see SimulationWorker)
+
+    Optional Args:
+        host (str): The address of the worker
+        port (int): The port of the worker
+
+    Returns:
+        dict: The response of the worker
+    """
+    with socket.create_connection((host, port)) as conn:
+        conn.sendall(json.dumps(job).encode() + b"\n")
+        with conn.makefile("rb") as response_file:
+            return json.loads(response_file.readline())
+
+
+def _describe_job(job: dict, response: dict) -> str:
+    description = " ".join(
+        str(job[key]) for key in ["command", "study", "scenario", "output_format"] if key in job
+    )
+    return f"Job {description or COMMAND_RUN}: {response['status']} in {response['elapsed_s']}s"
@@ -2,9 +2,28 @@
 Defines a SegmentStudy class
 """
 import os
+from typing import List, Tuple
 
 import pandas as pd
 
+from segment_iat.buildings.building import Building, PROFILE_MATRIX_COLUMNS
+from segment_iat.buildings.study_baseline import StudyBaseline
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.energy_profiles.profile_digest import ProfileDigest
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+from segment_iat.energy_profiles.profile_store import COMPILED_DIRNAME
+from segment_iat.scenario_creator.create_scenario import ScenarioCreator
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.scenario_creator.scenario_results import ScenarioResults
+from segment_iat.utils.config_tables import ConfigTables
+from segment_iat.utils.incentives import Incentives
+from segment_iat.utils.stage_recorder import stage
+from segment_iat.utils.status import QuietStatus
+from segment_iat.utils.time_axis import DEFAULT_WEATHER_YEAR, TimeAxis, get_time_axis
+
+
+PROFILES_BASEPATH = "./config_files/energy_consumption"
+
 
 class SegmentStudy:
     """
@@ -16,14 +35,26 @@ class SegmentStudy:
         study_end_year (str): The end year of the study
         gas_pipe_intervention_year (str): The year for gas pipe intervention
 
+    Optional Args:
+        weather_year (str): The weather year of the energy profiles
+        include_leap_day (str): "False" to drop February 29th from leap weather years
+
     Attributes:
         segment_name (str): The name of the segment
         study_start_year (int): The start year of the study
         study_end_year (int): The end year of the study
         gas_pipe_intervention_year (int): The year for gas pipe intervention
+        config_tables (ConfigTables): Config tables of the study, shared by all scenarios
+        time_axis (TimeAxis): Hourly time axis of the weather year, shared by all scenarios
+        baseline (StudyBaseline): Baseline values of the study's buildings, shared by all scenarios
 
     Methods:
-        None
+        load_study (None): Load the parcels table and compute the baseline for the study
+        load_parcels (None): Load the parcels table for the study
+        get_profile_keys (List[Tuple[str, float]]): The energy profiles used by a set of scenarios
+        build_profile_matrix (ProfileMatrix): Build the shared profile matrix for a set of scenarios
+        create_scenario_creator (ScenarioCreator): Create a scenario of the study, not yet run
+        run_scenario (ScenarioResults): Run a scenario in memory
     """
     def __init__(
             self,
@@ -31,7 +62,9 @@ class SegmentStudy:
             zip_code: str,
             study_start_year: str,
             study_end_year: str,
-            gas_pipe_intervention_year: str
+            gas_pipe_intervention_year: str,
+            weather_year: str = DEFAULT_WEATHER_YEAR,
+            include_leap_day: str = "True"
     ) -> None:
         self.segment_name: str = segment_name
         self.zip_code: int = int(zip_code)
@@ -41,12 +74,244 @@ class SegmentStudy:
 
         self._study_basepath = f"./config_files/{self.segment_name}"
         self.parcels_table: dict = {}
+        self.config_tables: ConfigTables = ConfigTables(self.segment_name)
+        self.time_axis: TimeAxis = get_time_axis(
+            int(weather_year), str(include_leap_day).lower() != "false"
+        )
+        self.baseline: StudyBaseline = None
+
+    def load_study(
+            self,
+            profile_cache: ProfileCache = None,
+            baseline_timeseries: bool = True
+    ) -> None:
+        """
+        Load the parcels table and compute the baseline of every parcel once for all scenarios:
+        baseline profile digests, hourly and total baseline consumption behind the meters, baseline
+        end use energy, and existing asset book values
+
+        Args:
+            None
+
+        Optional Args:
+            profile_cache (ProfileCache): Cache of energy consumption profiles
+            baseline_timeseries (bool): If False, only compute the baseline values that do not
+                need the baseline timeseries (i.e. when buildings use a profile matrix)
+
+        Returns:
+            None
+        """
+        profile_cache = profile_cache if profile_cache is not None else get_profile_cache()
+
+        def load_digest(consumption_id: str, load_scaling_factor: float) -> ProfileDigest:
+            return Building.get_profile_digest(consumption_id, load_scaling_factor, profile_cache)
 
+        def load_profile(consumption_id: str, load_scaling_factor: float) -> pd.DataFrame:
+            return Building.get_profile_timeseries(consumption_id, load_scaling_factor, profile_cache)
 
-    def load_study(self):
+        with stage("load_study"):
+            self.load_parcels()
+
+            self.baseline = StudyBaseline(
+                self._get_baseline_params(),
+                list(range(self.study_start_year, self.study_end_year)),
+                self.config_tables,
+                self.time_axis
+            )
+            self.baseline.populate_baseline(
+                load_digest, load_profile if baseline_timeseries else None
+            )
+
+    def load_parcels(self) -> None:
         self.parcels_table = self._get_parcels_table()
 
     def _get_parcels_table(self) -> dict:
         parcels_filepath = os.path.join(self._study_basepath, "parcels/parcels.csv")
         parcels_df = pd.read_csv(parcels_filepath, index_col="parcel_id").to_dict(orient="index")
         return parcels_df
+
+    def _get_baseline_params(self) -> List[dict]:
+        """
+        Baseline Building input parameters of each parcel
+        """
+        return [
+            {
+                "building_id": parcel_id,
+                "baseline_consumption_id": parcel.get("baseline_consumption_id"),
+                "load_scaling_factor": parcel.get("load_scaling_factor"),
+                "asset_install_year": parcel.get("install_year"),
+                "existing_measures_cost_id": parcel.get("measure_costs_filename"),
+            }
+            for parcel_id, parcel in self.parcels_table.items()
+        ]
+
+    def get_profile_keys(self, scenarios: List[str]) -> List[Tuple[str, float]]:
+        """
+        Get the (consumption ID, load scaling factor) pairs for all baseline and retrofit energy
+        profiles used by the given scenarios
+
+        Args:
+            scenarios (List[str]): The scenario IDs
+
+        Returns:
+            List[Tuple[str, float]]: Unique profile keys, in order of first use
+        """
+        profile_keys = []
+        for parcel in self.parcels_table.values():
+            profile_keys.append(
+                (parcel.get("baseline_consumption_id"), parcel.get("load_scaling_factor", 1))
+            )
+
+        for scenario in scenarios:
+            settings = pd.read_csv(
+                os.path.join(self._study_basepath, "scenarios", f"{scenario}_config.csv"),
+                index_col=0,
+                header=None
+            ).iloc[:, 0].to_dict()
+
+            measures = pd.read_csv(os.path.join(
+                self._study_basepath,
+                "parcels",
+                f"{settings.get('parcel_retrofit_measures_filename')}.csv"
+            ), index_col="parcel_id").to_dict(orient="index")
+
+            for parcel_id, parcel in self.parcels_table.items():
+                profile_keys.append((
+                    measures.get(parcel_id, {}).get("energy_profile_id"),
+                    parcel.get("load_scaling_factor", 1)
+                ))
+
+        return list(dict.fromkeys(profile_keys))
+
+    def build_profile_matrix(
+            self,
+            scenarios: List[str],
+            profile_cache: ProfileCache = None
+    ) -> ProfileMatrix:
+        """
+        Build the memory-mapped profile matrix holding every energy profile used by the given
+        scenarios. The matrix is written next to the compiled profile store
+
+        Args:
+            scenarios (List[str]): The scenario IDs
+
+        Optional Args:
+            profile_cache (ProfileCache): Cache of energy consumption profiles used while building
+
+        Returns:
+            ProfileMatrix: The opened matrix
+        """
+        profile_cache = profile_cache if profile_cache is not None else get_profile_cache()
+        profile_keys = self.get_profile_keys(scenarios)
+        # Each set of profiles has its own file, so builds for other scenarios never rewrite a
+        # matrix another process has open
+        matrix_filepath = ProfileMatrix.get_filepath(
+            os.path.join(PROFILES_BASEPATH, COMPILED_DIRNAME),
+            self.segment_name,
+            profile_keys,
+            PROFILE_MATRIX_COLUMNS
+        )
+
+        def load_profile(consumption_id: str, load_scaling_factor: float) -> pd.DataFrame:
+            # Digest while the full-precision timeseries is loaded, so buildings never reload it
+            Building.get_profile_digest(consumption_id, load_scaling_factor, profile_cache)
+            return Building.get_profile_timeseries(consumption_id, load_scaling_factor, profile_cache)
+
+        return ProfileMatrix.build(
+            matrix_filepath,
+            profile_keys,
+            load_profile,
+            PROFILE_MATRIX_COLUMNS
+        )
+
+    def run_scenario(
+            self,
+            scenario: str,
+            status_logging=None,
+            verbose: bool = False,
+            profile_cache: ProfileCache = None,
+            profile_matrix: ProfileMatrix = None,
+            incentives: Incentives = None
+    ) -> ScenarioResults:
+        """
+        Run a scenario without writing to disk, i.e. from a notebook or front end. The study is
+        loaded first if it has not been. Nothing is printed unless verbose is set
+
+        Args:
+            scenario (str): The scenario ID, i.e. "ex_gas"
+
+        Optional Args:
+            status_logging: Progress reporter with a progress(pct, msg) method
+            verbose (bool): If True and status_logging is not provided, print progress messages
+            profile_cache (ProfileCache): Cache of energy consumption profiles
+            profile_matrix (ProfileMatrix): Shared matrix of hourly profiles
+            incentives (Incentives): Incentives shared across runs; gathered by the run if not
+                provided
+
+        Returns:
+            ScenarioResults: The output tables, assembled when read, with the scenario's Buildings
+                and utility network
+        """
+        profile_cache = profile_cache if profile_cache is not None else get_profile_cache()
+        if self.baseline is None:
+            self.load_study(profile_cache, baseline_timeseries=profile_matrix is None)
+
+        if status_logging is None and not verbose:
+            status_logging = QuietStatus()
+
+        scenario_creator = self.create_scenario_creator(
+            scenario,
+            status_logging,
+            profile_cache=profile_cache,
+            profile_matrix=profile_matrix,
+            output_format=OUTPUT_FORMAT_MEMORY,
+            incentives=incentives
+        )
+        scenario_creator.create_scenario()
+
+        return scenario_creator.results
+
+    def create_scenario_creator(
+            self,
+            scenario: str,
+            status_logging=None,
+            gas_pipe_intervention_year: int = None,
+            study_baseline: bool = True,
+            **kwargs
+    ) -> ScenarioCreator:
+        """
+        Create a scenario of the study, sharing the study's parcels, config tables, time axis,
+        and baseline. The scenario is not run; call create_scenario on it
+
+        Args:
+            scenario (str): The scenario ID, i.e. "ex_gas"
+
+        Optional Args:
+            status_logging: Progress reporter with a progress(pct, msg) method; the scenario
+                prints if not provided
+            gas_pipe_intervention_year (int): Overrides the study's gas pipe intervention year
+            study_baseline (bool): If False, buildings compute their own baseline instead of
+                sharing the study's
+            kwargs: Other ScenarioCreator arguments, i.e. profile_cache, profile_matrix,
+                output_format, building_workers, install_years, incentives, building_cache
+
+        Returns:
+            ScenarioCreator: The scenario
+        """
+        if gas_pipe_intervention_year is None:
+            gas_pipe_intervention_year = self.gas_pipe_intervention_year
+
+        return ScenarioCreator(
+            self.segment_name,
+            self.zip_code,
+            self.study_start_year,
+            self.study_end_year,
+            gas_pipe_intervention_year,
+            self.parcels_table,
+            os.path.join(self._study_basepath, "scenarios", f"{scenario}_config.csv"),
+            status_logging=status_logging,
+            config_tables=self.config_tables,
+            time_axis=self.time_axis,
+            study_baseline=self.baseline if study_baseline else None,
+            **kwargs
+        )
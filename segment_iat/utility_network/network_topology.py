@@ -0,0 +1,99 @@
+"""
+Compiles the utility network config tables into asset records and parent -> children indices
+"""
+import os
+from typing import Dict, List
+
+import pandas as pd
+
+
+# Asset layers of the utility network: the config table of each layer and its child layers
+NETWORK_LAYERS = {
+    "gas_meter": {"table": "gas_meters", "children": []},
+    "gas_service": {"table": "gas_services", "children": ["gas_meter"]},
+    "gas_main": {"table": "gas_main", "children": ["gas_service"]},
+    "elec_meter": {"table": "elec_meters", "children": []},
+    "elec_service": {"table": "elec_services", "children": ["elec_meter"]},
+    "elec_secondary": {"table": "elec_secondaries", "children": ["elec_service"]},
+    "elec_xmfr": {"table": "elec_xmfrs", "children": ["elec_service", "elec_secondary"]},
+    "elec_primary": {"table": "elec_primary", "children": ["elec_xmfr"]},
+}
+
+PARENT_ID_COL = "parentid"
+ASSET_ID_COL = "gisid"
+
+
+class NetworkTopology:
+    """
+    The topology of a segment's utility network. Each config table is read once, converted to a
+    list of asset records (one dict of constructor kwargs per row), and indexed by parent ID, so
+    finding the children of every asset is linear in the size of the network
+
+    Args:
+        network_config_filepath (str): Directory of the utility network config files
+        segment_id (str): The ID of the segment
+
+    Attributes:
+        records (Dict[str, List[dict]]): The asset records of each layer, in table order
+        order (List[str]): The layers in construction order; children come before their parents
+
+    Methods:
+        compile_topology (None): Read the config tables and build the parent -> children indices
+        get_children (List[int]): Return the rows of a parent's children in a child layer
+    """
+    def __init__(self, network_config_filepath: str, segment_id: str):
+        self._network_config_filepath: str = network_config_filepath
+        self._segment_id: str = segment_id
+
+        self.records: Dict[str, List[dict]] = {}
+        self.order: List[str] = []
+        self._children: Dict[str, Dict[str, List[int]]] = {}
+
+    def compile_topology(self) -> None:
+        """
+        Read all network config tables and index each layer's rows by parent ID
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.order = self._get_construction_order()
+
+        for layer in self.order:
+            table_filepath = os.path.join(
+                self._network_config_filepath,
+                f"{self._segment_id}_{NETWORK_LAYERS[layer]['table']}.csv"
+            )
+            self.records[layer] = pd.read_csv(table_filepath).to_dict(orient="records")
+
+            children = {}
+            for row, record in enumerate(self.records[layer]):
+                children.setdefault(record.get(PARENT_ID_COL), []).append(row)
+            self._children[layer] = children
+
+    def get_children(self, child_layer: str, parent_id: str) -> List[int]:
+        """
+        Get the rows in child_layer whose parent ID is parent_id, in table order
+        """
+        return self._children[child_layer].get(parent_id, [])
+
+    @staticmethod
+    def _get_construction_order() -> List[str]:
+        """
+        Order the layers depth-first so every layer comes after all of its child layers
+        """
+        order = []
+
+        def visit(layer: str) -> None:
+            if layer in order:
+                return
+            for child_layer in NETWORK_LAYERS[layer]["children"]:
+                visit(child_layer)
+            order.append(layer)
+
+        for layer in NETWORK_LAYERS:
+            visit(layer)
+
+        return order
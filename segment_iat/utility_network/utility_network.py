@@ -17,6 +17,10 @@ from segment_iat.end_uses.utility_end_uses.elec_primary import ElecPrimary
 from segment_iat.end_uses.meters.elec_meter import ElecMeter
 
 from segment_iat.end_uses.utility_end_uses.thermal_energy_network import ThermalEnergyNetwork
+from segment_iat.utility_network.network_topology import NetworkTopology
+from segment_iat.utils.config_tables import ConfigTables
+from segment_iat.utils.stage_recorder import stage
+from segment_iat.utils.time_axis import TimeAxis, get_time_axis
 
 
 class UtilityNetwork:
@@ -38,6 +42,10 @@ class UtilityNetwork:
         }
         buildings (Dict[str, Building]): Dict of Building instances in the scenario, organized by id
 
+    Optional Args:
+        config_tables (ConfigTables): Study config tables; defaults to loading the segment's tables
+        time_axis (TimeAxis): Shared hourly time axis; defaults to the process-wide axis
+
     Attributes:
         buildings (Dict[str, Building]): Dict of Building instances in the scenario, organized by id
         years_vec (list): List of years in the simulation
@@ -52,6 +60,7 @@ class UtilityNetwork:
 
     Methods:
         populate_utility_network (None): Creates the utility network and associated assets
+        populate_gas_network (None): Creates the gas meters, services, and mains
     """
 
     def __init__(
@@ -59,12 +68,16 @@ class UtilityNetwork:
         network_config_filepath: str,
         sim_settings: dict,
         buildings: Dict[str, Building],
+        config_tables: ConfigTables = None,
+        time_axis: TimeAxis = None,
     ):
         self._network_config_filepath: str = network_config_filepath
         self._sim_settings: dict = sim_settings
         self.buildings: Dict[str, Building] = buildings
+        self._config_tables: ConfigTables = config_tables or ConfigTables(sim_settings["segment_id"])
+        self._time_axis: TimeAxis = time_axis or get_time_axis()
 
-        self._network_config: dict = {}
+        self._topology: NetworkTopology = None
         self._year_timestamps: pd.DatetimeIndex = None
         self.years_vec: list = []
 
@@ -82,75 +95,62 @@ class UtilityNetwork:
         """
         Calls all functions to populate the utility network
         """
-        segment_id = self._sim_settings["segment_id"]
+        with stage("utility_network"):
+            with stage("utility_network.topology"):
+                self._load_topology()
+
+            # order is important; children are created before their parents
+            self.populate_gas_network()
+
+            with stage("utility_network.elec_meters"):
+                self._create_elec_meters()
+            with stage("utility_network.elec_services"):
+                self._create_elec_services()
+            with stage("utility_network.elec_secondaries"):
+                self._create_elec_secondaries()
+            with stage("utility_network.elec_transformers"):
+                self._create_elec_transformers()
+            with stage("utility_network.elec_primaries"):
+                self._create_elec_primaries()
+
+            with stage("utility_network.thermal_energy_network"):
+                self._create_thermal_energy_network()
+
+    def populate_gas_network(self, sim_settings: dict = None) -> None:
+        """
+        Create the gas meters, services, and mains. Only the gas network depends on the gas
+        intervention and gas pipe intervention year, so it can be rebuilt for another intervention
+        without rebuilding the electric network
 
-        self._network_config = {
-            "networks": {
-                "gas": {
-                    "mains_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_gas_main.csv"
-                    ),
-                    "service_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_gas_services.csv"
-                    ),
-                    "meter_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_gas_meters.csv"
-                    ),
-                    "leakage_factors": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_leakage_factors.csv"
-                    ),
-                },
-                "elec": {
-                    "primary_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_elec_primary.csv"
-                    ),
-                    "secondary_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_elec_secondaries.csv"
-                    ),
-                    "service_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_elec_services.csv"
-                    ),
-                    "meter_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_elec_meters.csv"
-                    ),
-                    "xmfrs_config": os.path.join(
-                        self._network_config_filepath,
-                        f"{segment_id}_elec_xmfrs.csv"
-                    ),
-                }
-            }
-        }
+        Optional Args:
+            sim_settings (dict): Simulation settings that override the network's settings, i.e.
+                gas_intervention and gas_pipe_intervention_year
+        """
+        if self._topology is None:
+            self._load_topology()
+
+        if sim_settings:
+            self._sim_settings = {**self._sim_settings, **sim_settings}
+
+        self.gas_meters = []
+        self.gas_services = []
+        self.gas_mains = []
+
+        with stage("utility_network.gas_meters"):
+            self._create_gas_meters()
+        with stage("utility_network.gas_services"):
+            self._create_gas_services()
+        with stage("utility_network.gas_mains"):
+            self._create_gas_mains()
+
+    def _load_topology(self) -> None:
+        self._topology = NetworkTopology(
+            self._network_config_filepath, self._sim_settings["segment_id"]
+        )
+        self._topology.compile_topology()
 
         self._get_years_vec()
 
-        # order is important
-        self._create_gas_meters()
-        self._create_gas_services()
-        self._create_gas_mains()
-
-        self._create_elec_meters()
-        self._create_elec_services()
-        self._create_elec_secondaries()
-        self._create_elec_transformers()
-        self._create_elec_primaries()
-
-        self._create_thermal_energy_network()
-
-    def _read_csv_config(self, config_file_path=None) -> None:
-        """
-        Read in the utilty network config file and save to network_config attr
-        """
-        data = pd.read_csv(config_file_path)
-        return data
-
     def _get_years_vec(self) -> None:
         """
         Vector of simulation years
@@ -159,61 +159,55 @@ class UtilityNetwork:
         end_year = self._sim_settings.get("sim_end_year", 2050)
         self.years_vec = list(range(start_year, end_year))
 
-        #FIXME: setting to always be 2018 since that is the ResStock year, but will want to
-        # change to be tied to simulation years
-        self._year_timestamps = pd.date_range(
-            start="2018-01-01",
-            end="2019-01-01",
-            freq="h",
-            inclusive="left",
-        )
+        # Hourly data is always on the weather year of the energy profiles, shared by all assets
+        self._year_timestamps = self._time_axis.timestamps
+
+    def _get_children(self, child_layer: str, parent_id: str, all_children: List) -> List:
+        """
+        Get the already created assets of child_layer connected to parent_id. Assets of a layer are
+        created in table order, so topology rows index directly into all_children
+        """
+        return [all_children[i] for i in self._topology.get_children(child_layer, parent_id)]
 
     def _create_gas_meters(self) -> None:
         """
         Instantiate all necessary GasMeter instances and save to gas_meters list attr
         """
-        meter_config_file = self._network_config["networks"]["gas"]["meter_config"]
-        meter_configs = self._read_csv_config(config_file_path=meter_config_file)
-
-
-        for _, meter_config in meter_configs.iterrows():
+        for meter_config in self._topology.records["gas_meter"]:
             building_id = meter_config["LOC_ID"]
             building = self.buildings.get(building_id, None)
 
-            gas_meter = GasMeter(**meter_config, **self._sim_settings, building=building)
+            gas_meter = GasMeter(
+                **meter_config,
+                **self._sim_settings,
+                building=building,
+                time_axis=self._time_axis
+            )
             gas_meter.initialize_end_use()
             self.gas_meters.append(gas_meter)
 
-    def _get_children(self, parent_id=None, all_children=None) -> List:
-        selected_children = []
-        for child in all_children:
-            if child.parent_id == parent_id:
-                selected_children.append(child)
-        return selected_children
-
     def _create_gas_services(self) -> None:
         """
         Instantiate all necessary GasService instances and save to gas_services list attr
         """
-        service_config_file = self._network_config["networks"]["gas"]["service_config"]
-        service_configs = self._read_csv_config(config_file_path=service_config_file)
-
         # replacement_year = self._sim_settings.get("gas_replacement_year")
         # if replacement_year > self._sim_settings["sim_end_year"]:
         #     replacement_year = None
 
-        for _, service_config in service_configs.iterrows():
+        service_retrofit_params = {"replacement_year": self._sim_settings["gas_pipe_intervention_year"]}
+
+        for service_config in self._topology.records["gas_service"]:
             connected_meters = self._get_children(
-                parent_id=service_config["gisid"], all_children=self.gas_meters
+                "gas_meter", service_config["gisid"], self.gas_meters
             )
 
-            service_retrofit_params = {"replacement_year": self._sim_settings["gas_pipe_intervention_year"]}
-
             gas_service = GasService(
                 **service_config,
                 **service_retrofit_params,
                 **self._sim_settings,
-                connected_assets=connected_meters
+                connected_assets=connected_meters,
+                config_tables=self._config_tables,
+                time_axis=self._time_axis
             )
 
             gas_service.initialize_end_use()
@@ -223,26 +217,24 @@ class UtilityNetwork:
         """
         Instantiate the GasMain and write to gas_main attr
         """
-        main_config_file = self._network_config["networks"]["gas"]["mains_config"]
-        main_configs = self._read_csv_config(config_file_path=main_config_file)
-
         # replacement_year = self._sim_settings.get("gas_replacement_year")
         # if replacement_year > self._sim_settings["sim_end_year"]:
         #     replacement_year = None
 
-        for _, main_config in main_configs.iterrows():
+        main_retrofit_params = {"replacement_year": self._sim_settings["gas_pipe_intervention_year"]}
 
+        for main_config in self._topology.records["gas_main"]:
             connected_services = self._get_children(
-                parent_id=main_config["gisid"], all_children=self.gas_services
+                "gas_service", main_config["gisid"], self.gas_services
             )
 
-            main_retrofit_params = {"replacement_year": self._sim_settings["gas_pipe_intervention_year"]}
-
             gas_main = GasMain(
                 **main_config,
                 **main_retrofit_params,
                 **self._sim_settings,
-                connected_assets=connected_services
+                connected_assets=connected_services,
+                config_tables=self._config_tables,
+                time_axis=self._time_axis
             )
 
             gas_main.initialize_end_use()
@@ -252,15 +244,15 @@ class UtilityNetwork:
         """
         Instantiate all necessary ElecMeter instances and save to gas_meters list attr
         """
-        meter_config_file = self._network_config["networks"]["elec"]["meter_config"]
-        meter_configs = self._read_csv_config(config_file_path=meter_config_file)
-
-        for _, meter_config in meter_configs.iterrows():
+        for meter_config in self._topology.records["elec_meter"]:
             building_id = meter_config["LOC_ID"]
             building = self.buildings.get(building_id, None)
 
             elec_meter = ElecMeter(
-                **meter_config, **self._sim_settings, building=building
+                **meter_config,
+                **self._sim_settings,
+                building=building,
+                time_axis=self._time_axis
             )
             elec_meter.initialize_end_use()
             self.elec_meters.append(elec_meter)
@@ -269,15 +261,16 @@ class UtilityNetwork:
         """
         Instantiate all necessary ElecService instances and save to gas_services list attr
         """
-        service_config_file = self._network_config["networks"]["elec"]["service_config"]
-        service_configs = self._read_csv_config(config_file_path=service_config_file)
-        for _, service_config in service_configs.iterrows():
+        for service_config in self._topology.records["elec_service"]:
             connected_meters = self._get_children(
-                parent_id=service_config["gisid"], all_children=self.elec_meters
+                "elec_meter", service_config["gisid"], self.elec_meters
             )
 
             elec_service = ElecService(
-                **service_config, **self._sim_settings, connected_assets=connected_meters
+                **service_config,
+                **self._sim_settings,
+                connected_assets=connected_meters,
+                time_axis=self._time_axis
             )
 
             elec_service.initialize_end_use()
@@ -287,21 +280,16 @@ class UtilityNetwork:
         """
         Instantiate all necessary ElecSecondaries instances and save to gas_services list attr
         """
-        secondary_config_file = self._network_config["networks"]["elec"][
-            "secondary_config"
-        ]
-        secondary_configs = self._read_csv_config(
-            config_file_path=secondary_config_file
-        )
-        for _, secondary_config in secondary_configs.iterrows():
+        for secondary_config in self._topology.records["elec_secondary"]:
             connected_services = self._get_children(
-                parent_id=secondary_config["gisid"], all_children=self.elec_services
+                "elec_service", secondary_config["gisid"], self.elec_services
             )
 
             elec_secondary = ElecSecondary(
                 **secondary_config,
                 **self._sim_settings,
-                connected_assets=connected_services
+                connected_assets=connected_services,
+                time_axis=self._time_axis
             )
 
             elec_secondary.initialize_end_use()
@@ -311,21 +299,22 @@ class UtilityNetwork:
         """
         Instantiate all necessary ElecSecondaries instances and save to gas_services list attr
         """
-        xmfrs_config_file = self._network_config["networks"]["elec"]["xmfrs_config"]
-        xmfrs_configs = self._read_csv_config(config_file_path=xmfrs_config_file)
-        for _, xmfr_config in xmfrs_configs.iterrows():
+        for xmfr_config in self._topology.records["elec_xmfr"]:
             connected_services = self._get_children(
-                parent_id=xmfr_config["gisid"], all_children=self.elec_services
+                "elec_service", xmfr_config["gisid"], self.elec_services
             )
 
             connected_secondaries = self._get_children(
-                parent_id=xmfr_config["gisid"], all_children=self.elec_secondaries
+                "elec_secondary", xmfr_config["gisid"], self.elec_secondaries
             )
 
             connected_assets = connected_services + connected_secondaries
 
             elec_xfmr = ElecTransformer(
-                **xmfr_config, **self._sim_settings, connected_assets=connected_assets
+                **xmfr_config,
+                **self._sim_settings,
+                connected_assets=connected_assets,
+                time_axis=self._time_axis
             )
 
             elec_xfmr.initialize_end_use()
@@ -335,17 +324,16 @@ class UtilityNetwork:
         """
         Instantiate all necessary ElecPrimaries instances and save to gas_services list attr
         """
-        primary_config_file = self._network_config["networks"]["elec"]["primary_config"]
-        primary_configs = self._read_csv_config(config_file_path=primary_config_file)
-        for _, primary_config in primary_configs.iterrows():
+        for primary_config in self._topology.records["elec_primary"]:
             connected_transformers = self._get_children(
-                parent_id=primary_config["gisid"], all_children=self.elec_transformers
+                "elec_xmfr", primary_config["gisid"], self.elec_transformers
             )
 
             elec_primary = ElecPrimary(
                 **primary_config,
                 **self._sim_settings,
-                connected_assets=connected_transformers
+                connected_assets=connected_transformers,
+                time_axis=self._time_axis
             )
 
             elec_primary.initialize_end_use()
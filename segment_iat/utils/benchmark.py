@@ -0,0 +1,351 @@
+"""
+Scaled benchmark studies, scaling curves of stage timings, and comparison of benchmark results
+against a saved baseline
+"""
+import math
+import os
+import shutil
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_TEMPLATE = "example_street"
+DEFAULT_SCENARIO = "ex_managed_elec_1"
+DEFAULT_PARCEL_COUNTS = [10, 100, 1000, 10000]
+DEFAULT_YEAR_SPANS = [10, 25, 50]
+DEFAULT_FANOUTS = [5, 20, 50]
+# The point every curve passes through; each curve varies one parameter from it
+DEFAULT_PARCELS = 100
+DEFAULT_YEARS = 25
+DEFAULT_FANOUT = 5
+# Only the fan-out curve runs at this many parcels, so wide fan-outs still span several transformers
+FANOUT_CURVE_PARCELS = 1000
+
+DEFAULT_THRESHOLD = 0.25
+# Stages faster or smaller than this in the baseline are too noisy to flag
+MIN_COMPARED_SECONDS = 0.05
+MIN_COMPARED_MB = 1.0
+
+BASELINE_FILEPATH = "./benchmarks/baseline.json"
+# Settings that must match between benchmark results and the baseline they are compared to
+BASELINE_SETTINGS = ["template", "scenario", "profile_matrix"]
+RESULTS_FILEPATH = "./results/benchmarks/benchmark.json"
+BENCHMARK_STUDY_PREFIX = "bench_"
+
+CURVE_PARCELS = "parcels"
+CURVE_YEARS = "years"
+CURVE_FANOUT = "fanout"
+CURVES = [CURVE_PARCELS, CURVE_YEARS, CURVE_FANOUT]
+
+# Utility network tables with one row per parcel, and the table of their parents
+PARCEL_NETWORK_TABLES = {
+    "gas_meters": "gas_services",
+    "gas_services": "gas_main",
+    "elec_meters": "elec_services",
+    "elec_services": "elec_secondaries",
+}
+# Utility network tables written by write_scaled_study rather than copied from the template
+SCALED_NETWORK_TABLES = list(PARCEL_NETWORK_TABLES) + ["gas_main", "elec_xmfrs", "elec_secondaries"]
+
+
+def get_benchmark_cases(
+        parcel_counts: List[int] = None,
+        year_spans: List[int] = None,
+        fanouts: List[int] = None
+) -> List[dict]:
+    """
+    The cases of the scaling curves. Each curve varies one of parcel count, year span, and
+    transformer fan-out; cases shared by curves are run once
+
+    Optional Args:
+        parcel_counts (List[int]): Parcel counts of the parcels curve
+        year_spans (List[int]): Year spans of the years curve
+        fanouts (List[int]): Parcels per transformer of the fan-out curve
+
+    Returns:
+        List[dict]: The key, curves, parcels, years, and fanout of each case
+    """
+    curve_points = {
+        CURVE_PARCELS: [
+            (parcels, DEFAULT_YEARS, DEFAULT_FANOUT)
+            for parcels in parcel_counts or DEFAULT_PARCEL_COUNTS
+        ],
+        CURVE_YEARS: [
+            (DEFAULT_PARCELS, years, DEFAULT_FANOUT) for years in year_spans or DEFAULT_YEAR_SPANS
+        ],
+        CURVE_FANOUT: [
+            (FANOUT_CURVE_PARCELS, DEFAULT_YEARS, fanout) for fanout in fanouts or DEFAULT_FANOUTS
+        ],
+    }
+
+    cases = {}
+    for curve, points in curve_points.items():
+        for parcels, years, fanout in points:
+            key = get_case_key(parcels, years, fanout)
+            case = cases.setdefault(
+                key,
+                {"key": key, "curves": [], "parcels": parcels, "years": years, "fanout": fanout}
+            )
+            case["curves"].append(curve)
+
+    return sorted(cases.values(), key=lambda case: (case["parcels"], case["years"], case["fanout"]))
+
+
+def get_case_key(parcels: int, years: int, fanout: int) -> str:
+    return f"parcels={parcels}|years={years}|fanout={fanout}"
+
+
+def get_case_study_id(case: dict) -> str:
+    return f"{BENCHMARK_STUDY_PREFIX}p{case['parcels']}_y{case['years']}_f{case['fanout']}"
+
+
+def write_scaled_study(
+        template: str,
+        study_id: str,
+        parcels: int,
+        years: int,
+        fanout: int,
+        config_basepath: str = "./config_files"
+) -> str:
+    """
+    Write a study of any size by tiling the parcels of a template study. Parcel tables, measures,
+    and costs repeat the template's parcels in order. Every parcel gets its own gas and electric
+    meter and service; gas mains serve as many parcels as the template's mains do, and each
+    transformer (with one secondary) serves fanout parcels. Rates and emissions are extended past
+    the template's last year with its last year's values. Energy profiles are shared with the
+    template
+
+    Args:
+        template (str): The template study ID, i.e. "example_street"
+        study_id (str): The ID of the study to write
+        parcels (int): Number of parcels
+        years (int): Number of simulation years
+        fanout (int): Parcels per transformer
+
+    Optional Args:
+        config_basepath (str): Directory of the study config directories
+
+    Returns:
+        str: The directory of the written study
+    """
+    template_path = os.path.join(config_basepath, template)
+    study_path = os.path.join(config_basepath, study_id)
+    if os.path.exists(study_path):
+        shutil.rmtree(study_path)
+    shutil.copytree(os.path.join(template_path, "scenarios"), os.path.join(study_path, "scenarios"))
+
+    study_config = pd.read_csv(os.path.join(template_path, f"{template}_config.csv"), index_col=0)
+    start_year = int(study_config.loc["start_year", "value"])
+    end_year = start_year + years
+    study_config.loc["street_segment", "value"] = study_id
+    study_config.loc["end_year", "value"] = end_year
+    study_config.loc["gas_pipe_intervention_year", "value"] = min(
+        int(study_config.loc["gas_pipe_intervention_year", "value"]), end_year - 1
+    )
+    study_config.to_csv(os.path.join(study_path, f"{study_id}_config.csv"))
+
+    template_parcel_ids = list(
+        pd.read_csv(os.path.join(template_path, "parcels", "parcels.csv"))["parcel_id"]
+    )
+    parcel_ids = [f"{study_id.upper()}_{i:06d}" for i in range(parcels)]
+    template_rows = [i % len(template_parcel_ids) for i in range(parcels)]
+
+    os.makedirs(os.path.join(study_path, "parcels"))
+    for filename in os.listdir(os.path.join(template_path, "parcels")):
+        parcel_df = pd.read_csv(os.path.join(template_path, "parcels", filename))
+        parcel_df = parcel_df.set_index("parcel_id").loc[
+            [template_parcel_ids[i] for i in template_rows]
+        ]
+        parcel_df.index = pd.Index(parcel_ids, name="parcel_id")
+        parcel_df.to_csv(os.path.join(study_path, "parcels", filename))
+
+    network_path = os.path.join(study_path, "utility_network")
+    os.makedirs(network_path)
+    for filename in os.listdir(os.path.join(template_path, "utility_network")):
+        table_name = filename[len(template) + 1:-len(".csv")]
+        if not filename.startswith(f"{template}_"):
+            shutil.copy(os.path.join(template_path, "utility_network", filename), network_path)
+        elif table_name in SCALED_NETWORK_TABLES:
+            continue
+        elif table_name in ["consumption_rates", "emission_rates"]:
+            table_df = pd.read_csv(os.path.join(template_path, "utility_network", filename))
+            _extend_years(table_df, end_year).to_csv(
+                os.path.join(network_path, f"{study_id}_{table_name}.csv"), index=False
+            )
+        else:
+            shutil.copy(
+                os.path.join(template_path, "utility_network", filename),
+                os.path.join(network_path, f"{study_id}_{table_name}.csv")
+            )
+
+    _write_scaled_network(template_path, template, network_path, study_id, parcel_ids, fanout)
+
+    return study_path
+
+
+def _extend_years(table_df: pd.DataFrame, end_year: int) -> pd.DataFrame:
+    """
+    Repeat the last year of a table indexed by a Year column through end_year
+    """
+    last_row = table_df.iloc[-1]
+    extra_years = range(int(last_row["Year"]) + 1, end_year + 1)
+    extra_rows = pd.DataFrame([last_row] * len(extra_years)).assign(Year=list(extra_years))
+
+    return pd.concat([table_df, extra_rows], ignore_index=True).astype(table_df.dtypes.to_dict())
+
+
+def _write_scaled_network(
+        template_path: str,
+        template: str,
+        network_path: str,
+        study_id: str,
+        parcel_ids: List[str],
+        fanout: int
+) -> None:
+    """
+    Write the gas main, transformer, secondary, and per-parcel meter and service tables
+    """
+    def read_table(table_name: str) -> pd.DataFrame:
+        return pd.read_csv(
+            os.path.join(template_path, "utility_network", f"{template}_{table_name}.csv")
+        )
+
+    def write_table(table_df: pd.DataFrame, table_name: str) -> None:
+        table_df.to_csv(os.path.join(network_path, f"{study_id}_{table_name}.csv"), index=False)
+
+    def repeat_row(table_df: pd.DataFrame, count: int, prefix: str) -> pd.DataFrame:
+        table_df = table_df.iloc[[0] * count].reset_index(drop=True)
+        table_df["gisid"] = [f"{prefix}{i + 1}" for i in range(count)]
+        return table_df
+
+    num_parcels = len(parcel_ids)
+    template_mains = read_table("gas_main")
+    parcels_per_main = math.ceil(len(read_table("gas_services")) / len(template_mains))
+    num_mains = math.ceil(num_parcels / parcels_per_main)
+    num_transformers = math.ceil(num_parcels / fanout)
+
+    parents = {
+        "gas_main": repeat_row(template_mains, num_mains, "GP"),
+        "elec_xmfrs": repeat_row(read_table("elec_xmfrs"), num_transformers, "TB_"),
+        "elec_secondaries": repeat_row(read_table("elec_secondaries"), num_transformers, "ES_"),
+    }
+    parents["elec_secondaries"]["parentid"] = parents["elec_xmfrs"]["gisid"]
+    for table_name, table_df in parents.items():
+        write_table(table_df, table_name)
+
+    parent_rows = {
+        "gas_main": [i // parcels_per_main for i in range(num_parcels)],
+        "elec_secondaries": [i // fanout for i in range(num_parcels)],
+    }
+    prefixes = {
+        "gas_services": "GS_", "gas_meters": "GM_", "elec_services": "EV_", "elec_meters": "EM_"
+    }
+    for table_name in ["gas_services", "gas_meters", "elec_services", "elec_meters"]:
+        parent_table = PARCEL_NETWORK_TABLES[table_name]
+        if parent_table in parent_rows:
+            parent_ids = parents[parent_table]["gisid"].iloc[parent_rows[parent_table]].to_list()
+        else:
+            parent_ids = parents[parent_table]["gisid"].to_list()
+
+        table_df = repeat_row(read_table(table_name), num_parcels, prefixes[table_name])
+        table_df["parentid"] = parent_ids
+        table_df["LOC_ID"] = parcel_ids
+        write_table(table_df, table_name)
+        parents[table_name] = table_df
+
+
+def compare_to_baseline(
+        results: dict,
+        baseline: dict,
+        threshold: float = DEFAULT_THRESHOLD
+) -> List[dict]:
+    """
+    Find stages slower or larger than in a baseline by more than a threshold. Stages of cases
+    missing from the baseline, and stages below MIN_COMPARED_SECONDS or MIN_COMPARED_MB in the
+    baseline, are not compared. Raises a ValueError if the results were run with different
+    BASELINE_SETTINGS than the baseline
+
+    Args:
+        results (dict): Benchmark results
+        baseline (dict): Baseline benchmark results
+
+    Optional Args:
+        threshold (float): The allowed relative increase, i.e. 0.25 for 25%
+
+    Returns:
+        List[dict]: The case, stage, metric, baseline and current values, and ratio of each
+            regression
+    """
+    for setting in BASELINE_SETTINGS:
+        if baseline.get(setting) != results.get(setting):
+            raise ValueError(
+                f"Benchmark {setting} {results.get(setting)} does not match the baseline's "
+                f"{baseline.get(setting)}!"
+            )
+
+    baseline_cases = {case["key"]: case for case in baseline.get("cases", [])}
+    minimums = {"wall_s": MIN_COMPARED_SECONDS, "peak_mb": MIN_COMPARED_MB}
+
+    regressions = []
+    for case in results["cases"]:
+        if case["key"] not in baseline_cases:
+            continue
+        baseline_stages = baseline_cases[case["key"]]["stages"]
+        for stage, stats in case["stages"].items():
+            for metric, minimum in minimums.items():
+                baseline_value = baseline_stages.get(stage, {}).get(metric)
+                if baseline_value is None or metric not in stats or baseline_value < minimum:
+                    continue
+                ratio = stats[metric] / baseline_value
+                if ratio > 1 + threshold:
+                    regressions.append({
+                        "case": case["key"],
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": baseline_value,
+                        "current": stats[metric],
+                        "ratio": round(ratio, 3),
+                    })
+
+    return regressions
+
+
+def get_scaling_curves(results: dict) -> Dict[str, dict]:
+    """
+    The wall time of each stage along each curve, and its scaling exponent: the slope of log
+    wall time against log parameter, so 1 is linear scaling
+
+    Args:
+        results (dict): Benchmark results
+
+    Returns:
+        Dict[str, dict]: The x values and each stage's wall_s values and exponent, by curve
+    """
+    curves = {}
+    for curve in CURVES:
+        cases = sorted(
+            [case for case in results["cases"] if curve in case["curves"]],
+            key=lambda case: case[curve]
+        )
+        if not cases:
+            continue
+
+        x = [case[curve] for case in cases]
+        stages = {}
+        for stage in cases[0]["stages"]:
+            wall_s = [case["stages"].get(stage, {}).get("wall_s", 0.0) for case in cases]
+            stages[stage] = {"wall_s": wall_s, "exponent": _get_exponent(x, wall_s)}
+        curves[curve] = {"x": x, "stages": stages}
+
+    return curves
+
+
+def _get_exponent(x: List[float], y: List[float]) -> float:
+    points = [(i, j) for i, j in zip(x, y) if i > 0 and j > 0]
+    if len(points) < 2 or len({i for i, _ in points}) < 2:
+        return None
+
+    log_x, log_y = np.log(np.array(points, dtype=float)).T
+    return round(float(np.polyfit(log_x, log_y, 1)[0]), 3)
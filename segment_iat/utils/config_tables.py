@@ -0,0 +1,128 @@
+"""
+Study-level repository of config tables, so each table is read once per run
+"""
+import os
+from typing import Dict, Tuple
+
+import pandas as pd
+
+
+DB_BASEPATH = "./config_files/"
+
+
+class ConfigTables:
+    """
+    Loads each config table of a Study at most once and hands out pre-indexed lookups. Tables are
+    shared between all Buildings, utility assets, and Scenarios using the repository, so returned
+    tables should be treated as read-only
+
+    Args:
+        segment_id (str): The ID of the segment (the Study config directory name)
+
+    Attributes:
+        segment_id (str): The ID of the segment
+
+    Methods:
+        get_measure_costs (Dict[str, dict]): Building measure cost rows, by parcel ID
+        get_consumption_rates (pd.DataFrame): Energy consumption rates, indexed by year
+        get_alternate_rate (pd.DataFrame): An alternate electricity tariff, by month
+        get_emission_rates (pd.DataFrame): Emission rates, indexed by year
+        get_leakage_factor (float): The methane leakage factor of an asset type and code
+        get_operating_expenses (Dict[int, float]): O&M cost per mile of a pipeline type and material
+    """
+    def __init__(self, segment_id: str):
+        self.segment_id: str = segment_id
+
+        self._config_filepath: str = os.path.join(DB_BASEPATH, segment_id)
+        self._tables: dict = {}
+
+    def _get_table(self, key: Tuple, loader):
+        if key not in self._tables:
+            self._tables[key] = loader()
+
+        return self._tables[key]
+
+    def _get_utility_network_filepath(self, table_name: str) -> str:
+        return os.path.join(
+            self._config_filepath, "utility_network", f"{self.segment_id}_{table_name}.csv"
+        )
+
+    def get_measure_costs(self, costs_id: str) -> Dict[str, dict]:
+        """
+        Get the building measure costs table (parcels/<costs_id>.csv) as a dict of cost rows by
+        parcel ID
+        """
+        return self._get_table(
+            ("measure_costs", costs_id),
+            lambda: pd.read_csv(
+                os.path.join(self._config_filepath, "parcels", f"{costs_id}.csv"),
+                index_col="parcel_id"
+            ).to_dict(orient="index")
+        )
+
+    def get_consumption_rates(self) -> pd.DataFrame:
+        return self._get_table(
+            ("consumption_rates",),
+            lambda: pd.read_csv(
+                self._get_utility_network_filepath("consumption_rates"), index_col=0
+            )
+        )
+
+    def get_alternate_rate(self, rate_id: str) -> pd.DataFrame:
+        return self._get_table(
+            ("alternate_rate", rate_id),
+            lambda: pd.read_csv(
+                os.path.join(self._config_filepath, "utility_network", f"{rate_id}.csv")
+            )
+        )
+
+    def get_emission_rates(self) -> pd.DataFrame:
+        return self._get_table(
+            ("emission_rates",),
+            lambda: pd.read_csv(
+                self._get_utility_network_filepath("emission_rates"), index_col="Year"
+            )
+        )
+
+    def get_leakage_factor(self, asset: str, code: str) -> float:
+        """
+        Get the methane leakage factor for an asset type and code (i.e. pipe material). If the
+        table has duplicate rows, the first one is used
+        """
+        def load_leakage_factors() -> Dict[Tuple[str, str], float]:
+            leakage_factors = pd.read_csv(self._get_utility_network_filepath("leakage_factors"))
+
+            factors = {}
+            for row_asset, row_code, value in zip(
+                leakage_factors["asset"], leakage_factors["code"], leakage_factors["value"]
+            ):
+                factors.setdefault((row_asset, row_code), value)
+
+            return factors
+
+        factors = self._get_table(("leakage_factors",), load_leakage_factors)
+
+        if (asset, code) not in factors:
+            raise KeyError(f"No leakage factor for asset {asset} with code {code}!")
+
+        return factors[(asset, code)]
+
+    def get_operating_expenses(self, pipeline_type: str, material: str) -> Dict[int, float]:
+        """
+        Get the operating expenses per mile of a pipeline type and material, keyed by row of the
+        O&M table. Returns an empty dict if there are no matching rows
+        """
+        def load_operating_expenses() -> Dict[Tuple[str, str], Dict[int, float]]:
+            om_table = pd.read_csv(self._get_utility_network_filepath("operating_expenses"))
+
+            expenses = {}
+            for row, (row_type, row_material, value) in enumerate(zip(
+                om_table["type"], om_table["material"], om_table["operating_expense_per_mile"]
+            )):
+                expenses.setdefault((row_type, row_material), {})[row] = value
+
+            return expenses
+
+        expenses = self._get_table(("operating_expenses",), load_operating_expenses)
+
+        return expenses.get((pipeline_type, material), {})
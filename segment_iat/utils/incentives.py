@@ -2,9 +2,6 @@
 Object for storing incentive information
 """
 import os
-import requests
-
-from dotenv import load_dotenv
 
 
 INCENTIVE_API_URI = "https://api.rewiringamerica.org/api/v1/calculator"
@@ -56,8 +53,12 @@ class Incentives:
     
     def _call_rewiring_api(self) -> list:
         """
-        Call RA incentive API
+        Call RA incentive API. requests and dotenv are only imported here, so importing the
+        simulation modules does not pay for them
         """
+        import requests
+        from dotenv import load_dotenv
+
         load_dotenv()
         MY_KEY = os.environ.get("REWIRING_INCENTIVE_API_KEY")
         headers = {"Authorization": f"Bearer {MY_KEY}"}
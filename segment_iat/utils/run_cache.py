@@ -0,0 +1,293 @@
+"""
+Content-addressed cache of scenario outputs, keyed by a hash of every input of the scenario
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+import segment_iat
+from segment_iat.segment_study.segment_study import PROFILES_BASEPATH, SegmentStudy
+from segment_iat.energy_profiles.profile_store import COMPILED_DIRNAME
+
+
+RUN_CACHE_DIR = "./outputs/.run_cache"
+FILE_HASHES_FILENAME = "file_hashes.json"
+MANIFEST_FILENAME = "manifest.json"
+FILES_DIRNAME = "files"
+
+# Bump to invalidate every cached run, i.e. when the cache layout changes
+CACHE_VERSION = 1
+
+# Scenario settings naming parcel tables used by the scenario
+SCENARIO_PARCEL_TABLE_KEYS = [
+    "parcel_retrofit_measures_filename",
+    "parcel_retrofit_measure_costs_filename",
+]
+
+
+class RunCache:
+    """
+    Cache of scenario outputs. A scenario's key hashes the contents of everything it reads: the
+    study and scenario configs, the parcels table and the scenario's parcel measure and cost
+    tables, the utility network tables, the energy profiles of its buildings, and the model source
+    code, along with run options that change outputs. Editing one scenario's measures therefore
+    only changes that scenario's key. File hashes are remembered by size and modification time,
+    so unchanged profiles are not re-read on every run. Incentives are queried from an API at run
+    time and are not part of the key; use --force to pick up incentive changes
+
+    Args:
+        None
+
+    Optional Args:
+        cache_dir (str): Directory of the cache
+
+    Attributes:
+        cache_dir (str): Directory of the cache
+
+    Methods:
+        get_scenario_key (str): Hash the inputs of a scenario
+        restore (dict): Copy the cached outputs of a key back into place
+        store (None): Save the outputs of a scenario under its key
+        prune (List[str]): Remove superseded or unused cached runs
+    """
+    def __init__(self, cache_dir: str = RUN_CACHE_DIR):
+        self.cache_dir: str = cache_dir
+
+        self._file_hashes: Dict[str, list] = self._load_file_hashes()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _get_cached_filepath(self, key: str, filepath: str) -> str:
+        return os.path.join(
+            self._get_entry_path(key), FILES_DIRNAME, os.path.splitdrive(filepath)[1].lstrip(os.sep)
+        )
+
+    def _load_file_hashes(self) -> Dict[str, list]:
+        filepath = os.path.join(self.cache_dir, FILE_HASHES_FILENAME)
+        if not os.path.exists(filepath):
+            return {}
+
+        with open(filepath) as f:
+            return json.load(f)
+
+    def _save_file_hashes(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_filepath = os.path.join(self.cache_dir, f"{FILE_HASHES_FILENAME}.{os.getpid()}")
+        with open(tmp_filepath, "w") as f:
+            json.dump(self._file_hashes, f)
+        os.replace(tmp_filepath, os.path.join(self.cache_dir, FILE_HASHES_FILENAME))
+
+    def _hash_file(self, filepath: str) -> str:
+        """
+        Hash a file's contents, reusing the stored hash if its size and mtime are unchanged
+        """
+        if not os.path.exists(filepath):
+            return "missing"
+
+        stat = os.stat(filepath)
+        abs_filepath = os.path.abspath(filepath)
+        stored = self._file_hashes.get(abs_filepath)
+        if stored and stored[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return stored[2]
+
+        file_hash = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                file_hash.update(chunk)
+
+        self._file_hashes[abs_filepath] = [stat.st_size, stat.st_mtime_ns, file_hash.hexdigest()]
+        return file_hash.hexdigest()
+
+    def _get_input_filepaths(self, study: SegmentStudy, scenario: str) -> List[str]:
+        study_basepath = f"./config_files/{study.segment_name}"
+        scenario_filepath = os.path.join(study_basepath, "scenarios", f"{scenario}_config.csv")
+
+        settings = pd.read_csv(scenario_filepath, index_col=0, header=None).iloc[:, 0].to_dict()
+
+        filepaths = [
+            os.path.join(study_basepath, f"{study.segment_name}_config.csv"),
+            scenario_filepath,
+            os.path.join(study_basepath, "parcels", "parcels.csv"),
+        ]
+        filepaths += [
+            os.path.join(study_basepath, "parcels", f"{settings.get(key)}.csv")
+            for key in SCENARIO_PARCEL_TABLE_KEYS
+        ]
+        # Costs of each parcel's existing assets, named by the parcels table
+        existing_costs_ids = {
+            parcel.get("measure_costs_filename") for parcel in study.parcels_table.values()
+        }
+        filepaths += [
+            os.path.join(study_basepath, "parcels", f"{costs_id}.csv")
+            for costs_id in sorted(i for i in existing_costs_ids if not pd.isna(i))
+        ]
+        filepaths += sorted(glob.glob(os.path.join(study_basepath, "utility_network", "*")))
+
+        # A profile's CSV is its source; the compiled profile is only used if the CSV is missing
+        for consumption_id, _ in study.get_profile_keys([scenario]):
+            csv_filepath = os.path.join(PROFILES_BASEPATH, f"{consumption_id}.csv")
+            if os.path.exists(csv_filepath):
+                filepaths.append(csv_filepath)
+            else:
+                filepaths.append(
+                    os.path.join(PROFILES_BASEPATH, COMPILED_DIRNAME, f"{consumption_id}.npy")
+                )
+
+        package_path = os.path.dirname(segment_iat.__file__)
+        filepaths += sorted(glob.glob(os.path.join(package_path, "**", "*.py"), recursive=True))
+
+        return filepaths
+
+    def get_scenario_key(self, study: SegmentStudy, scenario: str, run_options: dict) -> str:
+        """
+        Hash every input of a scenario
+
+        Args:
+            study (SegmentStudy): The loaded study
+            scenario (str): The scenario ID
+            run_options (dict): Run options that change outputs, i.e. the output format
+
+        Returns:
+            str: The cache key of the scenario
+        """
+        key = hashlib.sha256()
+        key.update(json.dumps(
+            {"version": CACHE_VERSION, "study": study.segment_name, "scenario": scenario,
+             "run_options": run_options},
+            sort_keys=True
+        ).encode())
+
+        package_path = os.path.dirname(os.path.dirname(segment_iat.__file__))
+        for filepath in self._get_input_filepaths(study, scenario):
+            relative_filepath = os.path.relpath(os.path.abspath(filepath), package_path)
+            key.update(f"{relative_filepath}:{self._hash_file(filepath)}\n".encode())
+
+        self._save_file_hashes()
+
+        return key.hexdigest()
+
+    def restore(self, key: str) -> dict:
+        """
+        Copy the cached outputs of a key back to where the scenario wrote them
+
+        Args:
+            key (str): The cache key of the scenario
+
+        Returns:
+            dict: The manifest of the cached run, or None if the key is not cached
+        """
+        manifest_filepath = os.path.join(self._get_entry_path(key), MANIFEST_FILENAME)
+        if not os.path.exists(manifest_filepath):
+            return None
+
+        with open(manifest_filepath) as f:
+            manifest = json.load(f)
+
+        for filepath in manifest["output_filepaths"]:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            shutil.copyfile(self._get_cached_filepath(key, filepath), filepath)
+
+        # Touched on every use, so pruning by age keeps runs that are still being restored
+        os.utime(manifest_filepath)
+
+        return manifest
+
+    def store(
+            self,
+            key: str,
+            study: SegmentStudy,
+            scenario: str,
+            output_filepaths: List[str],
+            building_ids: List[str]
+    ) -> None:
+        """
+        Save copies of a scenario's outputs under its key
+
+        Args:
+            key (str): The cache key of the scenario
+            study (SegmentStudy): The loaded study
+            scenario (str): The scenario ID
+            output_filepaths (List[str]): The output files written by the scenario
+            building_ids (List[str]): The IDs of the buildings simulated in the scenario
+
+        Returns:
+            None
+        """
+        entry_path = self._get_entry_path(key)
+        tmp_key = f"{key}.{os.getpid()}.tmp"
+        tmp_entry_path = self._get_entry_path(tmp_key)
+        shutil.rmtree(tmp_entry_path, ignore_errors=True)
+
+        output_filepaths = [os.path.normpath(i) for i in output_filepaths]
+        for filepath in output_filepaths:
+            cached_filepath = self._get_cached_filepath(tmp_key, filepath)
+            os.makedirs(os.path.dirname(cached_filepath), exist_ok=True)
+            shutil.copyfile(filepath, cached_filepath)
+
+        with open(os.path.join(tmp_entry_path, MANIFEST_FILENAME), "w") as f:
+            json.dump({
+                "study": study.segment_name,
+                "scenario": scenario,
+                "street_segment": study.segment_name,
+                "building_ids": [str(i) for i in building_ids],
+                "output_filepaths": output_filepaths,
+                "created": time.time(),
+            }, f, indent=2)
+
+        # Entries are swapped in whole, so a partially written entry is never restored
+        shutil.rmtree(entry_path, ignore_errors=True)
+        os.replace(tmp_entry_path, entry_path)
+
+    def _get_manifests(self) -> Dict[str, dict]:
+        manifests = {}
+        for manifest_filepath in glob.glob(os.path.join(self.cache_dir, "*", MANIFEST_FILENAME)):
+            key = os.path.basename(os.path.dirname(manifest_filepath))
+            with open(manifest_filepath) as f:
+                manifests[key] = json.load(f)
+            manifests[key]["last_used"] = os.path.getmtime(manifest_filepath)
+
+        return manifests
+
+    def prune(
+            self,
+            current_keys: Dict[tuple, str] = None,
+            max_age_days: float = None
+    ) -> List[str]:
+        """
+        Remove cached runs that are superseded or unused
+
+        Args:
+            None
+
+        Optional Args:
+            current_keys (Dict[tuple, str]): The current key of each (study, scenario). Cached runs
+                of those scenarios under any other key are removed
+            max_age_days (float): Cached runs not stored or restored within this many days are
+                removed
+
+        Returns:
+            List[str]: The removed keys
+        """
+        current_keys = current_keys or {}
+
+        removed_keys = []
+        for key, manifest in self._get_manifests().items():
+            current_key = current_keys.get((manifest["study"], manifest["scenario"]), key)
+            is_superseded = current_key != key
+            is_unused = (
+                max_age_days is not None
+                and time.time() - manifest["last_used"] > max_age_days * 24 * 60 * 60
+            )
+
+            if is_superseded or is_unused:
+                shutil.rmtree(self._get_entry_path(key))
+                removed_keys.append(key)
+
+        return removed_keys
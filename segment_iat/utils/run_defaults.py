@@ -0,0 +1,22 @@
+"""
+Defaults of a run shared by the scripts and the simulation modules. Only the standard library is
+imported here, so scripts can build their argument parsers and pre-check studies without
+importing pandas
+"""
+import os
+
+
+# Memory budget of a ProfileCache
+DEFAULT_MEMORY_BUDGET_MB = 1024
+
+OUTPUT_FORMAT_CSV = "csv"
+OUTPUT_FORMAT_PARQUET = "parquet"
+OUTPUT_FORMATS = [OUTPUT_FORMAT_CSV, OUTPUT_FORMAT_PARQUET]
+# Tables are kept in memory instead of written, i.e. for parameter sweeps
+OUTPUT_FORMAT_MEMORY = "memory"
+
+OUTPUTS_BASEPATH = "./outputs"
+# Stage reports of profiled scenario runs
+STAGE_PROFILES_BASEPATH = os.path.join(OUTPUTS_BASEPATH, "profiles")
+
+CONFIG_BASEPATH = "./config_files"
@@ -0,0 +1,280 @@
+"""
+Stage hooks of a scenario run, and a StageRecorder that records the calls, wall time, CPU time,
+and peak traced memory of each stage
+"""
+import contextlib
+import inspect
+import threading
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Tuple
+
+
+BYTES_PER_MB = 1024 ** 2
+
+# Stage listeners of each thread. Stages entered on other threads, i.e. by profile loading worker
+# threads, are not reported
+_LOCAL = threading.local()
+
+
+class _Stage:
+    """
+    Reports entering and exiting a stage to the stage listeners of the current thread
+    """
+    __slots__ = ("_name", "_listeners")
+
+    def __init__(self, name: str, listeners: List):
+        self._name: str = name
+        self._listeners: List = listeners
+
+    def __enter__(self) -> None:
+        for listener in self._listeners:
+            listener.stage_started(self._name)
+
+    def __exit__(self, *exc_info) -> bool:
+        for listener in reversed(self._listeners):
+            listener.stage_finished(self._name)
+        return False
+
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+def stage(name: str):
+    """
+    A named stage of a run. Entering and exiting the stage calls stage_started(name) and
+    stage_finished(name) on the stage listeners of the current thread; without listeners the stage
+    does nothing
+
+    Args:
+        name (str): The name of the stage, i.e. "utility_network.gas_mains"
+
+    Returns:
+        A context manager around the stage
+    """
+    listeners = getattr(_LOCAL, "listeners", None)
+    if not listeners:
+        return _NO_STAGE
+
+    return _Stage(name, list(listeners))
+
+
+@contextlib.contextmanager
+def listen_stages(listener) -> Iterator[None]:
+    """
+    Report the stages of the current thread to a listener within a block. Listeners are
+    status_logging objects that also implement stage_started(stage) and stage_finished(stage);
+    other objects, None, and listeners already listening are ignored
+
+    Args:
+        listener: The stage listener
+    """
+    listeners = _LOCAL.__dict__.setdefault("listeners", [])
+    if (
+        not hasattr(listener, "stage_started")
+        or not hasattr(listener, "stage_finished")
+        or any(i is listener for i in listeners)
+    ):
+        yield
+        return
+
+    listeners.append(listener)
+    try:
+        yield
+    finally:
+        listeners.remove(listener)
+
+
+class StageRecorder:
+    """
+    Records the calls, wall time, CPU time, and peak traced memory of named stages of a run.
+    Passed as the status_logging of a ScenarioCreator, it records the ScenarioCreator's stage
+    hooks; blocks and methods without hooks can be recorded directly. With track_memory, each
+    stage's peak is the most memory allocated above what was allocated when the stage started,
+    including its nested stages. tracemalloc slows Python code down, so times recorded with
+    track_memory are not comparable to times recorded without it
+
+    Args:
+        None
+
+    Optional Args:
+        track_memory (bool): If True, record peak memory with tracemalloc
+        status_logging: Progress reporter that progress messages are passed on to; prints them if
+            not provided
+
+    Attributes:
+        stages (Dict[str, dict]): The calls, wall_s, cpu_s, and (with track_memory) peak_mb of
+            each stage, in the order stages were first entered
+
+    Methods:
+        progress (None): Pass a progress message on to the status_logging
+        stage_started (None): Start recording a stage
+        stage_finished (None): Finish recording the most recently started stage
+        measure (None): Record a block as a stage
+        instrument (None): Record every call of methods as stages within a block
+        format_report (str): A table of the recorded stages
+    """
+    def __init__(self, track_memory: bool = False, status_logging=None):
+        self._track_memory: bool = track_memory
+        self._status_logging = status_logging
+        self.stages: Dict[str, dict] = {}
+
+        # Start times of each open stage
+        self._open_stages: List[Tuple[str, float, float]] = []
+        # Traced memory at the start of each open stage and the peak traced within it
+        self._memory_stack: List[List[int]] = []
+        self._started_tracing: bool = False
+
+    def progress(self, pct: float, msg: str) -> None:
+        """
+        Pass a progress message on to the status_logging
+
+        Args:
+            pct (float): The share of the run complete
+            msg (str): The status message
+        """
+        if self._status_logging:
+            self._status_logging.progress(pct, msg)
+        else:
+            print(msg)
+
+    def stage_started(self, stage: str) -> None:
+        """
+        Start recording a stage. If memory is tracked and tracemalloc is not tracing, it traces
+        until the outermost open stage finishes
+
+        Args:
+            stage (str): The name of the stage
+        """
+        stats = self.stages.setdefault(stage, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+        if self._track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            stats.setdefault("peak_mb", 0.0)
+            self._start_memory()
+
+        self._open_stages.append((stage, time.perf_counter(), time.process_time()))
+
+    def stage_finished(self, stage: str) -> None:
+        """
+        Finish recording the most recently started stage
+
+        Args:
+            stage (str): The name of the stage
+        """
+        started_stage, start_wall, start_cpu = self._open_stages.pop()
+        if started_stage != stage:
+            raise ValueError(f"Stage {stage} finished before its nested stage {started_stage}!")
+
+        stats = self.stages[stage]
+        stats["wall_s"] += time.perf_counter() - start_wall
+        stats["cpu_s"] += time.process_time() - start_cpu
+        stats["calls"] += 1
+        if self._track_memory:
+            stats["peak_mb"] = max(stats["peak_mb"], self._end_memory() / BYTES_PER_MB)
+            if self._started_tracing and not self._open_stages:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextlib.contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """
+        Record a block as a stage
+
+        Args:
+            stage (str): The name of the stage
+        """
+        self.stage_started(stage)
+        try:
+            yield
+        finally:
+            self.stage_finished(stage)
+
+    @contextlib.contextmanager
+    def instrument(self, stages: Dict[str, Tuple[type, str]]) -> Iterator[None]:
+        """
+        Record every call of methods without stage hooks as stages within a block. The methods are
+        restored when the block exits. tracemalloc is started for the block if memory is tracked
+
+        Args:
+            stages (Dict[str, Tuple[type, str]]): The class and method name of each stage
+        """
+        originals = []
+        for stage, (owner, method_name) in stages.items():
+            original = inspect.getattr_static(owner, method_name)
+            originals.append((owner, method_name, original))
+            setattr(owner, method_name, self._wrap(stage, original))
+
+        started_tracing = self._track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            yield
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            for owner, method_name, original in reversed(originals):
+                setattr(owner, method_name, original)
+
+    def format_report(self, total_stage: str = None) -> str:
+        """
+        A table of the recorded stages, in the order they were first entered
+
+        Optional Args:
+            total_stage (str): A stage whose wall time each stage's share is given of
+
+        Returns:
+            str: The table
+        """
+        total_wall_s = self.stages.get(total_stage, {}).get("wall_s")
+        header = f"{'stage':45}{'calls':>8}{'wall_s':>11}{'cpu_s':>11}"
+        if self._track_memory:
+            header += f"{'peak_mb':>11}"
+        if total_wall_s:
+            header += f"{'share':>8}"
+
+        lines = [header]
+        for stage, stats in self.stages.items():
+            line = f"{stage:45}{stats['calls']:>8}{stats['wall_s']:>11.3f}{stats['cpu_s']:>11.3f}"
+            if self._track_memory:
+                line += f"{stats['peak_mb']:>11.1f}"
+            if total_wall_s:
+                line += f"{stats['wall_s'] / total_wall_s:>8.1%}"
+            lines.append(line)
+
+        return "\n".join(lines)
+
+    def _wrap(self, stage: str, method):
+        """
+        Wrap a function, staticmethod, or classmethod so each call is recorded as a stage
+        """
+        if isinstance(method, (staticmethod, classmethod)):
+            return type(method)(self._wrap(stage, method.__func__))
+
+        recorder = self
+
+        def recorded(*args, **kwargs):
+            with recorder.measure(stage):
+                return method(*args, **kwargs)
+
+        recorded.__name__ = method.__name__
+        recorded.__doc__ = method.__doc__
+
+        return recorded
+
+    def _start_memory(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._memory_stack:
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._memory_stack.append([current, current])
+
+    def _end_memory(self) -> int:
+        start, stage_peak = self._memory_stack.pop()
+        stage_peak = max(stage_peak, tracemalloc.get_traced_memory()[1])
+        if self._memory_stack:
+            self._memory_stack[-1][1] = max(self._memory_stack[-1][1], stage_peak)
+
+        return stage_peak - start
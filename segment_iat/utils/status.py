@@ -0,0 +1,26 @@
+"""
+Status reporting shared by the scenario runners: a reporter that discards messages, and reporting
+a message to an optional progress reporter
+"""
+
+
+class QuietStatus:
+    """
+    Discards status messages, i.e. of the scenario runs inside a sweep, optimizer, or check
+
+    Methods:
+        progress (None): Discard a status message
+    """
+    def progress(self, pct: float, msg: str) -> None:
+        pass
+
+
+def report_status(status_logging, msg: str, pct: float) -> None:
+    """
+    Report a status message to a progress reporter with a progress(pct, msg) method, or print it
+    if there is no reporter
+    """
+    if status_logging:
+        status_logging.progress(pct, msg)
+    else:
+        print(msg)
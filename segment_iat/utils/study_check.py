@@ -0,0 +1,210 @@
+"""
+Pre-check of a study's config files before it is loaded. Config files are read with the csv module,
+so a study can be checked, and its scenarios listed, without importing pandas
+"""
+import csv
+import os
+from typing import Dict, List
+
+from segment_iat.utils.run_defaults import CONFIG_BASEPATH
+
+
+SCENARIO_CONFIG_SUFFIX = "_config.csv"
+
+# Inputs SegmentStudy needs from the study config
+REQUIRED_STUDY_INPUTS = [
+    "street_segment",
+    "zip_code",
+    "start_year",
+    "end_year",
+    "gas_pipe_intervention_year",
+]
+INTEGER_STUDY_INPUTS = [
+    "zip_code", "start_year", "end_year", "gas_pipe_intervention_year", "weather_year"
+]
+# Settings ScenarioCreator needs from a scenario config
+REQUIRED_SCENARIO_SETTINGS = ["gas_intervention", "parcel_retrofit_measures_filename"]
+
+REQUIRED_PARCELS_COLS = ["parcel_id", "install_year", "baseline_consumption_id"]
+REQUIRED_MEASURES_COLS = ["parcel_id", "energy_profile_id"]
+
+
+def get_study_config_filepath(study: str, config_basepath: str = CONFIG_BASEPATH) -> str:
+    return os.path.join(config_basepath, study, f"{study}_config.csv")
+
+
+def get_scenario_config_filepath(
+        study: str,
+        scenario: str,
+        config_basepath: str = CONFIG_BASEPATH
+) -> str:
+    return os.path.join(config_basepath, study, "scenarios", f"{scenario}{SCENARIO_CONFIG_SUFFIX}")
+
+
+def get_scenarios(
+        study: str,
+        scenarios: List[str] = None,
+        config_basepath: str = CONFIG_BASEPATH
+) -> List[str]:
+    """
+    Get the scenarios to run of a study, checking that the study and each scenario has a config
+    file
+
+    Args:
+        study (str): The study ID
+
+    Optional Args:
+        scenarios (List[str]): The requested scenario IDs, case-insensitive; every scenario of
+            the study if not provided
+        config_basepath (str): Directory of the study config directories
+
+    Returns:
+        List[str]: The scenario IDs
+
+    Raises:
+        FileNotFoundError: If the study or a requested scenario has no config file
+    """
+    if not os.path.exists(get_study_config_filepath(study, config_basepath)):
+        raise FileNotFoundError(f"Config file does not exist for study {study.upper()}")
+
+    if not scenarios:
+        scenarios_path = os.path.join(config_basepath, study, "scenarios")
+        return [
+            i[:-len(SCENARIO_CONFIG_SUFFIX)]
+            for i in os.listdir(scenarios_path)
+            if i.endswith(SCENARIO_CONFIG_SUFFIX)
+        ]
+
+    scenarios = [i.lower() for i in scenarios]
+    for scenario in scenarios:
+        scenario_filepath = get_scenario_config_filepath(study, scenario, config_basepath)
+        if not os.path.exists(scenario_filepath):
+            raise FileNotFoundError(
+                f"File for scenario {scenario.upper()} does not exist for study {study.upper()}. "
+                f"No file found at {scenario_filepath}"
+            )
+
+    return scenarios
+
+
+def check_study(
+        study: str,
+        scenarios: List[str],
+        config_basepath: str = CONFIG_BASEPATH
+) -> List[str]:
+    """
+    Check the inputs of a study and its scenarios that a run reads before simulating: the study
+    config values, the parcels table, and each scenario's settings, measures, and measure costs.
+    Only the headers of the parcels and measures tables are read
+
+    Args:
+        study (str): The study ID
+        scenarios (List[str]): The scenario IDs (see get_scenarios)
+
+    Optional Args:
+        config_basepath (str): Directory of the study config directories
+
+    Returns:
+        List[str]: A description of each problem found; empty if the study can be run
+    """
+    study_path = os.path.join(config_basepath, study)
+    study_inputs = read_config(get_study_config_filepath(study, config_basepath))
+    problems = _check_study_config(study, study_inputs)
+
+    parcels_filepath = os.path.join(study_path, "parcels", "parcels.csv")
+    problems.extend(_check_table(parcels_filepath, REQUIRED_PARCELS_COLS))
+
+    if not os.path.isdir(os.path.join(study_path, "utility_network")):
+        problems.append(f"Utility network directory does not exist for study {study.upper()}")
+
+    for scenario in scenarios:
+        settings = read_config(get_scenario_config_filepath(study, scenario, config_basepath))
+        missing_settings = [i for i in REQUIRED_SCENARIO_SETTINGS if not settings.get(i)]
+        if missing_settings:
+            problems.append(f"Scenario {scenario.upper()} is missing settings {missing_settings}")
+
+        measures_id = settings.get("parcel_retrofit_measures_filename")
+        if measures_id:
+            problems.extend(
+                f"Scenario {scenario.upper()}: {i}" for i in _check_table(
+                    os.path.join(study_path, "parcels", f"{measures_id}.csv"),
+                    REQUIRED_MEASURES_COLS
+                )
+            )
+
+        costs_id = settings.get("parcel_retrofit_measure_costs_filename")
+        costs_filepath = os.path.join(study_path, "parcels", f"{costs_id}.csv")
+        if costs_id and not os.path.exists(costs_filepath):
+            problems.append(
+                f"Scenario {scenario.upper()}: No measure costs file found at {costs_filepath}"
+            )
+
+    return problems
+
+
+def read_config(filepath: str) -> Dict[str, str]:
+    """
+    Read a two-column config file (a study or scenario config) as a dict of its values by input
+    name. Values are strings, as pandas reads them from these mixed-type files
+    """
+    with open(filepath, newline="") as f:
+        return {row[0]: row[1] for row in csv.reader(f) if len(row) >= 2}
+
+
+def _check_study_config(study: str, study_inputs: Dict[str, str]) -> List[str]:
+    """
+    Problems with the values of a study config
+    """
+    problems = []
+    missing_inputs = [i for i in REQUIRED_STUDY_INPUTS if not study_inputs.get(i)]
+    if missing_inputs:
+        problems.append(f"Study {study.upper()} config is missing inputs {missing_inputs}")
+
+    segment_name = study_inputs.get("street_segment")
+    if segment_name and segment_name != study:
+        problems.append(
+            f"Study {study.upper()} config has street_segment {segment_name}; it must be the "
+            "study ID"
+        )
+
+    values = {}
+    for study_input in INTEGER_STUDY_INPUTS:
+        value = study_inputs.get(study_input)
+        if not value:
+            continue
+        try:
+            values[study_input] = int(value)
+        except ValueError:
+            problems.append(f"Study {study.upper()} {study_input} {value} is not an integer")
+
+    start_year = values.get("start_year")
+    end_year = values.get("end_year")
+    intervention_year = values.get("gas_pipe_intervention_year")
+    if start_year is not None and end_year is not None and start_year >= end_year:
+        problems.append(f"Study {study.upper()} start_year must be before its end_year")
+    elif (
+            None not in (start_year, end_year, intervention_year)
+            and not start_year <= intervention_year <= end_year
+    ):
+        problems.append(
+            f"Study {study.upper()} gas_pipe_intervention_year must be between its start_year "
+            "and end_year"
+        )
+
+    return problems
+
+
+def _check_table(filepath: str, required_cols: List[str]) -> List[str]:
+    """
+    Problems with a table: a missing file, or columns missing from its header
+    """
+    if not os.path.exists(filepath):
+        return [f"No file found at {filepath}"]
+
+    with open(filepath, newline="") as f:
+        header = next(csv.reader(f), [])
+    missing_cols = [i for i in required_cols if i not in header]
+    if missing_cols:
+        return [f"{filepath} is missing columns {missing_cols}"]
+
+    return []
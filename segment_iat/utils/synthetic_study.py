@@ -0,0 +1,644 @@
+"""
+Defines a SyntheticStudy class, which writes a complete study of any size, with synthetic energy
+profiles, from a seed
+"""
+import math
+import os
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.energy_profiles.profile_store import COMPILED_DIRNAME, ProfileStore
+from segment_iat.utils.time_axis import DEFAULT_WEATHER_YEAR, TIMESTAMP_COL
+
+
+PROFILES_BASEPATH = "./config_files/energy_consumption"
+
+DEFAULT_SEED = 0
+DEFAULT_PARCELS_PER_TRANSFORMER = 8
+DEFAULT_PARCELS_PER_MAIN = 40
+DEFAULT_RETROFIT_WAVES = 3
+DEFAULT_ARCHETYPES = 6
+DEFAULT_START_YEAR = 2025
+DEFAULT_END_YEAR = 2050
+DEFAULT_GAS_PIPE_INTERVENTION_YEAR = 2035
+DEFAULT_ZIP_CODE = "10710"
+DEFAULT_INCOME = 156200
+
+TRANSFORMERS_PER_PRIMARY = 50
+ELEC_BASELINE_SHARE = 0.1
+# Standard single-phase transformer sizes; each transformer gets the smallest that covers its
+# parcels at KVA_PER_PARCEL, so the largest fan-outs are the first to need upgrades
+TRANSFORMER_KVAS = [25, 37.5, 50, 75, 100, 167, 250, 333, 500]
+KVA_PER_PARCEL = 6
+# Share of gas mains and services of each material, oldest first
+PIPE_MATERIALS = {"CI": 0.3, "BS": 0.2, "CS": 0.2, "PL": 0.3}
+OPERATING_EXPENSE_PER_MILE = 23423
+MAIN_COST_PER_FT = 568
+FRONTAGE_FT = (40, 80)
+
+GAS_BASELINE = "gas_baseline"
+ELEC_BASELINE = "elec_baseline"
+HEAT_PUMP = "heat_pump"
+THERMAL = "thermal"
+PROFILE_VARIANTS = [GAS_BASELINE, ELEC_BASELINE, HEAT_PUMP, THERMAL]
+
+CONTINUED_GAS = "continued_gas"
+MANAGED_ELEC = "managed_elec"
+THERMAL_NETWORK = "thermal_network"
+# The gas intervention, retrofit profile variant, heating fuel, and measures of each scenario.
+# Continued gas parcels replace their existing equipment like for like
+SCENARIOS = {
+    CONTINUED_GAS: {"gas_intervention": "replace", "costs": "gas_costs"},
+    MANAGED_ELEC: {
+        "gas_intervention": "decommission",
+        "costs": "elec_costs",
+        "variant": HEAT_PUMP,
+        "heating_fuel": "Electricity",
+        "measures": {
+            "hvac": "ducted_heat_pump",
+            "domestic_hot_water": "heat_pump_water_heater",
+            "clothes_dryer": "heat_pump_clothes_dryer",
+            "stove": "electric_stove",
+        },
+    },
+    THERMAL_NETWORK: {
+        "gas_intervention": "decommission",
+        "costs": "thermal_costs",
+        "variant": THERMAL,
+        "heating_fuel": "Thermal",
+        "measures": {
+            "hvac": "thermal_network",
+            "domestic_hot_water": "heat_pump_water_heater",
+            "clothes_dryer": "heat_pump_clothes_dryer",
+            "stove": "electric_stove",
+        },
+    },
+}
+BASELINE_MEASURES = {
+    "Natural gas": {
+        "hvac": "gas_furnace",
+        "domestic_hot_water": "gas_water_heater",
+        "clothes_dryer": "gas_dryer",
+        "stove": "gas_stove",
+    },
+    "Electricity": {
+        "hvac": "electric_resistance",
+        "domestic_hot_water": "electric_water_heater",
+        "clothes_dryer": "electric_dryer",
+        "stove": "electric_stove",
+    },
+}
+MEASURE_COLUMNS = [
+    "hvac", "domestic_hot_water", "clothes_dryer", "stove", "weatherization", "panel_upgrade"
+]
+# Median cost of each measure by cost table; parcels scale them by their archetype's size
+MEASURE_COSTS = {
+    "gas_costs": [3900, 1250, 750, 650, 0, 0],
+    "elec_costs": [14400, 2350, 450, 850, 11300, 2500],
+    "thermal_costs": [17300, 2350, 450, 850, 11300, 0],
+}
+EQUIPMENT_LIFETIME = 20
+
+CONSUMPTION_RATES = {
+    "natural_gas": (23.33, 0.07),
+    "electricity": (18.14, 0.23),
+    "fuel_oil": (0, 0),
+    "propane": (0, 0),
+    "thermal_cooling": (4.875, 0),
+    "thermal_heating": (4.875, 0),
+}
+RATE_ESCALATION = {"natural_gas": 0.04, "electricity": 0.02}
+EMISSION_RATES = {
+    "natural_gas": 0.000199,
+    "electricity": 0.000269,
+    "fuel_oil": 0.000278,
+    "propane": 0.000232,
+    "thermal_cooling": 0,
+    "thermal_heating": 0,
+}
+# The electric grid's emission rate falls linearly to this share of its first year's rate
+ELECTRICITY_EMISSIONS_END_SHARE = 0.2
+LEAKAGE_FACTORS = [
+    ("gas_main", "CI", 0.2192, "kgCH4/ft-yr"),
+    ("gas_main", "BS", 0.1631, "kgCH4/ft-yr"),
+    ("gas_main", "CS", 0.0112, "kgCH4/ft-yr"),
+    ("gas_main", "PL", 0.0055, "kgCH4/ft-yr"),
+    ("gas_service", "CI", 0.2192, "kgCH4/ft-yr"),
+    ("gas_service", "BS", 0.227, "kgCH4/ft-yr"),
+    ("gas_service", "CS", 0.0179, "kgCH4/ft-yr"),
+    ("gas_service", "PL", 0.0026, "kgCH4/ft-yr"),
+    ("gas_meter", "Residential", 1.5, "kgCH4/meter-yr"),
+]
+DISTRIBUTIONS = [
+    ("existing_cost", "uniform", 0.1),
+    ("retrofit_cost", "triangular", 0.2),
+    ("install_year", "uniform", 3),
+    ("transformer_upgrade_cost", "normal", 0.15),
+]
+THERMAL_NETWORK_CONFIG = {"install_cost_per_ton": 20000, "lifetime": 55, "om_per_cust": 9500}
+
+# Hourly outdoor temperature of the synthetic weather year, in C
+MEAN_TEMPERATURE = 11
+ANNUAL_SWING = 14
+DAILY_SWING = 5
+HEATING_BALANCE_POINT = 16
+COOLING_BALANCE_POINT = 22
+FURNACE_EFFICIENCY = 0.8
+AIR_CONDITIONER_COP = 3
+NETWORK_HEAT_PUMP_COP = 4.5
+
+
+class SyntheticStudy:
+    """
+    A synthetic study of any size, written in the layout of the shipped studies. Every table and
+    energy profile is drawn from one seed, so a seed and the sizing arguments always write the
+    same study
+
+    Parcels are drawn from archetypes, each with a gas baseline, electric baseline, heat pump, and
+    thermal network energy profile synthesized from a synthetic weather year. Parcels are laid
+    along a street in order: consecutive parcels share a transformer and a gas main, with an
+    uneven number of parcels on each. The managed electrification and thermal network scenarios
+    retrofit parcels in waves between the start year and the gas pipe intervention year, one
+    group of gas mains at a time
+
+    Args:
+        study_id (str): The ID of the study to write
+        parcels (int): Number of parcels
+
+    Optional Args:
+        transformers (int): Number of transformers; defaults to one per
+            DEFAULT_PARCELS_PER_TRANSFORMER parcels
+        mains (int): Number of gas mains; defaults to one per DEFAULT_PARCELS_PER_MAIN gas parcels
+        retrofit_waves (int): Number of retrofit waves
+        seed (int): The random seed
+        archetypes (int): Number of building archetypes
+        start_year (int): The start year of the study
+        end_year (int): The end year of the study
+        gas_pipe_intervention_year (int): The year for gas pipe intervention
+        zip_code (str): The zip code of the study, used to gather incentives
+
+    Attributes:
+        study_id (str): The ID of the study
+        parcels_table (pd.DataFrame): The parcels table
+        profiles (Dict[str, pd.DataFrame]): The synthetic energy profiles, by consumption ID
+        tables (Dict[str, pd.DataFrame]): Every other table of the study, by filepath relative to
+            the study directory
+
+    Methods:
+        write_study (str): Write the study config directory and its energy profiles
+    """
+    def __init__(
+            self,
+            study_id: str,
+            parcels: int,
+            transformers: int = None,
+            mains: int = None,
+            retrofit_waves: int = DEFAULT_RETROFIT_WAVES,
+            seed: int = DEFAULT_SEED,
+            archetypes: int = DEFAULT_ARCHETYPES,
+            start_year: int = DEFAULT_START_YEAR,
+            end_year: int = DEFAULT_END_YEAR,
+            gas_pipe_intervention_year: int = DEFAULT_GAS_PIPE_INTERVENTION_YEAR,
+            zip_code: str = DEFAULT_ZIP_CODE
+    ):
+        if parcels < 1:
+            raise ValueError("A synthetic study needs at least one parcel!")
+        if not start_year < gas_pipe_intervention_year <= end_year:
+            raise ValueError(
+                f"Gas pipe intervention year {gas_pipe_intervention_year} must be after the start "
+                f"year {start_year} and no later than the end year {end_year}!"
+            )
+        transformers = transformers or math.ceil(parcels / DEFAULT_PARCELS_PER_TRANSFORMER)
+        if not 1 <= transformers <= parcels:
+            raise ValueError(f"Number of transformers must be between 1 and {parcels}!")
+        if not 1 <= retrofit_waves <= gas_pipe_intervention_year - start_year:
+            raise ValueError(
+                "Number of retrofit waves must be between 1 and the number of years before the "
+                "gas pipe intervention year!"
+            )
+
+        self.study_id: str = study_id
+        self._num_parcels: int = parcels
+        self._num_transformers: int = transformers
+        self._num_mains: int = mains
+        self._retrofit_waves: int = retrofit_waves
+        self._num_archetypes: int = archetypes
+        self._start_year: int = start_year
+        self._end_year: int = end_year
+        self._gas_pipe_intervention_year: int = gas_pipe_intervention_year
+        self._zip_code: str = zip_code
+        self._rng: np.random.Generator = np.random.default_rng(seed)
+
+        self.parcels_table: pd.DataFrame = None
+        self.profiles: Dict[str, pd.DataFrame] = {}
+        self.tables: Dict[str, pd.DataFrame] = {}
+
+        # Draws shared between tables
+        self._archetype_sizes: np.ndarray = None
+        self._archetypes: np.ndarray = None
+        self._uses_gas: np.ndarray = None
+        self._install_years: np.ndarray = None
+        self._main_rows: np.ndarray = None
+
+        self._create_study()
+
+    def write_study(
+            self,
+            config_basepath: str = "./config_files",
+            profiles_dirpath: str = PROFILES_BASEPATH,
+            compile_profiles: bool = False
+    ) -> str:
+        """
+        Write the study config directory and its energy profiles. An existing study directory of
+        the same ID is overwritten
+
+        Optional Args:
+            config_basepath (str): Directory of the study config directories
+            profiles_dirpath (str): Directory of the CSV energy consumption profiles
+            compile_profiles (bool): If True, also compile the profiles into the profile store
+
+        Returns:
+            str: The directory of the written study
+        """
+        study_path = os.path.join(config_basepath, self.study_id)
+        for relative_filepath, table_df in self.tables.items():
+            filepath = os.path.join(study_path, relative_filepath)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            table_df.to_csv(filepath, index=False)
+
+        os.makedirs(profiles_dirpath, exist_ok=True)
+        profile_store = ProfileStore(os.path.join(profiles_dirpath, COMPILED_DIRNAME))
+        for consumption_id, profile_df in self.profiles.items():
+            csv_filepath = os.path.join(profiles_dirpath, f"{consumption_id}.csv")
+            profile_df.to_csv(csv_filepath, float_format="%.6g")
+            if compile_profiles:
+                profile_store.compile_profile(csv_filepath, consumption_id)
+
+        return study_path
+
+    def _create_study(self) -> None:
+        """
+        Draw every table and profile of the study. The draws are made in a fixed order, so the
+        study depends only on the seed and sizing arguments
+        """
+        self._create_profiles()
+        self._create_parcels()
+        self._create_network()
+        self._create_scenarios()
+        self._create_rates()
+
+        self.tables[f"{self.study_id}_config.csv"] = pd.DataFrame({
+            "input": [
+                "street_segment",
+                "start_year",
+                "end_year",
+                "gas_pipe_intervention_year",
+                "zip_code",
+                "income",
+            ],
+            "value": [
+                self.study_id,
+                self._start_year,
+                self._end_year,
+                self._gas_pipe_intervention_year,
+                self._zip_code,
+                DEFAULT_INCOME,
+            ],
+        })
+        self.tables[f"{self.study_id}_distributions.csv"] = pd.DataFrame(
+            DISTRIBUTIONS, columns=["parameter", "distribution", "spread"]
+        )
+
+    def _get_consumption_id(self, archetype: int, variant: str) -> str:
+        return f"{self.study_id}_{archetype + 1:02d}_{variant}"
+
+    def _create_profiles(self) -> None:
+        """
+        Synthesize the hourly profiles of each archetype. Heating and cooling loads follow the
+        degree hours of a synthetic weather year; each variant serves them with its own equipment
+        """
+        timestamps = pd.date_range(
+            f"{DEFAULT_WEATHER_YEAR}-01-01", periods=8760, freq="h", name=TIMESTAMP_COL
+        )
+        day = timestamps.dayofyear.to_numpy() - 1 + timestamps.hour.to_numpy() / 24
+        temperature = (
+            MEAN_TEMPERATURE
+            - ANNUAL_SWING * np.cos(2 * np.pi * (day - 20) / 365)
+            - DAILY_SWING * np.cos(2 * np.pi * (timestamps.hour.to_numpy() - 3) / 24)
+            + np.convolve(self._rng.normal(0, 2, len(day) + 47), np.ones(48) / 48 ** 0.5, "valid")
+        )
+        heating_degrees = np.clip(HEATING_BALANCE_POINT - temperature, 0, None)
+        cooling_degrees = np.clip(temperature - COOLING_BALANCE_POINT, 0, None)
+        heat_pump_cop = np.clip(2.8 + 0.05 * temperature, 1.5, 4)
+        # Morning and evening peaks of plug loads, lighting, and cooking
+        daily_shape = 1 + 0.3 * np.sin(np.pi * timestamps.hour.to_numpy() / 24) ** 8 + 0.5 * (
+            np.cos(2 * np.pi * (timestamps.hour.to_numpy() - 19) / 24).clip(0) ** 4
+        )
+
+        self._archetype_sizes = self._rng.uniform(0.6, 1.6, self._num_archetypes)
+        for archetype, size in enumerate(self._archetype_sizes):
+            heating = 0.25 * size * heating_degrees * self._rng.lognormal(0, 0.1, 8760)
+            cooling = 0.2 * size * cooling_degrees * self._rng.lognormal(0, 0.1, 8760)
+            other = 0.5 * size * daily_shape * self._rng.lognormal(0, 0.2, 8760)
+            air_conditioning = cooling / AIR_CONDITIONER_COP
+            zeros = np.zeros(8760)
+
+            variants = {
+                GAS_BASELINE: (air_conditioning, heating / FURNACE_EFFICIENCY),
+                ELEC_BASELINE: (heating + air_conditioning, zeros),
+                HEAT_PUMP: ((heating + cooling) / heat_pump_cop, zeros),
+                THERMAL: ((heating + cooling) / NETWORK_HEAT_PUMP_COP, zeros),
+            }
+            for variant, (electricity_hvac, gas_heating) in variants.items():
+                profile_df = pd.DataFrame({
+                    "out.electricity.heating.energy_consumption": electricity_hvac,
+                    "out.electricity.other.energy_consumption": other,
+                    "out.natural_gas.heating.energy_consumption": gas_heating,
+                    "out.propane.other.energy_consumption": zeros,
+                    "out.fuel_oil.other.energy_consumption": zeros,
+                }, index=timestamps)
+                if variant == THERMAL:
+                    profile_df["out.thermal_heating.total.energy_consumption"] = heating
+                    profile_df["out.thermal_cooling.total.energy_consumption"] = cooling
+                self.profiles[self._get_consumption_id(archetype, variant)] = profile_df
+
+    def _create_parcels(self) -> None:
+        """
+        Draw the archetype, baseline fuel, equipment age, and load scaling of each parcel, and
+        the measure costs of each cost table
+        """
+        num_parcels = self._num_parcels
+        parcel_ids = [f"{self.study_id.upper()}_{i + 1:06d}" for i in range(num_parcels)]
+        self._archetypes = self._rng.integers(0, self._num_archetypes, num_parcels)
+        self._uses_gas = self._rng.random(num_parcels) >= ELEC_BASELINE_SHARE
+        self._install_years = self._rng.integers(
+            self._start_year - EQUIPMENT_LIFETIME, self._start_year, num_parcels
+        )
+
+        self.parcels_table = pd.DataFrame({
+            "parcel_id": parcel_ids,
+            "install_year": self._install_years,
+            "baseline_consumption_id": [
+                self._get_consumption_id(archetype, GAS_BASELINE if uses_gas else ELEC_BASELINE)
+                for archetype, uses_gas in zip(self._archetypes, self._uses_gas)
+            ],
+            "load_scaling_factor": self._rng.lognormal(0, 0.15, num_parcels).round(2),
+            "uses_piped_gas": self._uses_gas.astype(int),
+            "heating_fuel": np.where(self._uses_gas, "Natural gas", "Electricity"),
+            "measure_costs_filename": np.where(self._uses_gas, "gas_costs", "elec_costs"),
+        })
+        self.tables[os.path.join("parcels", "parcels.csv")] = self.parcels_table
+
+        sizes = self._archetype_sizes[self._archetypes]
+        for costs_filename, costs in MEASURE_COSTS.items():
+            costs_df = pd.DataFrame({"parcel_id": parcel_ids})
+            for column, cost in zip(MEASURE_COLUMNS, costs):
+                scale = sizes if column in ["hvac", "weatherization"] else 1
+                costs_df[column] = (
+                    cost * scale * self._rng.lognormal(0, 0.1, num_parcels)
+                ).round(-1).astype(int)
+            self.tables[os.path.join("parcels", f"{costs_filename}.csv")] = costs_df
+
+    def _create_network(self) -> None:
+        """
+        Lay the parcels along a street and draw the electric and gas networks serving them
+        """
+        network_path = "utility_network"
+        parcel_ids = self.parcels_table["parcel_id"]
+        num_parcels = self._num_parcels
+
+        # ---Electric network---
+        parcels_per_transformer = self._get_fanout(num_parcels, self._num_transformers)
+        transformer_rows = np.repeat(np.arange(self._num_transformers), parcels_per_transformer)
+        num_primaries = math.ceil(self._num_transformers / TRANSFORMERS_PER_PRIMARY)
+        primary_ids = [f"PL{i + 1:03d}" for i in range(num_primaries)]
+        transformer_ids = [f"TB_{i + 1}" for i in range(self._num_transformers)]
+        secondary_ids = [f"ES_{i + 1}" for i in range(self._num_transformers)]
+        service_ids = [f"EV_{i + 1}" for i in range(num_parcels)]
+
+        self.tables[os.path.join(network_path, f"{self.study_id}_elec_primary.csv")] = (
+            pd.DataFrame({
+                "parentid": "substation",
+                "gisid": primary_ids,
+                "inst_date": "1/1/20",
+                "inst_cost": 10000,
+                "lifetime": 40,
+            })
+        )
+        kvas = np.array(TRANSFORMER_KVAS)
+        self.tables[os.path.join(network_path, f"{self.study_id}_elec_xmfrs.csv")] = pd.DataFrame({
+            "parentid": [
+                primary_ids[i // TRANSFORMERS_PER_PRIMARY] for i in range(self._num_transformers)
+            ],
+            "bank_KVA": kvas[np.minimum(
+                np.searchsorted(kvas, parcels_per_transformer * KVA_PER_PARCEL), len(kvas) - 1
+            )],
+            "inst_date": "1/1/20",
+            "inst_cost": 20000,
+            "gisid": transformer_ids,
+            "lifetime": 40,
+        })
+        self.tables[os.path.join(network_path, f"{self.study_id}_elec_secondaries.csv")] = (
+            pd.DataFrame({
+                "gisid": secondary_ids,
+                "parentid": transformer_ids,
+                "inst_date": "1/1/20",
+                "inst_cost": 4000,
+                "lifetime": 40,
+            })
+        )
+        self.tables[os.path.join(network_path, f"{self.study_id}_elec_services.csv")] = (
+            pd.DataFrame({
+                "gisid": service_ids,
+                "parentid": np.array(secondary_ids)[transformer_rows],
+                "inst_date": "1/1/20",
+                "inst_cost": 2000,
+                "LOC_ID": parcel_ids,
+                "lifetime": 40,
+            })
+        )
+        self.tables[os.path.join(network_path, f"{self.study_id}_elec_meters.csv")] = (
+            pd.DataFrame({
+                "LOC_ID": parcel_ids,
+                "gisid": [f"EM_{i + 1}" for i in range(num_parcels)],
+                "parentid": service_ids,
+                "inst_date": "1/1/20",
+                "inst_cost": 300,
+                "lifetime": 40,
+            })
+        )
+
+        # ---Gas network---
+        gas_parcel_ids = parcel_ids[self._uses_gas].to_list()
+        num_gas_parcels = len(gas_parcel_ids)
+        num_mains = self._num_mains or max(math.ceil(num_gas_parcels / DEFAULT_PARCELS_PER_MAIN), 1)
+        if not 1 <= num_mains <= max(num_gas_parcels, 1):
+            raise ValueError(f"Number of gas mains must be between 1 and {num_gas_parcels}!")
+        self._num_mains = num_mains
+
+        parcels_per_main = self._get_fanout(num_gas_parcels, num_mains)
+        self._main_rows = np.repeat(np.arange(num_mains), parcels_per_main)
+        main_ids = [f"GP{i + 1:03d}" for i in range(num_mains)]
+        materials = list(PIPE_MATERIALS)
+        main_materials = self._rng.choice(materials, num_mains, p=list(PIPE_MATERIALS.values()))
+        main_lengths = (
+            np.maximum(parcels_per_main, 1) * self._rng.uniform(*FRONTAGE_FT, num_mains)
+        ).round().astype(int)
+        main_install_years = self._rng.integers(1930, 1990, num_mains)
+        service_ids = [f"GS_{i + 1}" for i in range(num_gas_parcels)]
+
+        self.tables[os.path.join(network_path, f"{self.study_id}_gas_main.csv")] = pd.DataFrame({
+            "gisid": main_ids,
+            "parentid": "GP000",
+            "size_in": self._rng.choice([2, 4, 6, 8], num_mains),
+            "material": main_materials,
+            "pressure": "LP",
+            "length_ft": main_lengths,
+            "inst_date": [f"1/1/{i}" for i in main_install_years],
+            "inst_cost": 0,
+            "lifetime": 40,
+            "replacement_cost": main_lengths * MAIN_COST_PER_FT,
+            "shutoff_cost": 20000,
+        })
+        self.tables[os.path.join(network_path, f"{self.study_id}_gas_services.csv")] = (
+            pd.DataFrame({
+                "gisid": service_ids,
+                "parentid": np.array(main_ids)[self._main_rows],
+                "inst_date": [f"1/1/{i}" for i in main_install_years[self._main_rows]],
+                "inst_cost": 1000,
+                "diameter": 1,
+                "material": main_materials[self._main_rows],
+                "length_ft": self._rng.integers(20, 120, num_gas_parcels),
+                "LOC_ID": gas_parcel_ids,
+                "lifetime": 40,
+                "replacement_cost": 0,
+            })
+        )
+        self.tables[os.path.join(network_path, f"{self.study_id}_gas_meters.csv")] = pd.DataFrame({
+            "gisid": [f"GM_{i + 1}" for i in range(num_gas_parcels)],
+            "parentid": service_ids,
+            "inst_cost": 300,
+            "inst_date": "1/1/2020",
+            "LOC_ID": gas_parcel_ids,
+            "lifetime": 40,
+            "replacement_cost": 0,
+            "replacement_freq": 0,
+        })
+
+        self.tables[os.path.join(network_path, f"{self.study_id}_leakage_factors.csv")] = (
+            pd.DataFrame(LEAKAGE_FACTORS, columns=["asset", "code", "value", "unit"])
+        )
+        self.tables[os.path.join(network_path, f"{self.study_id}_operating_expenses.csv")] = (
+            pd.DataFrame({
+                "material": materials,
+                "operating_expense_per_mile": OPERATING_EXPENSE_PER_MILE,
+                "type": "gas_main",
+            })
+        )
+
+    def _get_fanout(self, num_children: int, num_parents: int) -> np.ndarray:
+        """
+        Split consecutive children unevenly between parents, with at least one child per parent
+        when there are enough children
+        """
+        if num_children < num_parents:
+            return np.concatenate(
+                [np.ones(num_children, dtype=int), np.zeros(num_parents - num_children, dtype=int)]
+            )
+
+        weights = self._rng.dirichlet(np.full(num_parents, 4.0))
+        return 1 + self._rng.multinomial(num_children - num_parents, weights)
+
+    def _create_scenarios(self) -> None:
+        """
+        Write the scenario configs and measures. Retrofits of each scenario come in waves, with
+        the parcels on each group of consecutive gas mains retrofit together so their mains can
+        be decommissioned; electric baseline parcels join a random wave
+        """
+        wave_years = np.linspace(
+            self._start_year + 1, self._gas_pipe_intervention_year, self._retrofit_waves
+        ).round().astype(int)
+        waves = self._rng.integers(0, self._retrofit_waves, self._num_parcels)
+        waves[self._uses_gas] = self._main_rows * self._retrofit_waves // self._num_mains
+        retrofit_years = wave_years[waves]
+
+        # Continued gas parcels replace their equipment at the end of its life
+        replacement_years = self._install_years + EQUIPMENT_LIFETIME * np.ceil(
+            (self._start_year + 1 - self._install_years) / EQUIPMENT_LIFETIME
+        ).astype(int)
+
+        parcels = self.parcels_table
+        for scenario, scenario_config in SCENARIOS.items():
+            measures_df = pd.DataFrame({"parcel_id": parcels["parcel_id"]})
+            if scenario == CONTINUED_GAS:
+                measures_df["install_year"] = np.minimum(replacement_years, self._end_year)
+                measures_df["energy_profile_id"] = parcels["baseline_consumption_id"]
+                measures_df["uses_piped_gas"] = parcels["uses_piped_gas"]
+                measures_df["heating_fuel"] = parcels["heating_fuel"]
+                for column in MEASURE_COLUMNS[:4]:
+                    measures_df[column] = [
+                        BASELINE_MEASURES[i][column] for i in parcels["heating_fuel"]
+                    ]
+            else:
+                measures_df["install_year"] = retrofit_years
+                measures_df["energy_profile_id"] = [
+                    self._get_consumption_id(i, scenario_config["variant"])
+                    for i in self._archetypes
+                ]
+                measures_df["uses_piped_gas"] = 0
+                measures_df["heating_fuel"] = scenario_config["heating_fuel"]
+                for column, measure in scenario_config["measures"].items():
+                    measures_df[column] = measure
+            measures_df["weatherization"] = None
+            measures_df["panel_upgrade"] = None
+
+            self.tables[os.path.join("parcels", f"{scenario}_measures.csv")] = measures_df
+            self.tables[os.path.join("scenarios", f"{scenario}_config.csv")] = pd.DataFrame({
+                "scenario_name": [
+                    "gas_intervention",
+                    "parcel_retrofit_measures_filename",
+                    "parcel_retrofit_measure_costs_filename",
+                ],
+                scenario: [
+                    scenario_config["gas_intervention"], f"{scenario}_measures",
+                    scenario_config["costs"]
+                ],
+            })
+
+        self.tables[os.path.join("utility_network", f"{self.study_id}_thrml_net.csv")] = (
+            pd.DataFrame({
+                "asset_id": [*THERMAL_NETWORK_CONFIG, "install_year"],
+                "TEN_1": [*THERMAL_NETWORK_CONFIG.values(), wave_years[0]],
+            })
+        )
+
+    def _create_rates(self) -> None:
+        """
+        Write consumption rates escalating from the shipped studies' rates, and emission rates
+        with a grid decarbonizing through the end year
+        """
+        years = np.arange(self._start_year - 1, self._end_year + 1)
+        elapsed = years - years[0]
+
+        consumption_rates = pd.DataFrame({"Year": years})
+        for fuel, (fixed, volumetric) in CONSUMPTION_RATES.items():
+            escalation = (1 + RATE_ESCALATION.get(fuel, 0)) ** elapsed
+            consumption_rates[f"{fuel}.fixed"] = (fixed * escalation).round(2)
+            consumption_rates[f"{fuel}.volumetric"] = (volumetric * escalation).round(4)
+
+        emission_rates = pd.DataFrame({"Year": years})
+        for fuel, rate in EMISSION_RATES.items():
+            emission_rates[fuel] = rate
+        emission_rates["electricity"] = EMISSION_RATES["electricity"] * np.linspace(
+            1, ELECTRICITY_EMISSIONS_END_SHARE, len(years)
+        )
+
+        network_path = "utility_network"
+        self.tables[os.path.join(network_path, f"{self.study_id}_consumption_rates.csv")] = (
+            consumption_rates
+        )
+        self.tables[os.path.join(network_path, f"{self.study_id}_emission_rates.csv")] = (
+            emission_rates
+        )
@@ -0,0 +1,102 @@
+"""
+Shared hourly time axis of the weather year behind the energy consumption profiles
+"""
+import calendar
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_WEATHER_YEAR = 2018
+TIMESTAMP_COL = "timestamp"
+
+
+class TimeAxis:
+    """
+    The hourly timestamps of one weather year. A single instance is shared by every Building and
+    utility asset of a Study, so hourly timeseries built on it are aligned by identity and adding
+    them never reindexes
+
+    Args:
+        None
+
+    Optional Args:
+        weather_year (int): The calendar year of the weather data behind the energy profiles
+        include_leap_day (bool): If False, February 29th is dropped from leap weather years so
+            every year has 8760 hours
+
+    Attributes:
+        weather_year (int): The calendar year of the weather data
+        include_leap_day (bool): True if February 29th is kept in leap weather years
+        timestamps (pd.DatetimeIndex): Hourly timestamps of the weather year
+
+    Methods:
+        conform (pd.Series): Return an hourly timeseries indexed by the shared timestamps
+    """
+    def __init__(self, weather_year: int = DEFAULT_WEATHER_YEAR, include_leap_day: bool = True):
+        self.weather_year: int = int(weather_year)
+        self.include_leap_day: bool = include_leap_day
+
+        self.timestamps: pd.DatetimeIndex = self._get_timestamps()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _get_timestamps(self) -> pd.DatetimeIndex:
+        timestamps = pd.date_range(
+            start=f"{self.weather_year}-01-01",
+            end=f"{self.weather_year + 1}-01-01",
+            freq="h",
+            inclusive="left",
+            name=TIMESTAMP_COL
+        )
+
+        if calendar.isleap(self.weather_year) and not self.include_leap_day:
+            timestamps = timestamps[~self._is_leap_day(timestamps)]
+
+        return timestamps
+
+    @staticmethod
+    def _is_leap_day(timestamps: pd.DatetimeIndex) -> np.ndarray:
+        return (timestamps.month == 2) & (timestamps.day == 29)
+
+    def conform(self, timeseries: pd.Series) -> pd.Series:
+        """
+        Put an hourly timeseries of the weather year on the shared timestamps. The values are not
+        copied; only the index object is swapped. Leap days are dropped if the axis excludes them
+
+        Args:
+            timeseries (pd.Series): Hourly timeseries with the same timestamps as the axis
+
+        Returns:
+            pd.Series: The timeseries indexed by the shared timestamps
+        """
+        if timeseries.index is self.timestamps:
+            return timeseries
+
+        if len(timeseries) != len(self.timestamps) and not self.include_leap_day:
+            timeseries = timeseries[~self._is_leap_day(timeseries.index)]
+
+        if not timeseries.index.equals(self.timestamps):
+            raise ValueError(
+                f"Timeseries {timeseries.name} does not match the {self.weather_year} time axis!"
+            )
+
+        return pd.Series(
+            timeseries.to_numpy(), index=self.timestamps, name=timeseries.name, copy=False
+        )
+
+
+_TIME_AXES: Dict[Tuple[int, bool], TimeAxis] = {}
+
+
+def get_time_axis(weather_year: int = DEFAULT_WEATHER_YEAR, include_leap_day: bool = True) -> TimeAxis:
+    """
+    Return the process-wide TimeAxis for a weather year, creating it on first use
+    """
+    key = (int(weather_year), include_leap_day)
+    if key not in _TIME_AXES:
+        _TIME_AXES[key] = TimeAxis(*key)
+
+    return _TIME_AXES[key]
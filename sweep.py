@@ -0,0 +1,123 @@
+"""
+Script for sweeping one scenario over gas pipe intervention years and retrofit install years
+"""
+import argparse
+import os
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB, ProfileCache
+from segment_iat.scenario_creator.parameter_sweep import (
+    PARAM_GAS_PIPE_INTERVENTION_YEAR,
+    PARAM_INSTALL_YEAR,
+    SWEEP_TABLES,
+    ParameterSweep
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a scenario at every combination of gas pipe intervention years and "
+        "retrofit install years, and write the outputs as one tidy table"
+    )
+    parser.add_argument("study", help="The study to sweep")
+    parser.add_argument("scenario", help="The scenario to sweep")
+    parser.add_argument(
+        "--gas-pipe-intervention-year",
+        type=int,
+        nargs="+",
+        help="Gas pipe intervention years to sweep (default: the study's intervention year)"
+    )
+    parser.add_argument(
+        "--install-year",
+        type=int,
+        nargs="+",
+        help="Retrofit install years of every parcel to sweep (default: the scenario's measures)"
+    )
+    parser.add_argument(
+        "--parcel-install-year",
+        nargs="+",
+        default=[],
+        metavar="PARCEL_ID=YEAR[,YEAR...]",
+        help="Retrofit install years of one parcel to sweep, i.e. EX_001=2025,2030"
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        default=SWEEP_TABLES,
+        help="Output tables to collect (default: all numeric tables)"
+    )
+    parser.add_argument(
+        "--profile-matrix",
+        help="Hold all energy profiles in one shared memory-mapped float32 matrix",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Memory budget in MB for energy profiles (default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    parser.add_argument(
+        "--output",
+        help="File of the sweep table; written as Parquet if it ends in .parquet "
+        "(default: results/<study>/<scenario>_sweep.csv)"
+    )
+    args = parser.parse_args()
+
+    study_config_filepath = f"./config_files/{args.study}/{args.study}_config.csv"
+    if not os.path.exists(study_config_filepath):
+        raise FileNotFoundError(f"Config file does not exist for study {args.study.upper()}")
+
+    scenario = args.scenario.lower()
+    if not os.path.exists(f"./config_files/{args.study}/scenarios/{scenario}_config.csv"):
+        raise FileNotFoundError(
+            f"File for scenario {scenario.upper()} does not exist for study {args.study.upper()}"
+        )
+
+    grid = {}
+    if args.gas_pipe_intervention_year:
+        grid[PARAM_GAS_PIPE_INTERVENTION_YEAR] = args.gas_pipe_intervention_year
+    if args.install_year:
+        grid[PARAM_INSTALL_YEAR] = args.install_year
+    for parcel_install_years in args.parcel_install_year:
+        parcel_id, _, years = parcel_install_years.partition("=")
+        if not years:
+            parser.error(f"--parcel-install-year {parcel_install_years} must be PARCEL_ID=YEAR")
+        grid[f"{PARAM_INSTALL_YEAR}.{parcel_id}"] = [int(i) for i in years.split(",")]
+
+    output_filepath = args.output or f"./results/{args.study}/{scenario}_sweep.csv"
+
+    study = create_study(study_config_filepath)
+    profile_cache = ProfileCache(args.profile_cache_mb)
+
+    print("Computing study baseline...")
+    study.load_study(profile_cache, baseline_timeseries=not args.profile_matrix)
+
+    profile_matrix = None
+    if args.profile_matrix:
+        print("Building profile matrix...")
+        profile_matrix = study.build_profile_matrix([scenario], profile_cache)
+        profile_cache.clear()
+
+    sweep = ParameterSweep(
+        study,
+        scenario,
+        grid,
+        profile_cache=profile_cache,
+        profile_matrix=profile_matrix,
+        output_tables=args.tables
+    )
+    sweep_df = sweep.run_sweep()
+
+    os.makedirs(os.path.dirname(output_filepath) or ".", exist_ok=True)
+    if output_filepath.endswith(".parquet"):
+        sweep_df.to_parquet(output_filepath, index=False)
+    else:
+        sweep_df.to_csv(output_filepath, index=False)
+
+    print(f"Wrote {len(sweep_df)} rows of {len(sweep.get_sweep_points())} sweep points to "
+          f"{output_filepath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Unit tests for the benchmark scaled studies, scaling curves, and baseline comparison
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from benchmark import remove_study, run_case
+from segment_iat.utils.benchmark import (
+    compare_to_baseline,
+    get_benchmark_cases,
+    get_case_study_id,
+    get_scaling_curves,
+    write_scaled_study
+)
+
+
+class TestBenchmarkStudies(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_basepath = self.tmp_dir.name
+        shutil.copytree(
+            "./config_files/example_street", os.path.join(self.config_basepath, "example_street")
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _read_table(self, study_path: str, table_name: str) -> pd.DataFrame:
+        return pd.read_csv(os.path.join(study_path, "utility_network", f"bench_{table_name}.csv"))
+
+    def test_get_benchmark_cases(self):
+        cases = get_benchmark_cases([10, 100], [10, 25], [5, 20])
+
+        self.assertListEqual(
+            [case["key"] for case in cases],
+            [
+                "parcels=10|years=25|fanout=5",
+                "parcels=100|years=10|fanout=5",
+                "parcels=100|years=25|fanout=5",
+                "parcels=1000|years=25|fanout=5",
+                "parcels=1000|years=25|fanout=20",
+            ]
+        )
+        self.assertListEqual(cases[2]["curves"], ["parcels", "years"])
+
+    def test_write_scaled_study(self):
+        study_path = write_scaled_study(
+            "example_street", "bench", 45, 30, 4, config_basepath=self.config_basepath
+        )
+
+        study_config = pd.read_csv(os.path.join(study_path, "bench_config.csv"), index_col=0)
+        self.assertEqual(study_config.loc["street_segment", "value"], "bench")
+        self.assertEqual(int(study_config.loc["end_year", "value"]), 2055)
+
+        template_parcels = pd.read_csv(
+            os.path.join(self.config_basepath, "example_street", "parcels", "parcels.csv")
+        )
+        for filename in os.listdir(os.path.join(study_path, "parcels")):
+            parcel_df = pd.read_csv(os.path.join(study_path, "parcels", filename))
+            self.assertEqual(len(parcel_df), 45)
+        parcels = pd.read_csv(os.path.join(study_path, "parcels", "parcels.csv"))
+        self.assertEqual(parcels["parcel_id"].iloc[21], "BENCH_000021")
+        self.assertEqual(
+            parcels["baseline_consumption_id"].iloc[21],
+            template_parcels["baseline_consumption_id"].iloc[1]
+        )
+
+        transformers = self._read_table(study_path, "elec_xmfrs")
+        secondaries = self._read_table(study_path, "elec_secondaries")
+        services = self._read_table(study_path, "elec_services")
+        meters = self._read_table(study_path, "elec_meters")
+        self.assertEqual(len(transformers), 12)
+        self.assertListEqual(list(secondaries["parentid"]), list(transformers["gisid"]))
+        self.assertEqual(services.groupby("parentid").size().max(), 4)
+        self.assertListEqual(list(meters["parentid"]), list(services["gisid"]))
+        self.assertListEqual(list(meters["LOC_ID"]), list(parcels["parcel_id"]))
+
+        mains = self._read_table(study_path, "gas_main")
+        gas_services = self._read_table(study_path, "gas_services")
+        self.assertEqual(len(mains), 3)
+        self.assertTrue(gas_services["parentid"].isin(mains["gisid"]).all())
+
+        emission_rates = self._read_table(study_path, "emission_rates")
+        self.assertEqual(emission_rates["Year"].iloc[-1], 2055)
+        self.assertEqual(emission_rates["Year"].dtype, int)
+
+    def test_run_case_cold_cache(self):
+        # Each case loads its profiles into its own cache, not the warm process-wide cache
+        study_id = get_case_study_id({"parcels": 4, "years": 5, "fanout": 2})
+        write_scaled_study("example_street", study_id, 4, 5, 2)
+        self.addCleanup(remove_study, study_id)
+
+        for _ in range(2):
+            stages = run_case(study_id, "ex_gas", Mock(incentives=[]), 100.0)
+            self.assertGreater(stages["profile_load"]["calls"], 0)
+
+
+class TestBaselineComparison(unittest.TestCase):
+    def _get_results(self, parcels_wall_s: list, write_wall_s: float = 0.01) -> dict:
+        return {
+            "cases": [
+                {
+                    "key": f"parcels={parcels}",
+                    "curves": ["parcels"],
+                    "parcels": parcels,
+                    "stages": {
+                        "populate_building": {"wall_s": wall_s, "peak_mb": 10.0},
+                        "write_outputs": {"wall_s": write_wall_s, "peak_mb": 0.5},
+                    },
+                }
+                for parcels, wall_s in zip([10, 100], parcels_wall_s)
+            ]
+        }
+
+    def test_compare_to_baseline(self):
+        baseline = self._get_results([0.1, 1.0])
+        results = self._get_results([0.12, 1.5], write_wall_s=0.04)
+        results["cases"][0]["stages"]["populate_building"]["peak_mb"] = 20.0
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.25)
+
+        self.assertListEqual(
+            [(i["case"], i["stage"], i["metric"], i["ratio"]) for i in regressions],
+            [
+                ("parcels=10", "populate_building", "peak_mb", 2.0),
+                ("parcels=100", "populate_building", "wall_s", 1.5),
+            ]
+        )
+        self.assertListEqual(compare_to_baseline(results, {"cases": []}), [])
+
+        with self.assertRaises(ValueError):
+            compare_to_baseline(results, {**baseline, "profile_matrix": True})
+
+    def test_get_scaling_curves(self):
+        curves = get_scaling_curves(self._get_results([0.1, 1.0]))
+
+        self.assertListEqual(curves["parcels"]["x"], [10, 100])
+        self.assertEqual(curves["parcels"]["stages"]["populate_building"]["exponent"], 1.0)
+        self.assertEqual(curves["parcels"]["stages"]["write_outputs"]["exponent"], 0.0)
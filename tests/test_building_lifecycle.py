@@ -0,0 +1,117 @@
+"""
+Unit tests for the BuildingLifecycle module
+"""
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.buildings.building_lifecycle import BuildingLifecycle, FUELS
+from segment_iat.energy_profiles.profile_digest import ProfileDigest
+
+
+def make_digest(consumption_id: str, annual_total: float) -> ProfileDigest:
+    annual_totals = {
+        "out.{}.total.energy_consumption".format(fuel): annual_total for fuel in FUELS
+    }
+    return ProfileDigest(consumption_id, 1, annual_totals, {}, {})
+
+
+class TestBuildingLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.config_tables = Mock()
+        self.config_tables.get_emission_rates.return_value = pd.DataFrame(
+            {fuel: [0.5] * 3 for fuel in FUELS},
+            index=pd.Index([2020, 2022, 2024], name="Year")
+        )
+
+        self.buildings_params = [
+            {
+                "building_id": "parcel_1",
+                "asset_replacement_year": 2022,
+                "heating_fuel": "Natural Gas",
+                "retrofit_heating_fuel": "Hybrid Gas",
+            },
+            {
+                "building_id": "parcel_2",
+                "asset_replacement_year": 2024,
+                "heating_fuel": "Natural Gas",
+                "retrofit_heating_fuel": "Electricity",
+            },
+        ]
+
+        self.sim_settings = {
+            "segment_id": "example_street",
+            "sim_start_year": 2020,
+            "sim_end_year": 2025,
+        }
+
+        self.lifecycle = BuildingLifecycle(
+            self.buildings_params,
+            self.sim_settings,
+            [make_digest("baseline", 100.0), make_digest("baseline", 100.0)],
+            [make_digest("retrofit_1", 40.0), make_digest("retrofit_2", 10.0)],
+            self.config_tables
+        )
+
+    def test_populate_lifecycle(self):
+        self.lifecycle.populate_lifecycle()
+
+        np.testing.assert_array_equal(
+            self.lifecycle.replacement,
+            [
+                [False, False, True, False, False],
+                [False, False, False, False, True],
+            ]
+        )
+        np.testing.assert_array_equal(
+            self.lifecycle.is_retrofit,
+            [
+                [False, False, True, True, True],
+                [False, False, False, False, True],
+            ]
+        )
+        np.testing.assert_array_equal(
+            self.lifecycle.annual_energy_by_fuel["electricity"],
+            [
+                [100.0, 100.0, 40.0, 40.0, 40.0],
+                [100.0, 100.0, 100.0, 100.0, 10.0],
+            ]
+        )
+        np.testing.assert_array_equal(
+            self.lifecycle.fuel_type,
+            [
+                ["GAS", "GAS", "HPL", "HPL", "HPL"],
+                ["GAS", "GAS", "GAS", "GAS", "ELEC"],
+            ]
+        )
+        np.testing.assert_array_equal(
+            self.lifecycle.methane_leaks,
+            [
+                [2, 2, 1, 1, 1],
+                [2, 2, 2, 2, 0],
+            ]
+        )
+        np.testing.assert_array_equal(
+            self.lifecycle.combustion_emissions["natural_gas"],
+            [
+                [50.0, 50.0, 20.0, 20.0, 20.0],
+                [50.0, 50.0, 50.0, 50.0, 5.0],
+            ]
+        )
+
+    def test_missing_replacement_year(self):
+        del self.buildings_params[0]["asset_replacement_year"]
+        self.buildings_params[1]["asset_replacement_year"] = None
+
+        self.lifecycle.populate_lifecycle()
+
+        # Without a replacement year the building is retrofit in the last simulation year
+        np.testing.assert_array_equal(
+            self.lifecycle.replacement[0], [False, False, False, False, True]
+        )
+        self.assertFalse(self.lifecycle.is_retrofit[1].any())
+
+    def test_get_row_index(self):
+        self.assertEqual(1, self.lifecycle.get_row_index("parcel_2"))
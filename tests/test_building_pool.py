@@ -0,0 +1,36 @@
+"""
+Unit tests for the BuildingPool class
+"""
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from segment_iat.buildings import building_pool
+from segment_iat.buildings.building_pool import BuildingPool
+from segment_iat.energy_profiles.profile_cache import ProfileCache
+
+
+class TestBuildingPool(unittest.TestCase):
+    @patch("segment_iat.buildings.building_pool.ProfileMatrix")
+    @patch("segment_iat.buildings.building_pool.ProcessPoolExecutor")
+    def test_worker_profile_cache(self, process_pool, profile_matrix):
+        process_pool.return_value = MagicMock()
+        process_pool.return_value.__enter__.return_value.map.return_value = []
+        pool = BuildingPool(
+            2, {}, [], ProfileCache(3.0), Mock(), Mock(), profile_matrix=Mock(filepath="m.npy")
+        )
+
+        self.assertListEqual(list(pool.populate_buildings([{}], Mock())), [])
+
+        # Worker processes get a profile cache with the same memory budget
+        pool_kwargs = process_pool.call_args.kwargs
+        pool_kwargs["initializer"](*pool_kwargs["initargs"])
+        self.addCleanup(building_pool._WORKER_STATE.clear)
+        self.assertEqual(
+            building_pool._WORKER_STATE["profile_cache"].memory_budget,
+            ProfileCache(3.0).memory_budget
+        )
+        profile_matrix.assert_called_once_with("m.npy")
+
+
+if __name__ == "__main__":
+    unittest.main()
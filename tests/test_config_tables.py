@@ -0,0 +1,46 @@
+"""
+Unit tests for the ConfigTables class
+"""
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from segment_iat.utils.config_tables import ConfigTables
+
+
+class TestConfigTables(unittest.TestCase):
+    def setUp(self):
+        self.config_tables = ConfigTables("example_street")
+
+    def test_get_measure_costs(self):
+        costs = self.config_tables.get_measure_costs("gshp_costs")
+
+        self.assertEqual(81556, costs["EX_002"]["hvac"])
+        self.assertIs(costs, self.config_tables.get_measure_costs("gshp_costs"))
+
+    def test_tables_read_once(self):
+        with patch("segment_iat.utils.config_tables.pd.read_csv", wraps=pd.read_csv) as mock_read_csv:
+            for _ in range(3):
+                self.config_tables.get_emission_rates()
+                self.config_tables.get_leakage_factor("gas_main", "CI")
+                self.config_tables.get_leakage_factor("gas_service", "PL")
+
+        self.assertEqual(2, mock_read_csv.call_count)
+
+    def test_get_leakage_factor(self):
+        self.assertEqual(0.2192, self.config_tables.get_leakage_factor("gas_main", "CI"))
+        self.assertEqual(1.5, self.config_tables.get_leakage_factor("gas_meter", "Residential"))
+
+        with self.assertRaises(KeyError):
+            self.config_tables.get_leakage_factor("gas_main", "whatever")
+
+    def test_get_operating_expenses(self):
+        self.assertDictEqual(
+            {0: 23423}, self.config_tables.get_operating_expenses("gas_main", "CI")
+        )
+        # Rows are keyed by their position in the O&M table
+        self.assertDictEqual(
+            {1: 23423}, self.config_tables.get_operating_expenses("gas_main", "DI")
+        )
+        self.assertDictEqual({}, self.config_tables.get_operating_expenses("gas_service", "CI"))
@@ -4,6 +4,9 @@ Test the ElecTransformer class
 import unittest
 from unittest.mock import Mock
 
+import numpy as np
+import pandas as pd
+
 from segment_iat.end_uses.utility_end_uses.elec_transformer import ElecTransformer
 
 
@@ -113,3 +116,39 @@ class TestElecTransformer(unittest.TestCase):
             [1/(2*1.25), 12/(20*1.25), 2/1.25, 51/(40*1.25), 70/(40*1.25), 90/(40*1.25)],
             self.elec_transformer.overloading_ratio
         )
+
+    def test_get_annual_energy_use_timeseries(self):
+        timestamps = pd.date_range(start="2018-01-01", periods=24, freq="h")
+        baseline = pd.Series(np.linspace(0, 1, 24), index=timestamps)
+        retrofit = pd.Series(np.linspace(1, 3, 24), index=timestamps)
+
+        # Meter 1 retrofits in 2023, meter 2 in 2026
+        meter_1 = Mock()
+        meter_1.annual_energy_use_timeseries = {
+            i: retrofit if i >= 2023 else baseline for i in range(2020, 2030)
+        }
+        meter_2 = Mock()
+        meter_2.annual_energy_use_timeseries = {
+            i: retrofit if i >= 2026 else baseline for i in range(2020, 2030)
+        }
+
+        self.elec_transformer.connected_assets = [meter_1, meter_2]
+        self.elec_transformer.year_timestamps = timestamps
+
+        energy_timeseries = self.elec_transformer.get_annual_energy_use_timeseries()
+
+        for i in range(2020, 2030):
+            pd.testing.assert_series_equal(
+                meter_1.annual_energy_use_timeseries[i] + meter_2.annual_energy_use_timeseries[i],
+                energy_timeseries[i]
+            )
+
+        # One sum per distinct retrofit state, shared by the years in that state
+        self.assertEqual(3, len({id(i) for i in energy_timeseries.values()}))
+        self.assertIs(energy_timeseries[2020], energy_timeseries[2022])
+
+        self.elec_transformer.annual_energy_use_timeseries = energy_timeseries
+        self.assertListEqual(
+            [2.0] * 3 + [4.0] * 3 + [6.0] * 4,
+            self.elec_transformer.get_annual_peak_energy_use()
+        )
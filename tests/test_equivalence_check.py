@@ -0,0 +1,147 @@
+"""
+Unit tests for the output table comparison of the equivalence check
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.scenario_creator.equivalence_check import (
+    EquivalenceCheck,
+    compare_output_dirs,
+    compare_results,
+    compare_tables,
+    format_difference
+)
+
+
+class TestCompareTables(unittest.TestCase):
+    def setUp(self):
+        self.reference_df = pd.DataFrame({
+            "year": [2025, 2026, 2025, 2026],
+            "asset_id": ["B1", "B1", "B2", "B2"],
+            "asset_type": pd.Categorical(["building"] * 4),
+            "book_val": [100.0, 90.0, np.nan, 50.0],
+        })
+
+    def test_equal(self):
+        candidate_df = self.reference_df.copy()
+        candidate_df["book_val"] += [0.0, 1e-12, 0.0, 0.0]
+
+        self.assertIsNone(compare_tables(self.reference_df, candidate_df))
+
+        # Categoricals with other categories are compared by their values
+        candidate_df["asset_type"] = pd.Categorical(
+            ["building"] * 4, categories=["building", "meter"]
+        )
+        self.assertIsNone(compare_tables(self.reference_df, candidate_df))
+
+    def test_first_difference(self):
+        candidate_df = self.reference_df.copy()
+        candidate_df["book_val"] = [100.0, 90.5, 0.0, 51.0]
+
+        difference = compare_tables(self.reference_df, candidate_df)
+
+        self.assertEqual(difference["differing_rows"], 3)
+        self.assertEqual(difference["row"], 1)
+        self.assertDictEqual(
+            difference["location"], {"asset_id": "B1", "asset_type": "building", "year": 2026}
+        )
+        self.assertEqual(difference["column"], "book_val")
+        self.assertEqual(difference["reference"], 90.0)
+        self.assertEqual(difference["candidate"], 90.5)
+
+        self.assertIsNone(
+            compare_tables(self.reference_df.iloc[[0, 3]], candidate_df.iloc[[0, 3]], rtol=0.05)
+        )
+
+    def test_schema_and_length(self):
+        difference = compare_tables(
+            self.reference_df, self.reference_df.drop(columns="asset_type")
+        )
+        self.assertIn("Columns differ", difference["message"])
+
+        candidate_df = self.reference_df.copy()
+        candidate_df["year"] = candidate_df["year"].astype("float64")
+        difference = compare_tables(self.reference_df, candidate_df)
+        self.assertIn("is int64 in the reference", difference["message"])
+
+        difference = compare_tables(self.reference_df, self.reference_df.iloc[:3])
+        self.assertEqual(difference["row"], 3)
+        self.assertEqual(difference["location"]["asset_id"], "B2")
+
+
+class TestCompareResults(unittest.TestCase):
+    def setUp(self):
+        self.reference_tables = {
+            "book_val": pd.DataFrame({"year": [2025], "book_val": [100.0]}),
+            "peak_consump": pd.DataFrame({"year": [2025], "peak_consump": [10.0]}),
+        }
+
+    def test_compare_results(self):
+        candidate_tables = {
+            "book_val": pd.DataFrame({"year": [2025], "book_val": [100.0]}),
+            "peak_consump": pd.DataFrame({"year": [2025], "peak_consump": [10.001]}),
+            "incentives": pd.DataFrame({"year": [2025]}),
+        }
+
+        differences = compare_results(self.reference_tables, candidate_tables)
+        self.assertListEqual([i["table"] for i in differences], ["peak_consump", "incentives"])
+        self.assertEqual(differences[1]["message"], "Missing from the reference")
+
+        differences = compare_results(
+            self.reference_tables, candidate_tables, tolerances={"peak_consump": (1e-3, 0.0)}
+        )
+        self.assertListEqual([i["table"] for i in differences], ["incentives"])
+
+        differences[0]["scenario"] = "ex_gas"
+        differences[0]["variant"] = "profile_matrix"
+        self.assertEqual(
+            format_difference(differences[0]),
+            "[profile_matrix] ex_gas/incentives: Missing from the reference"
+        )
+
+    def test_compare_output_dirs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for dirname, peak in [("reference", 10.0), ("candidate", 12.0)]:
+                outputs_path = os.path.join(tmp_dir, dirname, "ex_gas")
+                os.makedirs(outputs_path)
+                self.reference_tables["book_val"].to_csv(
+                    os.path.join(outputs_path, "book_val.csv"), index=False
+                )
+                pd.DataFrame({"year": [2025], "peak_consump": [peak]}).to_csv(
+                    os.path.join(outputs_path, "peak_consump.csv"), index=False
+                )
+
+            differences = compare_output_dirs(
+                os.path.join(tmp_dir, "reference"), os.path.join(tmp_dir, "candidate")
+            )
+            self.assertEqual(len(differences), 1)
+            self.assertEqual(differences[0]["table"], "ex_gas/peak_consump")
+            self.assertIn(
+                "10.0 in the reference, 12.0 in the candidate", format_difference(differences[0])
+            )
+
+            self.assertListEqual(
+                compare_output_dirs(
+                    os.path.join(tmp_dir, "reference"),
+                    os.path.join(tmp_dir, "candidate"),
+                    tolerances={"peak_consump": (0.25, 0.0)}
+                ),
+                []
+            )
+
+
+class TestEquivalenceCheck(unittest.TestCase):
+    def test_validate(self):
+        with self.assertRaises(ValueError):
+            EquivalenceCheck(Mock(), ["ex_gas"], variants=["reference"])
+        with self.assertRaises(ValueError):
+            EquivalenceCheck(Mock(), ["ex_gas"], building_workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Unit tests for the GasNetworkEvaluator and GasInterventionOptimizer classes
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import ProfileCache
+from segment_iat.scenario_creator.gas_intervention_optimizer import (
+    DEFAULT_DISCOUNT_RATE,
+    GasInterventionOptimizer,
+    GasNetworkEvaluator,
+    get_annual_cost,
+    get_annual_emissions,
+)
+from segment_iat.scenario_creator.output_table import OutputTable
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.utils.incentives import Incentives
+from segment_iat.utils.status import QuietStatus
+
+
+YEARS = [2025, 2026, 2027]
+
+# A Rewiring America API response with one incentive
+INCENTIVES_RESPONSE = {
+    "incentives": [
+        {
+            "authority_type": "federal",
+            "program": "Energy Efficient Home Improvement Credit (25C)",
+            "items": ["heat_pump_water_heater"],
+            "amount": {"type": "dollar_amount", "number": 2000},
+            "start_date": "2023",
+            "end_date": "2033",
+        }
+    ]
+}
+
+
+def get_output_tables() -> dict:
+    retrofit_cost = OutputTable(YEARS, "retrofit_cost", ["asset_id", "asset_domain", "asset_type"])
+    retrofit_cost.add_series(
+        [100, 0, 0], asset_id="EX_001", asset_domain="building", asset_type="building_gross"
+    )
+    retrofit_cost.add_series(
+        [-20, 0, 0], asset_id="EX_001", asset_domain="building", asset_type="building_incentive"
+    )
+    retrofit_cost.add_series(
+        [80, 0, 0], asset_id="EX_001", asset_domain="building", asset_type="building_net"
+    )
+    retrofit_cost.add_series(
+        [0, 500, 0], asset_id="GP001", asset_domain="gas_network", asset_type="gas_main"
+    )
+
+    operating_costs = OutputTable(YEARS, "annual_operating_costs", ["asset_id", "asset_domain", "asset_type"])
+    operating_costs.add_series(
+        [10, 10, 10], asset_id="GP001", asset_domain="gas_network", asset_type="gas_main"
+    )
+
+    consumption = ["asset_id", "energy_type", "asset_domain", "asset_type"]
+    consumption_costs = OutputTable(YEARS, "consumption_costs", consumption)
+    consumption_costs.add_series(
+        [1, 2, 3],
+        asset_id="EX_001",
+        energy_type="electricity",
+        asset_domain="building",
+        asset_type="building_aggregate"
+    )
+
+    consumption_emissions = OutputTable(YEARS, "consumption_emissions", consumption)
+    consumption_emissions.add_series(
+        [1.0, 1.0, 0.5],
+        asset_id="EX_001",
+        energy_type="natural_gas",
+        asset_domain="building",
+        asset_type="building_aggregate"
+    )
+
+    leaks = OutputTable(YEARS, "leaks", ["asset_id", "asset_domain", "asset_type"])
+    leaks.add_series(
+        [1000, 1000, 0], asset_id="GP001", asset_domain="gas_network", asset_type="gas_main"
+    )
+
+    return {
+        "retrofit_cost": retrofit_cost.to_frame(),
+        "operating_costs": operating_costs.to_frame(),
+        "consumption_costs": consumption_costs.to_frame(),
+        "consumption_emissions": consumption_emissions.to_frame(),
+        "methane_leaks": leaks.to_frame(),
+    }
+
+
+class TestObjectives(unittest.TestCase):
+    def setUp(self):
+        self.tables = get_output_tables()
+
+    def test_get_annual_cost(self):
+        np.testing.assert_allclose(get_annual_cost(self.tables, YEARS), [91, 512, 13])
+        np.testing.assert_allclose(
+            get_annual_cost(self.tables, YEARS, exclude_domain="gas_network"), [81, 2, 3]
+        )
+
+    def test_get_annual_emissions(self):
+        np.testing.assert_allclose(
+            get_annual_emissions(self.tables, YEARS, methane_gwp=30), [31, 31, 0.5]
+        )
+        np.testing.assert_allclose(
+            get_annual_emissions(self.tables, YEARS, exclude_domain="gas_network"), [1, 1, 0.5]
+        )
+
+
+class TestGasNetworkEvaluator(unittest.TestCase):
+    def setUp(self):
+        building = Mock()
+        building._fuel_type = ["GAS", "GAS", "ELEC"]
+
+        self.network = Mock()
+        self.network.years_vec = YEARS
+        self.network.gas_meters = [Mock(building=building)]
+        self.network.gas_meters[0].get_retrofit_cost.return_value = [0, 0, 0]
+        self.network.gas_services = []
+        self.network.gas_mains = [Mock(annual_operating_expenses=[10, 10, 10])]
+
+        def populate_gas_network(sim_settings: dict):
+            main = self.network.gas_mains[0]
+            year_idx = sim_settings["gas_pipe_intervention_year"] - YEARS[0]
+            install_cost = np.zeros(3)
+            if sim_settings["gas_intervention"] == "replace":
+                install_cost[year_idx] = 500
+            main.get_install_cost.return_value = install_cost.tolist()
+            main.get_system_shutoff_cost.return_value = [0, 0, 0]
+            main.annual_total_leakage = [1000] * year_idx + [0] * (3 - year_idx)
+
+        self.network.populate_gas_network.side_effect = populate_gas_network
+
+        scenario_creator = Mock()
+        scenario_creator.utility_network = self.network
+        scenario_creator.output_tables = get_output_tables()
+
+        self.evaluator = GasNetworkEvaluator(scenario_creator, discount_rate=0, methane_gwp=30)
+
+    def test_evaluate(self):
+        evaluation = self.evaluator.evaluate("replace", 2026)
+
+        self.assertDictEqual(
+            evaluation,
+            {
+                "gas_intervention": "replace",
+                "gas_pipe_intervention_year": 2026,
+                "feasible": True,
+                "cost": 81 + 2 + 3 + 500 + 30,
+                "emissions": 2.5 + 30,
+            }
+        )
+
+        # Evaluations are cached
+        self.evaluator.evaluate("replace", 2026)
+        self.assertEqual(self.network.populate_gas_network.call_count, 1)
+
+        with self.assertRaises(ValueError):
+            self.evaluator.evaluate("abandon", 2026)
+        with self.assertRaises(ValueError):
+            self.evaluator.evaluate("replace", 2030)
+
+    def test_is_feasible(self):
+        self.assertTrue(self.evaluator.is_feasible("replace", 2025))
+        self.assertFalse(self.evaluator.is_feasible("decommission", 2026))
+        self.assertTrue(self.evaluator.is_feasible("decommission", 2027))
+
+
+class TestGasInterventionOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.optimizer = GasInterventionOptimizer(
+            Mock(), "ex_managed_elec_1", objective="cost", profile_cache=Mock(), status_logging=Mock()
+        )
+
+    def test_validate(self):
+        with self.assertRaises(ValueError):
+            GasInterventionOptimizer(Mock(), "ex_gas", objective="jobs", profile_cache=Mock())
+        with self.assertRaises(ValueError):
+            GasInterventionOptimizer(Mock(), "ex_gas", strategies=["abandon"], profile_cache=Mock())
+
+    @patch("segment_iat.scenario_creator.gas_intervention_optimizer.GasInterventionOptimizer._create_evaluator")
+    def test_run_optimizer(self, mock_create_evaluator: Mock):
+        costs = {
+            ("replace", 2025): 300,
+            ("replace", 2026): 200,
+            ("decommission", 2025): 100,
+            ("decommission", 2026): 250,
+        }
+
+        evaluator = Mock()
+        evaluator.years = [2025, 2026]
+        evaluator.evaluate.side_effect = lambda strategy, year: {
+            "gas_intervention": strategy,
+            "gas_pipe_intervention_year": year,
+            "feasible": (strategy, year) != ("decommission", 2025),
+            "cost": costs[(strategy, year)],
+            "emissions": 0,
+        }
+        mock_create_evaluator.return_value = evaluator
+
+        results = self.optimizer.run_optimizer()
+
+        self.assertEqual(evaluator.evaluate.call_count, 4)
+        self.assertListEqual(list(results["cost"]), [200, 250, 300, 100])
+        self.assertListEqual(list(results["feasible"]), [True, True, True, False])
+
+        best = self.optimizer.get_best()
+        self.assertEqual(best["gas_intervention"], "replace")
+        self.assertEqual(best["gas_pipe_intervention_year"], 2026)
+
+
+class TestGasNetworkEvaluatorScenario(unittest.TestCase):
+    @patch.object(Incentives, "_call_rewiring_api", return_value=INCENTIVES_RESPONSE)
+    def test_evaluate_matches_scenario(self, _):
+        study = create_study("./config_files/example_street/example_street_config.csv")
+        profile_cache = ProfileCache()
+        study.load_study(profile_cache)
+
+        def create_scenario(scenario: str, year: int = None):
+            scenario_creator = study.create_scenario_creator(
+                scenario,
+                QuietStatus(),
+                gas_pipe_intervention_year=year,
+                profile_cache=profile_cache,
+                output_format=OUTPUT_FORMAT_MEMORY
+            )
+            scenario_creator.create_scenario()
+            return scenario_creator
+
+        # Each scenario's own strategy, at a year other than the study's
+        for scenario, strategy in [("ex_gas", "replace"), ("ex_managed_elec_1", "decommission")]:
+            with self.subTest(scenario=scenario):
+                evaluator = GasNetworkEvaluator(create_scenario(scenario))
+                evaluation = evaluator.evaluate(strategy, 2040)
+
+                tables = create_scenario(scenario, 2040).output_tables
+                years = np.array(evaluator.years, dtype=float)
+                discount_factors = (1 + DEFAULT_DISCOUNT_RATE) ** -(years - years[0])
+                np.testing.assert_allclose(
+                    evaluation["cost"],
+                    (get_annual_cost(tables, evaluator.years) * discount_factors).sum(),
+                    rtol=1e-9
+                )
+                np.testing.assert_allclose(
+                    evaluation["emissions"],
+                    get_annual_emissions(tables, evaluator.years).sum(),
+                    rtol=1e-9
+                )
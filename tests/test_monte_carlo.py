@@ -0,0 +1,176 @@
+"""
+Unit tests for the MonteCarlo class
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import ProfileCache
+from segment_iat.scenario_creator.monte_carlo import (
+    PARAMS,
+    MonteCarlo,
+    StreamingSummary,
+    draw_values,
+)
+from segment_iat.utils.incentives import Incentives
+
+
+# A Rewiring America API response with one incentive
+INCENTIVES_RESPONSE = {
+    "incentives": [
+        {
+            "authority_type": "federal",
+            "program": "Energy Efficient Home Improvement Credit (25C)",
+            "items": ["heat_pump_water_heater"],
+            "amount": {"type": "dollar_amount", "number": 2000},
+            "start_date": "2023",
+            "end_date": "2033",
+        }
+    ]
+}
+SUMMARY_KEY_COLS = ["table", "asset_domain", "asset_type", "existing_or_retrofit"]
+
+
+class TestDrawValues(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.point = np.array([[100.0, 200.0], [0.0, 50.0]])
+
+    def test_fixed(self):
+        values = draw_values(self.rng, self.point, {"distribution": "fixed", "spread": 0.5}, 3)
+
+        self.assertEqual(values.shape, (3, 2, 2))
+        np.testing.assert_array_equal(values[2], self.point)
+
+    def test_uniform(self):
+        values = draw_values(self.rng, self.point, {"distribution": "uniform", "spread": 0.1}, 500)
+
+        self.assertTrue((values >= self.point * 0.9).all())
+        self.assertTrue((values <= self.point * 1.1).all())
+        self.assertTrue((values[:, 1, 0] == 0).all())
+
+        years = draw_values(
+            self.rng, np.array([2030.0]), {"distribution": "uniform", "spread": 2}, 500, relative=False
+        )
+        self.assertTrue((years >= 2028).all() and (years <= 2032).all())
+
+    def test_unknown_distribution(self):
+        with self.assertRaises(ValueError):
+            draw_values(self.rng, self.point, {"distribution": "lognormal", "spread": 0.1}, 3)
+
+
+class TestStreamingSummary(unittest.TestCase):
+    def setUp(self):
+        self.values = np.random.default_rng(1).normal(5, 2, (250, 3, 4))
+
+    def test_update(self):
+        summary = StreamingSummary((3, 4), sample_size=1000, seed=0)
+        for batch in np.array_split(self.values, 7):
+            summary.update(batch)
+
+        self.assertEqual(summary.count, 250)
+        np.testing.assert_allclose(summary.mean, self.values.mean(axis=0))
+        np.testing.assert_allclose(summary.std, self.values.std(axis=0, ddof=1))
+        # Every draw fits in the sample, so quantiles are exact
+        np.testing.assert_allclose(
+            summary.get_quantiles([0.1, 0.5]), np.quantile(self.values, [0.1, 0.5], axis=0)
+        )
+
+    def test_sample_size(self):
+        summary = StreamingSummary((3, 4), sample_size=50, seed=0)
+        for batch in np.array_split(self.values, 5):
+            summary.update(batch)
+
+        quantiles = summary.get_quantiles([0.5])
+        self.assertEqual(quantiles.shape, (1, 3, 4))
+        # Every sampled draw is one of the draws
+        sample = summary._sample.reshape(50, -1)
+        draws = self.values.reshape(250, -1)
+        self.assertTrue(all((draws == i).all(axis=1).any() for i in sample))
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.monte_carlo = MonteCarlo(
+            Mock(), "ex_managed_elec_1", {}, num_draws=5, seed=0, status_logging=Mock()
+        )
+        self.monte_carlo._years = np.arange(2025, 2030)
+
+    def test_validate_distributions(self):
+        with self.assertRaises(ValueError):
+            MonteCarlo(Mock(), "ex_gas", {"asset_lifetime": {"distribution": "fixed"}})
+        with self.assertRaises(ValueError):
+            MonteCarlo(Mock(), "ex_gas", {"retrofit_cost": {"distribution": "lognormal"}})
+
+    @patch("segment_iat.scenario_creator.monte_carlo.MonteCarlo._get_transformer_peaks")
+    def test_add_transformer_upgrades(self, mock_get_peaks: Mock):
+        loads = np.array([
+            [10, 30, 30, 45, 90],
+            [0, 0, 500, 500, 520],
+        ], dtype=float)
+        mock_get_peaks.return_value = loads
+        self.monte_carlo._transformers = [{"asset_id": "XMFR_1", "bank_kva": 8}]
+
+        self.monte_carlo._add_transformer_upgrades(np.zeros((2, 1)), np.array([1.0, 2.0]))
+
+        def get_upgrades(annual_peaks: list, bank_kva: float) -> list:
+            # Upgrade loop of ElecTransformer.get_upgrade_year
+            annual_bank_kva = [bank_kva] * len(annual_peaks)
+            upgrades = [0] * len(annual_peaks)
+            total_upgrades = 0
+            for year_idx, load in enumerate(annual_peaks):
+                while load > annual_bank_kva[year_idx] * 1.25:
+                    for i in range(year_idx, len(annual_peaks)):
+                        annual_bank_kva[i] += bank_kva
+                    total_upgrades += 1
+                    upgrades[year_idx] += 1
+                    if total_upgrades > 10:
+                        break
+
+            return upgrades
+
+        summary = self.monte_carlo.summaries[
+            ("retrofit_cost", "elec_network", "elec_xmfr", None)
+        ]
+        expected = np.array([get_upgrades(i, 8) for i in loads]) * np.array([[1.0], [2.0]])
+        np.testing.assert_allclose(summary.mean[0], expected.mean(axis=0))
+
+
+class TestMonteCarloScenario(unittest.TestCase):
+    @patch.object(Incentives, "_call_rewiring_api", return_value=INCENTIVES_RESPONSE)
+    def test_fixed_matches_scenario(self, _):
+        study = create_study("./config_files/example_street/example_street_config.csv")
+        profile_cache = ProfileCache()
+        study.load_study(profile_cache)
+        distributions = {param: {"distribution": "fixed", "spread": 0.3} for param in PARAMS}
+        monte_carlo = MonteCarlo(
+            study,
+            "ex_managed_elec_1",
+            distributions,
+            num_draws=3,
+            seed=0,
+            profile_cache=profile_cache,
+            status_logging=Mock()
+        )
+
+        summary_df = monte_carlo.run_monte_carlo()
+        results = study.run_scenario("ex_managed_elec_1", profile_cache=profile_cache)
+
+        # With every input fixed, each draw is the scenario run at its point estimates
+        for key, key_df in summary_df.groupby(SUMMARY_KEY_COLS, dropna=False):
+            table, domain, asset_type, existing_or_retrofit = key
+            df = results[table]
+            rows = (df["asset_domain"] == domain) & (df["asset_type"] == asset_type)
+            if not pd.isna(existing_or_retrofit):
+                rows &= df["existing_or_retrofit"] == existing_or_retrofit
+            expected = df[rows].astype({"asset_id": str}).set_index(["asset_id", "year"])[table]
+            actual = key_df.set_index(["asset_id", "year"])
+
+            self.assertEqual(len(expected), len(actual), key)
+            np.testing.assert_allclose(
+                actual["mean"], expected.reindex(actual.index), rtol=1e-9, atol=1e-9, err_msg=key
+            )
+            np.testing.assert_allclose(actual["std"], 0, atol=1e-9, err_msg=key)
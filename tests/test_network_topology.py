@@ -0,0 +1,58 @@
+"""
+Unit tests for the NetworkTopology class
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from segment_iat.utility_network.network_topology import NETWORK_LAYERS, NetworkTopology
+
+
+class TestNetworkTopology(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        tables = {
+            "gas_meters": [("GM_1", "GS_1"), ("GM_2", "GS_2"), ("GM_3", "GS_1")],
+            "gas_services": [("GS_1", "GP_1"), ("GS_2", "GP_1")],
+            "gas_main": [("GP_1", "GP_0")],
+            "elec_meters": [("EM_1", "EV_1")],
+            "elec_services": [("EV_1", "ES_1")],
+            "elec_secondaries": [("ES_1", "TB_1")],
+            "elec_xmfrs": [("TB_1", "PL_1")],
+            "elec_primary": [("PL_1", "substation")],
+        }
+        for table, rows in tables.items():
+            pd.DataFrame(rows, columns=["gisid", "parentid"]).to_csv(
+                os.path.join(self.tmp_dir, f"ex_segment_{table}.csv"), index=False
+            )
+
+        self.topology = NetworkTopology(self.tmp_dir, "ex_segment")
+        self.topology.compile_topology()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_order(self):
+        self.assertCountEqual(NETWORK_LAYERS.keys(), self.topology.order)
+
+        for layer in self.topology.order:
+            for child_layer in NETWORK_LAYERS[layer]["children"]:
+                self.assertLess(
+                    self.topology.order.index(child_layer), self.topology.order.index(layer)
+                )
+
+    def test_records(self):
+        self.assertListEqual(
+            [{"gisid": "GS_1", "parentid": "GP_1"}, {"gisid": "GS_2", "parentid": "GP_1"}],
+            self.topology.records["gas_service"]
+        )
+
+    def test_get_children(self):
+        self.assertListEqual([0, 2], self.topology.get_children("gas_meter", "GS_1"))
+        self.assertListEqual([0, 1], self.topology.get_children("gas_service", "GP_1"))
+        self.assertListEqual([], self.topology.get_children("gas_meter", "GS_3"))
+        self.assertListEqual([], self.topology.get_children("elec_service", "TB_1"))
@@ -0,0 +1,69 @@
+"""
+Unit tests for the OutputTable class
+"""
+import io
+import unittest
+
+import pandas as pd
+
+from segment_iat.scenario_creator.output_table import OutputTable
+
+
+class TestOutputTable(unittest.TestCase):
+    def setUp(self):
+        self.years_vec = [2020, 2021, 2022]
+        self.label_cols = ["asset_id", "asset_domain", "asset_type"]
+
+    def _concat_frames(self, value_col, series):
+        """
+        The table as built by concatenating one DataFrame per series
+        """
+        all_dfs = []
+        for values, labels in series:
+            df = pd.DataFrame({"year": self.years_vec, value_col: values})
+            for col, label in labels.items():
+                df.loc[:, col] = label
+            all_dfs.append(df)
+
+        return pd.concat(all_dfs)
+
+    def _assert_csv_equal(self, value_col, series):
+        table = OutputTable(self.years_vec, value_col, self.label_cols)
+        for values, labels in series:
+            table.add_series(values, **labels)
+
+        expected = io.StringIO()
+        self._concat_frames(value_col, series).to_csv(expected, index=False)
+        actual = io.StringIO()
+        table.to_frame().to_csv(actual, index=False)
+
+        self.assertEqual(expected.getvalue(), actual.getvalue())
+
+    def test_to_frame(self):
+        table = OutputTable(self.years_vec, "leaks", self.label_cols)
+        table.add_series([1.0, 2.0, 3.0], asset_id="B1", asset_domain="building", asset_type="agg")
+        table.add_series([4, 5, 6], asset_id="M1", asset_domain="gas_network", asset_type="main")
+
+        df = table.to_frame()
+        self.assertEqual(["year", "leaks"] + self.label_cols, df.columns.to_list())
+        self.assertEqual(self.years_vec * 2, df["year"].to_list())
+        self.assertEqual([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], df["leaks"].to_list())
+        self.assertEqual("float64", df["leaks"].dtype)
+        self.assertIsInstance(df["asset_id"].dtype, pd.CategoricalDtype)
+        self.assertEqual(["B1", "M1"], df["asset_id"].cat.categories.to_list())
+
+    def test_csv_matches_concat(self):
+        labels_1 = {"asset_id": "B1", "asset_domain": "building", "asset_type": "agg"}
+        labels_2 = {"asset_id": 17, "asset_domain": "gas_network", "asset_type": "main"}
+
+        self._assert_csv_equal("cost", [([0.1, 0.2, 1 / 3], labels_1), ([1, 2, 3], labels_2)])
+        self._assert_csv_equal("flag", [([True, False, True], labels_1), ([1, 0, 1], labels_2)])
+        self._assert_csv_equal("flag", [([True, False, True], labels_1), ([0.5, 0, 1], labels_2)])
+        self._assert_csv_equal("flag", [([True, False, True], labels_1)])
+        self._assert_csv_equal("fuel", [(["gas", "gas", "electricity"], labels_1)])
+
+    def test_length_mismatch(self):
+        table = OutputTable(self.years_vec, "leaks", self.label_cols)
+
+        with self.assertRaises(ValueError):
+            table.add_series([1.0, 2.0], asset_id="B1", asset_domain="building", asset_type="agg")
@@ -0,0 +1,85 @@
+"""
+Unit tests for the OutputWriter class
+"""
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from segment_iat.scenario_creator.output_writer import OutputWriter, write_dataset_metadata
+
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+COLUMN_TYPES = {"year": "int64", "book_val": "float64", "asset_id": "string"}
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.outputs_basepath = self.tmp_dir.name
+        self.df = pd.DataFrame({
+            "year": [2020, 2021],
+            "book_val": [1, 2.5],
+            "asset_id": pd.Categorical(["B1", "B1"]),
+        })
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _get_writer(self, output_format, scenario):
+        return OutputWriter(
+            output_format, self.outputs_basepath, "segment", scenario, self.outputs_basepath
+        )
+
+    def test_write_csv(self):
+        self._get_writer("csv", "scenario_1").write(self.df, "book_val", COLUMN_TYPES)
+
+        self.assertEqual(
+            "year,book_val,asset_id\n2020,1.0,B1\n2021,2.5,B1\n",
+            open(os.path.join(self.outputs_basepath, "book_val.csv")).read()
+        )
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self._get_writer("xlsx", "scenario_1")
+
+    @patch("importlib.util.find_spec", return_value=None)
+    def test_parquet_without_pyarrow(self, _):
+        with self.assertRaisesRegex(ImportError, "parquet output format needs pyarrow"):
+            self._get_writer("parquet", "scenario_1")
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_write_parquet(self):
+        import pyarrow.dataset as ds
+
+        for scenario in ["scenario_1", "scenario_2"]:
+            self._get_writer("parquet", scenario).write(
+                self.df, "book_val", {**COLUMN_TYPES, "existing_or_retrofit": "string"}
+            )
+
+        partition_files = write_dataset_metadata("book_val", self.outputs_basepath)
+        self.assertEqual(
+            [
+                "study=segment/scenario=scenario_1/part-0.parquet",
+                "study=segment/scenario=scenario_2/part-0.parquet",
+            ],
+            partition_files
+        )
+
+        combined = ds.parquet_dataset(
+            os.path.join(self.outputs_basepath, "parquet", "book_val", "_metadata"),
+            partitioning="hive"
+        ).to_table().to_pandas()
+
+        self.assertEqual(4, len(combined))
+        self.assertEqual([1.0, 2.5, 1.0, 2.5], combined["book_val"].to_list())
+        self.assertEqual(["B1"] * 4, combined["asset_id"].to_list())
+        self.assertTrue(combined["existing_or_retrofit"].isna().all())
+        self.assertEqual(
+            ["scenario_1", "scenario_1", "scenario_2", "scenario_2"],
+            combined["scenario"].astype(str).to_list()
+        )
@@ -0,0 +1,105 @@
+"""
+Unit tests for the ParameterSweep class
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from segment_iat.scenario_creator.output_table import OutputTable
+from segment_iat.scenario_creator.parameter_sweep import ParameterSweep
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.study = Mock()
+        self.study.segment_name = "example_street"
+        self.study.parcels_table = {"EX_001": {}, "EX_002": {}}
+
+        self.grid = {
+            "gas_pipe_intervention_year": [2025, 2030],
+            "install_year": [2026],
+            "install_year.EX_002": [2028, 2032],
+        }
+        self.sweep = ParameterSweep(
+            self.study,
+            "ex_gas",
+            self.grid,
+            profile_cache=Mock(),
+            status_logging=Mock(),
+            output_tables=["is_retrofit_vec_table", "energy_consumption"]
+        )
+
+    def test_validate_grid(self):
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.study, "ex_gas", {"asset_lifetime": [30]}, profile_cache=Mock())
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.study, "ex_gas", {"install_year.EX_999": [2030]}, profile_cache=Mock())
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.study, "ex_gas", {"install_year": []}, profile_cache=Mock())
+
+    def test_get_sweep_points(self):
+        points = self.sweep.get_sweep_points()
+
+        self.assertEqual(len(points), 4)
+        self.assertDictEqual(
+            points[1],
+            {"gas_pipe_intervention_year": 2025, "install_year": 2026, "install_year.EX_002": 2032}
+        )
+        self.assertEqual(
+            self.sweep.get_sweep_key(points[1]),
+            "gas_pipe_intervention_year=2025|install_year=2026|install_year.EX_002=2032"
+        )
+
+    def test_get_install_years(self):
+        point = {"gas_pipe_intervention_year": 2025, "install_year": 2026, "install_year.EX_002": 2032}
+
+        self.assertDictEqual(
+            self.sweep._get_install_years(point), {"EX_001": 2026, "EX_002": 2032}
+        )
+        self.assertDictEqual(self.sweep._get_install_years({"gas_pipe_intervention_year": 2025}), {})
+
+    @patch("segment_iat.scenario_creator.parameter_sweep.ParameterSweep.run_point")
+    def test_run_sweep(self, mock_run_point: Mock):
+        def run_point(point: dict) -> dict:
+            is_retrofit = OutputTable([2025, 2026], "is_retrofit", ["asset_id"], "bool")
+            is_retrofit.add_series([False, True], asset_id="EX_001")
+
+            consumption = OutputTable([2025, 2026], "consumption", ["asset_id", "energy_type"])
+            consumption.add_series(
+                [1.0, point["gas_pipe_intervention_year"]],
+                asset_id="EX_002",
+                energy_type="natural_gas"
+            )
+
+            return {
+                "is_retrofit_vec_table": is_retrofit.to_frame(),
+                "energy_consumption": consumption.to_frame(),
+            }
+
+        mock_run_point.side_effect = run_point
+
+        sweep_df = self.sweep.run_sweep()
+
+        self.assertEqual(mock_run_point.call_count, 4)
+        self.assertListEqual(
+            list(sweep_df.columns),
+            [
+                "sweep_key", "gas_pipe_intervention_year", "install_year", "install_year.EX_002",
+                "table", "year", "value", "asset_id", "energy_type"
+            ]
+        )
+        self.assertEqual(len(sweep_df), 4 * 4)
+        self.assertEqual(sweep_df["value"].dtype, float)
+        self.assertIsInstance(sweep_df["asset_id"].dtype, pd.CategoricalDtype)
+
+        point_df = sweep_df[
+            (sweep_df["sweep_key"] == "gas_pipe_intervention_year=2030|install_year=2026|"
+             "install_year.EX_002=2028")
+            & (sweep_df["table"] == "energy_consumption")
+        ]
+        self.assertListEqual(list(point_df["value"]), [1.0, 2030.0])
+        self.assertListEqual(list(point_df["energy_type"]), ["natural_gas", "natural_gas"])
+        self.assertTrue(
+            sweep_df.loc[sweep_df["table"] == "is_retrofit_vec_table", "energy_type"].isna().all()
+        )
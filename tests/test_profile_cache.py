@@ -0,0 +1,92 @@
+"""
+Unit tests for the ProfileCache class
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from segment_iat.energy_profiles.profile_cache import ProfileCache, get_profile_cache
+from segment_iat.segment_study.segment_study import SegmentStudy
+
+
+class TestProfileCache(unittest.TestCase):
+    def setUp(self):
+        # 1.5 MB budget fits one of the 100k float64 arrays (800 KB) used below, but not two
+        self.cache = ProfileCache(memory_budget_mb=1.5)
+
+    def test_get_loads_once(self):
+        loader = Mock(return_value=np.zeros(10))
+
+        first = self.cache.get("EX_PROFILE_1", loader)
+        second = self.cache.get("EX_PROFILE_1", loader)
+
+        loader.assert_called_once()
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_get_evicts_least_recently_used(self):
+        self.cache.get("a", lambda: np.zeros(100000))
+        self.cache.get("b", lambda: np.zeros(100000))
+
+        self.assertNotIn("a", self.cache)
+        self.assertIn("b", self.cache)
+        self.assertEqual(self.cache.memory_usage, 800000)
+
+    def test_get_recently_used_kept(self):
+        cache = ProfileCache(memory_budget_mb=2)
+        cache.get("a", lambda: np.zeros(100000))
+        cache.get("b", lambda: np.zeros(100000))
+        cache.get("a", lambda: np.zeros(100000))
+        cache.get("c", lambda: np.zeros(100000))
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_get_over_budget_not_cached(self):
+        value = self.cache.get("big", lambda: np.zeros(1000000))
+
+        self.assertEqual(len(value), 1000000)
+        self.assertNotIn("big", self.cache)
+        self.assertEqual(self.cache.memory_usage, 0)
+
+    def test_clear(self):
+        self.cache.get("a", lambda: np.zeros(10))
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.memory_usage, 0)
+
+    def test_get_concurrent_shares_first_value(self):
+        barrier = threading.Barrier(4)
+
+        def loader():
+            # All threads miss the cache before any of them stores a value
+            barrier.wait()
+            return np.zeros(10)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            values = list(executor.map(lambda _: self.cache.get("a", loader), range(4)))
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.memory_usage, 80)
+        cached = self.cache.get("a", loader)
+        for value in values:
+            self.assertIs(cached, value)
+
+
+class TestProfileCacheUsed(unittest.TestCase):
+    def test_empty_cache_used(self):
+        # An empty cache is passed in, so it must be used instead of the process-wide cache
+        cache = ProfileCache()
+        global_cache_size = len(get_profile_cache())
+
+        study = SegmentStudy("example_street", 10710, 2025, 2050, 2030)
+        study.load_study(cache)
+
+        self.assertGreater(len(cache), 0)
+        self.assertEqual(len(get_profile_cache()), global_cache_size)
@@ -0,0 +1,94 @@
+"""
+Unit tests for the ProfileDigest and ProfileDigestStore classes
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.energy_profiles.profile_digest import (
+    DIGEST_VERSION,
+    ProfileDigest,
+    ProfileDigestStore
+)
+
+
+COLUMN = "out.electricity.total.energy_consumption"
+
+
+class TestProfileDigest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        # 15-minute profile for a full year
+        timestamps = pd.date_range(
+            start="2018-01-01", end="2019-01-01", freq="15min", inclusive="left", name="timestamp"
+        )
+        self.consumption = pd.DataFrame(
+            {COLUMN: np.random.default_rng(0).random(len(timestamps))},
+            index=timestamps
+        )
+        self.digest = ProfileDigest.from_timeseries("EX_PROFILE", 1.5, self.consumption, [COLUMN])
+
+        self.digest_store = ProfileDigestStore(os.path.join(self.tmp_dir, "digests"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_from_timeseries(self):
+        self.assertEqual(
+            self.consumption[COLUMN].resample("YS").sum().values[0],
+            self.digest.annual_totals[COLUMN]
+        )
+        self.assertListEqual(
+            self.consumption[COLUMN].resample("MS").sum().to_list(),
+            self.digest.monthly_totals[COLUMN]
+        )
+        self.assertEqual(
+            self.consumption[COLUMN].resample("h").sum().max(),
+            self.digest.annual_peaks[COLUMN]
+        )
+
+    def test_save_and_load(self):
+        self.digest_store.save_digest(self.digest)
+        digest = self.digest_store.load_digest("EX_PROFILE", 1.5)
+
+        self.assertEqual(1.5, digest.load_scaling_factor)
+        self.assertDictEqual(self.digest.annual_totals, digest.annual_totals)
+        self.assertDictEqual(self.digest.monthly_totals, digest.monthly_totals)
+        self.assertDictEqual(self.digest.annual_peaks, digest.annual_peaks)
+
+    def test_is_current(self):
+        source_filepath = os.path.join(self.tmp_dir, "EX_PROFILE.csv")
+        self.consumption.to_csv(source_filepath)
+
+        self.assertFalse(self.digest_store.is_current("EX_PROFILE", 1.5, [source_filepath]))
+
+        self.digest_store.save_digest(self.digest)
+        self.assertTrue(self.digest_store.is_current("EX_PROFILE", 1.5, [source_filepath]))
+        self.assertFalse(self.digest_store.is_current("EX_PROFILE", 1, [source_filepath]))
+
+        # Touch the source after saving; the digest is now stale
+        digest_mtime = os.path.getmtime(
+            os.path.join(self.tmp_dir, "digests", "EX_PROFILE_x1.5.json")
+        )
+        os.utime(source_filepath, (digest_mtime + 10, digest_mtime + 10))
+        self.assertFalse(self.digest_store.is_current("EX_PROFILE", 1.5, [source_filepath]))
+
+    def test_is_current_version(self):
+        self.digest_store.save_digest(self.digest)
+        self.assertTrue(self.digest_store.is_current("EX_PROFILE", 1.5, []))
+
+        # A digest of an older format is stale
+        digest_filepath = os.path.join(self.tmp_dir, "digests", "EX_PROFILE_x1.5.json")
+        with open(digest_filepath, "r") as f:
+            digest = json.load(f)
+        digest["version"] = DIGEST_VERSION - 1
+        with open(digest_filepath, "w") as f:
+            json.dump(digest, f)
+
+        self.assertFalse(self.digest_store.is_current("EX_PROFILE", 1.5, []))
@@ -0,0 +1,123 @@
+"""
+Unit tests for the ProfileMatrix class
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.energy_profiles.profile_matrix import ProfileMatrix
+
+
+COLUMNS = ["out.electricity.total.energy_consumption", "out.natural_gas.total.energy_consumption"]
+
+
+class TestProfileMatrix(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmp_dir, "compiled", "ex_profile_matrix.npy")
+
+        # 15-minute profiles, which the matrix resamples to hourly
+        timestamps = pd.date_range(start="2018-01-01", periods=96, freq="15min", name="timestamp")
+        self.profiles = {
+            "EX_PROFILE_1": pd.DataFrame({
+                COLUMNS[0]: np.linspace(0, 1, 96),
+                COLUMNS[1]: np.arange(96, dtype=float),
+            }, index=timestamps),
+            "EX_PROFILE_2": pd.DataFrame({
+                COLUMNS[0]: np.ones(96),
+                COLUMNS[1]: np.zeros(96),
+            }, index=timestamps),
+        }
+
+        self.profile_matrix = ProfileMatrix.build(
+            self.filepath,
+            [("EX_PROFILE_1", 1), ("EX_PROFILE_2", 1), ("EX_PROFILE_1", 2), ("EX_PROFILE_1", 1)],
+            self._load_profile,
+            COLUMNS
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _load_profile(self, consumption_id, load_scaling_factor):
+        return self.profiles[consumption_id] * load_scaling_factor
+
+    def test_build(self):
+        self.assertEqual((3, 2, 24), self.profile_matrix.values.shape)
+        self.assertEqual(np.float32, self.profile_matrix.values.dtype)
+        self.assertEqual(24, len(self.profile_matrix.timestamps))
+
+    def test_get_index(self):
+        self.assertEqual(0, self.profile_matrix.get_index("EX_PROFILE_1"))
+        self.assertEqual(1, self.profile_matrix.get_index("EX_PROFILE_2", 1.0))
+        self.assertEqual(2, self.profile_matrix.get_index("EX_PROFILE_1", 2))
+
+        with self.assertRaises(KeyError):
+            self.profile_matrix.get_index("EX_PROFILE_3")
+
+    def test_get_series(self):
+        idx = self.profile_matrix.get_index("EX_PROFILE_1", 2)
+        expected = (self.profiles["EX_PROFILE_1"][COLUMNS[1]] * 2).resample("h").sum()
+
+        series = self.profile_matrix.get_series(idx, COLUMNS[1])
+
+        self.assertTrue(np.shares_memory(series.to_numpy(), self.profile_matrix.values))
+        pd.testing.assert_series_equal(expected, series, check_dtype=False, check_freq=False)
+
+    def test_reopen(self):
+        profile_matrix = ProfileMatrix(self.filepath)
+
+        self.assertListEqual(self.profile_matrix.profile_keys, profile_matrix.profile_keys)
+        pd.testing.assert_frame_equal(
+            self.profile_matrix.get_frame(1),
+            profile_matrix.get_frame(1)
+        )
+
+    def test_build_mismatched_length(self):
+        self.profiles["EX_PROFILE_2"] = self.profiles["EX_PROFILE_2"].iloc[:48]
+
+        with self.assertRaises(ValueError):
+            ProfileMatrix.build(
+                self.filepath,
+                [("EX_PROFILE_1", 1), ("EX_PROFILE_2", 1)],
+                self._load_profile,
+                COLUMNS
+            )
+
+    def test_rebuild_keeps_open_matrix(self):
+        values = self.profile_matrix.get_frame(0)
+        self.profiles["EX_PROFILE_1"] = self.profiles["EX_PROFILE_1"] * 10
+
+        rebuilt = ProfileMatrix.build(
+            self.filepath, [("EX_PROFILE_1", 1)], self._load_profile, COLUMNS
+        )
+
+        # The open matrix keeps reading the file it mapped
+        pd.testing.assert_frame_equal(values, self.profile_matrix.get_frame(0))
+        self.assertEqual((1, 2, 24), rebuilt.values.shape)
+        # No temporary files are left behind
+        self.assertListEqual(
+            sorted(os.listdir(os.path.dirname(self.filepath))),
+            ["ex_profile_matrix.json", "ex_profile_matrix.npy"]
+        )
+
+    def test_get_filepath(self):
+        filepath = ProfileMatrix.get_filepath(self.tmp_dir, "ex", [("EX_PROFILE_1", 1)], COLUMNS)
+
+        self.assertEqual(
+            filepath,
+            ProfileMatrix.get_filepath(
+                self.tmp_dir, "ex", [("EX_PROFILE_1", 1.0), ("EX_PROFILE_1", 1)], COLUMNS
+            )
+        )
+        self.assertNotEqual(
+            filepath,
+            ProfileMatrix.get_filepath(
+                self.tmp_dir, "ex", [("EX_PROFILE_1", 1), ("EX_PROFILE_2", 1)], COLUMNS
+            )
+        )
+        self.assertTrue(os.path.basename(filepath).startswith("ex_profile_matrix_"))
@@ -0,0 +1,88 @@
+"""
+Unit tests for the ProfileStore class
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.energy_profiles.profile_store import ProfileStore
+
+
+class TestProfileStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_filepath = os.path.join(self.tmp_dir, "EX_PROFILE.csv")
+
+        timestamps = pd.date_range(start="2018-01-01", periods=48, freq="h")
+        self.profile = pd.DataFrame({
+            "timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+            "in.sqft": [1200] * 48,
+            "out.electricity.heating.energy_consumption": np.linspace(0, 1, 48),
+            "out.natural_gas.heating.energy_consumption": np.arange(48),
+        })
+        self.profile.to_csv(self.csv_filepath, index=False)
+
+        self.profile_store = ProfileStore(os.path.join(self.tmp_dir, "compiled"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_profile_matches_csv(self):
+        self.profile_store.compile_profile(self.csv_filepath)
+
+        expected = pd.read_csv(self.csv_filepath).set_index("timestamp")
+        expected.index = pd.to_datetime(expected.index)
+
+        pd.testing.assert_frame_equal(
+            self.profile_store.load_profile("EX_PROFILE"),
+            expected,
+            check_freq=False
+        )
+
+    def test_load_profile_column_prefixes(self):
+        self.profile_store.compile_profile(self.csv_filepath)
+
+        profile = self.profile_store.load_profile("EX_PROFILE", ["out.natural_gas"])
+
+        self.assertListEqual(
+            ["out.natural_gas.heating.energy_consumption"],
+            profile.columns.to_list()
+        )
+        self.assertEqual(profile.iloc[:, 0].dtype, np.int64)
+
+    def test_is_current(self):
+        self.assertFalse(self.profile_store.is_current("EX_PROFILE", self.csv_filepath))
+
+        self.profile_store.compile_profile(self.csv_filepath)
+        self.assertTrue(self.profile_store.is_current("EX_PROFILE", self.csv_filepath))
+
+        # Touch the CSV after compiling; the compiled profile is now stale
+        compiled_mtime = os.path.getmtime(os.path.join(self.tmp_dir, "compiled", "EX_PROFILE.json"))
+        os.utime(self.csv_filepath, (compiled_mtime + 10, compiled_mtime + 10))
+        self.assertFalse(self.profile_store.is_current("EX_PROFILE", self.csv_filepath))
+
+    def test_compile_directory(self):
+        self.assertListEqual(
+            ["EX_PROFILE"],
+            self.profile_store.compile_directory(self.tmp_dir)
+        )
+        self.assertTrue(self.profile_store.has_profile("EX_PROFILE"))
+
+    def test_interrupted_compile(self):
+        self.profile_store.compile_profile(self.csv_filepath)
+        compiled_dir = os.path.join(self.tmp_dir, "compiled")
+        compiled_files = sorted(os.listdir(compiled_dir))
+
+        # A compile of a changed CSV fails while writing; the compiled profile is unchanged
+        self.profile.iloc[:24].to_csv(self.csv_filepath, index=False)
+        with patch("json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.profile_store.compile_profile(self.csv_filepath)
+
+        self.assertListEqual(sorted(os.listdir(compiled_dir)), compiled_files)
+        self.assertEqual(len(self.profile_store.load_profile("EX_PROFILE")), 48)
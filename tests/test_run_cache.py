@@ -0,0 +1,86 @@
+"""
+Unit tests for the RunCache class
+"""
+import os
+import tempfile
+import unittest
+
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.run_cache import RunCache
+
+
+class TestRunCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.run_cache = RunCache(os.path.join(self.tmp_dir.name, "cache"))
+
+        self.study = SegmentStudy("example_street", 10710, 2025, 2050, 2030)
+        self.study.load_parcels()
+
+        self.output_filepath = os.path.join(self.tmp_dir.name, "outputs", "book_val.csv")
+        os.makedirs(os.path.dirname(self.output_filepath))
+        with open(self.output_filepath, "w") as f:
+            f.write("year,book_val\n2020,1.0\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_scenario_key(self):
+        key = self.run_cache.get_scenario_key(self.study, "ex_gas", {"output_format": "csv"})
+
+        self.assertEqual(
+            key, self.run_cache.get_scenario_key(self.study, "ex_gas", {"output_format": "csv"})
+        )
+        self.assertEqual(
+            key,
+            RunCache(self.run_cache.cache_dir).get_scenario_key(
+                self.study, "ex_gas", {"output_format": "csv"}
+            )
+        )
+        self.assertNotEqual(
+            key, self.run_cache.get_scenario_key(self.study, "ex_uten", {"output_format": "csv"})
+        )
+        self.assertNotEqual(
+            key, self.run_cache.get_scenario_key(self.study, "ex_gas", {"output_format": "parquet"})
+        )
+
+    def test_get_scenario_key_existing_costs(self):
+        # ex_gas_costs.csv holds the existing asset costs of parcels in every scenario
+        costs_filepath = "./config_files/example_street/parcels/ex_gas_costs.csv"
+        with open(costs_filepath, "rb") as f:
+            costs = f.read()
+        self.addCleanup(self._write_file, costs_filepath, costs)
+
+        key = self.run_cache.get_scenario_key(self.study, "ex_uten", {"output_format": "csv"})
+        self._write_file(costs_filepath, costs + b"\n")
+
+        self.assertNotEqual(
+            key, self.run_cache.get_scenario_key(self.study, "ex_uten", {"output_format": "csv"})
+        )
+
+    @staticmethod
+    def _write_file(filepath: str, contents: bytes) -> None:
+        with open(filepath, "wb") as f:
+            f.write(contents)
+
+    def test_store_restore(self):
+        self.assertIsNone(self.run_cache.restore("key"))
+
+        self.run_cache.store("key", self.study, "ex_gas", [self.output_filepath], ["B1"])
+        os.remove(self.output_filepath)
+
+        manifest = self.run_cache.restore("key")
+        self.assertEqual(["B1"], manifest["building_ids"])
+        self.assertEqual("year,book_val\n2020,1.0\n", open(self.output_filepath).read())
+
+    def test_prune(self):
+        self.run_cache.store("old_key", self.study, "ex_gas", [self.output_filepath], ["B1"])
+        self.run_cache.store("other_key", self.study, "ex_uten", [self.output_filepath], ["B1"])
+
+        removed_keys = self.run_cache.prune({("example_street", "ex_gas"): "new_key"})
+
+        self.assertEqual(["old_key"], removed_keys)
+        self.assertIsNone(self.run_cache.restore("old_key"))
+        self.assertIsNotNone(self.run_cache.restore("other_key"))
+
+        self.assertEqual(["other_key"], self.run_cache.prune(max_age_days=0))
@@ -0,0 +1,58 @@
+"""
+Unit tests for the ScenarioProfiler class
+"""
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from segment_iat.scenario_creator.scenario_profiler import ScenarioProfiler
+from segment_iat.utils.stage_recorder import listen_stages, stage
+
+
+class TestScenarioProfiler(unittest.TestCase):
+    def _run(self, status_logging) -> None:
+        with listen_stages(status_logging), stage("create_scenario"):
+            status_logging.progress(0.5, "Halfway")
+            with stage("write_outputs"):
+                sum(range(1000))
+
+    def test_profile(self):
+        status_logging = Mock()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiler = ScenarioProfiler(tmp_dir, cprofile=True)
+            with profiler.profile("segment", "scenario_1", status_logging) as recorder:
+                self._run(recorder)
+
+            profiles_path = os.path.join(tmp_dir, "segment")
+            self.assertListEqual(
+                profiler.filepaths,
+                [
+                    os.path.join(profiles_path, "scenario_1_stages.txt"),
+                    os.path.join(profiles_path, "scenario_1_stages.json"),
+                    os.path.join(profiles_path, "scenario_1.pstats"),
+                ]
+            )
+
+            report = open(profiler.filepaths[0]).read().splitlines()
+            self.assertTrue(report[2].startswith("create_scenario"))
+            self.assertTrue(report[2].endswith("100.0%"))
+            stages = json.load(open(profiler.filepaths[1]))["stages"]
+            self.assertListEqual(list(stages), ["create_scenario", "write_outputs"])
+            self.assertEqual(stages["write_outputs"]["calls"], 1)
+            self.assertGreater(pstats.Stats(profiler.filepaths[2]).total_calls, 0)
+
+        status_logging.progress.assert_any_call(0.5, "Halfway")
+
+    def test_track_memory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiler = ScenarioProfiler(tmp_dir, track_memory=True)
+            with profiler.profile("segment", "scenario_1", Mock()) as recorder:
+                self._run(recorder)
+
+            stages = json.load(open(profiler.filepaths[1]))["stages"]
+            self.assertIn("peak_mb", stages["write_outputs"])
+            self.assertEqual(len(profiler.filepaths), 2)
@@ -0,0 +1,85 @@
+"""
+Unit tests for the ScenarioResults class
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.scenario_creator.output_table import OutputTable
+from segment_iat.scenario_creator.output_writer import OutputWriter
+from segment_iat.scenario_creator.scenario_results import ScenarioResults
+
+
+BOOK_VAL_COLUMN_TYPES = {"year": "int64", "book_val": "float64", "asset_id": "string"}
+INCENTIVES_COLUMN_TYPES = {"year": "int64", "incentive": "float64"}
+
+
+class TestScenarioResults(unittest.TestCase):
+    def setUp(self):
+        self.book_val = OutputTable([2020, 2021], "book_val", ["asset_id"])
+        self.book_val.add_series([1.0, 2.5], asset_id="B1")
+        self.book_val.add_series([3.0, 4.0], asset_id="B2")
+
+        self.get_incentives = Mock(
+            return_value=pd.DataFrame({"year": [2020, 2021], "incentive": [0.0, 10.0]})
+        )
+
+        self.results = ScenarioResults(
+            "segment",
+            "scenario_1",
+            [2020, 2021],
+            {"book_val": self.book_val, "incentives": self.get_incentives},
+            {"book_val": BOOK_VAL_COLUMN_TYPES, "incentives": INCENTIVES_COLUMN_TYPES}
+        )
+
+    def test_lazy_tables(self):
+        self.assertListEqual(list(self.results), ["book_val", "incentives"])
+        self.get_incentives.assert_not_called()
+
+        self.assertListEqual(self.results["incentives"]["incentive"].to_list(), [0.0, 10.0])
+        self.results["incentives"]
+        self.get_incentives.assert_called_once()
+
+        self.assertIs(self.results["book_val"], self.results["book_val"])
+        pd.testing.assert_frame_equal(self.results["book_val"], self.book_val.to_frame())
+
+    def test_get_array(self):
+        values, labels = self.results.get_array("book_val")
+
+        np.testing.assert_array_equal(values, [[1.0, 2.5], [3.0, 4.0]])
+        self.assertListEqual(labels["asset_id"].to_list(), ["B1", "B2"])
+
+        with self.assertRaises(ValueError):
+            self.results.get_array("incentives")
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepaths = self.results.write("csv", tmp_dir)
+
+            outputs_path = os.path.join(tmp_dir, "segment", "scenario_1")
+            self.assertListEqual(
+                filepaths,
+                [
+                    os.path.join(outputs_path, "book_val.csv"),
+                    os.path.join(outputs_path, "incentives.csv")
+                ]
+            )
+            self.assertEqual(
+                "year,book_val,asset_id\n2020,1.0,B1\n2021,2.5,B1\n2020,3.0,B2\n2021,4.0,B2\n",
+                open(filepaths[0]).read()
+            )
+
+    def test_memory_writer_keeps_tables_unassembled(self):
+        output_writer = OutputWriter("memory", "", "segment", "scenario_1")
+
+        output_writer.write_table(self.book_val, "book_val", BOOK_VAL_COLUMN_TYPES)
+        output_writer.write_table(self.get_incentives, "incentives", INCENTIVES_COLUMN_TYPES)
+
+        self.assertIs(output_writer.tables["book_val"], self.book_val)
+        self.assertIs(output_writer.tables["incentives"], self.get_incentives)
+        self.get_incentives.assert_not_called()
+        self.assertListEqual(output_writer.filepaths, [])
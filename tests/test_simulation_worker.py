@@ -0,0 +1,153 @@
+"""
+Unit tests for the SimulationWorker class
+"""
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import get_profile_cache
+from segment_iat.scenario_creator.simulation_worker import SimulationWorker, submit_job
+from segment_iat.segment_study.segment_study import SegmentStudy
+from segment_iat.utils.incentives import Incentives
+
+
+# A Rewiring America API response with one incentive
+INCENTIVES_RESPONSE = {
+    "incentives": [
+        {
+            "authority_type": "federal",
+            "program": "Energy Efficient Home Improvement Credit (25C)",
+            "items": ["heat_pump_water_heater"],
+            "amount": {"type": "dollar_amount", "number": 2000},
+            "start_date": "2023",
+            "end_date": "2033",
+        }
+    ]
+}
+
+
+class TestSimulationWorker(unittest.TestCase):
+    def setUp(self):
+        self.study = Mock()
+        self.results = {"book_val": pd.DataFrame({"year": [2020, 2021], "book_val": [1.0, None]})}
+        self.study.run_scenario.return_value = self.results
+
+        self.create_study = Mock(return_value=self.study)
+        self.worker = SimulationWorker(self.create_study, status_logging=Mock())
+
+        patch.object(
+            Incentives, "_call_rewiring_api", return_value=INCENTIVES_RESPONSE
+        ).start()
+        patch("os.path.exists", return_value=True).start()
+        patch(
+            "segment_iat.scenario_creator.simulation_worker.SimulationWorker._get_scenarios",
+            return_value=["ex_gas"]
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def test_studies_stay_loaded(self):
+        for _ in range(3):
+            response = self.worker.run_job({"study": "example_street", "scenario": "EX_GAS"})
+            self.assertEqual(response["status"], "ok")
+
+        self.create_study.assert_called_once_with(
+            "./config_files/example_street/example_street_config.csv"
+        )
+        self.study.load_study.assert_called_once()
+        self.assertEqual(self.study.run_scenario.call_count, 3)
+        self.assertEqual(self.study.run_scenario.call_args.args, ("ex_gas",))
+        self.assertDictEqual(
+            response["tables"],
+            {"book_val": {"columns": ["year", "book_val"], "data": [[2020, 1.0], [2021, None]]}}
+        )
+
+        self.worker.run_job({"command": "reload", "study": "example_street"})
+        self.worker.run_job({"study": "example_street", "scenario": "ex_gas"})
+        self.assertEqual(self.create_study.call_count, 2)
+
+    def test_write_outputs(self):
+        self.study.run_scenario.return_value = Mock()
+        self.study.run_scenario.return_value.write.return_value = ["book_val.csv"]
+
+        response = self.worker.run_job(
+            {"study": "example_street", "scenario": "ex_gas", "output_format": "csv"}
+        )
+
+        self.assertEqual(response["output_filepaths"], ["book_val.csv"])
+        self.study.run_scenario.return_value.write.assert_called_once_with("csv", "./outputs")
+
+    def test_errors(self):
+        bad_jobs = [
+            {"study": "example_street", "scenario": "ex_missing"},
+            {"study": "example_street"},
+            {"study": "example_street", "scenario": "ex_gas", "output_format": "xlsx"},
+            {"study": "example_street", "scenario": "ex_gas", "tables": ["missing"]},
+            {"command": "restart"},
+        ]
+        for job in bad_jobs:
+            response = self.worker.run_job(job)
+            self.assertEqual(response["status"], "error")
+            self.assertIn("error", response)
+
+        self.assertEqual(self.worker.jobs_run, len(bad_jobs))
+
+    def test_serve(self):
+        thread = threading.Thread(target=self.worker.serve, kwargs={"port": 0})
+        thread.start()
+        for _ in range(500):
+            if self.worker.address:
+                break
+            time.sleep(0.01)
+        port = self.worker.address[1]
+
+        response = submit_job({"study": "example_street", "scenario": "ex_gas"}, port=port)
+        self.assertEqual(response["tables"]["book_val"]["data"][0], [2020, 1.0])
+
+        self.assertEqual(submit_job({"command": "shutdown"}, port=port)["status"], "ok")
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+
+class TestSimulationWorkerStudy(unittest.TestCase):
+    def setUp(self):
+        self.call_api = patch.object(
+            Incentives, "_call_rewiring_api", return_value=INCENTIVES_RESPONSE
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def test_incentives_gathered_once(self):
+        worker = SimulationWorker(create_study, status_logging=Mock())
+        for scenario in ["ex_gas", "ex_managed_elec_1", "ex_gas"]:
+            response = worker.run_job(
+                {"study": "example_street", "scenario": scenario, "tables": ["incentives"]}
+            )
+            self.assertEqual(response["status"], "ok")
+        self.assertEqual(self.call_api.call_count, 1)
+
+        worker.run_job({"command": "reload", "study": "example_street"})
+        worker.run_job({"study": "example_street", "scenario": "ex_gas", "tables": ["book_val"]})
+        self.assertEqual(self.call_api.call_count, 2)
+
+    def test_reload_profiles(self):
+        # Scenarios are not run, so only the study's own profiles are loaded
+        patch.object(SegmentStudy, "run_scenario", return_value={}).start()
+        worker = SimulationWorker(create_study, status_logging=Mock())
+        global_cache_len = len(get_profile_cache())
+        job = {"study": "example_street", "scenario": "ex_gas"}
+
+        self.assertEqual(worker.run_job(job)["status"], "ok")
+        num_profiles = len(worker.profile_cache)
+        self.assertGreater(num_profiles, 0)
+        self.assertEqual(worker.profile_cache.misses, num_profiles)
+
+        worker.run_job({"command": "reload", "study": "example_street"})
+        self.assertEqual(len(worker.profile_cache), 0)
+
+        self.assertEqual(worker.run_job(job)["status"], "ok")
+        self.assertEqual(len(worker.profile_cache), num_profiles)
+        self.assertEqual(worker.profile_cache.misses, 2 * num_profiles)
+        self.assertEqual(len(get_profile_cache()), global_cache_len)
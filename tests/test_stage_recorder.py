@@ -0,0 +1,121 @@
+"""
+Unit tests for the stage hooks and the StageRecorder class
+"""
+import threading
+import tracemalloc
+import unittest
+from unittest.mock import Mock
+
+from segment_iat.buildings.building import Building
+from segment_iat.utils.stage_recorder import StageRecorder, listen_stages, stage
+
+
+class Pipeline:
+    def run(self, size: int) -> list:
+        with stage("run"):
+            return [self.allocate(size), Pipeline.scale(size), Pipeline.describe()]
+
+    @staticmethod
+    def allocate(size: int) -> int:
+        with stage("allocate"):
+            return len(bytearray(size))
+
+    @staticmethod
+    def scale(size: int) -> int:
+        return size * 2
+
+    @classmethod
+    def describe(cls) -> str:
+        return cls.__name__
+
+
+class TestStageHooks(unittest.TestCase):
+    def test_listen_stages(self):
+        recorder = StageRecorder()
+        Pipeline().run(10)
+
+        with listen_stages(recorder), listen_stages(recorder), listen_stages(Mock(spec=[])):
+            Pipeline().run(10)
+            thread = threading.Thread(target=Pipeline().run, args=(10,))
+            thread.start()
+            thread.join()
+        Pipeline().run(10)
+
+        self.assertListEqual(list(recorder.stages), ["run", "allocate"])
+        self.assertEqual(recorder.stages["run"]["calls"], 1)
+        self.assertEqual(recorder.stages["allocate"]["calls"], 1)
+        self.assertGreaterEqual(
+            recorder.stages["run"]["wall_s"], recorder.stages["allocate"]["wall_s"]
+        )
+
+    def test_callbacks(self):
+        listener = Mock()
+
+        with listen_stages(listener):
+            Pipeline.allocate(1)
+
+        self.assertListEqual(
+            listener.mock_calls,
+            [("stage_started", ("allocate",), {}), ("stage_finished", ("allocate",), {})]
+        )
+
+    def test_populate_building(self):
+        recorder = StageRecorder(status_logging=Mock())
+        building = Mock()
+
+        with listen_stages(recorder):
+            Building.populate_building(building)
+
+        self.assertListEqual(
+            list(recorder.stages),
+            [
+                "populate_building",
+                "building.energies",
+                "building.lifecycle",
+                "building.costs",
+                "building.utility_costs",
+            ]
+        )
+        building._get_building_energies.assert_called_once()
+
+
+class TestStageRecorder(unittest.TestCase):
+    def test_instrument(self):
+        recorder = StageRecorder()
+        stages = {"scale": (Pipeline, "scale"), "describe": (Pipeline, "describe")}
+        original_run = Pipeline.run
+
+        with recorder.instrument(stages), listen_stages(recorder):
+            self.assertListEqual(Pipeline().run(10), [10, 20, "Pipeline"])
+            Pipeline.scale(1)
+
+        self.assertIs(Pipeline.run, original_run)
+        self.assertIsInstance(Pipeline.__dict__["scale"], staticmethod)
+        self.assertListEqual(list(recorder.stages), ["run", "allocate", "scale", "describe"])
+        self.assertEqual(recorder.stages["scale"]["calls"], 2)
+        self.assertNotIn("peak_mb", recorder.stages["run"])
+
+    def test_track_memory(self):
+        recorder = StageRecorder(track_memory=True)
+        size = 8 * 1024 ** 2
+
+        with listen_stages(recorder), recorder.measure("total"):
+            Pipeline().run(size)
+            Pipeline.scale(size)
+
+        self.assertFalse(tracemalloc.is_tracing())
+        for stage_name in ["total", "run", "allocate"]:
+            self.assertGreaterEqual(recorder.stages[stage_name]["peak_mb"], 8)
+            self.assertLess(recorder.stages[stage_name]["peak_mb"], 9)
+
+        report = recorder.format_report("total").splitlines()
+        self.assertEqual(len(report), 4)
+        self.assertIn("peak_mb", report[0])
+        self.assertTrue(report[1].startswith("total"))
+        self.assertTrue(report[1].endswith("100.0%"))
+
+    def test_progress(self):
+        status_logging = Mock()
+        StageRecorder(status_logging=status_logging).progress(0.5, "Halfway")
+
+        status_logging.progress.assert_called_once_with(0.5, "Halfway")
@@ -0,0 +1,130 @@
+"""
+Unit tests for the StudyBaseline module
+"""
+import pickle
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.buildings.study_baseline import METER_COLUMNS, StudyBaseline
+from segment_iat.end_uses.building_end_uses.stove import Stove
+from segment_iat.utils.time_axis import TimeAxis
+
+
+STOVE_COLUMN = "out.natural_gas.range_oven.energy_consumption"
+
+
+class TestStudyBaseline(unittest.TestCase):
+    def setUp(self):
+        self.time_axis = TimeAxis(2018)
+        self.years_vec = [2020, 2021, 2022]
+
+        self.config_tables = Mock()
+        self.config_tables.get_measure_costs.return_value = {
+            "parcel_1": {
+                "stove": 1000, "hvac": 8000, "clothes_dryer": 700, "domestic_hot_water": 1500
+            },
+            "parcel_2": {
+                "stove": 2000, "hvac": 9000, "clothes_dryer": 800, "domestic_hot_water": 1600
+            },
+        }
+
+        self.buildings_params = [
+            {
+                "building_id": "parcel_1",
+                "baseline_consumption_id": "profile_a",
+                "load_scaling_factor": 1,
+                "asset_install_year": 2010,
+                "existing_measures_cost_id": "existing_costs",
+            },
+            {
+                "building_id": "parcel_2",
+                "baseline_consumption_id": "profile_a",
+                "load_scaling_factor": 1,
+                "asset_install_year": 2015,
+                "existing_measures_cost_id": "existing_costs",
+            },
+        ]
+
+        # 15-minute profile, so hourly consumption is resampled
+        timestamps = pd.date_range("2018-01-01", periods=4 * len(self.time_axis), freq="15min")
+        values = np.arange(len(timestamps), dtype=float)
+        self.consumption = pd.DataFrame(
+            {**{column: values for column in METER_COLUMNS}, STOVE_COLUMN: values},
+            index=timestamps
+        )
+
+        self.load_digest = Mock(return_value="digest_a")
+        self.load_profile = Mock(return_value=self.consumption)
+
+        self.baseline = StudyBaseline(
+            self.buildings_params, self.years_vec, self.config_tables, self.time_axis
+        )
+
+    def test_populate_baseline(self):
+        self.baseline.populate_baseline(self.load_digest, self.load_profile)
+
+        self.load_digest.assert_called_once_with("profile_a", 1)
+        self.assertEqual(self.baseline.get_digest(("profile_a", 1)), "digest_a")
+
+        for column in METER_COLUMNS:
+            pd.testing.assert_series_equal(
+                self.baseline.get_hourly_consumption(("profile_a", 1), column),
+                self.time_axis.conform(self.consumption[column].resample("h").sum())
+            )
+            self.assertEqual(
+                self.baseline.get_total_consumption(("profile_a", 1), column),
+                self.consumption[column].sum()
+            )
+
+    def test_end_use_energy(self):
+        self.baseline.populate_baseline(self.load_digest, self.load_profile)
+
+        stove_energy = self.baseline.get_end_use_energy(("profile_a", 1), "stove")
+        self.assertIn(STOVE_COLUMN, stove_energy.columns)
+        pd.testing.assert_series_equal(stove_energy[STOVE_COLUMN], self.consumption[STOVE_COLUMN])
+
+        stove = Stove(self.years_vec, [], custom_baseline_energy=self.consumption)
+        stove.initialize_baseline(stove_energy)
+        self.assertIs(stove.baseline_energy_use, stove_energy)
+
+    def test_existing_book_val(self):
+        self.baseline.populate_baseline(self.load_digest)
+
+        stove = Stove(
+            self.years_vec,
+            [],
+            existing_install_cost=2000,
+            existing_install_year=2015,
+            inflation_escalator=0.02
+        )
+
+        self.assertEqual(
+            self.baseline.get_existing_book_val("parcel_2", "stove"),
+            stove._get_existing_book_val()
+        )
+        self.assertIsNotNone(self.baseline.get_existing_book_val("parcel_1", "hvac"))
+
+    def test_populate_baseline_without_timeseries(self):
+        self.baseline.populate_baseline(self.load_digest)
+
+        self.assertEqual(self.baseline.get_digest(("profile_a", 1)), "digest_a")
+        self.assertIsNone(self.baseline.get_hourly_consumption(("profile_a", 1), METER_COLUMNS[0]))
+        self.assertIsNone(self.baseline.get_total_consumption(("profile_a", 1), METER_COLUMNS[0]))
+        self.assertIsNone(self.baseline.get_end_use_energy(("profile_a", 1), "stove"))
+
+    def test_pickle_drops_timeseries(self):
+        self.baseline.populate_baseline(self.load_digest, self.load_profile)
+        self.baseline._config_tables = None
+
+        unpickled = pickle.loads(pickle.dumps(self.baseline))
+
+        self.assertEqual(unpickled.get_digest(("profile_a", 1)), "digest_a")
+        self.assertEqual(
+            unpickled.get_existing_book_val("parcel_1", "stove"),
+            self.baseline.get_existing_book_val("parcel_1", "stove")
+        )
+        self.assertIsNone(unpickled.get_hourly_consumption(("profile_a", 1), METER_COLUMNS[0]))
+        self.assertIsNone(unpickled.get_end_use_energy(("profile_a", 1), "stove"))
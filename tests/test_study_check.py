@@ -0,0 +1,88 @@
+"""
+Unit tests for the study pre-check
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from segment_iat.utils.study_check import check_study, get_scenarios
+
+
+class TestStudyCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_basepath = self.tmp_dir.name
+        self.study_path = os.path.join(self.config_basepath, "example_street")
+        shutil.copytree("./config_files/example_street", self.study_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_file(self, relative_filepath: str, contents: str) -> None:
+        with open(os.path.join(self.study_path, relative_filepath), "w") as f:
+            f.write(contents)
+
+    def test_get_scenarios(self):
+        scenarios = get_scenarios("example_street", config_basepath=self.config_basepath)
+        self.assertEqual(len(scenarios), 6)
+        self.assertIn("ex_gas", scenarios)
+
+        self.assertListEqual(
+            get_scenarios("example_street", ["EX_GAS"], config_basepath=self.config_basepath),
+            ["ex_gas"]
+        )
+        with self.assertRaises(FileNotFoundError):
+            get_scenarios("example_street", ["ex_none"], config_basepath=self.config_basepath)
+        with self.assertRaises(FileNotFoundError):
+            get_scenarios("other_street", config_basepath=self.config_basepath)
+
+    def test_check_study(self):
+        scenarios = get_scenarios("example_street", config_basepath=self.config_basepath)
+        self.assertListEqual(
+            check_study("example_street", scenarios, config_basepath=self.config_basepath), []
+        )
+
+        self._write_file(
+            "example_street_config.csv",
+            "input,value\nstreet_segment,example_street\nstart_year,2025\nend_year,2050\n"
+            "gas_pipe_intervention_year,2060\nzip_code,107A0\n"
+        )
+        self._write_file(
+            os.path.join("scenarios", "ex_gas_config.csv"),
+            "scenario_name,ex_gas\nparcel_retrofit_measures_filename,ex_none_measures\n"
+            "parcel_retrofit_measure_costs_filename,ex_gas_costs\n"
+        )
+        os.remove(os.path.join(self.study_path, "parcels", "uten_costs.csv"))
+
+        problems = check_study(
+            "example_street", ["ex_gas", "ex_uten"], config_basepath=self.config_basepath
+        )
+
+        self.assertEqual(len(problems), 5)
+        self.assertIn("zip_code 107A0 is not an integer", problems[0])
+        self.assertIn("gas_pipe_intervention_year must be between", problems[1])
+        self.assertIn("EX_GAS is missing settings ['gas_intervention']", problems[2])
+        self.assertIn("ex_none_measures.csv", problems[3])
+        self.assertIn("EX_UTEN: No measure costs file found", problems[4])
+
+    def test_light_imports(self):
+        # The CLI only imports pandas once a run starts
+        modules = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, run; print(sorted(set(sys.modules) & {'pandas', 'numpy', 'requests'}))"
+            ],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+
+        self.assertEqual(modules.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the SyntheticStudy class
+"""
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from segment_iat.utils.synthetic_study import SyntheticStudy
+
+
+SIZES = {"parcels": 120, "transformers": 15, "mains": 4, "retrofit_waves": 3, "archetypes": 2}
+
+
+class TestSyntheticStudy(unittest.TestCase):
+    def setUp(self):
+        self.study = SyntheticStudy("synth", seed=7, **SIZES)
+
+    def _get_table(self, table_name: str) -> pd.DataFrame:
+        return self.study.tables[os.path.join("utility_network", f"synth_{table_name}.csv")]
+
+    def test_seed(self):
+        same_seed = SyntheticStudy("synth", seed=7, **SIZES)
+        other_seed = SyntheticStudy("synth", seed=8, **SIZES)
+
+        for relative_filepath, table_df in self.study.tables.items():
+            pd.testing.assert_frame_equal(table_df, same_seed.tables[relative_filepath])
+        for consumption_id, profile_df in self.study.profiles.items():
+            pd.testing.assert_frame_equal(profile_df, same_seed.profiles[consumption_id])
+
+        self.assertFalse(self.study.parcels_table.equals(other_seed.parcels_table))
+
+    def test_network(self):
+        parcels = self.study.parcels_table
+        transformers = self._get_table("elec_xmfrs")
+        secondaries = self._get_table("elec_secondaries")
+        services = self._get_table("elec_services")
+        meters = self._get_table("elec_meters")
+
+        self.assertEqual(len(transformers), 15)
+        self.assertListEqual(list(secondaries["parentid"]), list(transformers["gisid"]))
+        self.assertListEqual(list(services["LOC_ID"]), list(parcels["parcel_id"]))
+        self.assertListEqual(list(meters["parentid"]), list(services["gisid"]))
+        fanout = services.groupby("parentid").size()
+        self.assertEqual(len(fanout), 15)
+        self.assertGreater(fanout.max(), fanout.min())
+
+        mains = self._get_table("gas_main")
+        gas_services = self._get_table("gas_services")
+        gas_meters = self._get_table("gas_meters")
+        gas_parcels = parcels.loc[parcels["uses_piped_gas"] == 1, "parcel_id"]
+        self.assertEqual(len(mains), 4)
+        self.assertSetEqual(set(gas_services["parentid"]), set(mains["gisid"]))
+        self.assertListEqual(list(gas_services["LOC_ID"]), list(gas_parcels))
+        self.assertListEqual(list(gas_meters["parentid"]), list(gas_services["gisid"]))
+        self.assertLess(len(gas_parcels), len(parcels))
+
+    def test_scenarios(self):
+        parcels = self.study.parcels_table
+        measures = self.study.tables[os.path.join("parcels", "managed_elec_measures.csv")]
+        gas_services = self._get_table("gas_services")
+
+        self.assertListEqual(sorted(measures["install_year"].unique()), [2026, 2030, 2035])
+        # Every parcel on a gas main is retrofit in the same wave
+        main_years = gas_services.merge(
+            measures, left_on="LOC_ID", right_on="parcel_id"
+        ).groupby("parentid")["install_year"].nunique()
+        self.assertEqual(main_years.max(), 1)
+
+        consumption_ids = set(parcels["baseline_consumption_id"])
+        consumption_ids.update(measures["energy_profile_id"])
+        self.assertTrue(consumption_ids.issubset(self.study.profiles))
+        profile = self.study.profiles[measures["energy_profile_id"].iloc[0]]
+        self.assertEqual(len(profile), 8760)
+        self.assertEqual(profile["out.natural_gas.heating.energy_consumption"].sum(), 0)
+
+        thermal_network = self._get_table("thrml_net").set_index("asset_id")
+        self.assertEqual(thermal_network.loc["install_year", "TEN_1"], 2026)
+
+    def test_write_study(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiles_dirpath = os.path.join(tmp_dir, "energy_consumption")
+            study_path = self.study.write_study(tmp_dir, profiles_dirpath, compile_profiles=True)
+
+            study_config = pd.read_csv(os.path.join(study_path, "synth_config.csv"), index_col=0)
+            self.assertEqual(study_config.loc["street_segment", "value"], "synth")
+            scenario_config = pd.read_csv(
+                os.path.join(study_path, "scenarios", "thermal_network_config.csv"), index_col=0
+            )
+            self.assertEqual(
+                scenario_config.loc["parcel_retrofit_measures_filename", "thermal_network"],
+                "thermal_network_measures"
+            )
+            self.assertEqual(len(os.listdir(profiles_dirpath)), len(self.study.profiles) + 1)
+            self.assertTrue(os.path.isdir(os.path.join(profiles_dirpath, "compiled")))
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            SyntheticStudy("synth", 10, transformers=11)
+        with self.assertRaises(ValueError):
+            SyntheticStudy("synth", 10, retrofit_waves=20)
+        with self.assertRaises(ValueError):
+            SyntheticStudy("synth", 10, gas_pipe_intervention_year=2060)
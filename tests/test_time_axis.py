@@ -0,0 +1,65 @@
+"""
+Unit tests for the TimeAxis class
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from segment_iat.utils.time_axis import TimeAxis, get_time_axis
+
+
+class TestTimeAxis(unittest.TestCase):
+    def setUp(self):
+        self.time_axis = TimeAxis()
+
+    def test_timestamps(self):
+        self.assertEqual(
+            pd.date_range(
+                start="2018-01-01", end="2019-01-01", freq="h", inclusive="left"
+            ).to_list(),
+            self.time_axis.timestamps.to_list()
+        )
+
+    def test_leap_year(self):
+        self.assertEqual(8784, len(TimeAxis(2020)))
+
+        time_axis = TimeAxis(2020, include_leap_day=False)
+        self.assertEqual(8760, len(time_axis))
+        self.assertFalse(
+            ((time_axis.timestamps.month == 2) & (time_axis.timestamps.day == 29)).any()
+        )
+
+    def test_get_time_axis(self):
+        self.assertIs(get_time_axis(), get_time_axis(2018, True))
+        self.assertIsNot(get_time_axis(), get_time_axis(2020))
+
+    def test_conform(self):
+        timeseries = pd.Series(
+            np.arange(8760.0),
+            index=pd.date_range(start="2018-01-01", periods=8760, freq="h"),
+            name="out.electricity.total.energy_consumption"
+        )
+
+        conformed = self.time_axis.conform(timeseries)
+        self.assertIs(self.time_axis.timestamps, conformed.index)
+        self.assertEqual(timeseries.name, conformed.name)
+        self.assertTrue(np.shares_memory(timeseries.to_numpy(), conformed.to_numpy()))
+        self.assertIs(conformed, self.time_axis.conform(conformed))
+
+    def test_conform_leap_day(self):
+        time_axis = TimeAxis(2020, include_leap_day=False)
+        timeseries = pd.Series(
+            np.ones(8784), index=pd.date_range(start="2020-01-01", periods=8784, freq="h")
+        )
+
+        conformed = time_axis.conform(timeseries)
+        self.assertIs(time_axis.timestamps, conformed.index)
+
+    def test_conform_mismatch(self):
+        timeseries = pd.Series(
+            np.ones(8760), index=pd.date_range(start="2019-01-01", periods=8760, freq="h")
+        )
+
+        with self.assertRaises(ValueError):
+            self.time_axis.conform(timeseries)
@@ -0,0 +1,113 @@
+"""
+Integration tests checking that the optimized paths of a scenario run give the same outputs as
+the reference path, and that the reference path gives the golden outputs
+"""
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import ProfileCache
+from segment_iat.scenario_creator.equivalence_check import (
+    EquivalenceCheck,
+    compare_output_dirs,
+    format_difference
+)
+from segment_iat.scenario_creator.output_writer import OUTPUT_FORMAT_MEMORY
+from segment_iat.utils.status import QuietStatus
+from segment_iat.utils.synthetic_study import PROFILES_BASEPATH, SyntheticStudy
+
+
+SYNTHETIC_STUDY_ID = "synth_equivalence"
+
+# Outputs of each study, written by the scenario runs before any of the optimized paths existed,
+# with no incentives
+GOLDEN_BASEPATH = "./tests_integration/golden"
+GOLDEN_SYNTHETIC_STUDY_ID = "synth_golden"
+
+
+class TestEquivalenceCheck(unittest.TestCase):
+    def setUp(self):
+        # The reference and optimized paths share incentives, so none are queried
+        self.incentives = Mock(incentives=[])
+
+    def _check_study(self, study_id: str, scenarios: list) -> None:
+        equivalence_check = EquivalenceCheck(
+            create_study(f"./config_files/{study_id}/{study_id}_config.csv"),
+            scenarios,
+            incentives=self.incentives,
+            status_logging=Mock()
+        )
+        differences = equivalence_check.run()
+
+        self.assertListEqual([format_difference(i) for i in differences], [])
+
+    def test_example_street(self):
+        self._check_study("example_street", ["ex_gas", "ex_managed_elec_1", "ex_uten"])
+
+    def test_synthetic_study(self):
+        synthetic_study = SyntheticStudy(SYNTHETIC_STUDY_ID, 40, retrofit_waves=2, seed=3)
+        synthetic_study.write_study()
+        self.addCleanup(self._remove_synthetic_study)
+
+        self._check_study(
+            SYNTHETIC_STUDY_ID, ["continued_gas", "managed_elec", "thermal_network"]
+        )
+
+    def _remove_synthetic_study(self, study_id: str = SYNTHETIC_STUDY_ID) -> None:
+        shutil.rmtree(os.path.join("./config_files", study_id), ignore_errors=True)
+        profile_filepaths = glob.glob(
+            os.path.join(PROFILES_BASEPATH, "**", f"{study_id}_*"), recursive=True
+        )
+        for filepath in profile_filepaths:
+            os.remove(filepath)
+
+
+class TestGoldenOutputs(TestEquivalenceCheck):
+    """
+    The reference path shares its output tables and asset lifecycles with the optimized paths, so
+    it is checked against outputs written before those were optimized
+    """
+    def _check_study(self, study_id: str, scenarios: list) -> None:
+        study = create_study(f"./config_files/{study_id}/{study_id}_config.csv")
+        study.load_parcels()
+        profile_cache = ProfileCache()
+        outputs_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(outputs_dir.cleanup)
+
+        for scenario in scenarios:
+            scenario_creator = study.create_scenario_creator(
+                scenario,
+                QuietStatus(),
+                study_baseline=False,
+                profile_cache=profile_cache,
+                output_format=OUTPUT_FORMAT_MEMORY,
+                incentives=self.incentives
+            )
+            scenario_creator.create_scenario()
+            scenario_creator.results.write("csv", outputs_dir.name)
+
+        differences = compare_output_dirs(
+            os.path.join(GOLDEN_BASEPATH, study_id), os.path.join(outputs_dir.name, study_id)
+        )
+
+        self.assertListEqual([format_difference(i) for i in differences], [])
+
+    def test_example_street(self):
+        self._check_study("example_street", ["ex_gas", "ex_managed_elec_1", "ex_uten"])
+
+    def test_synthetic_study(self):
+        synthetic_study = SyntheticStudy(GOLDEN_SYNTHETIC_STUDY_ID, 16, retrofit_waves=2, seed=3)
+        synthetic_study.write_study()
+        self.addCleanup(self._remove_synthetic_study, GOLDEN_SYNTHETIC_STUDY_ID)
+
+        self._check_study(
+            GOLDEN_SYNTHETIC_STUDY_ID, ["continued_gas", "managed_elec", "thermal_network"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Script for running a long-running simulation worker that keeps studies loaded between jobs
+"""
+import argparse
+import json
+
+from run import create_study
+from segment_iat.energy_profiles.profile_cache import DEFAULT_MEMORY_BUDGET_MB
+from segment_iat.scenario_creator.simulation_worker import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    SimulationWorker,
+    submit_job
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep studies loaded in memory and run scenario jobs sent as JSON lines to a "
+        "local socket, or send one job to a running worker"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address (default: {DEFAULT_HOST})")
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument(
+        "--preload",
+        nargs="+",
+        default=[],
+        help="Studies to load before accepting jobs"
+    )
+    parser.add_argument(
+        "--profile-cache-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Memory budget in MB for energy profiles (default: {DEFAULT_MEMORY_BUDGET_MB})"
+    )
+    parser.add_argument(
+        "--profile-matrix",
+        help="Hold the energy profiles of every scenario of a study in one shared matrix",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--verbose",
+        help="Print the status messages of each scenario run",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--submit",
+        metavar="JOB",
+        help='Send one job to a running worker and print its response, i.e. '
+        '\'{"study": "example_street", "scenario": "ex_gas", "output_format": "csv"}\''
+    )
+    args = parser.parse_args()
+
+    if args.submit:
+        print(json.dumps(submit_job(json.loads(args.submit), args.host, args.port)))
+        return
+
+    worker = SimulationWorker(
+        create_study,
+        profile_cache_mb=args.profile_cache_mb,
+        profile_matrix=args.profile_matrix,
+        verbose=args.verbose
+    )
+    for study in args.preload:
+        worker.load_study(study)
+
+    worker.serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()